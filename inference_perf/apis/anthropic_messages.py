@@ -20,10 +20,11 @@ from aiohttp import ClientResponse
 
 from inference_perf.apis.base import InferenceAPIData, InferenceInfo, StreamedResponseMetrics, UnaryResponseMetrics
 from inference_perf.apis.chat import ChatMessage, _clean_parameters
+from inference_perf.apis.json_codec import JsonCodec, get_json_codec
 from inference_perf.apis.streaming_parser import parse_sse_stream
 from inference_perf.config import APIConfig, APIType
 from inference_perf.payloads import RequestBody, RequestMetrics, Text
-from inference_perf.utils.custom_tokenizer import CustomTokenizer
+from inference_perf.utils.custom_tokenizer import CustomTokenizer, count_chunk_tokens_async, count_tokens_async
 
 
 ANTHROPIC_VERSION = "2023-06-01"
@@ -263,14 +264,21 @@ def _build_anthropic_stream_handlers() -> tuple[Callable[[dict[str, Any]], str |
 
 
 async def parse_anthropic_stream_response(
-    response: ClientResponse,
-) -> tuple[str, dict[str, Any], list[float], str, list[str], dict[str, Any] | None]:
+    response: ClientResponse, capture_raw: bool = True, json_codec: JsonCodec | None = None
+) -> tuple[str, dict[str, Any], list[float], str, list[str], dict[str, Any] | None, list[str]]:
     extract_content, build_output_message = _build_anthropic_stream_handlers()
-    output_text, chunk_times, raw_content, response_chunks, server_usage = await parse_sse_stream(
-        response,
-        extract_content=extract_content,
+    output_text, chunk_times, raw_content, response_chunks, server_usage, chunk_texts = await parse_sse_stream(
+        response, extract_content=extract_content, capture_raw=capture_raw, json_codec=json_codec
+    )
+    return (
+        output_text,
+        build_output_message(output_text),
+        chunk_times,
+        raw_content,
+        response_chunks,
+        server_usage,
+        chunk_texts,
     )
-    return output_text, build_output_message(output_text), chunk_times, raw_content, response_chunks, server_usage
 
 
 class AnthropicMessagesAPIData(InferenceAPIData):
@@ -314,10 +322,13 @@ class AnthropicMessagesAPIData(InferenceAPIData):
                 raw_content,
                 response_chunks,
                 server_usage,
-            ) = await parse_anthropic_stream_response(response)
+                chunk_texts,
+            ) = await parse_anthropic_stream_response(
+                response, capture_raw=config.capture_raw_response, json_codec=get_json_codec(config.json_codec)
+            )
             input_tokens = (server_usage or {}).get("input_tokens")
             output_tokens = (server_usage or {}).get("output_tokens")
-            output_len = int(output_tokens) if output_tokens is not None else tokenizer.count_tokens(output_text)
+            output_len = int(output_tokens) if output_tokens is not None else await count_tokens_async(tokenizer, output_text)
             return InferenceInfo(
                 request_metrics=RequestMetrics(
                     text=Text(
@@ -329,6 +340,7 @@ class AnthropicMessagesAPIData(InferenceAPIData):
                     chunk_times=chunk_times,
                     output_tokens=output_len,
                     output_token_times=chunk_times,
+                    chunk_token_counts=await count_chunk_tokens_async(tokenizer, chunk_texts),
                     server_usage=server_usage,
                 ),
                 lora_adapter=lora_adapter,
@@ -340,7 +352,7 @@ class AnthropicMessagesAPIData(InferenceAPIData):
         output_text, output_message = parse_anthropic_content(data.get("content"))
         input_tokens = usage.get("input_tokens")
         output_tokens = usage.get("output_tokens")
-        output_len = int(output_tokens) if output_tokens is not None else tokenizer.count_tokens(output_text)
+        output_len = int(output_tokens) if output_tokens is not None else await count_tokens_async(tokenizer, output_text)
         extra_info: dict[str, Any] = {
             "stop_reason": data.get("stop_reason"),
             "output_message": output_message,
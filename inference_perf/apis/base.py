@@ -36,6 +36,9 @@ class StreamedResponseMetrics(ResponseMetrics):
     response_chunks: List[str] = []
     chunk_times: List[float] = []
     output_token_times: List[float] = []
+    # Tokens in each content chunk, 1:1 with chunk_times; counted when the request completes so
+    # reports can expand chunk times into per-token times without re-tokenizing response_chunks
+    chunk_token_counts: List[int] = []
 
 
 class InferenceInfo(BaseModel):
@@ -75,6 +78,10 @@ class RequestLifecycleMetric(BaseModel):
     ttft_slo_sec: Optional[float] = None
     tpot_slo_sec: Optional[float] = None
 
+    # Seconds spent serializing the request body and parsing response JSON
+    json_encode_time: Optional[float] = None
+    json_decode_time: Optional[float] = None
+
 
 class SessionLifecycleMetric(BaseModel):
     session_id: str
@@ -34,6 +34,7 @@ from inference_perf.payloads import (
     SyntheticImageSpec,
     SyntheticMp4VideoSpec,
 )
+from inference_perf.apis.json_codec import get_json_codec
 from inference_perf.apis.streaming_parser import parse_sse_stream
 from inference_perf.config import APIConfig, APIType
 from inference_perf.mediagen.pool import get_video_pool
@@ -49,7 +50,7 @@ from inference_perf.payloads import (
     Video,
     Videos,
 )
-from inference_perf.utils.custom_tokenizer import CustomTokenizer
+from inference_perf.utils.custom_tokenizer import CustomTokenizer, count_chunk_tokens_async, count_tokens_async
 
 logger = logging.getLogger(__name__)
 
@@ -561,14 +562,17 @@ class ChatCompletionAPIData(InferenceAPIData):
         self, response: ClientResponse, config: APIConfig, tokenizer: CustomTokenizer, lora_adapter: Optional[str] = None
     ) -> InferenceInfo:
         if config.streaming:
-            output_text, chunk_times, raw_content, response_chunks, server_usage = await parse_sse_stream(
-                response, extract_content=lambda data: data.get("choices", [{}])[0].get("delta", {}).get("content")
+            output_text, chunk_times, raw_content, response_chunks, server_usage, chunk_texts = await parse_sse_stream(
+                response,
+                extract_content=lambda data: data.get("choices", [{}])[0].get("delta", {}).get("content"),
+                capture_raw=config.capture_raw_response,
+                json_codec=get_json_codec(config.json_codec),
             )
             prompt_len = self._resolve_prompt_tokens(server_usage, tokenizer)
             # Generated text is a continuation, not a sequence start: counting it
             # with special tokens would add a BOS the server's completion_tokens
             # never contains.
-            output_len = tokenizer.count_tokens(output_text, add_special_tokens=False)
+            output_len = await count_tokens_async(tokenizer, output_text, add_special_tokens=False)
             return InferenceInfo(
                 request_metrics=self._build_request_metrics(prompt_len, output_len),
                 response_metrics=StreamedResponseMetrics(
@@ -576,6 +580,7 @@ class ChatCompletionAPIData(InferenceAPIData):
                     chunk_times=chunk_times,
                     output_tokens=output_len,
                     output_token_times=chunk_times,
+                    chunk_token_counts=await count_chunk_tokens_async(tokenizer, chunk_texts),
                     server_usage=server_usage,
                 ),
                 lora_adapter=lora_adapter,
@@ -592,7 +597,7 @@ class ChatCompletionAPIData(InferenceAPIData):
                 lora_adapter=lora_adapter,
             )
         output_text = "".join([choice.get("message", {}).get("content", "") for choice in choices])
-        output_len = tokenizer.count_tokens(output_text, add_special_tokens=False)
+        output_len = await count_tokens_async(tokenizer, output_text, add_special_tokens=False)
         return InferenceInfo(
             request_metrics=self._build_request_metrics(prompt_len, output_len),
             response_metrics=UnaryResponseMetrics(output_tokens=output_len, server_usage=server_usage),
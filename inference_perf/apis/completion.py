@@ -18,8 +18,9 @@ from typing import Any, Dict, Optional
 from aiohttp import ClientResponse
 from inference_perf.apis import InferenceAPIData, InferenceInfo, UnaryResponseMetrics, StreamedResponseMetrics
 from inference_perf.payloads import RequestBody, RequestMetrics, Text
-from inference_perf.utils.custom_tokenizer import CustomTokenizer
+from inference_perf.utils.custom_tokenizer import CustomTokenizer, count_chunk_tokens_async, count_tokens_async
 from inference_perf.config import APIConfig, APIType
+from inference_perf.apis.json_codec import get_json_codec
 from inference_perf.apis.streaming_parser import parse_sse_stream
 
 
@@ -75,15 +76,18 @@ class CompletionAPIData(InferenceAPIData):
     ) -> InferenceInfo:
         if config.streaming:
             # Use shared streaming parser with completion-specific content extraction
-            output_text, chunk_times, raw_content, response_chunks, server_usage = await parse_sse_stream(
-                response, extract_content=lambda data: data.get("choices", [{}])[0].get("text")
+            output_text, chunk_times, raw_content, response_chunks, server_usage, chunk_texts = await parse_sse_stream(
+                response,
+                extract_content=lambda data: data.get("choices", [{}])[0].get("text"),
+                capture_raw=config.capture_raw_response,
+                json_codec=get_json_codec(config.json_codec),
             )
 
             prompt_len = self._resolve_prompt_tokens(server_usage, tokenizer)
             # Generated text is a continuation, not a sequence start: counting it
             # with special tokens would add a BOS the server's completion_tokens
             # never contains.
-            output_len = tokenizer.count_tokens(output_text, add_special_tokens=False)
+            output_len = await count_tokens_async(tokenizer, output_text, add_special_tokens=False)
             self.model_response = output_text
             return InferenceInfo(
                 request_metrics=RequestMetrics(text=Text(input_tokens=prompt_len)),
@@ -92,6 +96,7 @@ class CompletionAPIData(InferenceAPIData):
                     chunk_times=chunk_times,
                     output_tokens=output_len,
                     output_token_times=chunk_times,
+                    chunk_token_counts=await count_chunk_tokens_async(tokenizer, chunk_texts),
                     server_usage=server_usage,
                 ),
                 lora_adapter=lora_adapter,
@@ -108,7 +113,7 @@ class CompletionAPIData(InferenceAPIData):
                     lora_adapter=lora_adapter,
                 )
             output_text = choices[0].get("text", "")
-            output_len = tokenizer.count_tokens(output_text, add_special_tokens=False)
+            output_len = await count_tokens_async(tokenizer, output_text, add_special_tokens=False)
             self.model_response = output_text
             return InferenceInfo(
                 request_metrics=RequestMetrics(text=Text(input_tokens=prompt_len)),
@@ -0,0 +1,151 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pluggable JSON codec for request bodies and streamed response chunks.
+
+orjson or msgspec are used when installed (``pip install inference-perf[fastjson]``)
+and the standard library otherwise. All codecs raise json.JSONDecodeError on
+invalid input so callers handle decode errors the same way regardless of codec.
+
+Time spent in the codec is added to the CodecTiming of the current asyncio task
+(see start_codec_timing), which the client records per request.
+"""
+
+import json
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Union
+
+from inference_perf.config import JsonCodecType
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+class CodecTiming:
+    """Seconds a single request spent encoding and decoding JSON."""
+
+    def __init__(self) -> None:
+        self.encode_time = 0.0
+        self.decode_time = 0.0
+
+
+_codec_timing: ContextVar[Optional[CodecTiming]] = ContextVar("codec_timing", default=None)
+
+
+def start_codec_timing() -> CodecTiming:
+    """Start accounting codec time of the current task (and tasks it spawns) to a fresh CodecTiming."""
+    timing = CodecTiming()
+    _codec_timing.set(timing)
+    return timing
+
+
+class JsonCodec:
+    """Standard library codec; subclasses swap in faster encoders and decoders."""
+
+    codec_type = JsonCodecType.STDLIB
+
+    @property
+    def name(self) -> str:
+        return self.codec_type.value
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON."""
+        start = time.perf_counter()
+        try:
+            return self._dumps(obj)
+        finally:
+            timing = _codec_timing.get()
+            if timing is not None:
+                timing.encode_time += time.perf_counter() - start
+
+    def loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._loads(data)
+        finally:
+            timing = _codec_timing.get()
+            if timing is not None:
+                timing.decode_time += time.perf_counter() - start
+
+    def _dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    codec_type = JsonCodecType.ORJSON
+
+    def _dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Non-string dict keys, integers beyond 64 bits and the like
+            return super()._dumps(obj)
+
+    def _loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    codec_type = JsonCodecType.MSGSPEC
+
+    def _dumps(self, obj: Any) -> bytes:
+        try:
+            encoded: bytes = msgspec.json.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return super()._dumps(obj)
+        return encoded
+
+    def _loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+
+_codecs: Dict[JsonCodecType, JsonCodec] = {}
+
+
+def get_json_codec(codec_type: JsonCodecType = JsonCodecType.AUTO) -> JsonCodec:
+    """Return the codec for codec_type, resolving 'auto' to the fastest installed one."""
+    if codec_type not in _codecs:
+        codec: JsonCodec
+        if codec_type == JsonCodecType.ORJSON or (codec_type == JsonCodecType.AUTO and ORJSON_AVAILABLE):
+            if not ORJSON_AVAILABLE:
+                raise ImportError("api.json_codec is 'orjson' but orjson is not installed")
+            codec = OrjsonCodec()
+        elif codec_type == JsonCodecType.MSGSPEC or (codec_type == JsonCodecType.AUTO and MSGSPEC_AVAILABLE):
+            if not MSGSPEC_AVAILABLE:
+                raise ImportError("api.json_codec is 'msgspec' but msgspec is not installed")
+            codec = MsgspecCodec()
+        else:
+            codec = JsonCodec()
+        _codecs[codec_type] = codec
+    return _codecs[codec_type]
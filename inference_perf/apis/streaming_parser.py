@@ -25,6 +25,8 @@ from typing import Any, Callable, List, Optional, Tuple
 
 from aiohttp import ClientResponse
 
+from inference_perf.apis.json_codec import JsonCodec, get_json_codec
+
 
 class StreamInterruptedError(Exception):
     """Raised when an SSE stream fails partway through being read.
@@ -43,8 +45,11 @@ class StreamInterruptedError(Exception):
 
 
 async def parse_sse_stream(
-    response: ClientResponse, extract_content: Callable[[dict[str, Any]], Optional[str]]
-) -> Tuple[str, List[float], str, List[str], Optional[dict[str, Any]]]:
+    response: ClientResponse,
+    extract_content: Callable[[dict[str, Any]], Optional[str]],
+    capture_raw: bool = True,
+    json_codec: Optional[JsonCodec] = None,
+) -> Tuple[str, List[float], str, List[str], Optional[dict[str, Any]], List[str]]:
     """
     Parse Server-Sent Events (SSE) stream and extract content.
 
@@ -53,69 +58,99 @@ async def parse_sse_stream(
     streaming response chunk by chunk, extracting content using the provided
     extraction function.
 
+    The work per network chunk is proportional to the chunk: received bytes are
+    appended to one buffer that is scanned from where the previous search stopped,
+    and consumed messages are trimmed from its front in one go, so long responses
+    don't slow down the event loop that is timestamping other streams.
+
     Args:
         response: The HTTP response with streaming content
         extract_content: Function to extract text content from parsed JSON data.
                         Should return the text content or None if not found.
                         Example: lambda data: data.get("choices", [{}])[0].get("delta", {}).get("content")
+        capture_raw: Whether to return the raw body of a successful stream. The
+                     received chunks are kept either way so an interrupted stream can
+                     still report them, but joining and decoding them is skipped when
+                     nothing reads the body.
+        json_codec: Codec used to decode each event. Defaults to the fastest
+                    installed one.
 
     Returns:
-        Tuple of (output_text, chunk_times, raw_content, response_chunks, server_usage):
+        Tuple of (output_text, chunk_times, raw_content, response_chunks, server_usage, chunk_texts):
         - output_text: The concatenated text content from all chunks
         - chunk_times: Timestamps for content-bearing chunks only. Role-only
           deltas, usage-only chunks, [DONE] signals, and unparseable messages
           are excluded so they don't corrupt downstream TPOT/TTFT/ITL.
-        - raw_content: The raw string content of the stream
+        - raw_content: The raw string content of the stream, or "" when
+          capture_raw is False
         - response_chunks: Raw JSON strings of content-bearing chunks, 1:1 with
           chunk_times.
         - server_usage: Merged `usage` fields from chunks that carried one
           (e.g. OpenAI trailing `{"choices":[],"usage":{...}}` or Anthropic
           `message.usage`/`message_delta.usage`). None if the server didn't
           emit usage.
+        - chunk_texts: The content extracted from each content-bearing chunk, 1:1
+          with chunk_times; output_text is their concatenation.
     """
-    output_text = ""
+    loads = (json_codec or get_json_codec()).loads
+    output_parts: List[str] = []
     chunk_times: List[float] = []
-    buffer = b""
-    raw_content = b""
+    buffer = bytearray()
+    # Offset in buffer from which the next delimiter search starts; everything before it is known
+    # not to contain one
+    scan_from = 0
+    received: List[bytes] = []
     response_chunks: List[str] = []
     server_usage: Optional[dict[str, Any]] = None
+    # Set by [DONE]; the rest of the body is still read, for the raw content, but no longer parsed
+    done = False
 
     try:
         async for chunk in response.content.iter_any():
-            raw_content += chunk
+            received.append(chunk)
+            if done:
+                continue
             buffer += chunk
-            while b"\n\n" in buffer:
-                message, buffer = buffer.split(b"\n\n", 1)
-                message_time = time.perf_counter()
-                done = False
-                for line in message.split(sep=b"\n"):
-                    if line.startswith(b"data:"):
-                        data_str = line.removeprefix(b"data: ").strip()
-                        if data_str == b"[DONE]":
-                            done = True
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            usage = data.get("usage")
-                            if not isinstance(usage, dict):
-                                message_data = data.get("message")
-                                if isinstance(message_data, dict):
-                                    usage = message_data.get("usage")
-                            if isinstance(usage, dict):
-                                server_usage = {**(server_usage or {}), **usage}
-                            if content := extract_content(data):
-                                output_text += content
-                                chunk_times.append(message_time)
-                                response_chunks.append(data_str.decode("utf-8", errors="ignore"))
-                        except (json.JSONDecodeError, IndexError):
-                            continue
-                if done:
+            message_start = 0
+            while not done:
+                message_end = buffer.find(b"\n\n", scan_from)
+                if message_end < 0:
                     break
+                message = bytes(buffer[message_start:message_end])
+                message_start = scan_from = message_end + 2
+                message_time = time.perf_counter()
+                for line in message.split(b"\n"):
+                    if not line.startswith(b"data:"):
+                        continue
+                    data_str = line.removeprefix(b"data: ").strip()
+                    if data_str == b"[DONE]":
+                        done = True
+                        break
+                    try:
+                        data = loads(data_str)
+                        usage = data.get("usage")
+                        if not isinstance(usage, dict):
+                            message_data = data.get("message")
+                            if isinstance(message_data, dict):
+                                usage = message_data.get("usage")
+                        if isinstance(usage, dict):
+                            server_usage = {**(server_usage or {}), **usage}
+                        if content := extract_content(data):
+                            output_parts.append(content)
+                            chunk_times.append(message_time)
+                            response_chunks.append(data_str.decode("utf-8", errors="ignore"))
+                    except (json.JSONDecodeError, IndexError):
+                        continue
+            if message_start:
+                del buffer[:message_start]
+            # A delimiter split across two network chunks starts on the last byte kept
+            scan_from = max(len(buffer) - 1, 0)
     except Exception as e:
         # The stream broke partway (e.g. a truncated SSE stream, a dropped
         # connection, or a proxy that 200s then sends an error page). Re-raise
         # with the bytes received so far attached so the caller can still record
         # what the server actually sent instead of an empty response body.
-        raise StreamInterruptedError(e, raw_content.decode("utf-8", errors="ignore")) from e
+        raise StreamInterruptedError(e, b"".join(received).decode("utf-8", errors="ignore")) from e
 
-    return output_text, chunk_times, raw_content.decode("utf-8", errors="ignore"), response_chunks, server_usage
+    raw_content = b"".join(received).decode("utf-8", errors="ignore") if capture_raw else ""
+    return "".join(output_parts), chunk_times, raw_content, response_chunks, server_usage, output_parts
@@ -30,6 +30,10 @@ def init_circuit_breakers(configs: List[CircuitBreakerConfig]) -> None:
         _initialized_circuit_breakers[config.name] = SimpleCircuitBreaker(config)
 
 
+def circuit_breakers_enabled() -> bool:
+    return bool(_initialized_circuit_breakers)
+
+
 def feed_breakers(data: BaseModel) -> None:
     for breaker in _initialized_circuit_breakers.values():
         breaker.feed(data)
@@ -42,6 +46,7 @@ def get_circuit_breaker(name: str) -> CircuitBreaker:
 
 
 __all__ = [
+    "circuit_breakers_enabled",
     "feed_breakers",
     "get_circuit_breaker",
     "init_circuit_breakers",
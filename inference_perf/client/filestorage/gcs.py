@@ -22,6 +22,9 @@ from inference_perf.utils import ReportFile
 
 logger = logging.getLogger(__name__)
 
+# Resumable uploads send data in multiples of 256 KiB
+UPLOAD_CHUNK_SIZE = 32 * 256 * 1024
+
 
 class GoogleCloudStorageClient(StorageClient):
     def __init__(self, config: GoogleCloudStorageConfig) -> None:
@@ -49,7 +52,13 @@ class GoogleCloudStorageClient(StorageClient):
                 continue
 
             try:
-                blob.upload_from_string(json.dumps(report.get_contents()), content_type="application/json")
+                if report.is_streamed():
+                    # A resumable upload, sent a chunk at a time
+                    with blob.open("wb", content_type=report.get_content_type(), chunk_size=UPLOAD_CHUNK_SIZE) as f:
+                        for chunk in report.iter_chunks():
+                            f.write(chunk)
+                else:
+                    blob.upload_from_string(json.dumps(report.get_contents()), content_type="application/json")
                 logger.info(f"Uploaded gs://{self.output_bucket}/{blob_path}")
             except GoogleCloudError as e:
                 logger.error(f"Failed to upload {blob_path}: {e}")
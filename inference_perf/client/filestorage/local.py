@@ -34,6 +34,12 @@ class LocalStorageClient(StorageClient):
             filename = report.get_filename()
             report_path = f"{self.config.path if self.config.path else ''}/{self.config.report_file_prefix if self.config.report_file_prefix else ''}{filename}"
             os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            if report.is_streamed():
+                with open(report_path, "wb") as stream:
+                    for chunk in report.iter_chunks(indent=2):
+                        stream.write(chunk)
+                logger.info(f"Report saved to: {report_path}")
+                continue
             with open(report_path, "w", encoding="utf-8") as f:
                 if report.file_type == "yaml":
                     yaml.dump(report.get_contents(), f, sort_keys=False, default_flow_style=False)
@@ -22,6 +22,9 @@ from inference_perf.utils import ReportFile
 
 logger = logging.getLogger(__name__)
 
+# S3 parts other than the last must be at least 5 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
 
 def _build_boto_config(addressing_style: Optional[str]) -> Optional[BotoConfig]:
     """Build a botocore Config that honors the configured S3 addressing style.
@@ -70,6 +73,11 @@ class SimpleStorageServiceClient(StorageClient):
                     if e.response["Error"]["Code"] == "404":
                         pass
 
+                if report.is_streamed():
+                    self._upload_multipart(blob_path, report)
+                    logger.info(f"Uploaded s3://{self.output_bucket}/{blob_path}")
+                    continue
+
                 # Upload the files
                 self.client.put_object(
                     Bucket=self.output_bucket,
@@ -80,3 +88,34 @@ class SimpleStorageServiceClient(StorageClient):
                 logger.info(f"Uploaded s3://{self.output_bucket}/{blob_path}")
             except Exception as e:
                 logger.error(f"Failed to upload {blob_path}: {e}")
+
+    def _upload_multipart(self, key: str, report: ReportFile) -> None:
+        """Upload a streamed report as a multipart upload, aborted if any part fails."""
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.output_bucket, Key=key, ContentType=report.get_content_type()
+        )["UploadId"]
+        try:
+            parts: List[dict[str, Any]] = []
+
+            def upload_part(body: bytes) -> None:
+                part_number = len(parts) + 1
+                response = self.client.upload_part(
+                    Bucket=self.output_bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+            buffer = bytearray()
+            for chunk in report.iter_chunks():
+                buffer += chunk
+                if len(buffer) >= MULTIPART_PART_SIZE:
+                    upload_part(bytes(buffer))
+                    buffer.clear()
+            # Every part but the last must be at least 5 MiB; an upload needs at least one part
+            if buffer or not parts:
+                upload_part(bytes(buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.output_bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.client.abort_multipart_upload(Bucket=self.output_bucket, Key=key, UploadId=upload_id)
+            raise
@@ -23,6 +23,7 @@ from inference_perf.apis import (
     StreamedResponseMetrics,
 )
 from inference_perf.apis.anthropic_messages import ANTHROPIC_VERSION, parse_anthropic_content
+from inference_perf.apis.json_codec import get_json_codec, start_codec_timing
 from inference_perf.apis.streaming_parser import StreamInterruptedError
 from inference_perf.payloads import RequestMetrics, Text
 from inference_perf.utils import CustomTokenizer
@@ -106,6 +107,11 @@ class openAIModelServerClient(ModelServerClient):
 
         # Initialize OTEL instrumentation (configured via environment variables)
         self.otel = get_otel_instrumentation()
+        # Resolve the codec up front so a missing library fails here rather than in every worker
+        get_json_codec(api_config.json_codec)
+        if self.otel.enabled:
+            # Output text of streamed responses is recovered from the raw body for the span
+            self.api_config.capture_raw_response = True
 
         if model_name is None:
             supported_models = self.get_supported_models()
@@ -211,6 +217,7 @@ class openAIModelServerClientSession(ModelServerClientSession):
 
         self.client = client
         self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        self.json_codec = get_json_codec(client.api_config.json_codec)
         # Server-assigned session tokens keyed by session identity, captured from
         # the response header named by api_config.session_token_header_key.
         # Sessions are pinned to a worker (preferred_worker_id), so a per-worker
@@ -282,7 +289,7 @@ class openAIModelServerClientSession(ModelServerClientSession):
                 # Extract output text (gen_ai.output.text)
                 if self.client.api_config.type == APIType.AnthropicMessages and response and response.status == 200:
                     if not self.client.api_config.streaming and response_content:
-                        response_json = json.loads(response_content)
+                        response_json = self.json_codec.loads(response_content)
                         output_text, output_message = parse_anthropic_content(response_json.get("content"))
                         if output_text:
                             otel_response_info["output_text"] = output_text
@@ -304,7 +311,7 @@ class openAIModelServerClientSession(ModelServerClientSession):
                             if not payload or payload == "[DONE]":
                                 continue
                             try:
-                                chunk = json.loads(payload)
+                                chunk = self.json_codec.loads(payload)
                             except json.JSONDecodeError:
                                 continue
                             choices = chunk.get("choices", [])
@@ -325,7 +332,7 @@ class openAIModelServerClientSession(ModelServerClientSession):
                         if tool_call_parts:
                             otel_response_info["output_message"] = json.dumps(tool_call_parts)
                 elif response and response.status == 200 and response_content:
-                    response_json = json.loads(response_content)
+                    response_json = self.json_codec.loads(response_content)
                     choices = response_json.get("choices", [])
                     if choices:
                         if "message" in choices[0]:
@@ -400,7 +407,9 @@ class openAIModelServerClientSession(ModelServerClientSession):
             if session_token:
                 headers[session_token_header] = session_token
 
-        request_data = json.dumps(payload)
+        codec_timing = start_codec_timing()
+        request_body = self.json_codec.dumps(payload)
+        request_data = request_body.decode("utf-8")
 
         # Determine operation name based on API type
         if self.client.api_config.type == APIType.Chat:
@@ -428,7 +437,7 @@ class openAIModelServerClientSession(ModelServerClientSession):
             parent_context=parent_context,
         ) as span:
             try:
-                async with self.session.post(self.client.uri + data.get_route(), headers=headers, data=request_data) as resp:
+                async with self.session.post(self.client.uri + data.get_route(), headers=headers, data=request_body) as resp:
                     response = resp
                     if session_id and session_token_header:
                         received_token = resp.headers.get(session_token_header)
@@ -572,6 +581,8 @@ class openAIModelServerClientSession(ModelServerClientSession):
             start_time=start,
             end_time=end_time,
             scheduled_time=scheduled_time,
+            json_encode_time=codec_timing.encode_time,
+            json_decode_time=codec_timing.decode_time,
         )
 
         # Grab TTFT and TPOT thresholds from request headers if available for streaming requests with token-level timestamps
@@ -13,7 +13,7 @@
 # limitations under the License.
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 from inference_perf.client.modelserver.metrics import (
@@ -31,6 +31,32 @@ class StageStatus(Enum):
     SKIPPED = auto()
 
 
+class StageDispatchStats(BaseModel):
+    """Health of the request producer for a stage.
+
+    queue depth counts requests enqueued but not yet finished; producer lag is how far
+    past its scheduled time a request was when it was enqueued.
+    """
+
+    lookahead: float
+    enqueued: int = 0
+    max_queue_depth: int = 0
+    mean_queue_depth: float = 0.0
+    late_enqueues: int = 0
+    max_producer_lag: float = 0.0
+
+
+class ScheduleSlipStats(BaseModel):
+    """How late workers dispatched requests relative to their schedule during a stage."""
+
+    policy: str
+    # Upper edge in seconds of every bucket but the last, which collects anything slower
+    bucket_upper_bounds: List[float]
+    counts: List[int]
+    dropped: int = 0
+    per_worker_counts: List[List[int]] = []
+
+
 class StageRuntimeInfo(BaseModel):
     stage_id: int
     rate: float
@@ -39,6 +65,10 @@ class StageRuntimeInfo(BaseModel):
     status: StageStatus
     concurrency_level: Optional[int] = None
     timeout: Optional[float] = None
+    dispatch: Optional[StageDispatchStats] = None
+    schedule_slip: Optional[ScheduleSlipStats] = None
+    # CPU time (user + system) used by the load generator's main process over the stage, as a fraction of one core
+    parent_cpu_utilization: Optional[float] = None
 
 
 class PerfRuntimeParameters:
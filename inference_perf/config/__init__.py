@@ -14,6 +14,7 @@
 from inference_perf.config.apis import (
     APIConfig,
     APIType,
+    JsonCodecType,
     ResponseFormat,
     ResponseFormatType,
 )
@@ -62,13 +63,17 @@ from inference_perf.config.datagen import (
 )
 from inference_perf.config.loadgen import (
     ConcurrentLoadStage,
+    DispatchPolicy,
+    DispatchSchedulerConfig,
     LoadConfig,
     LoadStage,
     LoadType,
     MultiLoRAConfig,
+    RequestQueueBackend,
     StageGenType,
     StandardLoadStage,
     SweepConfig,
+    SweepSearch,
     TraceSessionReplayLoadStage,
 )
 from inference_perf.config.metrics import (
@@ -77,7 +82,10 @@ from inference_perf.config.metrics import (
 )
 from inference_perf.config.reportgen import (
     GoodputConfig,
+    PercentileMode,
+    PerRequestReportFormat,
     PrometheusMetricsReportConfig,
+    ReportCompression,
     ReportConfig,
     RequestLifecycleMetricsReportConfig,
     SessionLifecycleReportConfig,
@@ -91,6 +99,8 @@ __all__ = [
     "AudioDatagenConfig",
     "CircuitBreakerConfig",
     "ConcurrentLoadStage",
+    "DispatchPolicy",
+    "DispatchSchedulerConfig",
     "Config",
     "ConversationReplayConfig",
     "CustomTokenizerConfig",
@@ -101,6 +111,7 @@ __all__ = [
     "GoodputConfig",
     "GoogleCloudStorageConfig",
     "ImageDatagenConfig",
+    "JsonCodecType",
     "LoadConfig",
     "LoadStage",
     "LoadType",
@@ -111,9 +122,13 @@ __all__ = [
     "ModelServerClientConfig",
     "ModelServerType",
     "MultiLoRAConfig",
+    "RequestQueueBackend",
     "OTelTraceReplayConfig",
+    "PercentileMode",
+    "PerRequestReportFormat",
     "PrometheusClientConfig",
     "PrometheusMetricsReportConfig",
+    "ReportCompression",
     "ReportConfig",
     "RequestLifecycleMetricsReportConfig",
     "Resolution",
@@ -129,6 +144,7 @@ __all__ = [
     "StorageConfig",
     "StorageConfigBase",
     "SweepConfig",
+    "SweepSearch",
     "SyntheticMultimodalDatagenConfig",
     "TraceConfig",
     "TraceFormat",
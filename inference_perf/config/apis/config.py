@@ -24,6 +24,13 @@ class APIType(Enum):
     AnthropicMessages = "anthropic_messages"
 
 
+class JsonCodecType(Enum):
+    AUTO = "auto"
+    ORJSON = "orjson"
+    MSGSPEC = "msgspec"
+    STDLIB = "stdlib"
+
+
 class ResponseFormatType(Enum):
     JSON_SCHEMA = "json_schema"
     JSON_OBJECT = "json_object"
@@ -79,6 +86,14 @@ class APIConfig(StrictBaseModel):
     response_format: Optional[ResponseFormat] = Field(
         default=None, description="Structured output settings sent as the 'response_format' request parameter."
     )
+    json_codec: JsonCodecType = Field(
+        default=JsonCodecType.AUTO,
+        description="JSON library used to encode requests and decode streamed chunks. 'auto' picks orjson, then msgspec, when installed and falls back to the standard library. orjson and msgspec write compact JSON, which makes the reported request_size_bytes smaller than with 'stdlib'.",
+    )
+    capture_raw_response: bool = Field(
+        default=False,
+        description="Keep the raw body of successful streamed responses. Always on when per-request lifecycle reports or OTel tracing are enabled, which read it.",
+    )
     session_id_header_key: Optional[str] = Field(
         default=None, description="Header used to send the session ID with each request in multi-turn benchmarks."
     )
@@ -112,6 +112,28 @@ class DataConfig(StrictBaseModel):
         None,
         description="Path to a text file to use as the prompt tokenization corpus instead of the default hardcoded sonnet",
     )
+    prompt_cache_dir: Optional[str] = Field(
+        default=None,
+        description=(
+            "Directory of the on-disk prompt cache. When set, the 'random', 'synthetic', 'shared_prefix' and"
+            " 'conversation_replay' types store the prompts they generate under a key of the tokenizer, the data"
+            " config and the seed, and later runs with the same key memory-map them instead of regenerating."
+            " The 'random' and 'synthetic' types then build every prompt up front in the main process rather"
+            " than in the load workers, and only hit the cache when load.base_seed is set. The 'shareGPT',"
+            " 'cnn_dailymail', 'billsum_conversations' and 'infinity_instruct' types instead index the token"
+            " lengths of their dataset once and serve completion requests by index from the records within the"
+            " input and output distributions."
+        ),
+    )
+    tokenize_workers: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Processes that tokenize a dataset when building its length index under prompt_cache_dir. Only used by"
+            " the 'shareGPT', 'cnn_dailymail', 'billsum_conversations' and 'infinity_instruct' types. 1 tokenizes"
+            " in the main process."
+        ),
+    )
 
     input_distribution: Optional[Distribution] = Field(
         default=None,
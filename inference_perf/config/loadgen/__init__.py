@@ -13,24 +13,32 @@
 # limitations under the License.
 from inference_perf.config.loadgen.config import (
     ConcurrentLoadStage,
+    DispatchPolicy,
+    DispatchSchedulerConfig,
     LoadConfig,
     LoadStage,
     LoadType,
     MultiLoRAConfig,
+    RequestQueueBackend,
     StageGenType,
     StandardLoadStage,
     SweepConfig,
+    SweepSearch,
     TraceSessionReplayLoadStage,
 )
 
 __all__ = [
     "ConcurrentLoadStage",
+    "DispatchPolicy",
+    "DispatchSchedulerConfig",
     "LoadConfig",
     "LoadStage",
     "LoadType",
     "MultiLoRAConfig",
+    "RequestQueueBackend",
     "StageGenType",
     "StandardLoadStage",
     "SweepConfig",
+    "SweepSearch",
     "TraceSessionReplayLoadStage",
 ]
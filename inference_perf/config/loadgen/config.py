@@ -14,9 +14,9 @@
 import time
 from enum import Enum
 from os import cpu_count
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
-from inference_perf.config.common import StrictBaseModel
+from inference_perf.config.common import Distribution, StrictBaseModel
 from pydantic import ConfigDict, Field, model_validator
 
 from inference_perf.config.datagen.replay import TraceConfig
@@ -30,6 +30,31 @@ class LoadType(Enum):
     TRACE_SESSION_REPLAY = "trace_session_replay"
 
 
+class RequestQueueBackend(Enum):
+    JOINABLE_QUEUE = "joinable_queue"
+    RING_BUFFER = "ring_buffer"
+
+
+class DispatchPolicy(Enum):
+    STRICT = "strict"
+    DROP_IF_LATE = "drop_if_late"
+    COORDINATED_OMISSION_CORRECTED = "coordinated_omission_corrected"
+
+
+class DispatchSchedulerConfig(StrictBaseModel):
+    policy: DispatchPolicy = Field(
+        default=DispatchPolicy.STRICT,
+        description="How workers treat requests that are already late when they come up for dispatch. 'strict' sends them"
+        " immediately; 'drop_if_late' skips requests later than late_threshold; 'coordinated_omission_corrected' sends"
+        " them immediately and also reports latencies measured from the scheduled send time.",
+    )
+    late_threshold: float = Field(
+        default=0.1,
+        gt=0,
+        description="Seconds past its scheduled time after which a request is dropped under the 'drop_if_late' policy.",
+    )
+
+
 class LoadStage(StrictBaseModel):
     """Base class for load stages. Use specific subclasses for different load types."""
 
@@ -60,6 +85,10 @@ class ConcurrentLoadStage(LoadStage):
 
     num_requests: int = Field(..., gt=0, description="Number of requests to send")
     concurrency_level: int = Field(..., gt=0, description="Concurrency level")
+    think_time: Optional[Distribution] = Field(
+        None,
+        description="Pause in milliseconds between a virtual user's response and its next request. Only used with 'closed_loop'.",
+    )
 
     # These fields are set at runtime for load generation but should not be configured
     rate: Optional[float] = Field(None, description="Set at runtime for load generation")
@@ -141,8 +170,18 @@ class StageGenType(Enum):
     LINEAR = "linear"
 
 
+class SweepSearch(Enum):
+    BURN_DOWN = "burn_down"
+    ADAPTIVE = "adaptive"
+
+
 class SweepConfig(StrictBaseModel):
     type: StageGenType = Field(description="How stage rates are spaced up to the saturation rate: 'geometric' or 'linear'.")
+    search: SweepSearch = Field(
+        default=SweepSearch.BURN_DOWN,
+        description="How the saturation rate is found: 'burn_down' estimates it from one burst of requests,"
+        " 'adaptive' bisects on short stages until the highest rate that meets the SLOs is known within 'tolerance'.",
+    )
     num_requests: int = Field(
         default=2000, description="Number of requests sent in the initial burst used to find the saturation rate."
     )
@@ -152,6 +191,42 @@ class SweepConfig(StrictBaseModel):
     saturation_percentile: float = Field(
         default=95, description="Percentile of observed request rates taken as the saturation point."
     )
+    constraints: Dict[str, float] = Field(
+        default={},
+        description="Adaptive search: SLO thresholds in seconds a request must meet to count as good."
+        " Keys: 'ttft', 'tpot', 'itl', 'ntpot', 'request_latency'.",
+    )
+    min_goodput_percentage: float = Field(
+        default=95,
+        gt=0,
+        le=100,
+        description="Adaptive search: share of requests that must meet 'constraints' for a rate to pass.",
+    )
+    max_ttft_p99: Optional[float] = Field(
+        default=None, gt=0, description="Adaptive search: highest p99 time to first token in seconds for a rate to pass."
+    )
+    start_rate: float = Field(default=1.0, gt=0, description="Adaptive search: first rate probed, doubled until one fails.")
+    probe_duration: int = Field(default=10, gt=0, description="Adaptive search: duration of each probe stage in seconds.")
+    tolerance: float = Field(
+        default=0.05,
+        gt=0,
+        lt=1,
+        description="Adaptive search: stop once the gap between the highest passing and lowest failing rate is at most"
+        " this fraction of the failing rate.",
+    )
+    max_probes: int = Field(default=12, gt=0, description="Adaptive search: upper bound on the number of probe stages.")
+    knee_spread: float = Field(
+        default=0.25,
+        ge=0,
+        lt=1,
+        description="Adaptive search: generated stages cover the saturation rate plus and minus this fraction.",
+    )
+
+    @model_validator(mode="after")
+    def validate_adaptive_slo(self) -> "SweepConfig":
+        if self.search == SweepSearch.ADAPTIVE and not self.constraints and self.max_ttft_p99 is None:
+            raise ValueError("Adaptive sweep search requires 'constraints' or 'max_ttft_p99'")
+        return self
 
 
 class MultiLoRAConfig(StrictBaseModel):
@@ -176,6 +251,30 @@ class LoadConfig(StrictBaseModel):
     )
     worker_max_concurrency: int = Field(default=100, description="Maximum concurrent in-flight requests per worker.")
     worker_max_tcp_connections: int = Field(default=2500, description="Maximum TCP connections per worker.")
+    dispatch_lookahead: float = Field(
+        default=2.0,
+        gt=0,
+        description="Seconds of scheduled requests kept enqueued ahead of the clock. The queue is refilled as the stage progresses.",
+    )
+    worker_side_schedule: bool = Field(
+        default=False,
+        description="For 'constant' and 'poisson' loads with lazily loaded data, send each worker its share of a stage"
+        " once and let it generate its own arrival times and data indices instead of queueing every request.",
+    )
+    closed_loop: bool = Field(
+        default=False,
+        description="For 'concurrent' loads with lazily loaded data, run concurrency_level virtual users that each send"
+        " their next request as soon as the previous one completes, balanced across workers, instead of queueing"
+        " every request of the stage at once.",
+    )
+    scheduler: DispatchSchedulerConfig = Field(
+        default=DispatchSchedulerConfig(), description="Per-worker dispatch policy for requests that fall behind schedule."
+    )
+    request_queue_backend: RequestQueueBackend = Field(
+        default=RequestQueueBackend.JOINABLE_QUEUE,
+        description="Transport between the load generator and its workers. 'ring_buffer' passes lazily loaded requests"
+        " as fixed-size records in shared memory and pickles only other payloads.",
+    )
     trace: Optional[TraceConfig] = Field(
         default=None, description="Request timing trace to replay. Only used by the 'trace_replay' load type."
     )
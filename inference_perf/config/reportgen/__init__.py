@@ -13,7 +13,10 @@
 # limitations under the License.
 from inference_perf.config.reportgen.config import (
     GoodputConfig,
+    PercentileMode,
+    PerRequestReportFormat,
     PrometheusMetricsReportConfig,
+    ReportCompression,
     ReportConfig,
     RequestLifecycleMetricsReportConfig,
     SessionLifecycleReportConfig,
@@ -21,7 +24,10 @@ from inference_perf.config.reportgen.config import (
 
 __all__ = [
     "GoodputConfig",
+    "PercentileMode",
+    "PerRequestReportFormat",
     "PrometheusMetricsReportConfig",
+    "ReportCompression",
     "ReportConfig",
     "RequestLifecycleMetricsReportConfig",
     "SessionLifecycleReportConfig",
@@ -11,16 +11,45 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from enum import Enum
 from typing import Dict, List, Optional
 
 from inference_perf.config.common import StrictBaseModel
 from pydantic import Field
 
 
+class PercentileMode(Enum):
+    EXACT = "exact"
+    SKETCH = "sketch"
+
+
+class PerRequestReportFormat(Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+class ReportCompression(Enum):
+    ZSTD = "zstd"
+
+
 class RequestLifecycleMetricsReportConfig(StrictBaseModel):
     summary: Optional[bool] = Field(default=True, description="Generate a summary report across the whole run.")
     per_stage: Optional[bool] = Field(default=True, description="Generate a report for each load stage.")
     per_request: Optional[bool] = Field(default=False, description="Generate a report with per-request details.")
+    per_request_format: PerRequestReportFormat = Field(
+        default=PerRequestReportFormat.JSON,
+        description="Format of the per-request report: 'json' writes one JSON array, 'ndjson' one JSON object per line. "
+        "Either way requests are written as they are read rather than built in memory first.",
+    )
+    per_request_compression: Optional[ReportCompression] = Field(
+        default=None,
+        description="Compress the per-request report, e.g. 'zstd' (requires the zstandard package).",
+    )
+    per_request_parquet: bool = Field(
+        default=False,
+        description="Also export one row per request (stage, session, adapter, times, TTFT, TPOT, token counts, error "
+        "type and chunk times) to per_request_lifecycle_metrics.parquet.",
+    )
     per_adapter: Optional[bool] = Field(default=True, description="Generate a report for each LoRA adapter.")
     per_adapter_stage: Optional[bool] = Field(
         default=False, description="Generate a report for each LoRA adapter within each load stage."
@@ -37,6 +66,29 @@ class RequestLifecycleMetricsReportConfig(StrictBaseModel):
         description="Cap on the number of distinct example error messages retained per error label in the failure "
         "report, and per substitution entry.",
     )
+    percentile_mode: PercentileMode = Field(
+        default=PercentileMode.EXACT,
+        description="How percentiles are computed: 'exact' keeps every value, 'sketch' uses a log-bucketed "
+        "sketch whose memory does not grow with the number of output tokens, at the cost of a bounded relative error.",
+    )
+    sketch_relative_accuracy: float = Field(
+        default=0.01,
+        gt=0,
+        lt=1,
+        description="Relative error bound of percentiles in 'sketch' percentile_mode, e.g. 0.01 for within 1%.",
+    )
+    spill_to_disk: bool = Field(
+        default=False,
+        description="Append request metrics to Arrow IPC segment files in a new per-run directory under 'request_metrics' "
+        "in the local storage path as they arrive, instead of holding them in memory. Only applies when "
+        "load.num_workers > 0.",
+    )
+    report_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Processes that summarize the whole-run, per-stage and per-adapter reports in parallel. "
+        "1 summarizes them one after another in the main process.",
+    )
 
 
 class PrometheusMetricsReportConfig(StrictBaseModel):
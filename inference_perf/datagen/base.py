@@ -186,6 +186,21 @@ class SessionGenerator(BaseGenerator):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def wait_for_session_completions(self, timeout: float) -> List[str]:
+        """Block until workers report finished sessions, or until timeout.
+
+        LoadGen calls this from a helper thread instead of polling check_session_completed
+        for every active session, so each wakeup only costs work for sessions that finished.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the first completion
+
+        Returns:
+            IDs of the sessions newly marked complete by this call, empty on timeout
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def build_session_metric(
         self,
@@ -257,6 +272,15 @@ class LazyLoadDataMixin(ABC):
         """
         raise NotImplementedError
 
+    def is_lazy_load_supported(self) -> bool:
+        """Whether every request of get_data is a LazyLoadInferenceAPIData placeholder.
+
+        Returns True by default. Override for generators that only load lazily in
+        some configurations, so workers never build requests from a data index alone
+        when the generator yields materialized data.
+        """
+        return True
+
     @staticmethod
     def get_request(data_generator: BaseGenerator, data: InferenceAPIData) -> InferenceAPIData:
         """Static utility method to handle lazy loading.
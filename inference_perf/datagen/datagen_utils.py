@@ -12,16 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Callable, List, Optional, Set, Tuple
+import hashlib
+import json
+import logging
+import os
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import numpy as np
+from transformers import PreTrainedTokenizerBase
 
+from inference_perf.datagen.prompt_cache import save_array
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
+logger = logging.getLogger(__name__)
 
-def init_vocab_sampling(tokenizer: CustomTokenizer) -> Tuple[int, Set[int], np.ndarray]:
+# Length of the random sequence round_trip_stable_token_ids re-encodes to check its subset
+STABLE_VOCAB_CHECK_TOKENS = 4096
+
+# Token id tables derived from a tokenizer's vocab, built once per tokenizer object and inherited by
+# forked workers
+_token_id_tables: "weakref.WeakKeyDictionary[Any, Dict[str, np.ndarray]]" = weakref.WeakKeyDictionary()
+
+
+def init_vocab_sampling(tokenizer: CustomTokenizer, cache_dir: Optional[str] = None) -> Tuple[int, Set[int], np.ndarray]:
     """Resolve a tokenizer's vocab size and build the valid-token-id pool for random sampling.
 
+    The pool is memoized per tokenizer, and under ``cache_dir`` when given
+    (see _cached_token_ids).
+
     Returns:
         (vocab_size, special_token_ids, valid_token_ids) where valid_token_ids excludes
         the tokenizer's special tokens.
@@ -47,7 +66,14 @@ def init_vocab_sampling(tokenizer: CustomTokenizer) -> Tuple[int, Set[int], np.n
         raise ValueError(f"Tokenizer vocabulary size must be positive, got {vocab_size}.")
 
     special_token_ids: Set[int] = set(getattr(hf_tokenizer, "all_special_ids", None) or [])
-    valid_token_ids = np.array([i for i in range(vocab_size) if i not in special_token_ids], dtype=np.int64)
+
+    def build() -> np.ndarray:
+        valid = np.ones(vocab_size, dtype=bool)
+        special = np.fromiter(special_token_ids, dtype=np.int64, count=len(special_token_ids))
+        valid[special[(special >= 0) & (special < vocab_size)]] = False
+        return np.flatnonzero(valid).astype(np.int64)
+
+    valid_token_ids = _cached_token_ids(hf_tokenizer, f"valid_{vocab_size}", cache_dir, build)
     return vocab_size, special_token_ids, valid_token_ids
 
 
@@ -62,24 +88,133 @@ def random_token_ids(rng: np.random.Generator, valid_token_ids: np.ndarray, leng
     return rng.choice(valid_token_ids, size=length).tolist()  # type: ignore[no-any-return]
 
 
-def build_word_start_token_ids(tokenizer: CustomTokenizer, valid_token_ids: np.ndarray) -> np.ndarray:
+def build_word_start_token_ids(
+    tokenizer: CustomTokenizer, valid_token_ids: np.ndarray, cache_dir: Optional[str] = None
+) -> np.ndarray:
     """Token IDs whose decoded form starts with whitespace.
 
     Used to pin the first token of a suffix when appending it to a prefix:
     a whitespace-prefixed token prevents BPE merges across the boundary,
     so ``len(decode(prefix_ids + suffix_ids))`` retokenizes exactly and the
     prefix's server-side tokens stay stable. Falls back to the full vocab
-    when no such tokens exist.
+    when no such tokens exist. HF tokenizers decode the vocab in one
+    batch_decode call; the result is memoized per tokenizer, and under
+    ``cache_dir`` when given.
     """
     hf_tokenizer = tokenizer.get_tokenizer()
-    word_starts: List[int] = []
-    for tid in valid_token_ids:
-        decoded = hf_tokenizer.decode([int(tid)], skip_special_tokens=True)
-        if decoded and decoded[0].isspace():
-            word_starts.append(int(tid))
-    if not word_starts:
+
+    def build() -> np.ndarray:
+        if isinstance(hf_tokenizer, PreTrainedTokenizerBase):
+            decoded = hf_tokenizer.batch_decode(valid_token_ids.reshape(-1, 1).tolist(), skip_special_tokens=True)
+        else:
+            decoded = [hf_tokenizer.decode([int(tid)], skip_special_tokens=True) for tid in valid_token_ids]
+        is_word_start = np.fromiter((text[:1].isspace() for text in decoded), dtype=bool, count=len(valid_token_ids))
+        word_start_ids: np.ndarray = valid_token_ids[is_word_start]
+        return word_start_ids
+
+    word_starts = _cached_token_ids(hf_tokenizer, f"word_start_{len(valid_token_ids)}", cache_dir, build)
+    if not len(word_starts):
         return valid_token_ids
-    return np.array(word_starts, dtype=np.int64)
+    return word_starts
+
+
+def round_trip_stable_token_ids(
+    tokenizer: CustomTokenizer, valid_token_ids: np.ndarray, cache_dir: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """Token IDs random prompts can be sampled from without re-tokenizing them.
+
+    A token qualifies when a run of two of it decodes to the same alphabetic
+    word twice, separated by whitespace, and re-encodes to the same two ids.
+    Any sequence of such tokens then decodes to whitespace-separated words the
+    tokenizer splits back into exactly those tokens, so ``len(ids)`` is the
+    token count of ``decode(ids)``. A long random sequence is checked before
+    trusting the subset. Computed with batched calls over the vocab and
+    memoized per tokenizer, and under ``cache_dir`` when given. Returns None
+    for tokenizers that are not HF tokenizers or have no such tokens.
+    """
+    hf_tokenizer = tokenizer.get_tokenizer()
+    if not isinstance(hf_tokenizer, PreTrainedTokenizerBase):
+        return None
+
+    def build() -> np.ndarray:
+        token_ids = valid_token_ids.tolist()
+        texts = hf_tokenizer.batch_decode([[tid, tid] for tid in token_ids], skip_special_tokens=True)
+        encoded = hf_tokenizer(texts, add_special_tokens=False).input_ids
+        stable = np.array(
+            [
+                tid
+                for tid, text, ids in zip(token_ids, texts, encoded, strict=True)
+                if ids == [tid, tid] and _is_repeated_word(text)
+            ],
+            dtype=np.int64,
+        )
+        if len(stable):
+            sample = np.random.default_rng(0).choice(stable, size=STABLE_VOCAB_CHECK_TOKENS).tolist()
+            text = hf_tokenizer.decode(sample, skip_special_tokens=True)
+            if hf_tokenizer(text, add_special_tokens=False).input_ids != sample:
+                logger.warning("Tokenizer merges across word boundaries; using the convergence loop for exact-length prompts")
+                stable = np.empty(0, dtype=np.int64)
+        return stable
+
+    stable = _cached_token_ids(hf_tokenizer, f"round_trip_stable_{len(valid_token_ids)}", cache_dir, build)
+    return stable if len(stable) else None
+
+
+def _cached_token_ids(hf_tokenizer: Any, table: str, cache_dir: Optional[str], build: Callable[[], np.ndarray]) -> np.ndarray:
+    """A token id table of hf_tokenizer: memoized in-process, else read from cache_dir, else built.
+
+    Tables are stored as <cache_dir>/vocab/<key>/<table>.npy, keyed on the
+    tokenizer's name, revision and vocab shape (see _vocab_cache_key);
+    tokenizers without a name are only memoized in-process.
+    """
+    try:
+        tables = _token_id_tables.setdefault(hf_tokenizer, {})
+    except TypeError:
+        # Not weak-referenceable
+        tables = {}
+    if table in tables:
+        return tables[table]
+
+    path = None
+    key = _vocab_cache_key(hf_tokenizer) if cache_dir else None
+    if cache_dir and key:
+        path = os.path.join(cache_dir, "vocab", key, f"{table}.npy")
+        try:
+            tables[table] = np.load(path)
+            return tables[table]
+        except (OSError, ValueError):
+            pass
+
+    token_ids = build()
+    if path:
+        save_array(path, token_ids)
+    tables[table] = token_ids
+    return token_ids
+
+
+def _vocab_cache_key(hf_tokenizer: Any) -> Optional[str]:
+    """On-disk identity of a tokenizer: its name, revision and vocab shape, or None when it has no name."""
+    name = getattr(hf_tokenizer, "name_or_path", None)
+    if not isinstance(name, str) or not name:
+        return None
+    revision = (getattr(hf_tokenizer, "init_kwargs", None) or {}).get("revision")
+    if os.path.isdir(name):
+        # Local tokenizers have no revision; the modification times of their files stand in for one
+        revision = max((entry.stat().st_mtime_ns for entry in os.scandir(name) if entry.is_file()), default=0)
+    identity = [
+        type(hf_tokenizer).__name__,
+        name,
+        revision,
+        len(hf_tokenizer),
+        getattr(hf_tokenizer, "vocab_size", None),
+        sorted(getattr(hf_tokenizer, "all_special_ids", None) or []),
+    ]
+    return hashlib.sha256(json.dumps(identity, default=str).encode()).hexdigest()
+
+
+def _is_repeated_word(text: str) -> bool:
+    words = text.split()
+    return len(words) == 2 and words[0] == words[1] and words[0].isalpha()
 
 
 def converge_to_exact_length_text(
@@ -142,20 +277,36 @@ def generate_random_exact_length_text(
     tokenizer: CustomTokenizer,
     target_len: int,
     wrap_fn: Optional[Callable[[str], str]] = None,
+    stable_token_ids: Optional[np.ndarray] = None,
 ) -> Tuple[str, List[int]]:
     """Generate random text tokenizing to exactly target_len; return (text, ids).
 
     With ``wrap_fn`` set, target_len applies to the wrapped text; see
-    converge_to_exact_length_text.
+    converge_to_exact_length_text. With ``stable_token_ids`` (see
+    round_trip_stable_token_ids) the ids are sampled from those instead, and
+    the prompt is decoded once with no re-encoding: its length is the id count
+    plus the special tokens the count adds. A wrapper's template may merge
+    with the first word, so wrapped prompts still go through the convergence
+    loop, starting from a candidate of the predicted size.
     """
     if target_len <= 0:
         return "", []
 
-    initial_tokens = random_token_ids(rng, valid_token_ids, target_len)
+    pool = valid_token_ids
+    initial_len = target_len
+    if stable_token_ids is not None:
+        pool = stable_token_ids
+        overhead = _token_overhead(tokenizer, stable_token_ids, wrap_fn)
+        if wrap_fn is None and target_len > overhead:
+            ids = random_token_ids(rng, stable_token_ids, target_len - overhead)
+            text = tokenizer.get_tokenizer().decode(ids, skip_special_tokens=True)
+            return text if isinstance(text, str) else " ".join(text), ids
+        initial_len = max(1, target_len - overhead)
+    initial_tokens = random_token_ids(rng, pool, initial_len)
 
     def adjust_tokens(current_tokens: List[int], current_len: int, target_len: int) -> List[int]:
         if current_len < target_len:
-            current_tokens.extend(random_token_ids(rng, valid_token_ids, target_len - current_len))
+            current_tokens.extend(random_token_ids(rng, pool, target_len - current_len))
             return current_tokens
         diff = current_len - target_len
         if diff < len(current_tokens):
@@ -169,3 +320,11 @@ def generate_random_exact_length_text(
         adjust_tokens_fn=adjust_tokens,
         wrap_fn=wrap_fn,
     )
+
+
+def _token_overhead(tokenizer: CustomTokenizer, stable_token_ids: np.ndarray, wrap_fn: Optional[Callable[[str], str]]) -> int:
+    """Tokens a count adds on top of the content ids: the special tokens, or the wrapper's template tokens."""
+    text = str(tokenizer.get_tokenizer().decode([int(stable_token_ids[0])], skip_special_tokens=True))
+    if wrap_fn is None:
+        return tokenizer.count_tokens(text) - 1
+    return tokenizer.count_tokens(wrap_fn(text), add_special_tokens=False) - 1
@@ -13,77 +13,97 @@
 # limitations under the License.
 import itertools
 import logging
-from inference_perf.apis import InferenceAPIData, CompletionAPIData
+from inference_perf.apis import InferenceAPIData, CompletionAPIData, LazyLoadInferenceAPIData
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
-from ..base import DataGenerator
+from ..base import DataGenerator, LazyLoadDataMixin
+from .length_index import load_or_build_length_index
 from inference_perf.config import APIConfig, APIType, DataConfig
-from typing import Generator, List, Optional
+from typing import Any, Generator, List, Optional, Tuple
 from datasets import load_dataset
+import numpy as np
 import os
 
 logger = logging.getLogger(__name__)
 
 
-class CNNDailyMailDataGenerator(DataGenerator):
+class CNNDailyMailDataGenerator(DataGenerator, LazyLoadDataMixin):
     def __init__(self, api_config: APIConfig, config: DataConfig, tokenizer: Optional[CustomTokenizer]) -> None:
         super().__init__(api_config, config, tokenizer)
         if tokenizer is None:
             raise ValueError("CustomTokenizer instance cannot be None")
 
-        if config.path is not None:
-            # check if the path is valid
-            if not os.path.exists(config.path):
-                raise ValueError(f"Invalid dataset path: {config.path}. Path does not exist.")
-            # depending on whether the dataset is a single file or a directory, we need to load it differently
-            # TODO: add support for other file types
-            if os.path.isfile(config.path) and config.path.endswith(".json"):
-                self.cnn_dailymail_dataset = itertools.cycle(
-                    load_dataset("json", data_files=config.path, streaming=True, split="train")
-                )
-            elif os.path.isdir(config.path):
-                json_files = [f for f in os.listdir(config.path) if f.endswith(".json")]
-                self.cnn_dailymail_dataset = itertools.cycle(
-                    load_dataset("json", data_files=json_files, streaming=True, split="train")
-                )
-            else:
-                raise ValueError(f"Invalid dataset path: {config.path}")
-        else:
-            self.cnn_dailymail_dataset = itertools.cycle(
-                load_dataset(
-                    "abisee/cnn_dailymail",
-                    "3.0.0",
-                    streaming=True,
-                    split="train",
-                )
-            )
         self.article_key = "article"
         self.highlights_key = "highlights"
+
+        # With a prompt cache, requests are drawn by index from the records within the configured
+        # lengths rather than filtered while streaming
+        self.indexed_records: Optional[np.ndarray] = None
+        if config.prompt_cache_dir is not None:
+            self.length_index = load_or_build_length_index(
+                self._load_dataset(streaming=False),
+                self.get_completion_pair,
+                tokenizer,
+                config.prompt_cache_dir,
+                type(self).__name__,
+                num_proc=config.tokenize_workers,
+            )
+            self.indexed_records = self.length_index.select(self.input_distribution, self.output_distribution)
+            if len(self.indexed_records) == 0:
+                raise ValueError(
+                    f"None of the {len(self.length_index)} indexed CNN/DailyMail records are within the configured lengths"
+                )
+            return
+
+        self.cnn_dailymail_dataset = itertools.cycle(self._load_dataset(streaming=True))
         # initialize data collection
         next(self.cnn_dailymail_dataset)
 
+    def _load_dataset(self, streaming: bool) -> Any:
+        if self.config.path is not None:
+            # check if the path is valid
+            if not os.path.exists(self.config.path):
+                raise ValueError(f"Invalid dataset path: {self.config.path}. Path does not exist.")
+            # depending on whether the dataset is a single file or a directory, we need to load it differently
+            # TODO: add support for other file types
+            if os.path.isfile(self.config.path) and self.config.path.endswith(".json"):
+                return load_dataset("json", data_files=self.config.path, streaming=streaming, split="train")
+            elif os.path.isdir(self.config.path):
+                json_files = [f for f in os.listdir(self.config.path) if f.endswith(".json")]
+                return load_dataset("json", data_files=json_files, streaming=streaming, split="train")
+            else:
+                raise ValueError(f"Invalid dataset path: {self.config.path}")
+        return load_dataset(
+            "abisee/cnn_dailymail",
+            "3.0.0",
+            streaming=streaming,
+            split="train",
+        )
+
     def get_supported_apis(self) -> List[APIType]:
         return [APIType.Completion]
 
     def get_data(self) -> Generator[InferenceAPIData, None, None]:
+        if self.api_config.type != APIType.Completion:
+            raise Exception("Unsupported API type")
+
+        if self.indexed_records is not None:
+            i = 0
+            while True:
+                yield LazyLoadInferenceAPIData(data_index=i)
+                i += 1
+
         if self.cnn_dailymail_dataset is None:
             return
 
         assert self.tokenizer is not None
 
-        if self.api_config.type != APIType.Completion:
-            raise Exception("Unsupported API type")
-
         while True:
             data = next(self.cnn_dailymail_dataset)
-            if data is None or data[self.article_key] is None or data[self.highlights_key] is None:
-                continue
-
             try:
-                prompt = data[self.article_key]
-                if not prompt:
+                pair = self.get_completion_pair(data)
+                if pair is None:
                     continue
-
-                completion = data[self.highlights_key]
+                prompt, completion = pair
                 completion_tokens = self.tokenizer.count_tokens(completion)
                 prompt_ids = self.tokenizer.get_tokenizer().encode(prompt)
                 prompt_tokens = len(prompt_ids)
@@ -105,6 +125,23 @@ class CNNDailyMailDataGenerator(DataGenerator):
                 logger.warning(f"Skipping invalid completion data: {e}")
                 continue
 
+    def is_lazy_load_supported(self) -> bool:
+        return self.indexed_records is not None
+
+    def load_lazy_data(self, data: LazyLoadInferenceAPIData) -> InferenceAPIData:
+        if self.indexed_records is None:
+            raise ValueError("CNNDailyMailDataGenerator only loads lazily from a length index")
+        return self.length_index.completion_data(int(self.indexed_records[data.data_index % len(self.indexed_records)]))
+
+    def get_completion_pair(self, data: Any) -> Optional[Tuple[str, str]]:
+        """The article and highlights of a record, or None if it has no article."""
+        if data is None or data[self.article_key] is None or data[self.highlights_key] is None:
+            return None
+        prompt = data[self.article_key]
+        if not prompt:
+            return None
+        return prompt, data[self.highlights_key]
+
     def is_io_distribution_supported(self) -> bool:
         return True
 
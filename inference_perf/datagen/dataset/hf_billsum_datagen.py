@@ -13,19 +13,27 @@
 # limitations under the License.
 import logging
 import os
-from typing import Generator, List, Optional
+from typing import Any, Generator, List, Optional, Tuple
 
+import numpy as np
 from datasets import load_dataset
-from inference_perf.apis import ChatCompletionAPIData, ChatMessage, CompletionAPIData, InferenceAPIData
+from inference_perf.apis import (
+    ChatCompletionAPIData,
+    ChatMessage,
+    CompletionAPIData,
+    InferenceAPIData,
+    LazyLoadInferenceAPIData,
+)
 from inference_perf.config import APIConfig, APIType, DataConfig
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
-from ..base import DataGenerator
+from ..base import DataGenerator, LazyLoadDataMixin
+from .length_index import load_or_build_length_index
 
 logger = logging.getLogger(__name__)
 
 
-class BillsumConversationsDataGenerator(DataGenerator):
+class BillsumConversationsDataGenerator(DataGenerator, LazyLoadDataMixin):
     def __init__(
         self,
         api_config: APIConfig,
@@ -34,17 +42,40 @@ class BillsumConversationsDataGenerator(DataGenerator):
     ) -> None:
         super().__init__(api_config, config, tokenizer)
         self.config = config
-        self._initialize_dataset()
 
         self.min_num_turns = 2
         self.data_key = "conversations"
         self.role_key = "from"
         self.content_key = "value"
 
+        # With a prompt cache, completion requests are drawn by index from the records within the
+        # configured lengths rather than filtered while streaming
+        self.indexed_records: Optional[np.ndarray] = None
+        if api_config.type == APIType.Completion and config.prompt_cache_dir is not None and tokenizer is not None:
+            self.length_index = load_or_build_length_index(
+                self._load_dataset(streaming=False),
+                self.get_completion_pair,
+                tokenizer,
+                config.prompt_cache_dir,
+                type(self).__name__,
+                num_proc=config.tokenize_workers,
+            )
+            self.indexed_records = self.length_index.select(self.input_distribution, self.output_distribution)
+            if len(self.indexed_records) == 0:
+                raise ValueError(
+                    f"None of the {len(self.length_index)} indexed Billsum records are within the configured lengths"
+                )
+            return
+
+        self._initialize_dataset()
+
         # Advance the iterator to the first data point
         next(self.billsum_dataset)
 
     def _initialize_dataset(self) -> None:
+        self.billsum_dataset = iter(self._load_dataset(streaming=True))
+
+    def _load_dataset(self, streaming: bool) -> Any:
         if self.config.path is None:
             raise ValueError("Invalid dataset path: No dataset path provided")
         # check if the path is valid
@@ -52,10 +83,10 @@ class BillsumConversationsDataGenerator(DataGenerator):
             raise ValueError(f"Invalid dataset path: {self.config.path}. Path does not exist.")
         # depending on whether the dataset is a single file or a directory, we need to load it differently
         if os.path.isfile(self.config.path) and self.config.path.endswith(".json"):
-            self.billsum_dataset = iter(load_dataset("json", data_files=self.config.path, streaming=True, split="train"))
+            return load_dataset("json", data_files=self.config.path, streaming=streaming, split="train")
         elif os.path.isdir(self.config.path):
             json_files = [f for f in os.listdir(self.config.path) if f.endswith(".json")]
-            self.billsum_dataset = iter(load_dataset("json", data_files=json_files, streaming=True, split="train"))
+            return load_dataset("json", data_files=json_files, streaming=streaming, split="train")
         else:
             raise ValueError(f"Invalid dataset path: {self.config.path}")
 
@@ -63,6 +94,11 @@ class BillsumConversationsDataGenerator(DataGenerator):
         return [APIType.Chat, APIType.Completion]
 
     def get_data(self) -> Generator[InferenceAPIData, None, None]:
+        if self.indexed_records is not None:
+            i = 0
+            while True:
+                yield LazyLoadInferenceAPIData(data_index=i)
+                i += 1
         if self.billsum_dataset is not None:
             while True:
                 try:
@@ -71,20 +107,15 @@ class BillsumConversationsDataGenerator(DataGenerator):
                     self._initialize_dataset()
                     data = next(self.billsum_dataset)
 
-                if (
-                    data is None
-                    or data[self.data_key] is None
-                    or len(data[self.data_key]) < self.min_num_turns
-                    or len(data[self.data_key]) == 0
-                ):
+                if not self._has_conversation(data):
                     continue
 
                 if self.api_config.type == APIType.Completion:
                     try:
-                        prompt = data[self.data_key][0].get(self.content_key)
-                        completion = data[self.data_key][1].get(self.content_key)
-                        if not prompt:
+                        pair = self.get_completion_pair(data)
+                        if pair is None:
                             continue
+                        prompt, completion = pair
                         assert self.tokenizer is not None
                         prompt_ids = self.tokenizer.get_tokenizer().encode(prompt)
                         prompt_tokens = len(prompt_ids)
@@ -115,6 +146,32 @@ class BillsumConversationsDataGenerator(DataGenerator):
                 else:
                     raise Exception("Unsupported API type")
 
+    def is_lazy_load_supported(self) -> bool:
+        return self.indexed_records is not None
+
+    def load_lazy_data(self, data: LazyLoadInferenceAPIData) -> InferenceAPIData:
+        if self.indexed_records is None:
+            raise ValueError("BillsumConversationsDataGenerator only loads lazily from a length index")
+        return self.length_index.completion_data(int(self.indexed_records[data.data_index % len(self.indexed_records)]))
+
+    def get_completion_pair(self, data: Any) -> Optional[Tuple[str, str]]:
+        """The bill and its summary from a record's first two turns, or None if the completion API cannot use it."""
+        if not self._has_conversation(data):
+            return None
+        prompt = data[self.data_key][0].get(self.content_key)
+        completion = data[self.data_key][1].get(self.content_key)
+        if not prompt:
+            return None
+        return prompt, completion
+
+    def _has_conversation(self, data: Any) -> bool:
+        return not (
+            data is None
+            or data[self.data_key] is None
+            or len(data[self.data_key]) < self.min_num_turns
+            or len(data[self.data_key]) == 0
+        )
+
     def is_io_distribution_supported(self) -> bool:
         return True
 
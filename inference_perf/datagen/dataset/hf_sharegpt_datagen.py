@@ -19,12 +19,15 @@ from inference_perf.apis import (
     ChatMessage,
     CompletionAPIData,
     InferenceAPIData,
+    LazyLoadInferenceAPIData,
 )
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
-from ..base import DataGenerator
+from ..base import DataGenerator, LazyLoadDataMixin
+from .length_index import load_or_build_length_index
 from inference_perf.config import APIConfig, APIType, DataConfig
-from typing import Any, Generator, List, Optional
+from typing import Any, Generator, List, Optional, Tuple
 from datasets import load_dataset
+import numpy as np
 import os
 import json
 
@@ -35,47 +38,68 @@ SHAREGPT_HF_DATAFILES_PATH = "ShareGPT_V3_unfiltered_cleaned_split.json"
 SHAREGPT_HF_CHAT_ROLE_MAP = {"human": "user", "gpt": "assistant"}
 
 
-class HFShareGPTDataGenerator(DataGenerator):
+class HFShareGPTDataGenerator(DataGenerator, LazyLoadDataMixin):
     def __init__(self, api_config: APIConfig, config: DataConfig, tokenizer: Optional[CustomTokenizer]) -> None:
         super().__init__(api_config, config, tokenizer)
 
-        if config.path is not None:
-            # check if the path is valid
-            if not os.path.exists(config.path):
-                raise ValueError(f"Invalid dataset path: {config.path}. Path does not exist.")
-            # depending on whether the dataset is a single file or a directory, we need to load it differently
-            # TODO: add support for other file types
-            if os.path.isfile(config.path) and config.path.endswith(".json"):
-                self.sharegpt_dataset = itertools.cycle(
-                    load_dataset("json", data_files=config.path, streaming=True, split="train")
-                )
-            elif os.path.isdir(config.path):
-                json_files = [f for f in os.listdir(config.path) if f.endswith(".json")]
-                self.sharegpt_dataset = itertools.cycle(
-                    load_dataset("json", data_files=json_files, streaming=True, split="train")
-                )
-            else:
-                raise ValueError(f"Invalid dataset path: {config.path}")
-        else:
-            self.sharegpt_dataset = itertools.cycle(
-                load_dataset(
-                    SHAREGPT_HF_DATASET_URL,
-                    data_files=SHAREGPT_HF_DATAFILES_PATH,
-                    streaming=True,
-                    split="train",
-                )
-            )
         self.min_num_turns = 2
         self.data_key = "conversations"
         self.role_key = "from"
         self.content_key = "value"
+
+        # With a prompt cache, completion requests are drawn by index from the records within the
+        # configured lengths rather than filtered while streaming
+        self.indexed_records: Optional[np.ndarray] = None
+        if api_config.type == APIType.Completion and config.prompt_cache_dir is not None and tokenizer is not None:
+            self.length_index = load_or_build_length_index(
+                self._load_dataset(streaming=False),
+                self.get_completion_pair,
+                tokenizer,
+                config.prompt_cache_dir,
+                type(self).__name__,
+                num_proc=config.tokenize_workers,
+            )
+            self.indexed_records = self.length_index.select(self.input_distribution, self.output_distribution)
+            if len(self.indexed_records) == 0:
+                raise ValueError(
+                    f"None of the {len(self.length_index)} indexed ShareGPT records are within the configured lengths"
+                )
+            return
+
+        self.sharegpt_dataset = itertools.cycle(self._load_dataset(streaming=True))
         # initialize data collection
         next(self.sharegpt_dataset)
 
+    def _load_dataset(self, streaming: bool) -> Any:
+        if self.config.path is not None:
+            # check if the path is valid
+            if not os.path.exists(self.config.path):
+                raise ValueError(f"Invalid dataset path: {self.config.path}. Path does not exist.")
+            # depending on whether the dataset is a single file or a directory, we need to load it differently
+            # TODO: add support for other file types
+            if os.path.isfile(self.config.path) and self.config.path.endswith(".json"):
+                return load_dataset("json", data_files=self.config.path, streaming=streaming, split="train")
+            elif os.path.isdir(self.config.path):
+                json_files = [f for f in os.listdir(self.config.path) if f.endswith(".json")]
+                return load_dataset("json", data_files=json_files, streaming=streaming, split="train")
+            else:
+                raise ValueError(f"Invalid dataset path: {self.config.path}")
+        return load_dataset(
+            SHAREGPT_HF_DATASET_URL,
+            data_files=SHAREGPT_HF_DATAFILES_PATH,
+            streaming=streaming,
+            split="train",
+        )
+
     def get_supported_apis(self) -> List[APIType]:
         return [APIType.Chat, APIType.Completion, APIType.AnthropicMessages]
 
     def get_data(self) -> Generator[InferenceAPIData, None, None]:
+        if self.indexed_records is not None:
+            i = 0
+            while True:
+                yield LazyLoadInferenceAPIData(data_index=i)
+                i += 1
         if self.sharegpt_dataset is None:
             return
         if self.api_config.type == APIType.Completion:
@@ -86,24 +110,39 @@ class HFShareGPTDataGenerator(DataGenerator):
             yield from self.get_anthropic_messages_data()
         raise Exception("Unsupported API type")
 
+    def is_lazy_load_supported(self) -> bool:
+        return self.indexed_records is not None
+
+    def load_lazy_data(self, data: LazyLoadInferenceAPIData) -> InferenceAPIData:
+        if self.indexed_records is None:
+            raise ValueError("HFShareGPTDataGenerator only loads lazily from a length index")
+        return self.length_index.completion_data(int(self.indexed_records[data.data_index % len(self.indexed_records)]))
+
+    def get_completion_pair(self, data: Any) -> Optional[Tuple[str, str]]:
+        """The prompt and completion of a record, or None if the completion API cannot use it."""
+        if (
+            data is None
+            or data[self.data_key] is None
+            or len(data[self.data_key]) < self.min_num_turns
+            or len(data[self.data_key]) == 0
+        ):
+            return None
+        prompt = self.get_conversation_turn_content(data, 0)
+        completion = self.get_conversation_turn_content(data, 1)
+        if not prompt:
+            return None
+        return prompt, completion
+
     def get_completion_data(self) -> Generator[InferenceAPIData, None, None]:
         if self.tokenizer is None:
             raise Exception("Tokenizer is required for completion API of HFShareGPTDataGenerator")
         while True:
             data = next(self.sharegpt_dataset)
-            if (
-                data is None
-                or data[self.data_key] is None
-                or len(data[self.data_key]) < self.min_num_turns
-                or len(data[self.data_key]) == 0
-            ):
-                continue
-
             try:
-                prompt = self.get_conversation_turn_content(data, 0)
-                completion = self.get_conversation_turn_content(data, 1)
-                if not prompt:
+                pair = self.get_completion_pair(data)
+                if pair is None:
                     continue
+                prompt, completion = pair
                 prompt_ids = self.tokenizer.get_tokenizer().encode(prompt)
                 prompt_tokens = len(prompt_ids)
                 completion_tokens = self.tokenizer.count_tokens(completion)
@@ -12,49 +12,80 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-from inference_perf.apis import InferenceAPIData, CompletionAPIData, ChatCompletionAPIData, ChatMessage
+from inference_perf.apis import (
+    InferenceAPIData,
+    CompletionAPIData,
+    ChatCompletionAPIData,
+    ChatMessage,
+    LazyLoadInferenceAPIData,
+)
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
-from ..base import DataGenerator
+from ..base import DataGenerator, LazyLoadDataMixin
+from .length_index import load_or_build_length_index
 from inference_perf.config import APIConfig, APIType, DataConfig
-from typing import Generator, List, Optional
+from typing import Any, Generator, List, Optional, Tuple
 from datasets import load_dataset
+import numpy as np
 import os
 
 logger = logging.getLogger(__name__)
 
 
-class InfinityInstructDataGenerator(DataGenerator):
+class InfinityInstructDataGenerator(DataGenerator, LazyLoadDataMixin):
     def __init__(self, api_config: APIConfig, config: DataConfig, tokenizer: Optional[CustomTokenizer]) -> None:
         super().__init__(api_config, config, tokenizer)
 
-        if config.path is not None:
+        self.conversations_key = "conversations"
+
+        # With a prompt cache, completion requests are drawn by index from the records within the
+        # configured lengths rather than filtered while streaming
+        self.indexed_records: Optional[np.ndarray] = None
+        if api_config.type == APIType.Completion and config.prompt_cache_dir is not None and tokenizer is not None:
+            self.length_index = load_or_build_length_index(
+                self._load_dataset(streaming=False),
+                self.get_completion_pair,
+                tokenizer,
+                config.prompt_cache_dir,
+                type(self).__name__,
+                num_proc=config.tokenize_workers,
+            )
+            self.indexed_records = self.length_index.select(self.input_distribution, self.output_distribution)
+            if len(self.indexed_records) == 0:
+                raise ValueError(
+                    f"None of the {len(self.length_index)} indexed Infinity-Instruct records are within the configured lengths"
+                )
+            return
+
+        self.infinity_instruct_dataset = iter(self._load_dataset(streaming=True))
+        # initialize data collection
+        next(self.infinity_instruct_dataset)
+
+    def _load_dataset(self, streaming: bool) -> Any:
+        if self.config.path is not None:
             # check if the path is valid
-            if not os.path.exists(config.path):
-                raise ValueError(f"Invalid dataset path: {config.path}. Path does not exist.")
+            if not os.path.exists(self.config.path):
+                raise ValueError(f"Invalid dataset path: {self.config.path}. Path does not exist.")
             # depending on whether the dataset is a single file or a directory, we need to load it differently
             # TODO: add support for other file types
-            if os.path.isfile(config.path) and config.path.endswith(".json"):
-                self.infinity_instruct_dataset = iter(
-                    load_dataset("json", data_files=config.path, streaming=True, split="train")
-                )
-            elif os.path.isdir(config.path):
-                json_files = [f for f in os.listdir(config.path) if f.endswith(".json")]
-                self.infinity_instruct_dataset = iter(
-                    load_dataset("json", data_files=json_files, streaming=True, split="train")
-                )
+            if os.path.isfile(self.config.path) and self.config.path.endswith(".json"):
+                return load_dataset("json", data_files=self.config.path, streaming=streaming, split="train")
+            elif os.path.isdir(self.config.path):
+                json_files = [f for f in os.listdir(self.config.path) if f.endswith(".json")]
+                return load_dataset("json", data_files=json_files, streaming=streaming, split="train")
             else:
-                raise ValueError(f"Invalid dataset path: {config.path}")
+                raise ValueError(f"Invalid dataset path: {self.config.path}")
         else:
             raise ValueError("path is not provided in the config")
 
-        self.conversations_key = "conversations"
-        # initialize data collection
-        next(self.infinity_instruct_dataset)
-
     def get_supported_apis(self) -> List[APIType]:
         return [APIType.Completion, APIType.Chat]
 
     def get_data(self) -> Generator[InferenceAPIData, None, None]:
+        if self.indexed_records is not None:
+            i = 0
+            while True:
+                yield LazyLoadInferenceAPIData(data_index=i)
+                i += 1
         if self.infinity_instruct_dataset is not None:
             while True:
                 data = next(self.infinity_instruct_dataset)
@@ -67,18 +98,10 @@ class InfinityInstructDataGenerator(DataGenerator):
 
                 if self.api_config.type == APIType.Completion:
                     try:
-                        # The last message is the completion
-                        completion_message = conversations[-1]
-                        if completion_message.get("from") != "gpt":
-                            continue
-                        completion = completion_message.get("value")
-
-                        # The rest of the messages are the prompt
-                        prompt_messages = conversations[:-1]
-                        prompt = "\n".join([msg.get("value", "") for msg in prompt_messages])
-
-                        if not prompt or not completion:
+                        pair = self.get_completion_pair(data)
+                        if pair is None:
                             continue
+                        prompt, completion = pair
 
                         assert self.tokenizer is not None
                         prompt_ids = self.tokenizer.get_tokenizer().encode(prompt)
@@ -120,6 +143,33 @@ class InfinityInstructDataGenerator(DataGenerator):
                 else:
                     raise Exception("Unsupported API type")
 
+    def is_lazy_load_supported(self) -> bool:
+        return self.indexed_records is not None
+
+    def load_lazy_data(self, data: LazyLoadInferenceAPIData) -> InferenceAPIData:
+        if self.indexed_records is None:
+            raise ValueError("InfinityInstructDataGenerator only loads lazily from a length index")
+        return self.length_index.completion_data(int(self.indexed_records[data.data_index % len(self.indexed_records)]))
+
+    def get_completion_pair(self, data: Any) -> Optional[Tuple[str, str]]:
+        """The earlier turns of a record joined as the prompt and its last, assistant turn as the completion."""
+        if data is None or self.conversations_key not in data or not data[self.conversations_key]:
+            return None
+        conversations = data[self.conversations_key]
+        # The last message is the completion
+        completion_message = conversations[-1]
+        if completion_message.get("from") != "gpt":
+            return None
+        completion = completion_message.get("value")
+
+        # The rest of the messages are the prompt
+        prompt_messages = conversations[:-1]
+        prompt = "\n".join([msg.get("value", "") for msg in prompt_messages])
+
+        if not prompt or not completion:
+            return None
+        return prompt, completion
+
     def is_io_distribution_supported(self) -> bool:
         return True
 
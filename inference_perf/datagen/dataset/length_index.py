@@ -0,0 +1,217 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Tokenized dataset tables, so generators pick records within the configured lengths up front.
+
+Filtering records against input/output distributions while streaming tokenizes every record only to
+discard most of them when the bounds are narrow, and does so on the producer path of a stage. A
+dataset is instead tokenized once with Dataset.map, in batches spread over a pool of processes, into
+an Arrow table holding the dataset offset, prompt, completion and token counts of every usable
+record. The table is stored under <cache_dir>/length-index/<key>/, keyed on the tokenizer, the
+generator and the dataset's fingerprint, and memory-mapped by later runs and the load workers.
+"""
+
+import glob
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from datasets import Dataset, Features, Value, concatenate_datasets
+from transformers import PreTrainedTokenizerBase
+
+from inference_perf.apis import CompletionAPIData
+from inference_perf.config import Distribution
+from inference_perf.datagen.prompt_cache import corpus_key
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+logger = logging.getLogger(__name__)
+
+# Records whose prompts and completions are encoded in one call; fast tokenizers spread a batch
+# across their thread pool
+INDEX_BATCH_SIZE = 1024
+
+# Returns a record's (prompt, completion), None to skip it, or raises KeyError/TypeError for a malformed one
+CompletionExtractor = Callable[[Any], Optional[Tuple[str, str]]]
+
+INDEX_FEATURES = Features(
+    {
+        "record": Value("int64"),
+        "prompt": Value("large_string"),
+        "completion": Value("large_string"),
+        "prompt_tokens": Value("int64"),
+        "completion_tokens": Value("int64"),
+    }
+)
+
+
+class DatasetLengthIndex:
+    """The usable records of a dataset in dataset order: their offset, prompt, completion and token counts."""
+
+    def __init__(self, table: Dataset) -> None:
+        self.table = table
+        # One (record offset, prompt tokens, completion tokens) row per table row
+        self.rows = np.column_stack(
+            [np.asarray(table.data.column(name), dtype=np.int64) for name in ("record", "prompt_tokens", "completion_tokens")]
+        ).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def select(self, input_distribution: Optional[Distribution], output_distribution: Optional[Distribution]) -> np.ndarray:
+        """Positions of the rows whose prompt and completion lengths lie within the distributions' bounds."""
+        mask = np.ones(len(self.rows), dtype=bool)
+        for column, distribution in ((1, input_distribution), (2, output_distribution)):
+            if distribution is not None:
+                mask &= (self.rows[:, column] >= distribution.min) & (self.rows[:, column] <= distribution.max)
+        return np.flatnonzero(mask)
+
+    def completion_data(self, position: int) -> CompletionAPIData:
+        """A completion request for the row at position, asking for as many tokens as its completion has."""
+        row = self.table[position]
+        return CompletionAPIData(prompt=row["prompt"], max_tokens=row["completion_tokens"])
+
+
+def load_or_build_length_index(
+    dataset: Dataset,
+    extract: CompletionExtractor,
+    tokenizer: CustomTokenizer,
+    cache_dir: str,
+    generator: str,
+    num_proc: int = 1,
+) -> DatasetLengthIndex:
+    """The length index of dataset, read from cache_dir or built with num_proc processes and stored there on a miss."""
+    key = corpus_key(tokenizer, f"{generator}.length_index", dataset._fingerprint)
+    index_dir = os.path.join(cache_dir, "length-index")
+    directory = os.path.join(index_dir, key)
+    if os.path.isdir(directory):
+        try:
+            index = _load_index(directory)
+            logger.info(f"Loaded the length index of {len(index)} {generator} records from {directory}")
+            return index
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable length index {directory}: {e}")
+
+    start = time.perf_counter()
+    os.makedirs(index_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{key}.", dir=index_dir)
+    try:
+        build_length_index(
+            dataset, extract, tokenizer, num_proc=num_proc, cache_file_name=os.path.join(staging, "index.arrow")
+        )
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another run stored the same key first, or an unreadable index is in the way
+            try:
+                return _load_index(directory)
+            except (OSError, ValueError):
+                shutil.rmtree(directory, ignore_errors=True)
+                os.rename(staging, directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    index = _load_index(directory)
+    logger.info(
+        f"Indexed {len(index)} of {len(dataset)} {generator} records with {num_proc} processes in"
+        f" {time.perf_counter() - start:.1f}s, stored in {directory}"
+    )
+    return index
+
+
+def build_length_index(
+    dataset: Dataset,
+    extract: CompletionExtractor,
+    tokenizer: CustomTokenizer,
+    num_proc: int = 1,
+    batch_size: int = INDEX_BATCH_SIZE,
+    cache_file_name: Optional[str] = None,
+) -> DatasetLengthIndex:
+    """
+    Extract and encode every record of dataset, batch_size records at a time across num_proc processes.
+
+    The table is written to cache_file_name (one shard per process) when given, and kept in memory
+    otherwise.
+    """
+    table = dataset.map(
+        _tokenize_batch,
+        with_indices=True,
+        batched=True,
+        batch_size=batch_size,
+        remove_columns=dataset.column_names,
+        features=INDEX_FEATURES,
+        fn_kwargs={"extract": extract, "tokenizer": tokenizer},
+        num_proc=num_proc if num_proc > 1 else None,
+        keep_in_memory=cache_file_name is None,
+        cache_file_name=cache_file_name,
+        load_from_cache_file=False,
+        # The tokenizer and extractor are not worth hashing into a fingerprint; the table is cached by key
+        new_fingerprint=dataset._fingerprint + ".length_index",
+        desc="Tokenizing dataset",
+    )
+    skipped = len(dataset) - len(table)
+    if skipped:
+        logger.info(f"Skipped {skipped} dataset records that are empty or malformed for the completion API")
+    return DatasetLengthIndex(table)
+
+
+def _load_index(directory: str) -> DatasetLengthIndex:
+    shards = sorted(glob.glob(os.path.join(directory, "*.arrow")))
+    if not shards:
+        raise ValueError(f"No index shards in {directory}")
+    table = concatenate_datasets([Dataset.from_file(shard) for shard in shards])
+    if table.features != INDEX_FEATURES:
+        raise ValueError(f"Unexpected length index columns {table.features}")
+    return DatasetLengthIndex(table)
+
+
+def _tokenize_batch(
+    batch: Dict[str, List[Any]], indices: List[int], extract: CompletionExtractor, tokenizer: CustomTokenizer
+) -> Dict[str, List[Any]]:
+    """The index rows of a batch of records, counting tokens the way the streaming generators do."""
+    offsets: List[int] = []
+    prompts: List[str] = []
+    completions: List[str] = []
+    for offset, values in zip(indices, zip(*batch.values(), strict=True), strict=True):
+        try:
+            pair = extract(dict(zip(batch, values, strict=True)))
+        except (KeyError, TypeError):
+            continue
+        if pair is None or not all(isinstance(text, str) for text in pair):
+            continue
+        offsets.append(offset)
+        prompts.append(pair[0])
+        completions.append(pair[1])
+
+    hf_tokenizer = tokenizer.get_tokenizer()
+    # Prompts are counted untruncated, as encode() does; completions as count_tokens does
+    if not prompts:
+        prompt_tokens: List[int] = []
+    elif isinstance(hf_tokenizer, PreTrainedTokenizerBase):
+        prompt_tokens = [len(ids) for ids in hf_tokenizer(prompts).input_ids]
+    else:
+        prompt_tokens = [len(hf_tokenizer.encode(prompt)) for prompt in prompts]
+    if type(tokenizer).count_tokens is CustomTokenizer.count_tokens:
+        completion_tokens = tokenizer.count_tokens_batch(completions)
+    else:
+        completion_tokens = [tokenizer.count_tokens(completion) for completion in completions]
+    return {
+        "record": offsets,
+        "prompt": prompts,
+        "completion": completions,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+    }
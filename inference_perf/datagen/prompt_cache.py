@@ -0,0 +1,198 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+On-disk cache of generated prompt corpora, keyed on everything that determines the prompts.
+
+Exact-length prompts are found by repeatedly decoding and re-encoding candidates, which for large
+configs takes minutes before the first request. A corpus stored here lives in <cache_dir>/<key>/ as
+the UTF-8 prompt texts and their token ids, each a flat array plus an offsets array, and later runs
+memory-map it instead of regenerating. Load workers forked from the main process share its pages.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, overload
+
+import numpy as np
+
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout, the meaning of a generator's cached metadata or the prompts a config generates
+# change, so stale entries are ignored rather than misread
+CACHE_FORMAT_VERSION = 2
+
+_TEXTS = "texts.bin"
+_TEXT_OFFSETS = "text_offsets.npy"
+_TOKEN_IDS = "token_ids.npy"
+_TOKEN_OFFSETS = "token_offsets.npy"
+_META = "meta.json"
+
+
+def tokenizer_fingerprint(tokenizer: CustomTokenizer) -> str:
+    """Digest of the tokenizer's definition: its serialized pipeline (or vocab) and chat template."""
+    hf_tokenizer = tokenizer.get_tokenizer()
+    digest = hashlib.sha256(type(hf_tokenizer).__name__.encode())
+    backend = getattr(hf_tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        digest.update(backend.to_str().encode())
+    else:
+        vocab = sorted(hf_tokenizer.get_vocab().items(), key=lambda item: item[1])
+        digest.update(json.dumps(vocab, ensure_ascii=False).encode())
+    digest.update(json.dumps(getattr(hf_tokenizer, "chat_template", None)).encode())
+    return digest.hexdigest()
+
+
+def corpus_key(tokenizer: CustomTokenizer, generator: str, *inputs: Any) -> str:
+    """
+    Cache key of a generator's corpus: the tokenizer, the generator and whatever else its prompts
+    depend on (config dumps, seeds, length arrays), which must be JSON-serializable or numpy arrays.
+    """
+    digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{generator}:{tokenizer_fingerprint(tokenizer)}".encode())
+    for value in inputs:
+        if isinstance(value, np.ndarray):
+            digest.update(f"{value.dtype.str}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class PromptCorpus(Sequence[str]):
+    """A cached corpus: prompt texts by index, their token ids and the generator's metadata, all read from disk."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        with open(os.path.join(directory, _META), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        texts_path = os.path.join(directory, _TEXTS)
+        # np.memmap refuses empty files
+        self._texts = np.memmap(texts_path, dtype=np.uint8, mode="r") if os.path.getsize(texts_path) else np.empty(0, np.uint8)
+        self._text_offsets = np.load(os.path.join(directory, _TEXT_OFFSETS), mmap_mode="r")
+        self._token_ids = np.load(os.path.join(directory, _TOKEN_IDS), mmap_mode="r")
+        self._token_offsets = np.load(os.path.join(directory, _TOKEN_OFFSETS), mmap_mode="r")
+        if self._text_offsets[-1] != len(self._texts) or self._token_offsets[-1] != len(self._token_ids):
+            raise ValueError(f"Truncated prompt cache entry {directory}")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers that are not forked reopen the mapping rather than receive a copy of the corpus
+        return {"directory": self.directory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["directory"])  # type: ignore[misc]
+
+    def __len__(self) -> int:
+        return len(self._text_offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Prompt index {index} out of range")
+        return self._texts[self._text_offsets[index] : self._text_offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def token_ids(self, index: int) -> List[int]:
+        """Token ids the prompt at index was decoded from; empty when the generator did not record them."""
+        return self._token_ids[self._token_offsets[index] : self._token_offsets[index + 1]].tolist()  # type: ignore[no-any-return]
+
+
+def load_corpus(cache_dir: str, key: str) -> Optional[PromptCorpus]:
+    """The corpus cached under key, or None on a miss or an unreadable entry."""
+    directory = os.path.join(cache_dir, key)
+    if not os.path.isdir(directory):
+        return None
+    try:
+        corpus = PromptCorpus(directory)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable prompt cache entry {directory}: {e}")
+        return None
+    logger.info(f"Loaded {len(corpus)} cached prompts from {directory}")
+    return corpus
+
+
+def store_corpus(
+    cache_dir: str,
+    key: str,
+    texts: Sequence[str],
+    token_ids: Optional[Sequence[Sequence[int]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> PromptCorpus:
+    """
+    Cache a corpus under key and return it read back from disk. The entry is written to a temporary
+    directory and renamed into place, so concurrent runs never see a partial entry.
+    """
+    if token_ids is not None and len(token_ids) != len(texts):
+        raise ValueError(f"Got token ids for {len(token_ids)} prompts but {len(texts)} prompt texts")
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{key}.", dir=cache_dir)
+    try:
+        encoded = [text.encode("utf-8") for text in texts]
+        with open(os.path.join(staging, _TEXTS), "wb") as f:
+            f.writelines(encoded)
+        np.save(os.path.join(staging, _TEXT_OFFSETS), _offsets(len(chunk) for chunk in encoded))
+        ids = token_ids if token_ids is not None else [[] for _ in texts]
+        flat_ids = np.fromiter((token for prompt_ids in ids for token in prompt_ids), dtype=np.int64)
+        np.save(os.path.join(staging, _TOKEN_IDS), flat_ids)
+        np.save(os.path.join(staging, _TOKEN_OFFSETS), _offsets(len(prompt_ids) for prompt_ids in ids))
+        with open(os.path.join(staging, _META), "w", encoding="utf-8") as f:
+            json.dump(meta or {}, f)
+
+        directory = os.path.join(cache_dir, key)
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another run stored the same key first, or an unreadable entry is in the way
+            if (existing := load_corpus(cache_dir, key)) is not None:
+                return existing
+            shutil.rmtree(directory, ignore_errors=True)
+            os.rename(staging, directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    logger.info(f"Cached {len(texts)} prompts in {directory}")
+    return PromptCorpus(directory)
+
+
+def save_array(path: str, array: np.ndarray) -> None:
+    """Write array to path as .npy through a temporary file, so concurrent runs never read a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, staging = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(staging, path)
+    except BaseException:
+        os.unlink(staging)
+        raise
+
+
+def _offsets(lengths: Iterator[int]) -> np.ndarray:
+    offsets = np.zeros(1, dtype=np.int64)
+    return np.concatenate([offsets, np.cumsum(np.fromiter(lengths, dtype=np.int64))])
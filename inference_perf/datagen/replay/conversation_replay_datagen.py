@@ -60,6 +60,7 @@ from inference_perf.utils.custom_tokenizer import CustomTokenizer
 from inference_perf.utils.numeric.distribution import sample_from_distribution
 
 from ..base import DataGenerator, LazyLoadDataMixin
+from ..prompt_cache import PromptCorpus, corpus_key, load_corpus, store_corpus
 
 logger = logging.getLogger(__name__)
 
@@ -324,7 +325,76 @@ class ConversationReplayDataGenerator(DataGenerator, LazyLoadDataMixin):
         return str(hf_tokenizer.decode(token_ids, skip_special_tokens=True))
 
     def _build_conversations(self) -> None:
-        """Pre-generate all conversation blueprints deterministically."""
+        """Pre-generate all conversation blueprints deterministically, or read them from the prompt cache."""
+        cache_dir = self.config.prompt_cache_dir
+        if cache_dir is None:
+            self._generate_conversations()
+        else:
+            assert self.tokenizer is not None
+            key = corpus_key(
+                self.tokenizer, type(self).__name__, self.config.model_dump(mode="json", exclude={"prompt_cache_dir"})
+            )
+            corpus = load_corpus(cache_dir, key)
+            if corpus is None:
+                self._generate_conversations()
+                self._store_conversations(cache_dir, key)
+            else:
+                self._load_conversations(corpus)
+
+        # Create a LocalUserSession per conversation with the system prompt as initial context
+        for bp in self.blueprints:
+            self.user_sessions.append(
+                self._new_session(
+                    user_session_id=f"conv_{bp.conversation_id}",
+                    context=bp.system_prompt,
+                    system_prompt=bp.system_prompt,
+                )
+            )
+
+    def _store_conversations(self, cache_dir: str, key: str) -> None:
+        """Cache the stage 0 shared prompt and every blueprint's dynamic prompt and turn prompts, in that order."""
+        assert self._current_shared_prompt is not None
+        texts = [self._current_shared_prompt]
+        for bp in self.blueprints:
+            texts.append(bp.dynamic_system_prompt)
+            texts.extend(bp.turn_prompts)
+        meta = {
+            "turn_counts": [bp.num_turns for bp in self.blueprints],
+            "dynamic_lens": [bp.system_prompt_tokens - self.cr_config.shared_system_prompt_len for bp in self.blueprints],
+            "turn_output_lens": [n for bp in self.blueprints for n in bp.turn_output_lens],
+            "turn_tool_call_latencies": [latency for bp in self.blueprints for latency in bp.turn_tool_call_latencies],
+            "rng_state": self.rng.bit_generator.state,
+        }
+        store_corpus(cache_dir, key, texts, meta=meta)
+
+    def _load_conversations(self, corpus: PromptCorpus) -> None:
+        """Rebuild the blueprints _generate_conversations would have produced from a cached corpus."""
+        meta = corpus.meta
+        self._current_shared_prompt = corpus[0]
+        self._current_stage_id = 0
+        text_offset = 1
+        turn_offset = 0
+        for conv_id, (num_turns, dynamic_len) in enumerate(zip(meta["turn_counts"], meta["dynamic_lens"], strict=True)):
+            dynamic_text = corpus[text_offset]
+            turn_prompts = corpus[text_offset + 1 : text_offset + 1 + num_turns]
+            text_offset += 1 + num_turns
+            self.blueprints.append(
+                ConversationBlueprint(
+                    conversation_id=conv_id,
+                    num_turns=num_turns,
+                    system_prompt=self._build_system_prompt(self._current_shared_prompt, dynamic_text),
+                    system_prompt_tokens=self.cr_config.shared_system_prompt_len + dynamic_len,
+                    dynamic_system_prompt=dynamic_text,
+                    turn_prompts=turn_prompts,
+                    turn_output_lens=meta["turn_output_lens"][turn_offset : turn_offset + num_turns],
+                    turn_tool_call_latencies=meta["turn_tool_call_latencies"][turn_offset : turn_offset + num_turns],
+                )
+            )
+            turn_offset += num_turns
+        self.rng.bit_generator.state = meta["rng_state"]
+
+    def _generate_conversations(self) -> None:
+        """Sample and generate all conversation blueprints from the seeded RNG."""
         cfg = self.cr_config
         n = cfg.num_conversations
 
@@ -401,12 +471,3 @@ class ConversationReplayDataGenerator(DataGenerator, LazyLoadDataMixin):
                 turn_tool_call_latencies=turn_tool_latencies,
             )
             self.blueprints.append(bp)
-
-            # Create a LocalUserSession with the system prompt as initial context
-            self.user_sessions.append(
-                self._new_session(
-                    user_session_id=f"conv_{conv_id}",
-                    context=system_prompt,
-                    system_prompt=system_prompt,
-                )
-            )
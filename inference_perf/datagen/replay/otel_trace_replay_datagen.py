@@ -51,7 +51,7 @@ Two orthogonal coordination problems exist in this system:
 
     - WorkerSessionTracker: Per-worker tracking of event completions and session failures
     - session_completion_queue: Workers push completion data when last event finishes
-    - Main process consumes from queue in check_session_completed()
+    - Main process blocks on the queue in wait_for_session_completions() and handles only the sessions reported
 
 SessionChatCompletionAPIData holds refs to WorkerSessionTracker and completion_queue.
 """
@@ -60,7 +60,6 @@ import glob
 import json
 import logging
 import random
-from multiprocessing.managers import SyncManager
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Union, cast
 from datasets import load_dataset, Dataset
@@ -73,6 +72,7 @@ from inference_perf.datagen.replay.otel_trace_to_replay_graph import (
     build_raw_calls,
     build_graph,
 )
+from inference_perf.datagen.replay.session_completion_channel import SessionCompletionChannel
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 from inference_perf.apis import InferenceAPIData, LazyLoadInferenceAPIData
 
@@ -339,7 +339,7 @@ class OTelTraceReplayDataGenerator(ReplayGraphSessionGeneratorBase):
         api_config: APIConfig,
         config: DataConfig,
         tokenizer: Optional[CustomTokenizer],
-        mp_manager: Optional[SyncManager] = None,
+        completion_channel: Optional[SessionCompletionChannel] = None,
         base_seed: Optional[int] = None,
         num_workers: int = 1,
     ) -> None:
@@ -353,13 +353,12 @@ class OTelTraceReplayDataGenerator(ReplayGraphSessionGeneratorBase):
             api_config,
             config,
             tokenizer,
-            mp_manager=mp_manager,
+            completion_channel=completion_channel,
             base_seed=base_seed,
             num_workers=num_workers,
             replay_config=self.otel_config,
         )
 
-        self.mp_manager = mp_manager
         self.num_workers = max(1, num_workers)
         self.base_seed = base_seed if base_seed is not None else 42
 
@@ -30,7 +30,7 @@ import time
 import uuid
 from collections import Counter
 from dataclasses import dataclass, field, replace as dc_replace
-from multiprocessing.managers import SyncManager
+from queue import Empty
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from aiohttp import ClientResponse
@@ -53,12 +53,14 @@ from inference_perf.apis.anthropic_messages import (
 )
 from inference_perf.apis.chat import ChatMessage
 from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.apis.json_codec import get_json_codec
 from inference_perf.apis.streaming_parser import parse_sse_stream
 from inference_perf.config import APIConfig, APIType, DataConfig, SessionReplayConfig
 from inference_perf.config.datagen.replay import BadToolCallHandling
 from inference_perf.datagen.base import LazyLoadDataMixin, SessionGenerator
 from inference_perf.datagen.replay.replay_graph_types import InputSegment, ReplayGraph
-from inference_perf.utils.custom_tokenizer import CustomTokenizer
+from inference_perf.datagen.replay.session_completion_channel import SessionCompletionChannel
+from inference_perf.utils.custom_tokenizer import CustomTokenizer, count_chunk_tokens_async, count_tokens_async
 
 logger = logging.getLogger(__name__)
 
@@ -890,8 +892,11 @@ class SessionChatCompletionAPIData(ChatCompletionAPIData):
                 content = delta.get("content")
                 return str(content) if content is not None else None
 
-            text_content, chunk_times, raw_content, response_chunks, server_usage = await parse_sse_stream(
-                response, extract_content=_extract_streaming_content
+            text_content, chunk_times, raw_content, response_chunks, server_usage, chunk_texts = await parse_sse_stream(
+                response,
+                extract_content=_extract_streaming_content,
+                capture_raw=config.capture_raw_response,
+                json_codec=get_json_codec(config.json_codec),
             )
 
             # Combine reasoning_content with text_content in output_text (used for token count)
@@ -921,7 +926,7 @@ class SessionChatCompletionAPIData(ChatCompletionAPIData):
                 tc_text = ""
                 if tool_call_chunks:
                     tc_text = json.dumps([tool_call_chunks[i] for i in sorted(tool_call_chunks)], ensure_ascii=False)
-                output_len = tokenizer.count_tokens(output_text + tc_text)
+                output_len = await count_tokens_async(tokenizer, output_text + tc_text)
             info = SessionInferenceInfo(
                 request_metrics=RequestMetrics(text=Text(input_tokens=prompt_len)),
                 response_metrics=StreamedResponseMetrics(
@@ -929,6 +934,7 @@ class SessionChatCompletionAPIData(ChatCompletionAPIData):
                     chunk_times=chunk_times,
                     output_tokens=output_len,
                     output_token_times=chunk_times,
+                    chunk_token_counts=await count_chunk_tokens_async(tokenizer, chunk_texts),
                     server_usage=server_usage,
                 ),
                 lora_adapter=lora_adapter,
@@ -972,7 +978,7 @@ class SessionChatCompletionAPIData(ChatCompletionAPIData):
                 tc_text = ""
                 if tool_calls:
                     tc_text = json.dumps(tool_calls, ensure_ascii=False)
-                output_len = tokenizer.count_tokens(output_text + tc_text)
+                output_len = await count_tokens_async(tokenizer, output_text + tc_text)
             info = SessionInferenceInfo(
                 request_metrics=RequestMetrics(text=Text(input_tokens=prompt_len)),
                 response_metrics=UnaryResponseMetrics(output_tokens=output_len, server_usage=server_usage),
@@ -1105,10 +1111,13 @@ class SessionAnthropicMessagesAPIData(SessionChatCompletionAPIData):
                 raw_content,
                 response_chunks,
                 server_usage,
-            ) = await parse_anthropic_stream_response(response)
+                chunk_texts,
+            ) = await parse_anthropic_stream_response(
+                response, capture_raw=config.capture_raw_response, json_codec=get_json_codec(config.json_codec)
+            )
             input_tokens = (server_usage or {}).get("input_tokens")
             output_tokens = (server_usage or {}).get("output_tokens")
-            output_len = int(output_tokens) if output_tokens is not None else tokenizer.count_tokens(output_text)
+            output_len = int(output_tokens) if output_tokens is not None else await count_tokens_async(tokenizer, output_text)
             base_info = InferenceInfo(
                 request_metrics=RequestMetrics(
                     text=Text(
@@ -1122,6 +1131,7 @@ class SessionAnthropicMessagesAPIData(SessionChatCompletionAPIData):
                     chunk_times=chunk_times,
                     output_tokens=output_len,
                     output_token_times=chunk_times,
+                    chunk_token_counts=await count_chunk_tokens_async(tokenizer, chunk_texts),
                     server_usage=server_usage,
                 ),
                 lora_adapter=lora_adapter,
@@ -1133,7 +1143,7 @@ class SessionAnthropicMessagesAPIData(SessionChatCompletionAPIData):
             output_text, output_message = parse_anthropic_content(data.get("content"))
             input_tokens = usage.get("input_tokens")
             output_tokens = usage.get("output_tokens")
-            output_len = int(output_tokens) if output_tokens is not None else tokenizer.count_tokens(output_text)
+            output_len = int(output_tokens) if output_tokens is not None else await count_tokens_async(tokenizer, output_text)
             base_info = InferenceInfo(
                 request_metrics=RequestMetrics(
                     text=Text(
@@ -1233,7 +1243,7 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         api_config: APIConfig,
         config: DataConfig,
         tokenizer: Optional[CustomTokenizer],
-        mp_manager: Optional[SyncManager] = None,
+        completion_channel: Optional[SessionCompletionChannel] = None,
         base_seed: Optional[int] = None,
         num_workers: int = 1,
         replay_config: Optional[SessionReplayConfig] = None,
@@ -1241,16 +1251,13 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         super().__init__(api_config, config, tokenizer)
         self.config = config
         self.replay_config = replay_config
-        self.mp_manager = mp_manager
         self.num_workers = max(1, num_workers)
         self.base_seed = base_seed if base_seed is not None else 42
 
         self.output_registry = EventOutputRegistry()
         self.worker_tracker = WorkerSessionTracker()
-        if mp_manager is not None:
-            self.session_completion_queue: Any = mp_manager.Queue()
-        else:
-            self.session_completion_queue = None
+        # None when running in-process; sessions are then tracked through local state only
+        self.session_completion_queue: Any = completion_channel
 
         self.sessions: List[Optional[ReplaySession]] = []
         self._session_ids: List[str] = []
@@ -1296,10 +1303,16 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         self.sessions = [None] * len(session_ids)
         self._session_ids = list(session_ids)
         self._session_id_to_index = {sid: i for i, sid in enumerate(session_ids)}
+        self._bind_completion_channel()
         self._session_events = {}
         self.all_events = []
         logger.info("Lazy init: %d session slots allocated", len(session_ids))
 
+    def _bind_completion_channel(self) -> None:
+        channel = getattr(self, "session_completion_queue", None)
+        if isinstance(channel, SessionCompletionChannel):
+            channel.bind_sessions(self._session_ids)
+
     def _build_session(self, session_index: int) -> Optional[ReplaySession]:
         """Build the ReplaySession for one slot. Implemented by lazy subclasses."""
         raise NotImplementedError("Lazy generators must implement _build_session()")
@@ -1426,6 +1439,7 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         self._session_events = {}
         self._session_ids = [s.session_id for s in self.sessions if s is not None]
         self._session_id_to_index = {sid: i for i, sid in enumerate(self._session_ids)}
+        self._bind_completion_channel()
         for session in self.sessions:
             if session is None:
                 continue
@@ -1596,44 +1610,64 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         state.ready_events.update(root_events)
         logger.debug("Activated session %s with %d root events", session_id, len(root_events))
 
-    def _process_completion_queue(self) -> None:
+    def _apply_completion(self, completion_data: Dict[str, Any]) -> Optional[str]:
+        """Fold a worker's completion notification into session state, returning the session ID if it is known."""
+        completed_session_id = completion_data["session_id"]
+
+        completed_state = self.session_graph_state.get(completed_session_id)
+        if completed_state is None:
+            return None
+        event_times = completion_data.get("event_completion_times", {})
+        for event_id, completion_time in event_times.items():
+            if event_id not in completed_state.completed_events:
+                completed_state.completed_events.add(event_id)
+                completed_state.event_completion_times[event_id] = completion_time
+
+        completed_state.is_complete = True
+        completed_state.failed = completion_data.get("failed", False)
+        completed_state.failure_reason = completion_data.get("failure_reason")
+        completed_state.cancelled_events = completion_data.get("cancelled_events", 0)
+        # Bad tool-call handling telemetry. The two keys are
+        # gated worker-side behind `len(...) > 0`, so their
+        # absence here is meaningful (no substitution path
+        # exercised) and we propagate that absence to the
+        # session metric as None.
+        if "n_recorded_substitutions" in completion_data:
+            completed_state.n_recorded_substitutions = completion_data["n_recorded_substitutions"]
+            completed_state.recorded_substitution_event_ids = completion_data.get("recorded_substitution_event_ids", [])
+        logger.debug(
+            "Session %s marked complete from queue notification (failed=%s)",
+            completed_session_id,
+            completed_state.failed,
+        )
+        return str(completed_session_id)
+
+    def _process_completion_queue(self) -> List[str]:
+        completed: List[str] = []
         if self.session_completion_queue is None:
-            return
+            return completed
 
         try:
             while True:
-                completion_data = self.session_completion_queue.get_nowait()
-                completed_session_id = completion_data["session_id"]
-
-                completed_state = self.session_graph_state.get(completed_session_id)
-                if completed_state is not None:
-                    event_times = completion_data.get("event_completion_times", {})
-                    for event_id, completion_time in event_times.items():
-                        if event_id not in completed_state.completed_events:
-                            completed_state.completed_events.add(event_id)
-                            completed_state.event_completion_times[event_id] = completion_time
-
-                    completed_state.is_complete = True
-                    completed_state.failed = completion_data.get("failed", False)
-                    completed_state.failure_reason = completion_data.get("failure_reason")
-                    completed_state.cancelled_events = completion_data.get("cancelled_events", 0)
-                    # Bad tool-call handling telemetry. The two keys are
-                    # gated worker-side behind `len(...) > 0`, so their
-                    # absence here is meaningful (no substitution path
-                    # exercised) and we propagate that absence to the
-                    # session metric as None.
-                    if "n_recorded_substitutions" in completion_data:
-                        completed_state.n_recorded_substitutions = completion_data["n_recorded_substitutions"]
-                        completed_state.recorded_substitution_event_ids = completion_data.get(
-                            "recorded_substitution_event_ids", []
-                        )
-                    logger.debug(
-                        "Session %s marked complete from queue notification (failed=%s)",
-                        completed_session_id,
-                        completed_state.failed,
-                    )
+                session_id = self._apply_completion(self.session_completion_queue.get_nowait())
+                if session_id is not None:
+                    completed.append(session_id)
         except Exception:
             pass
+        return completed
+
+    def wait_for_session_completions(self, timeout: float) -> List[str]:
+        if self.session_completion_queue is None:
+            time.sleep(timeout)
+            return []
+
+        try:
+            first = self.session_completion_queue.get(timeout=timeout)
+        except Empty:
+            return []
+        completed = self._process_completion_queue()
+        session_id = self._apply_completion(first)
+        return completed if session_id is None else [session_id, *completed]
 
     def get_session_state(self, session_id: str) -> Optional[ReplaySessionState]:
         return self.session_graph_state.get(session_id)
@@ -1649,13 +1683,11 @@ class ReplayGraphSessionGeneratorBase(SessionGenerator, LazyLoadDataMixin):
         if state.is_complete:
             return True
 
-        shared_failed = getattr(self, "shared_failed_sessions", None)
-        if shared_failed is not None:
-            is_failed = session_id in shared_failed
-            if is_failed:
-                state.is_complete = True
-                logger.info("Session %s marked as complete due to failure", session_id)
-                return True
+        channel = self.session_completion_queue
+        if isinstance(channel, SessionCompletionChannel) and channel.is_failed(session_id):
+            state.is_complete = True
+            logger.info("Session %s marked as complete due to failure", session_id)
+            return True
 
         return False
 
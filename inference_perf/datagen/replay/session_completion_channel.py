@@ -0,0 +1,158 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Worker → main process transport for session completion notifications.
+
+Workers report a session as finished with the same dict they always built
+(session_id, completion_time, failed, event_completion_times, and the optional
+failure_reason / cancelled_events / substitution keys). The channel packs it
+into a compact binary record, addresses the session by its index instead of its
+ID string, and ships it over a plain multiprocessing pipe. No manager server
+process sits in between. Failure flags are mirrored into a shared byte array
+indexed by session_index so the main process can check them without a round trip.
+
+The channel must be created, and bind_sessions() called, before workers start.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing as mp
+import struct
+from typing import Any, Dict, List, Optional
+
+# session_index (-1 = session_id sent inline), flags, cancelled_events, completion_time,
+# number of event completion times, number of recorded substitution event ids
+_HEADER = struct.Struct("<iBIdII")
+_STR_LEN = struct.Struct("<H")
+_TIME = struct.Struct("<d")
+
+_FAILED = 1
+_HAS_FAILURE_REASON = 2
+_HAS_CANCELLED_EVENTS = 4
+_HAS_SUBSTITUTIONS = 8
+
+
+def _pack_str(parts: List[bytes], value: str) -> None:
+    encoded = value.encode()
+    parts.append(_STR_LEN.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def _unpack_str(buf: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _STR_LEN.unpack_from(buf, offset)
+    offset += _STR_LEN.size
+    return buf[offset : offset + length].decode(), offset + length
+
+
+class SessionCompletionChannel:
+    """Multi-producer, single-consumer channel of session completion records."""
+
+    def __init__(self) -> None:
+        # mp.Queue is a pipe plus a feeder thread, so put_nowait never blocks a worker's event loop
+        self._queue: mp.Queue[bytes] = mp.Queue()
+        self._session_ids: List[str] = []
+        self._session_index: Dict[str, int] = {}
+        self._failed: Optional[ctypes.Array[ctypes.c_uint8]] = None
+
+    def bind_sessions(self, session_ids: List[str]) -> None:
+        """Record the session ID ↔ index mapping shared by every process and allocate the failure flags."""
+        self._session_ids = list(session_ids)
+        self._session_index = {sid: i for i, sid in enumerate(self._session_ids)}
+        # One byte per session rather than one bit, so concurrent writers never share a word
+        self._failed = mp.RawArray(ctypes.c_uint8, len(self._session_ids))
+
+    def is_failed(self, session_id: str) -> bool:
+        index = self._session_index.get(session_id)
+        return self._failed is not None and index is not None and bool(self._failed[index])
+
+    def pack(self, completion: Dict[str, Any]) -> bytes:
+        session_id = completion["session_id"]
+        session_index = self._session_index.get(session_id, -1)
+        flags = _FAILED if completion.get("failed", False) else 0
+        if completion.get("failure_reason") is not None:
+            flags |= _HAS_FAILURE_REASON
+        if "cancelled_events" in completion:
+            flags |= _HAS_CANCELLED_EVENTS
+        if "n_recorded_substitutions" in completion:
+            flags |= _HAS_SUBSTITUTIONS
+        event_times: Dict[str, float] = completion.get("event_completion_times", {})
+        substitution_ids: List[str] = completion.get("recorded_substitution_event_ids", [])
+
+        parts = [
+            _HEADER.pack(
+                session_index,
+                flags,
+                completion.get("cancelled_events", 0),
+                completion.get("completion_time", 0.0),
+                len(event_times),
+                len(substitution_ids) if flags & _HAS_SUBSTITUTIONS else 0,
+            )
+        ]
+        if session_index < 0:
+            _pack_str(parts, session_id)
+        if flags & _HAS_FAILURE_REASON:
+            _pack_str(parts, completion["failure_reason"])
+        for event_id, completion_time in event_times.items():
+            _pack_str(parts, event_id)
+            parts.append(_TIME.pack(completion_time))
+        if flags & _HAS_SUBSTITUTIONS:
+            for event_id in substitution_ids:
+                _pack_str(parts, event_id)
+        return b"".join(parts)
+
+    def unpack(self, buf: bytes) -> Dict[str, Any]:
+        session_index, flags, cancelled_events, completion_time, num_events, num_substitutions = _HEADER.unpack_from(buf)
+        offset = _HEADER.size
+        if session_index < 0:
+            session_id, offset = _unpack_str(buf, offset)
+        else:
+            session_id = self._session_ids[session_index]
+        completion: Dict[str, Any] = {
+            "session_id": session_id,
+            "completion_time": completion_time,
+            "failed": bool(flags & _FAILED),
+        }
+        if flags & _HAS_FAILURE_REASON:
+            completion["failure_reason"], offset = _unpack_str(buf, offset)
+        if flags & _HAS_CANCELLED_EVENTS:
+            completion["cancelled_events"] = cancelled_events
+        event_times: Dict[str, float] = {}
+        for _ in range(num_events):
+            event_id, offset = _unpack_str(buf, offset)
+            (event_times[event_id],) = _TIME.unpack_from(buf, offset)
+            offset += _TIME.size
+        completion["event_completion_times"] = event_times
+        if flags & _HAS_SUBSTITUTIONS:
+            substitution_ids = []
+            for _ in range(num_substitutions):
+                event_id, offset = _unpack_str(buf, offset)
+                substitution_ids.append(event_id)
+            completion["recorded_substitution_event_ids"] = substitution_ids
+            completion["n_recorded_substitutions"] = len(substitution_ids)
+        return completion
+
+    def put_nowait(self, completion: Dict[str, Any]) -> None:
+        if completion.get("failed", False):
+            index = self._session_index.get(completion["session_id"])
+            if self._failed is not None and index is not None:
+                self._failed[index] = 1
+        self._queue.put_nowait(self.pack(completion))
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Return the next completion record; raises queue.Empty if none arrives in time."""
+        return self.unpack(self._queue.get(block, timeout))
+
+    def get_nowait(self) -> Dict[str, Any]:
+        return self.get(False)
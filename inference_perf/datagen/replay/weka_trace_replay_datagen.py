@@ -62,7 +62,6 @@ import math
 from pathlib import Path
 import random
 from typing import Any, Dict, List, Literal, Optional, Tuple, Union, Annotated
-from multiprocessing.managers import SyncManager
 
 from huggingface_hub import hf_hub_download
 from pydantic import BaseModel, Field
@@ -77,6 +76,7 @@ from inference_perf.datagen.replay.otel_trace_to_replay_graph import (
     build_graph,
 )
 from inference_perf.datagen.replay.replay_graph_types import ReplayMessage
+from inference_perf.datagen.replay.session_completion_channel import SessionCompletionChannel
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
 logger = logging.getLogger(__name__)
@@ -594,7 +594,7 @@ class WekaTraceReplayDataGenerator(ReplayGraphSessionGeneratorBase):
         api_config: APIConfig,
         config: DataConfig,
         tokenizer: Optional[CustomTokenizer],
-        mp_manager: Optional[SyncManager] = None,
+        completion_channel: Optional[SessionCompletionChannel] = None,
         base_seed: Optional[int] = None,
         num_workers: int = 1,
     ) -> None:
@@ -608,13 +608,12 @@ class WekaTraceReplayDataGenerator(ReplayGraphSessionGeneratorBase):
             api_config,
             config,
             tokenizer,
-            mp_manager=mp_manager,
+            completion_channel=completion_channel,
             base_seed=base_seed,
             num_workers=num_workers,
             replay_config=self.weka_config,
         )
 
-        self.mp_manager = mp_manager
         self.num_workers = max(1, num_workers)
         self.base_seed = base_seed if base_seed is not None else 42
 
@@ -23,7 +23,13 @@ from inference_perf.utils.custom_tokenizer import CustomTokenizer
 from inference_perf.utils.numeric.distribution import generate_distribution
 from inference_perf.utils.trace_reader import AzurePublicDatasetReader
 from ..base import DataGenerator, LazyLoadDataMixin
-from ..datagen_utils import generate_random_exact_length_text, init_vocab_sampling, random_token_ids
+from ..datagen_utils import (
+    generate_random_exact_length_text,
+    init_vocab_sampling,
+    random_token_ids,
+    round_trip_stable_token_ids,
+)
+from ..prompt_cache import PromptCorpus, corpus_key, load_corpus, store_corpus
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +95,9 @@ class RandomDataGenerator(DataGenerator, LazyLoadDataMixin):
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for RandomDataGenerator")
 
-        self.vocab_size, self.special_token_ids, self.valid_token_ids = init_vocab_sampling(self.tokenizer)
+        cache_dir = self.config.prompt_cache_dir
+        self.vocab_size, self.special_token_ids, self.valid_token_ids = init_vocab_sampling(self.tokenizer, cache_dir)
+        self.stable_token_ids = round_trip_stable_token_ids(self.tokenizer, self.valid_token_ids, cache_dir)
 
         self.wrap_fn: Optional[Callable[[str], str]] = None
         if config.use_chat_template:
@@ -111,6 +119,39 @@ class RandomDataGenerator(DataGenerator, LazyLoadDataMixin):
                 )
             self.wrap_fn = self.tokenizer.apply_chat_template
 
+        # With a prompt cache, every prompt is generated (or loaded) here instead of per request in the workers
+        self.prompt_corpus: Optional[PromptCorpus] = None
+        if config.prompt_cache_dir is not None and seed is not None:
+            self.prompt_corpus = self._load_or_generate_prompts(config.prompt_cache_dir, seed)
+
+    def _load_or_generate_prompts(self, cache_dir: str, seed: int) -> PromptCorpus:
+        """The prompt of every request, read from the prompt cache or generated and cached on a miss."""
+        assert self.tokenizer is not None
+        input_lengths = self.input_lengths[: self.get_request_count()]
+        key = corpus_key(
+            self.tokenizer,
+            type(self).__name__,
+            self.config.model_dump(mode="json", exclude={"prompt_cache_dir"}),
+            seed,
+            input_lengths,
+        )
+        corpus = load_corpus(cache_dir, key)
+        if corpus is None:
+            logger.info(f"Generating {len(input_lengths)} prompts for the prompt cache")
+            prompts = [
+                generate_random_exact_length_text(
+                    self.rng,
+                    self.valid_token_ids,
+                    self.tokenizer,
+                    int(length),
+                    wrap_fn=self.wrap_fn,
+                    stable_token_ids=self.stable_token_ids,
+                )
+                for length in input_lengths
+            ]
+            corpus = store_corpus(cache_dir, key, [text for text, _ in prompts], [ids for _, ids in prompts])
+        return corpus
+
     def _generate_random_token_ids(self, length: int) -> List[int]:
         """Generates a list of random token IDs of a specified length."""
         return random_token_ids(self.rng, self.valid_token_ids, length)
@@ -120,7 +161,12 @@ class RandomDataGenerator(DataGenerator, LazyLoadDataMixin):
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for generating exact length prompts.")
         text, _ = generate_random_exact_length_text(
-            self.rng, self.valid_token_ids, self.tokenizer, target_len, wrap_fn=self.wrap_fn
+            self.rng,
+            self.valid_token_ids,
+            self.tokenizer,
+            target_len,
+            wrap_fn=self.wrap_fn,
+            stable_token_ids=self.stable_token_ids,
         )
         return text
 
@@ -143,8 +189,10 @@ class RandomDataGenerator(DataGenerator, LazyLoadDataMixin):
             raise ValueError("Tokenizer is required for RandomDataGenerator")
 
         if self.api_config.type == APIType.Completion:
-            length = self.input_lengths[n]
-            text = self._generate_exact_length_text(length)
+            if self.prompt_corpus is not None:
+                text = self.prompt_corpus[n]
+            else:
+                text = self._generate_exact_length_text(self.input_lengths[n])
             # Templated prompts already embed their special tokens; ask the server
             # not to prepend another BOS so its prefill count matches the target.
             add_special_tokens = False if self.wrap_fn is not None else None
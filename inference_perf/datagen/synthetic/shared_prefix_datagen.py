@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
-from typing import Dict, Generator, List, Optional, Tuple, Union
+from typing import Dict, Generator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -48,7 +48,9 @@ from ..datagen_utils import (
     generate_random_exact_length_text,
     init_vocab_sampling,
     random_token_ids,
+    round_trip_stable_token_ids,
 )
+from ..prompt_cache import PromptCorpus, corpus_key, load_corpus, store_corpus
 
 logger = logging.getLogger(__name__)
 
@@ -76,8 +78,10 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for SharedPrefixDataGenerator but was not initialized.")
 
-        self.vocab_size, self.special_token_ids, self.valid_token_ids = init_vocab_sampling(self.tokenizer)
-        self.word_start_token_ids = build_word_start_token_ids(self.tokenizer, self.valid_token_ids)
+        cache_dir = self.config.prompt_cache_dir
+        self.vocab_size, self.special_token_ids, self.valid_token_ids = init_vocab_sampling(self.tokenizer, cache_dir)
+        self.word_start_token_ids = build_word_start_token_ids(self.tokenizer, self.valid_token_ids, cache_dir)
+        self.stable_token_ids = round_trip_stable_token_ids(self.tokenizer, self.valid_token_ids, cache_dir)
 
         if self.shared_prefix is None:
             raise ValueError("Shared Prefix config is required for SharedPrefixDataGenerator")
@@ -117,8 +121,9 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
         # ``prompts[i]`` is the full prompt text (prefix + " " + question);
         # ``prefix_texts[i]`` is just the shared system prompt portion (empty
         # string when no prefix is configured).  ``prompt_groups[i]`` is the
-        # group_id used to look up per-group prefix multimodal specs.
-        self.prompts: List[str] = []
+        # group_id used to look up per-group prefix multimodal specs. With a
+        # prompt cache configured, ``prompts`` is the memory-mapped corpus.
+        self.prompts: Sequence[str] = []
         self.prefix_texts: List[str] = []
         self.prompt_groups: List[int] = []
 
@@ -208,6 +213,12 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
             return []
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for sampling suffix IDs.")
+        if self.stable_token_ids is not None:
+            # Round-trip-stable tokens are all word-start tokens already
+            _, ids = generate_random_exact_length_text(
+                self.rng, self.valid_token_ids, self.tokenizer, length, stable_token_ids=self.stable_token_ids
+            )
+            return ids
         initial = [int(self.rng.choice(self.word_start_token_ids))]
         if length > 1:
             initial += random_token_ids(self.rng, self.valid_token_ids, length - 1)
@@ -234,17 +245,74 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
         """Generates a string + its underlying token IDs, tokenizing to exactly target_len."""
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for generating exact length prompts.")
-        return generate_random_exact_length_text(self.rng, self.valid_token_ids, self.tokenizer, target_len)
+        return generate_random_exact_length_text(
+            self.rng, self.valid_token_ids, self.tokenizer, target_len, stable_token_ids=self.stable_token_ids
+        )
 
     def _generate_prompts(self) -> None:
-        """Pre-generates all per-group prefix texts/specs and per-prompt question texts."""
+        """Pre-generates all per-group prefix texts/specs and per-prompt question texts.
+
+        With ``data.prompt_cache_dir`` set and a seed configured, they are read
+        from the prompt cache instead, and generated and cached on a miss.
+        """
         if self.tokenizer is None:
             raise ValueError("Tokenizer is not available for generating prompts.")
 
         if self.shared_prefix is None:
             raise ValueError("Shared prefix is not available for generating prompts.")
 
+        cache_dir = self.config.prompt_cache_dir
+        if cache_dir is None or self.shared_prefix.seed is None:
+            self._build_prompts()
+            return
+
+        key = corpus_key(
+            self.tokenizer, type(self).__name__, self.config.model_dump(mode="json", exclude={"prompt_cache_dir"})
+        )
+        corpus = load_corpus(cache_dir, key)
+        if corpus is None:
+            prompt_ids, order = self._build_prompts()
+            group_prefix_texts = [""] * self.num_groups
+            for group_id, prefix_text in zip(self.prompt_groups, self.prefix_texts, strict=True):
+                group_prefix_texts[group_id] = prefix_text
+            meta = {
+                "order": order,
+                "group_prefix_texts": group_prefix_texts,
+                "prefix_specs": {
+                    str(group_id): spec.model_dump(mode="json") for group_id, spec in self.prefix_specs_by_group.items()
+                },
+                "rng_state": self.rng.bit_generator.state,
+            }
+            corpus = store_corpus(cache_dir, key, self.prompts, prompt_ids, meta)
+        self._load_prompts(corpus)
+
+    def _load_prompts(self, corpus: PromptCorpus) -> None:
+        """Restores the state _build_prompts leaves behind from a cached corpus."""
+        order: List[int] = corpus.meta["order"]
+        group_prefix_texts: List[str] = corpus.meta["group_prefix_texts"]
+        flat_output_lens = [length for group_lens in self.output_len_list_per_group for length in group_lens]
+
+        self.prompts = corpus
+        self.prompt_groups = [i // self.num_prompts_per_group for i in order]
+        self.prefix_texts = [group_prefix_texts[group_id] for group_id in self.prompt_groups]
+        self.flat_output_lens = [flat_output_lens[i] for i in order]
+        self.prefix_specs_by_group = {
+            int(group_id): MultimodalSpec.model_validate(spec) for group_id, spec in corpus.meta["prefix_specs"].items()
+        }
+        if self.enable_multi_turn_chat:
+            self.user_sessions = [
+                LocalUserSession(user_session_id=f"user_session_{i}", context=prefix_text)
+                for i, prefix_text in zip(order, self.prefix_texts, strict=True)
+            ]
+        # Payload-side specs keep drawing from where generation left the RNG
+        self.rng.bit_generator.state = corpus.meta["rng_state"]
+
+    def _build_prompts(self) -> Tuple[List[List[int]], List[int]]:
+        """Generates the prompts; returns each prompt's token ids and its index before the shuffle."""
+        assert self.tokenizer is not None
         hf_tokenizer = self.tokenizer.get_tokenizer()
+        prompts: List[str] = []
+        prompt_ids: List[List[int]] = []
 
         for group_id in range(self.num_groups):
             sys_prompt_len = self.system_prompt_lens_per_group[group_id]
@@ -262,10 +330,12 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
             for prompt_id in range(self.num_prompts_per_group):
                 q_len = self.question_len_list_per_group[group_id][prompt_id]
                 suffix_ids = self._sample_suffix_ids(q_len)
-                full_text = hf_tokenizer.decode(shared_prefix_ids + suffix_ids, skip_special_tokens=True)
+                full_ids = shared_prefix_ids + suffix_ids
+                full_text = hf_tokenizer.decode(full_ids, skip_special_tokens=True)
                 full_text_str = full_text if isinstance(full_text, str) else " ".join(full_text)
 
-                self.prompts.append(full_text_str)
+                prompts.append(full_text_str)
+                prompt_ids.append(full_ids)
                 self.prefix_texts.append(shared_prefix_text)
                 self.prompt_groups.append(group_id)
 
@@ -287,13 +357,14 @@ class SharedPrefixDataGenerator(DataGenerator, LazyLoadDataMixin):
 
         # Shuffle using seeded RNG for reproducibility. Group ids and prefix
         # texts shuffle alongside so per-prompt lookups remain consistent.
-        indices = self.rng.permutation(len(self.prompts))
-        self.prompts = [self.prompts[i] for i in indices]
+        indices = self.rng.permutation(len(prompts)).tolist()
+        self.prompts = [prompts[i] for i in indices]
         self.prefix_texts = [self.prefix_texts[i] for i in indices]
         self.prompt_groups = [self.prompt_groups[i] for i in indices]
         self.flat_output_lens = [self.flat_output_lens[i] for i in indices]
         if self.enable_multi_turn_chat:
             self.user_sessions = [self.user_sessions[i] for i in indices]
+        return [prompt_ids[i] for i in indices], indices
 
 
 def _sample_spec(cfg: SyntheticMultimodalDatagenConfig, rng: np.random.Generator) -> MultimodalSpec:
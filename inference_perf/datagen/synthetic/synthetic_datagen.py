@@ -15,7 +15,7 @@ import logging
 import os
 import time
 from pathlib import Path
-from typing import Generator, List, Optional
+from typing import Generator, List, Optional, Tuple
 
 import numpy as np
 
@@ -25,6 +25,7 @@ from inference_perf.utils.custom_tokenizer import CustomTokenizer
 from inference_perf.utils.numeric.distribution import generate_distribution
 from ..base import DataGenerator, LazyLoadDataMixin
 from ..datagen_utils import converge_to_exact_length_text
+from ..prompt_cache import PromptCorpus, corpus_key, load_corpus, store_corpus
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +93,30 @@ class SyntheticDataGenerator(DataGenerator, LazyLoadDataMixin):
         self._materialized_count: int = 0
         self._last_progress_log_time: Optional[float] = None
 
+        # With a prompt cache, every prompt is generated (or loaded) here instead of per request in the workers
+        self.prompt_corpus: Optional[PromptCorpus] = None
+        if config.prompt_cache_dir is not None and seed is not None:
+            self.prompt_corpus = self._load_or_generate_prompts(config.prompt_cache_dir, seed)
+
+    def _load_or_generate_prompts(self, cache_dir: str, seed: int) -> PromptCorpus:
+        """The prompt of every request, read from the prompt cache or generated and cached on a miss."""
+        assert self.tokenizer is not None
+        input_lengths = self.input_lengths[: min(len(self.input_lengths), len(self.output_lengths))]
+        key = corpus_key(
+            self.tokenizer,
+            type(self).__name__,
+            self.config.model_dump(mode="json", exclude={"prompt_cache_dir"}),
+            seed,
+            input_lengths,
+            np.asarray(self.token_ids, dtype=np.int64),
+        )
+        corpus = load_corpus(cache_dir, key)
+        if corpus is None:
+            logger.info(f"Generating {len(input_lengths)} prompts for the prompt cache")
+            prompts = [self._generate_exact_length_prompt(int(length)) for length in input_lengths]
+            corpus = store_corpus(cache_dir, key, [text for text, _ in prompts], [ids for _, ids in prompts])
+        return corpus
+
     def get_supported_apis(self) -> List[APIType]:
         return [APIType.Completion]
 
@@ -103,8 +128,12 @@ class SyntheticDataGenerator(DataGenerator, LazyLoadDataMixin):
 
     def _generate_exact_length_text(self, target_len: int) -> str:
         """Generates a string from self.token_ids that tokenizes to exactly target_len."""
+        return self._generate_exact_length_prompt(target_len)[0]
+
+    def _generate_exact_length_prompt(self, target_len: int) -> Tuple[str, List[int]]:
+        """Generates a string from self.token_ids that tokenizes to exactly target_len, and the ids it decodes from."""
         if target_len <= 0:
-            return ""
+            return "", []
 
         if self.tokenizer is None:
             raise ValueError("Tokenizer is required for generating exact length prompts.")
@@ -139,13 +168,12 @@ class SyntheticDataGenerator(DataGenerator, LazyLoadDataMixin):
                 return self.token_ids[adjusted_start : adjusted_start + slice_to_use]
             return self.token_ids[start_idx:end_idx]
 
-        text, _ = converge_to_exact_length_text(
+        return converge_to_exact_length_text(
             tokenizer=self.tokenizer,
             target_len=target_len,
             initial_tokens=initial_tokens,
             adjust_tokens_fn=adjust_tokens,
         )
-        return text
 
     def load_lazy_data(self, data: LazyLoadInferenceAPIData) -> InferenceAPIData:
         n = data.data_index
@@ -154,9 +182,11 @@ class SyntheticDataGenerator(DataGenerator, LazyLoadDataMixin):
             raise ValueError("Tokenizer is required for SyntheticDataGenerator")
 
         if self.api_config.type == APIType.Completion:
-            length = self.input_lengths[n]
-            prompt_text = self._generate_exact_length_text(length)
-            self._log_progress()
+            if self.prompt_corpus is not None:
+                prompt_text = self.prompt_corpus[n]
+            else:
+                prompt_text = self._generate_exact_length_text(self.input_lengths[n])
+                self._log_progress()
             return CompletionAPIData(
                 prompt=prompt_text,
                 max_tokens=self.output_lengths[n],
@@ -0,0 +1,63 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import ctypes
+import multiprocessing as mp
+from typing import Optional
+
+
+class VirtualUserPool:
+    """
+    Virtual users and data indices of a closed-loop stage, shared by all workers.
+
+    Each virtual user is one permit of a cross-process semaphore. A worker takes a permit, claims the
+    next data index, sends the request and returns the permit once the response (and any think time)
+    is done, so any worker with spare capacity can pick the user up next. Users are therefore balanced
+    across workers as they free up rather than split between them up front.
+
+    Must be created before the workers start; the main process calls start_stage() before handing out
+    the stage and reset() once every worker has left it.
+    """
+
+    def __init__(self) -> None:
+        self._users = mp.Semaphore(0)
+        self._next_index = mp.Value(ctypes.c_int64, 0)
+        self._num_requests = mp.RawValue(ctypes.c_int64, 0)
+
+    def start_stage(self, num_users: int, num_requests: int) -> None:
+        with self._next_index.get_lock():
+            self._next_index.value = 0
+        self._num_requests.value = num_requests
+        for _ in range(num_users):
+            self._users.release()
+
+    def reset(self) -> None:
+        """Take back the permits of users that are still idle so the next stage starts from zero."""
+        while self._users.acquire(block=False):
+            pass
+
+    def acquire_user(self, timeout: float) -> bool:
+        """Block until a virtual user is idle; returns False on timeout."""
+        return self._users.acquire(timeout=timeout)
+
+    def release_user(self) -> None:
+        self._users.release()
+
+    def claim_index(self) -> Optional[int]:
+        """Return the next data index of the stage, or None once every request has been claimed."""
+        with self._next_index.get_lock():
+            index = int(self._next_index.value)
+            if index >= self._num_requests.value:
+                return None
+            self._next_index.value = index + 1
+        return index
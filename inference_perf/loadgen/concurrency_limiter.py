@@ -0,0 +1,84 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from asyncio import Future, get_running_loop
+from collections import deque
+from typing import Deque
+
+
+class ConcurrencyLimiter:
+    """
+    A counting semaphore whose limit can change while permits are held.
+
+    Raising the limit wakes waiters immediately. Lowering it never revokes a permit: in-flight requests
+    finish normally and new acquisitions block until usage has dropped below the new limit. Waiters
+    are served in FIFO order. Drop-in for asyncio.Semaphore within a single event loop.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 0:
+            raise ValueError("ConcurrencyLimiter limit must be non-negative")
+        self._limit = limit
+        self._in_use = 0
+        self._waiters: Deque[Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def locked(self) -> bool:
+        """Return True if acquire() would block."""
+        return self._in_use >= self._limit or bool(self._waiters)
+
+    async def acquire(self) -> bool:
+        if not self.locked():
+            self._in_use += 1
+            return True
+        waiter: Future[None] = get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a permit just as we were cancelled: hand it on
+                self.release()
+            else:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+            raise
+        return True
+
+    def release(self) -> None:
+        if self._in_use <= 0:
+            raise ValueError("ConcurrencyLimiter released too many times")
+        self._in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        """Change the limit; permits already held are kept even if they exceed it."""
+        if limit < 0:
+            raise ValueError("ConcurrencyLimiter limit must be non-negative")
+        self._limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_use < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
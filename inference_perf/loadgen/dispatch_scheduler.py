@@ -0,0 +1,110 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import ctypes
+import multiprocessing as mp
+import time
+from abc import ABC, abstractmethod
+from asyncio import sleep
+from typing import List
+
+from inference_perf.config import DispatchPolicy, DispatchSchedulerConfig
+
+# Upper bucket edges in seconds; the last bucket collects everything slower
+SLIP_BUCKETS: List[float] = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0]
+
+
+class SlipHistogram:
+    """
+    Counts of how late requests were dispatched relative to their scheduled time.
+
+    Backed by shared memory and written by a single worker, so the main process can read it live
+    without locking. The slot after the buckets counts requests the scheduler dropped.
+    """
+
+    def __init__(self) -> None:
+        self._counts = mp.RawArray(ctypes.c_int64, len(SLIP_BUCKETS) + 2)
+
+    def record(self, slip: float) -> None:
+        bucket = 0
+        while bucket < len(SLIP_BUCKETS) and slip > SLIP_BUCKETS[bucket]:
+            bucket += 1
+        self._counts[bucket] += 1
+
+    def record_dropped(self) -> None:
+        self._counts[len(SLIP_BUCKETS) + 1] += 1
+
+    def snapshot(self) -> List[int]:
+        """Return the bucket counts followed by the dropped count."""
+        return list(self._counts)
+
+
+class DispatchScheduler(ABC):
+    """Decides when a worker sends each request and whether a late one is sent at all."""
+
+    policy: DispatchPolicy
+
+    def __init__(self, histogram: SlipHistogram) -> None:
+        self.histogram = histogram
+
+    async def wait_for_dispatch(self, request_time: float) -> bool:
+        """Sleep until request_time, record the slip, and return whether the request should be sent."""
+        sleep_time = request_time - time.perf_counter()
+        if sleep_time > 0:
+            await sleep(sleep_time)
+        slip = max(time.perf_counter() - request_time, 0.0)
+        self.histogram.record(slip)
+        if self.admit(slip):
+            return True
+        self.histogram.record_dropped()
+        return False
+
+    @abstractmethod
+    def admit(self, slip: float) -> bool:
+        raise NotImplementedError
+
+
+class StrictScheduler(DispatchScheduler):
+    """Open loop: late requests go out immediately."""
+
+    policy = DispatchPolicy.STRICT
+
+    def admit(self, slip: float) -> bool:
+        return True
+
+
+class DropIfLateScheduler(DispatchScheduler):
+    """Skips requests that are more than late_threshold seconds behind schedule."""
+
+    policy = DispatchPolicy.DROP_IF_LATE
+
+    def __init__(self, histogram: SlipHistogram, late_threshold: float) -> None:
+        super().__init__(histogram)
+        self.late_threshold = late_threshold
+
+    def admit(self, slip: float) -> bool:
+        return slip <= self.late_threshold
+
+
+class CoordinatedOmissionCorrectedScheduler(StrictScheduler):
+    """Sends like strict; the report additionally measures latency from each request's scheduled time."""
+
+    policy = DispatchPolicy.COORDINATED_OMISSION_CORRECTED
+
+
+def get_dispatch_scheduler(config: DispatchSchedulerConfig, histogram: SlipHistogram) -> DispatchScheduler:
+    if config.policy == DispatchPolicy.DROP_IF_LATE:
+        return DropIfLateScheduler(histogram, config.late_threshold)
+    if config.policy == DispatchPolicy.COORDINATED_OMISSION_CORRECTED:
+        return CoordinatedOmissionCorrectedScheduler(histogram)
+    return StrictScheduler(histogram)
@@ -12,22 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from pathlib import Path
-from inference_perf.client.server_metrics.base import StageRuntimeInfo, StageStatus
+from inference_perf.client.server_metrics.base import ScheduleSlipStats, StageDispatchStats, StageRuntimeInfo, StageStatus
 from inference_perf.datagen.base import BaseGenerator
 from inference_perf.utils.trace_reader import AzurePublicDatasetReader
-from inference_perf.utils.request_queue import RequestQueue
+from inference_perf.utils.request_queue import RequestChannel, RequestQueue, RingBufferRequestQueue, RingSlot, SlotCodec
+from inference_perf.utils.numeric.distribution import sample_from_distribution
 from .load_timer import LoadTimer, ConstantLoadTimer, PoissonLoadTimer, TraceReplayLoadTimer
+from .closed_loop import VirtualUserPool
+from .saturation_search import SaturationProbe, SaturationSearch
+from .concurrency_limiter import ConcurrencyLimiter
+from .dispatch_scheduler import SLIP_BUCKETS, DispatchScheduler, SlipHistogram, StrictScheduler, get_dispatch_scheduler
 from inference_perf.datagen import DataGenerator, SessionGenerator, LazyLoadDataMixin
-from inference_perf.apis import InferenceAPIData
+from inference_perf.apis import InferenceAPIData, LazyLoadInferenceAPIData
 from inference_perf.apis.user_session import LocalUserSession
 from inference_perf.client.modelserver import ModelServerClient
 from inference_perf.client.modelserver.otel_instrumentation import get_otel_instrumentation
 from inference_perf.circuit_breaker import get_circuit_breaker
-from inference_perf.metrics import SessionMetricsCollector
+from inference_perf.metrics import RequestMetricCollector, SessionMetricsCollector
+from inference_perf.metrics.request_collector.compact import flush_side_stores
 from inference_perf.config import (
+    DispatchPolicy,
+    Distribution,
     LoadConfig,
     LoadType,
+    RequestQueueBackend,
     StageGenType,
+    SweepSearch,
     TraceFormat,
     ConcurrentLoadStage,
     StandardLoadStage,
@@ -35,7 +45,7 @@ from inference_perf.config import (
 )
 from asyncio import (
     CancelledError,
-    Semaphore,
+    Task,
     create_task,
     gather,
     run,
@@ -55,6 +65,7 @@ else:
 
 from typing import List, Tuple, Optional, NamedTuple, Union, Set, Dict
 from types import FrameType
+import os
 import time
 import multiprocessing as mp
 from queue import Empty
@@ -88,12 +99,119 @@ class RequestQueueData(NamedTuple):
     lora_adapter: Optional[str]
 
 
+class WorkerStageSchedule(NamedTuple):
+    """A worker's share of a CONSTANT/POISSON stage, expanded into requests by the worker itself.
+
+    Sent once per worker per stage instead of one RequestQueueData per request. The worker
+    draws `end_index - start_index` arrival times at `rate` from a generator seeded with
+    (`seed`, `stage_id`) and lazy-loads data indices [start_index, end_index).
+    """
+
+    stage_id: int
+    load_type: LoadType
+    rate: float
+    duration: float
+    start_time: float
+    start_index: int
+    end_index: int
+    seed: int
+    lora_adapters: Optional[List[str]]
+    lora_weights: Optional[List[float]]
+
+
+class ClosedLoopStageSchedule(NamedTuple):
+    """Start of a closed-loop CONCURRENT stage, sent once to every worker.
+
+    Workers then take virtual users and data indices from the shared VirtualUserPool until the
+    stage's requests run out, sampling think times from a generator seeded with (`seed`, `stage_id`).
+    """
+
+    stage_id: int
+    think_time: Optional[Distribution]
+    seed: int
+    lora_adapters: Optional[List[str]]
+    lora_weights: Optional[List[float]]
+
+
+WorkItem = Union[RequestQueueData, WorkerStageSchedule, ClosedLoopStageSchedule]
+
+
+class RequestQueueDataCodec(SlotCodec[WorkItem]):
+    """Packs plain lazily loaded requests into ring slots; everything else is pickled.
+
+    LoRA adapters are sent as an index into `lora_adapters`, which both sides share.
+    """
+
+    def __init__(self, lora_adapters: Optional[List[str]] = None) -> None:
+        self.lora_adapters = lora_adapters or []
+        self._lora_ids = {name: i for i, name in enumerate(self.lora_adapters)}
+
+    def encode(self, item: WorkItem) -> Optional[RingSlot]:
+        if not isinstance(item, RequestQueueData):
+            return None
+        data = item.request_data
+        # Subclasses may carry extra payload, and per-request metadata can't be represented in a slot
+        if type(data) is not LazyLoadInferenceAPIData:
+            return None
+        if data.session_id is not None or data.otel_context is not None or data.headers or data.labels:
+            return None
+        lora_id = -1 if item.lora_adapter is None else self._lora_ids.get(item.lora_adapter)
+        if lora_id is None:
+            return None
+        return RingSlot(
+            stage_id=item.stage_id,
+            data_index=data.data_index,
+            scheduled_time=item.request_time,
+            lora_id=lora_id,
+            preferred_worker_id=data.preferred_worker_id,
+        )
+
+    def decode(self, slot: RingSlot) -> WorkItem:
+        request_data = LazyLoadInferenceAPIData(
+            data_index=slot.data_index, stage_id=slot.stage_id, preferred_worker_id=slot.preferred_worker_id
+        )
+        lora_adapter = self.lora_adapters[slot.lora_id] if slot.lora_id >= 0 else None
+        return RequestQueueData(slot.stage_id, request_data, slot.scheduled_time, lora_adapter)
+
+
+# Longest an adaptive sweep probe waits for the collector to receive its last metrics
+PROBE_METRICS_GRACE_PERIOD = 5.0
+
+# Longest the session dispatcher waits for completions before re-checking signals and timeouts
+SESSION_WAIT_INTERVAL = 0.5
+
+
+def _process_cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+def _cpu_utilization(cpu_start: float, start_time: float, end_time: float) -> Optional[float]:
+    """Fraction of one core used by this process between two wall-clock times, given its CPU time at the start."""
+    if end_time <= start_time:
+        return None
+    return (_process_cpu_seconds() - cpu_start) / (end_time - start_time)
+
+
+def _stage_rng(seed: int, stage_id: int) -> np.random.Generator:
+    """A worker's random stream for one stage; sweep probes run as negative stage ids, which seed entropy must not hold."""
+    return np.random.default_rng((seed, 0, stage_id) if stage_id >= 0 else (seed, 1, -stage_id))
+
+
+def _release_permits(semaphore: ConcurrencyLimiter, count: int) -> None:
+    for _ in range(count):
+        semaphore.release()
+
+
 class Worker(mp.Process):
+    # Upper bound on items taken from a batching queue (see RingBufferRequestQueue) in one read
+    max_batch_size = 64
+
     def __init__(
         self,
         id: int,
         client: ModelServerClient,
-        request_queue: "mp.JoinableQueue[RequestQueueData]",
+        request_queue: RequestChannel[WorkItem],
         datagen: BaseGenerator,
         max_concurrency: int,
         stop_signal: SyncEvent,
@@ -104,6 +222,8 @@ class Worker(mp.Process):
         shared_max_concurrency: Optional["Synchronized[int]"],
         base_seed: int,
         stage_barrier: Optional[SyncBarrier] = None,
+        scheduler: Optional[DispatchScheduler] = None,
+        user_pool: Optional[VirtualUserPool] = None,
     ):
         super().__init__(daemon=True)  # kill worker process if main process exit unexpected
         self.id = id
@@ -120,36 +240,205 @@ class Worker(mp.Process):
         self.skip = False
         self.base_seed = base_seed
         self.stage_barrier = stage_barrier
+        self.scheduler = scheduler if scheduler is not None else StrictScheduler(SlipHistogram())
+        self.user_pool = user_pool
         # Snapshot the parent's effective root log level so the worker
         # interpreter (which under forkserver/spawn does not inherit the
         # parent's basicConfig) can configure its own handler to surface
         # logs at the same level the user asked for.
         self._log_level = logging.getLogger().getEffectiveLevel()
 
+    async def schedule_client(
+        self,
+        request_data: InferenceAPIData,
+        request_time: float,
+        stage_id: int,
+        semaphore: ConcurrencyLimiter,
+        lora_adapter: Optional[str],
+        queued: bool = True,
+    ) -> None:
+        inflight = False
+        try:
+            if not await self.scheduler.wait_for_dispatch(request_time):
+                logger.debug(f"[Worker {self.id}] dropping request scheduled at {request_time:.3f}, past the late threshold")
+                return  # Exit this task, finally block will clean up
+
+            # Wait for dependencies before dispatching (OTel trace replay)
+            if hasattr(request_data, "wait_for_predecessors_and_substitute"):
+                await request_data.wait_for_predecessors_and_substitute()
+
+            # Check if request should be skipped (e.g., session failed in OTel replay)
+            if hasattr(request_data, "skip_request") and request_data.skip_request:
+                logger.debug(f"Skipping request - session failure detected: {getattr(request_data, 'event_id', 'unknown')}")
+                return  # Exit this task, finally block will clean up
+
+            with self.active_requests_counter.get_lock():
+                self.active_requests_counter.value += 1
+                inflight = True
+
+            await self.client.process_request(request_data, stage_id, request_time, lora_adapter)
+        except CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"[DEBUG] Exception in task: {type(e).__name__}: {e}", exc_info=True)
+            raise
+        finally:
+            with self.active_requests_counter.get_lock():
+                if inflight:
+                    self.active_requests_counter.value -= 1
+            with self.finished_requests_counter.get_lock():
+                self.finished_requests_counter.value += 1
+            # Requests expanded from a WorkerStageSchedule were never queued individually
+            if queued:
+                self.request_queue.task_done()
+            semaphore.release()
+
+    async def run_local_schedule(
+        self, schedule: WorkerStageSchedule, semaphore: ConcurrencyLimiter, tasks: List["Task[None]"]
+    ) -> None:
+        """Dispatch this worker's share of a stage from a locally generated arrival schedule."""
+        rng = _stage_rng(schedule.seed, schedule.stage_id)
+        # A child stream, so adapter picks are reproducible without shifting the arrival times
+        lora_rng = rng.spawn(1)[0]
+        timer: LoadTimer
+        if schedule.load_type == LoadType.POISSON:
+            timer = PoissonLoadTimer(schedule.rate, schedule.duration, rng)
+        else:
+            timer = ConstantLoadTimer(schedule.rate, schedule.duration, rng)
+        time_generator = timer.start_timer(schedule.start_time)
+        request_time = schedule.start_time
+        logger.debug(
+            f"[Worker {self.id}] running local schedule for stage {schedule.stage_id}: "
+            f"indices [{schedule.start_index}, {schedule.end_index}) at {schedule.rate:0.2f} QPS"
+        )
+
+        for data_index in range(schedule.start_index, schedule.end_index):
+            await semaphore.acquire()
+            if not self.request_phase.is_set() or self.cancel_signal.is_set():
+                semaphore.release()
+                break
+            # A constant timer can round its count down by one; reuse the last time rather than drop requests
+            request_time = next(time_generator, request_time)
+            lora_adapter = (
+                str(lora_rng.choice(schedule.lora_adapters, p=schedule.lora_weights))
+                if schedule.lora_adapters is not None
+                else None
+            )
+            try:
+                lazy_data = LazyLoadInferenceAPIData(data_index=data_index)
+                lazy_data.stage_id = schedule.stage_id
+                request_data = LazyLoadDataMixin.get_request(self.datagen, lazy_data)
+            except Exception as e:
+                logger.error(f"[Worker {self.id}] Failed to get request: {e}", exc_info=True)
+                with self.finished_requests_counter.get_lock():
+                    self.finished_requests_counter.value += 1
+                semaphore.release()
+                continue
+            tasks.append(
+                create_task(
+                    self.schedule_client(request_data, request_time, schedule.stage_id, semaphore, lora_adapter, queued=False)
+                )
+            )
+            await sleep(0)
+
+    async def run_closed_loop(
+        self, schedule: ClosedLoopStageSchedule, semaphore: ConcurrencyLimiter, tasks: List["Task[None]"]
+    ) -> None:
+        """Send requests on behalf of the stage's virtual users whenever one is idle and this worker has room."""
+        if self.user_pool is None:
+            raise RuntimeError("closed-loop stage scheduled on a worker without a virtual user pool")
+        user_pool = self.user_pool
+        rng = _stage_rng(schedule.seed, schedule.stage_id)
+        # A child stream, so adapter picks are reproducible without shifting the think times
+        lora_rng = rng.spawn(1)[0]
+        event_loop = get_event_loop()
+        acquire_user = partial(user_pool.acquire_user, 0.1)
+        logger.debug(f"[Worker {self.id}] running closed loop for stage {schedule.stage_id}")
+
+        while self.request_phase.is_set() and not self.cancel_signal.is_set():
+            await semaphore.acquire()
+            if not await event_loop.run_in_executor(None, acquire_user):
+                semaphore.release()
+                continue
+            data_index = user_pool.claim_index() if self.request_phase.is_set() else None
+            if data_index is None:
+                user_pool.release_user()
+                semaphore.release()
+                break
+            lora_adapter = (
+                str(lora_rng.choice(schedule.lora_adapters, p=schedule.lora_weights))
+                if schedule.lora_adapters is not None
+                else None
+            )
+            think_time = (
+                float(sample_from_distribution(schedule.think_time, 1, rng)[0]) / 1000
+                if schedule.think_time is not None
+                else 0.0
+            )
+            try:
+                lazy_data = LazyLoadInferenceAPIData(data_index=data_index)
+                lazy_data.stage_id = schedule.stage_id
+                request_data = LazyLoadDataMixin.get_request(self.datagen, lazy_data)
+            except Exception as e:
+                logger.error(f"[Worker {self.id}] Failed to get request: {e}", exc_info=True)
+                with self.finished_requests_counter.get_lock():
+                    self.finished_requests_counter.value += 1
+                user_pool.release_user()
+                semaphore.release()
+                continue
+            tasks.append(
+                create_task(
+                    self.run_virtual_user_request(
+                        request_data, schedule.stage_id, semaphore, lora_adapter, think_time, user_pool
+                    )
+                )
+            )
+            await sleep(0)
+
+    async def run_virtual_user_request(
+        self,
+        request_data: InferenceAPIData,
+        stage_id: int,
+        semaphore: ConcurrencyLimiter,
+        lora_adapter: Optional[str],
+        think_time: float,
+        user_pool: VirtualUserPool,
+    ) -> None:
+        """Send one request, then keep the virtual user busy for its think time before handing it back."""
+        try:
+            await self.schedule_client(request_data, time.perf_counter(), stage_id, semaphore, lora_adapter, queued=False)
+            if think_time > 0:
+                await sleep(think_time)
+        finally:
+            user_pool.release_user()
+
+    def _sync_concurrency_limit(self, semaphore: ConcurrencyLimiter) -> int:
+        """
+        Apply the shared max concurrency to the limiter and return it.
+
+        Growing takes effect immediately. Shrinking does not drain the worker: in-flight requests finish on
+        their own and new ones start once usage is below the new limit. A zero value leaves the limiter as is.
+        """
+        assert self.shared_max_concurrency is not None
+        new_concurrency = self.shared_max_concurrency.value
+        if new_concurrency > 0 and new_concurrency != semaphore.limit:
+            logger.debug(f"[Worker {self.id}] resizing concurrency limit from {semaphore.limit} to {new_concurrency}")
+            semaphore.resize(new_concurrency)
+        return new_concurrency
+
     async def loop(self) -> None:
         # The self.shared_max_concurrency is initialized to self.max_concurrency
-        semaphore = Semaphore(self.max_concurrency)
-        current_concurrency = self.max_concurrency
-        tasks = []
+        semaphore = ConcurrencyLimiter(self.max_concurrency)
+        tasks: List["Task[None]"] = []
         event_loop = get_event_loop()
-        item = None
         timeout = 0.5
+        get_batch = getattr(self.request_queue, "get_batch", None)
 
         while not self.stop_signal.is_set():
-            # Check if max_concurrency has been updated and recreate semaphore if needed (concurrent load type)
+            # Check if max_concurrency has been updated and resize the limiter if needed (concurrent load type)
             if self.shared_max_concurrency and not self.skip:
-                with self.shared_max_concurrency.get_lock():
-                    new_concurrency = self.shared_max_concurrency.value
-                if new_concurrency == 0:
+                if self._sync_concurrency_limit(semaphore) == 0:
                     self.skip = True
-                elif new_concurrency != current_concurrency:
-                    logger.debug(f"[Worker {self.id}] updating semaphore from {current_concurrency} to {new_concurrency}")
-                    # Wait for all current semaphore permits to be released
-                    for _ in range(current_concurrency):
-                        await semaphore.acquire()
-                    # Create new semaphore with updated limit
-                    semaphore = Semaphore(new_concurrency)
-                    current_concurrency = new_concurrency
 
             if not self.skip:
                 logger.debug(f"Worker {self.id} is currently working")
@@ -158,91 +447,71 @@ class Worker(mp.Process):
 
             # Process requests in loop
             while self.request_phase.is_set() and not self.cancel_signal.is_set() and not self.skip:
+                if self.shared_max_concurrency:
+                    # Pick up resizes mid-stage; a zero limit only takes effect at the next stage boundary
+                    self._sync_concurrency_limit(semaphore)
                 await semaphore.acquire()
+                permits = 1
+                if get_batch is not None:
+                    # Take one item per free concurrency slot so a batch never waits behind the semaphore
+                    while permits < self.max_batch_size and not semaphore.locked():
+                        await semaphore.acquire()
+                        permits += 1
                 try:
                     # Use partial to pass named arg
-                    get = partial(self.request_queue.get, timeout=timeout)
-                    item = await event_loop.run_in_executor(None, get)
-                    if item is None:
-                        self.request_queue.task_done()
-                        semaphore.release()
-                        continue
+                    if get_batch is not None:
+                        items = await event_loop.run_in_executor(None, partial(get_batch, permits, timeout=timeout))
+                    else:
+                        get = partial(self.request_queue.get, timeout=timeout)
+                        items = [await event_loop.run_in_executor(None, get)]
                 except TimeoutError:
                     logger.debug(f"[Worker {self.id}] timed out getting request from queue")
-                    semaphore.release()
+                    _release_permits(semaphore, permits)
                     continue
                 except Empty:
-                    semaphore.release()
+                    _release_permits(semaphore, permits)
                     continue
                 except Exception as e:
                     logger.info(f"[Worker {self.id}] hit exception {e}")
-                    semaphore.release()
+                    _release_permits(semaphore, permits)
                     continue
+                _release_permits(semaphore, permits - len(items))
 
-                async def schedule_client(
-                    queue: "mp.JoinableQueue[RequestQueueData]",
-                    request_data: InferenceAPIData,
-                    request_time: float,
-                    stage_id: int,
-                    semaphore: Semaphore,
-                    lora_adapter: Optional[str],
-                ) -> None:
-                    inflight = False
-                    try:
-                        current_time = time.perf_counter()
-                        sleep_time = request_time - current_time
-                        if sleep_time > 0:
-                            await sleep(sleep_time)
-
-                        # Wait for dependencies before dispatching (OTel trace replay)
-                        if hasattr(request_data, "wait_for_predecessors_and_substitute"):
-                            await request_data.wait_for_predecessors_and_substitute()
-
-                        # Check if request should be skipped (e.g., session failed in OTel replay)
-                        if hasattr(request_data, "skip_request") and request_data.skip_request:
-                            logger.debug(
-                                f"Skipping request - session failure detected: {getattr(request_data, 'event_id', 'unknown')}"
-                            )
-                            return  # Exit this task, finally block will clean up
+                for item in items:
+                    if item is None:
+                        self.request_queue.task_done()
+                        semaphore.release()
+                        continue
+
+                    if isinstance(item, WorkerStageSchedule):
+                        semaphore.release()
+                        self.request_queue.task_done()
+                        await self.run_local_schedule(item, semaphore, tasks)
+                        continue
 
-                        with self.active_requests_counter.get_lock():
-                            self.active_requests_counter.value += 1
-                            inflight = True
+                    if isinstance(item, ClosedLoopStageSchedule):
+                        semaphore.release()
+                        self.request_queue.task_done()
+                        await self.run_closed_loop(item, semaphore, tasks)
+                        continue
 
-                        await self.client.process_request(request_data, stage_id, request_time, lora_adapter)
-                    except CancelledError:
-                        pass
+                    try:
+                        stage_id, request, request_time, lora_adapter = item
+                        request_data = LazyLoadDataMixin.get_request(self.datagen, request)
                     except Exception as e:
-                        logger.error(f"[DEBUG] Exception in task: {type(e).__name__}: {e}", exc_info=True)
-                        raise
-                    finally:
-                        with self.active_requests_counter.get_lock():
-                            if inflight:
-                                self.active_requests_counter.value -= 1
+                        logger.error(f"[Worker {self.id}] Failed to get request: {e}", exc_info=True)
                         with self.finished_requests_counter.get_lock():
                             self.finished_requests_counter.value += 1
-                        queue.task_done()
+                        self.request_queue.task_done()
                         semaphore.release()
+                        continue
 
-                try:
-                    stage_id, request, request_time, lora_adapter = item
-                    request_data = LazyLoadDataMixin.get_request(self.datagen, request)
-                except Exception as e:
-                    logger.error(f"[Worker {self.id}] Failed to get request: {e}", exc_info=True)
-                    with self.finished_requests_counter.get_lock():
-                        self.finished_requests_counter.value += 1
-                    self.request_queue.task_done()
-                    semaphore.release()
-                    continue
-
-                task = create_task(
-                    schedule_client(self.request_queue, request_data, request_time, stage_id, semaphore, lora_adapter)
-                )
-                logging.debug(
-                    f"creating inference task with request data {request_data}", extra={"request_data": request_data}
-                )
-                tasks.append(task)
-                await sleep(0)
+                    task = create_task(self.schedule_client(request_data, request_time, stage_id, semaphore, lora_adapter))
+                    logging.debug(
+                        f"creating inference task with request data {request_data}", extra={"request_data": request_data}
+                    )
+                    tasks.append(task)
+                    await sleep(0)
 
             # Reset skip
             self.skip = False
@@ -258,6 +527,8 @@ class Worker(mp.Process):
                 await gather(*tasks)
                 tasks = []
                 LocalUserSession.clear_instances()
+                # The stage's request bodies are on disk before the parent moves on, and eventually reads them
+                flush_side_stores()
                 if self.stage_barrier:
                     self.stage_barrier.wait()
                 logger.debug(f"[Worker {self.id}] waiting for next phase")
@@ -296,6 +567,7 @@ class LoadGenerator:
         datagen: BaseGenerator,
         load_config: LoadConfig,
         session_metrics_collector: Optional[SessionMetricsCollector] = None,
+        request_metrics_collector: Optional[RequestMetricCollector] = None,
     ) -> None:
         self.datagen = datagen
         self.stageInterval = load_config.interval
@@ -304,11 +576,20 @@ class LoadGenerator:
         self.stage_runtime_info = dict[int, StageRuntimeInfo]()
         self.num_workers = load_config.num_workers
         self.worker_max_concurrency = load_config.worker_max_concurrency
+        self.dispatch_lookahead = load_config.dispatch_lookahead
+        self.request_queue_backend = load_config.request_queue_backend
+        self.scheduler_config = load_config.scheduler
+        if self.load_type == LoadType.TRACE_SESSION_REPLAY and self.scheduler_config.policy == DispatchPolicy.DROP_IF_LATE:
+            # Dropping an event would leave every event that depends on it waiting forever
+            logger.warning("Dispatch policy drop_if_late is not supported for trace session replay, using strict instead")
+            self.scheduler_config = self.scheduler_config.model_copy(update={"policy": DispatchPolicy.STRICT})
+        self.slip_histograms: List[SlipHistogram] = []
         self.workers: List[Worker] = []
         self.circuit_breakers = [get_circuit_breaker(breaker_name) for breaker_name in load_config.circuit_breakers]
         self.sweep_config = load_config.sweep
         self.interrupt_sig = False
         self.session_metrics_collector = session_metrics_collector
+        self.request_metrics_collector = request_metrics_collector
         signal.signal(signal.SIGINT, self._sigint_handler)
 
         # Validate that datagen type matches load_type
@@ -344,16 +625,59 @@ class LoadGenerator:
         self.base_seed: int = load_config.base_seed
         self._session_cursor: int = 0
 
+        # Workers can only build their own schedule when requests are fully described by a
+        # data index: lazily loaded, timer-driven, and not pinned to a particular worker.
+        self.worker_side_schedule = (
+            load_config.worker_side_schedule
+            and self.num_workers > 0
+            and self.load_type in (LoadType.CONSTANT, LoadType.POISSON)
+            and isinstance(datagen, LazyLoadDataMixin)
+            and datagen.is_lazy_load_supported()
+            and isinstance(datagen, DataGenerator)
+            and datagen.trace is None
+            and not datagen.is_preferred_worker_requested()
+        )
+        if load_config.worker_side_schedule and not self.worker_side_schedule:
+            logger.warning(
+                "worker_side_schedule requires a 'constant' or 'poisson' load, num_workers > 0 and a lazily loaded"
+                " data generator without trace or worker affinity; falling back to parent-side scheduling"
+            )
+        self.closed_loop = (
+            load_config.closed_loop
+            and self.num_workers > 0
+            and self.load_type == LoadType.CONCURRENT
+            and isinstance(datagen, LazyLoadDataMixin)
+            and datagen.is_lazy_load_supported()
+            and isinstance(datagen, DataGenerator)
+            and datagen.trace is None
+            and not datagen.is_preferred_worker_requested()
+        )
+        if load_config.closed_loop and not self.closed_loop:
+            logger.warning(
+                "closed_loop requires a 'concurrent' load, num_workers > 0 and a lazily loaded data generator"
+                " without trace or worker affinity; falling back to queueing every request of the stage"
+            )
+        self.user_pool: Optional[VirtualUserPool] = None
+
     def _sigint_handler(self, _signum: int, _frame: Optional[FrameType]) -> None:
         """SIGINT handler that sets interrup_sig flag to True"""
         self.interrupt_sig = True
 
     def _set_worker_concurrency(self, concurrency_level: int) -> None:
-        """Determines the per worker concurrency, handling cases where concurrency_level % num_workers != 0."""
-        # Calculate new concurrency for worker (concurrency_level will always be > 0)
-        new_concurrency = concurrency_level // self.num_workers
-        # Calculate index cutoff for workers with +1 concurrency
-        remainder = concurrency_level % self.num_workers
+        """
+        Determines the per worker concurrency, handling cases where concurrency_level % num_workers != 0.
+
+        Workers resize their limiter in place without draining, so this can also be called while a stage runs.
+        In closed-loop mode the shared VirtualUserPool enforces the total, so every worker may take up to
+        concurrency_level requests and users go to whichever worker has room.
+        """
+        if self.closed_loop:
+            new_concurrency, remainder = concurrency_level, 0
+        else:
+            # Calculate new concurrency for worker (concurrency_level will always be > 0)
+            new_concurrency = concurrency_level // self.num_workers
+            # Calculate index cutoff for workers with +1 concurrency
+            remainder = concurrency_level % self.num_workers
         for worker in self.workers:
             worker_concurrency = new_concurrency + 1 if worker.id < remainder else new_concurrency
             # Update the shared concurrency value to signal the worker to update its semaphore (needs to be synchronized with main process)
@@ -377,7 +701,28 @@ class LoadGenerator:
         # For concurrent and constant load types (rate is adjusted in main.py for concurrent load type)
         return ConstantLoadTimer(rate=rate, duration=duration)
 
-    async def drain(self, queue: "mp.JoinableQueue[RequestQueueData]") -> None:
+    def get_slip_histograms(self) -> List[List[int]]:
+        """Live per-worker schedule slip counts: one list per worker, bucket counts followed by the dropped count."""
+        return [histogram.snapshot() for histogram in self.slip_histograms]
+
+    def _schedule_slip_stats(self, start_snapshots: List[List[int]]) -> Optional[ScheduleSlipStats]:
+        """Difference between the current per-worker slip histograms and the snapshots taken at stage start."""
+        if not self.slip_histograms:
+            return None
+        per_worker = [
+            [now - before for now, before in zip(current, start, strict=True)]
+            for current, start in zip(self.get_slip_histograms(), start_snapshots, strict=True)
+        ]
+        totals = [sum(column) for column in zip(*per_worker, strict=True)]
+        return ScheduleSlipStats(
+            policy=self.scheduler_config.policy.value,
+            bucket_upper_bounds=SLIP_BUCKETS,
+            counts=totals[:-1],
+            dropped=totals[-1],
+            per_worker_counts=[counts[:-1] for counts in per_worker],
+        )
+
+    async def drain(self, queue: RequestChannel[WorkItem]) -> None:
         while True:
             try:
                 _ = queue.get_nowait()
@@ -392,7 +737,7 @@ class LoadGenerator:
         self,
         stage_id: int,
         stage: TraceSessionReplayLoadStage,
-        request_queue: RequestQueue[RequestQueueData],
+        request_queue: RequestQueue[WorkItem],
         active_requests_counter: "Synchronized[int]",
         finished_requests_counter: "Synchronized[int]",
         request_phase: SyncEvent,
@@ -419,6 +764,8 @@ class LoadGenerator:
             finished_requests_counter.value = 0
 
         start_time_epoch = time.time()
+        cpu_start = _process_cpu_seconds()
+        slip_start = self.get_slip_histograms()
         start_time = time.perf_counter()
 
         # Get total number of sessions
@@ -460,6 +807,7 @@ class LoadGenerator:
             range(stage_start_cursor, stage_start_cursor + effective_num_sessions)
         )  # Sessions waiting to start
         completed_session_ids: Set[str] = set()  # Session IDs that have completed
+        active_session_ids: Dict[str, int] = {}  # session_id → session index, for sessions awaiting completion
         session_dispatch_times: Dict[str, float] = {}  # session_id → wall-clock dispatch time
 
         # Cache OTEL instrumentation to avoid redundant calls
@@ -505,7 +853,7 @@ class LoadGenerator:
 
             return True
 
-        def dispatch_session(session_idx: int) -> int:
+        async def dispatch_session(session_idx: int) -> int:
             """Dispatch all events for a session. Returns number of events dispatched."""
             nonlocal sessions_dispatched, last_dispatch_time, next_dispatch_time
 
@@ -546,8 +894,9 @@ class LoadGenerator:
             # Get all events for this session
             events = self.datagen.get_session_events(session_idx)
 
-            # Dispatch all events
+            # Dispatch all events, one batch per worker channel
             dispatched_count = 0
+            batches: Dict[int, List[WorkItem]] = {}
             for lazy_data in events:
                 lora_adapter = self._get_lora_adapter()
                 worker_id = lazy_data.preferred_worker_id
@@ -561,11 +910,15 @@ class LoadGenerator:
 
                 event_time = time.perf_counter()
                 queue_data = RequestQueueData(stage_id, lazy_data, event_time, lora_adapter)
-                request_queue.put(queue_data, worker_id)
+                batches.setdefault(worker_id, []).append(queue_data)
                 dispatched_count += 1
+            # A full ring channel is waited on without blocking the loop, which also tracks session completions
+            for worker_id, items in batches.items():
+                await request_queue.put_batch_async(items, worker_id)
 
             # Update session pool
             active_session_indices.add(session_idx)
+            active_session_ids[session_id] = session_idx
             sessions_dispatched += 1
 
             # Update timing for rate limiting
@@ -583,6 +936,8 @@ class LoadGenerator:
         if progress_ctx:
             stage_task = progress_ctx.add_task(description=f"Stage {stage_id} Sessions", total=effective_num_sessions)
 
+        event_loop = get_event_loop()
+        reported_session_ids: List[str] = []
         while True:
             # Check for interrupts
             if self.interrupt_sig:
@@ -621,39 +976,34 @@ class LoadGenerator:
                     del session_spans[sid]
                 break
 
-            # Check for completed sessions
-            newly_completed = []
-            for session_idx in list(active_session_indices):
-                session_info = self.datagen.get_session_info(session_idx)
-                session_id = session_info["session_id"]
-
-                # Check if this session completed
-                if self.datagen.check_session_completed(session_id):
-                    if session_id not in completed_session_ids:
-                        completed_session_ids.add(session_id)
-                        newly_completed.append(session_idx)
-
-                        # End OTEL session span (using cached otel_instr)
-                        if session_id in session_spans:
-                            # Check if session failed from SessionGenerator state
-                            session_state = self.datagen.get_session_state(session_id)
-                            session_failed = session_state.failed if session_state else False
-                            error_msg = "Session failed" if session_failed else None
-                            otel_instr.end_session_span(session_spans[session_id], error_msg)
-                            del session_spans[session_id]
-
-                        logger.debug(
-                            f"Session {session_idx} ({session_id}) completed "
-                            f"({len(completed_session_ids)}/{effective_num_sessions} total)"
-                        )
+            # Only sessions reported by workers since the last wakeup are visited
+            newly_completed: List[Tuple[int, str]] = []
+            for session_id in reported_session_ids:
+                session_idx = active_session_ids.pop(session_id, -1)
+                if session_idx < 0 or session_id in completed_session_ids:
+                    continue
+                completed_session_ids.add(session_id)
+                newly_completed.append((session_idx, session_id))
+
+                # End OTEL session span (using cached otel_instr)
+                if session_id in session_spans:
+                    # Check if session failed from SessionGenerator state
+                    session_state = self.datagen.get_session_state(session_id)
+                    session_failed = session_state.failed if session_state else False
+                    error_msg = "Session failed" if session_failed else None
+                    otel_instr.end_session_span(session_spans[session_id], error_msg)
+                    del session_spans[session_id]
+
+                logger.debug(
+                    f"Session {session_idx} ({session_id}) completed "
+                    f"({len(completed_session_ids)}/{effective_num_sessions} total)"
+                )
 
             # Remove completed sessions from active pool and clean up memory
-            for session_idx in newly_completed:
+            for session_idx, session_id in newly_completed:
                 active_session_indices.discard(session_idx)
 
                 # Build and record session-level metric before cleanup
-                session_info = self.datagen.get_session_info(session_idx)
-                session_id = session_info["session_id"]
                 session_metric = self.datagen.build_session_metric(
                     session_id=session_id,
                     stage_id=stage_id,
@@ -671,7 +1021,7 @@ class LoadGenerator:
             # Try to start new sessions to fill the pool
             while should_start_next_session():
                 session_idx = pending_session_indices.pop(0)
-                dispatch_session(session_idx)
+                await dispatch_session(session_idx)
 
             # Check if we're done
             if len(completed_session_ids) >= effective_num_sessions:
@@ -686,8 +1036,17 @@ class LoadGenerator:
                 logger.info("No more sessions to dispatch or wait for")
                 break
 
-            # Sleep and update progress
-            await sleep(0)
+            # Block until a worker reports a completion, waking early for the next rate-limited
+            # dispatch or the stage timeout, and at least every SESSION_WAIT_INTERVAL to check signals.
+            now = time.perf_counter()
+            wait = SESSION_WAIT_INTERVAL
+            if timeout is not None:
+                wait = min(wait, start_time + timeout - now)
+            if session_rate is not None and pending_session_indices:
+                wait = min(wait, next_dispatch_time - now)
+            reported_session_ids = await event_loop.run_in_executor(
+                None, self.datagen.wait_for_session_completions, max(wait, 0.0)
+            )
 
             # Update progress
             if progress_ctx and stage_task:
@@ -722,14 +1081,17 @@ class LoadGenerator:
             otel_instr.end_stage_span(stage_span, error_msg)
             logger.info(f"Ended stage-level OTEL span for stage {stage_id}")
 
+        end_time_epoch = time.time()
         self.stage_runtime_info[stage_id] = StageRuntimeInfo(
             stage_id=stage_id,
             rate=session_rate if session_rate else 0.0,
             start_time=start_time_epoch,
-            end_time=time.time(),
+            end_time=end_time_epoch,
             status=stage_status,
             concurrency_level=concurrent_sessions,
             timeout=timeout,
+            parent_cpu_utilization=_cpu_utilization(cpu_start, start_time_epoch, end_time_epoch),
+            schedule_slip=self._schedule_slip_stats(slip_start),
         )
         logger.info(
             "Stage %d - session-based run %s", stage_id, "completed" if stage_status == StageStatus.COMPLETED else "failed"
@@ -740,7 +1102,7 @@ class LoadGenerator:
         stage_id: int,
         rate: float,
         duration: int,
-        request_queue: RequestQueue[RequestQueueData],
+        request_queue: RequestQueue[WorkItem],
         active_requests_counter: "Synchronized[int]",
         finished_requests_counter: "Synchronized[int]",
         request_phase: SyncEvent,
@@ -749,7 +1111,14 @@ class LoadGenerator:
         concurrency_level: Optional[int] = None,
         progress_ctx: Optional[Progress] = None,
         stage_barrier: Optional[SyncBarrier] = None,
+        closed_loop_stage: Optional[ConcurrentLoadStage] = None,
     ) -> None:
+        """
+        Run a rate-based or CONCURRENT stage.
+
+        With closed_loop_stage, rate and duration are ignored: the stage's virtual users send its
+        num_requests requests back to back through the shared VirtualUserPool.
+        """
         logger.info("Stage %d - run started", stage_id)
 
         if timeout is not None and cancel_signal is None:
@@ -760,12 +1129,16 @@ class LoadGenerator:
             finished_requests_counter.value = 0
         timer = self.get_timer(rate, duration)
 
-        # Allow generation a second to begin populating the queue so the workers
-        # don't miss the initial scheuled request times
+        # Give the producer a second to fill the first lookahead window so the
+        # workers don't miss the initial scheduled request times
         start_time_epoch = time.time()
+        cpu_start = _process_cpu_seconds()
+        slip_start = self.get_slip_histograms()
         start_time = time.perf_counter() + 1
 
-        if isinstance(self.datagen, DataGenerator) and self.datagen.trace is not None:
+        if closed_loop_stage is not None:
+            num_requests = closed_loop_stage.num_requests
+        elif isinstance(self.datagen, DataGenerator) and self.datagen.trace is not None:
             num_requests = self.datagen.get_request_count()
         else:
             num_requests = int(rate * duration)
@@ -782,17 +1155,95 @@ class LoadGenerator:
             # If concurrency_level is set, some worker may get 0 concurrency, then we should re-evaluate workers we can assign reqeusts to.
             active_workers = min(self.num_workers, concurrency_level)
 
-        for _ in range(num_requests):
-            request_data = next(data_generator)
-            request_data.stage_id = stage_id
-            lora_adapter = self._get_lora_adapter()
-            worker_id = request_data.preferred_worker_id
-            if worker_id >= 0:
-                worker_id = worker_id % active_workers
-            request_queue.put(
-                RequestQueueData(stage_id, request_data, next(time_generator), lora_adapter),
-                worker_id,
-            )
+        dispatch_stats = StageDispatchStats(lookahead=self.dispatch_lookahead)
+        queue_depth_samples: List[int] = []
+
+        async def produce() -> None:
+            """Keep only the next `dispatch_lookahead` seconds of arrivals in the queues.
+
+            The clock is read once per refill rather than once per request; requests that
+            fall inside the current window are enqueued as one batch per channel.
+            """
+            horizon = float("-inf")
+            now = float("-inf")
+            pending: Dict[int, List[WorkItem]] = {}
+
+            async def flush() -> None:
+                # A full ring channel is waited on without blocking the loop, which also runs the stage and collector
+                for channel_id, items in pending.items():
+                    await request_queue.put_batch_async(items, channel_id)
+                pending.clear()
+
+            for _ in range(num_requests):
+                request_time = next(time_generator)
+                if request_time > horizon:
+                    await flush()
+                    queue_depth = dispatch_stats.enqueued - finished_requests_counter.value
+                    queue_depth_samples.append(queue_depth)
+                    dispatch_stats.max_queue_depth = max(dispatch_stats.max_queue_depth, queue_depth)
+                    now = time.perf_counter()
+                    if request_time - self.dispatch_lookahead > now:
+                        await sleep(request_time - self.dispatch_lookahead - now)
+                        now = time.perf_counter()
+                    else:
+                        # Behind schedule: yield so the stage loop can still observe timeouts and signals
+                        await sleep(0)
+                    horizon = now + self.dispatch_lookahead
+
+                request_data = next(data_generator)
+                request_data.stage_id = stage_id
+                lora_adapter = self._get_lora_adapter()
+                worker_id = request_data.preferred_worker_id
+                if worker_id >= 0:
+                    worker_id = worker_id % active_workers
+                pending.setdefault(worker_id, []).append(RequestQueueData(stage_id, request_data, request_time, lora_adapter))
+                dispatch_stats.enqueued += 1
+                if now > request_time:
+                    dispatch_stats.late_enqueues += 1
+                    dispatch_stats.max_producer_lag = max(dispatch_stats.max_producer_lag, now - request_time)
+            await flush()
+
+        async def assign_worker_schedules() -> None:
+            """Send each worker its contiguous share of the stage's data indices."""
+            share, remainder = divmod(num_requests, self.num_workers)
+            start_index = 0
+            for worker_id in range(self.num_workers):
+                count = share + 1 if worker_id < remainder else share
+                schedule = WorkerStageSchedule(
+                    stage_id=stage_id,
+                    load_type=self.load_type,
+                    rate=count / duration,
+                    duration=duration,
+                    start_time=start_time,
+                    start_index=start_index,
+                    end_index=start_index + count,
+                    seed=(self.base_seed + worker_id) % 2**32,
+                    lora_adapters=self.lora_adapters,
+                    lora_weights=self.lora_weights,
+                )
+                request_queue.put(schedule, worker_id)
+                start_index += count
+
+        async def start_virtual_users() -> None:
+            """Fill the shared pool with the stage's users and requests, then tell every worker to start."""
+            assert closed_loop_stage is not None and self.user_pool is not None
+            self.user_pool.start_stage(closed_loop_stage.concurrency_level, num_requests)
+            for worker_id in range(self.num_workers):
+                schedule = ClosedLoopStageSchedule(
+                    stage_id=stage_id,
+                    think_time=closed_loop_stage.think_time,
+                    seed=(self.base_seed + worker_id) % 2**32,
+                    lora_adapters=self.lora_adapters,
+                    lora_weights=self.lora_weights,
+                )
+                request_queue.put(schedule, worker_id)
+
+        if closed_loop_stage is not None:
+            producer = create_task(start_virtual_users())
+        elif self.worker_side_schedule:
+            producer = create_task(assign_worker_schedules())
+        else:
+            producer = create_task(produce())
 
         # Wait until all requests are finished processing
         stage_task = None
@@ -801,6 +1252,8 @@ class LoadGenerator:
 
         timed_out = False
         while finished_requests_counter.value < num_requests:
+            if producer.done() and not producer.cancelled() and (e := producer.exception()) is not None:
+                raise e
             if timeout and start_time + timeout < time.perf_counter():
                 logger.info(f"Loadgen timed out after {timeout:0.2f}s")
                 timed_out = True
@@ -823,6 +1276,23 @@ class LoadGenerator:
         if progress_ctx and stage_task:
             progress_ctx.remove_task(stage_task)
 
+        # Stop producing before the queues are drained and joined
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except CancelledError:
+                pass
+        elif not producer.cancelled() and (producer_error := producer.exception()) is not None:
+            logger.error(f"Stage {stage_id}: request producer failed: {producer_error}")
+        if queue_depth_samples:
+            dispatch_stats.mean_queue_depth = float(np.mean(queue_depth_samples))
+        if dispatch_stats.late_enqueues > 0:
+            logger.warning(
+                f"Stage {stage_id}: producer enqueued {dispatch_stats.late_enqueues} request(s) after their scheduled time "
+                f"(max lag {dispatch_stats.max_producer_lag:0.3f}s), the client may be the bottleneck"
+            )
+
         # Trigger cleanup if timed out or received SIGINT
         if (timed_out or self.interrupt_sig) and cancel_signal:
             cancel_signal.set()
@@ -839,21 +1309,31 @@ class LoadGenerator:
             request_queue.drain()
             cancel_signal.clear()
         request_queue.join()
-
+        if closed_loop_stage is not None and self.user_pool is not None:
+            self.user_pool.reset()
+
+        end_time_epoch = time.time()
+        if closed_loop_stage is not None:
+            # There is no requested rate in a closed loop; report the rate the virtual users achieved
+            elapsed = end_time_epoch - start_time_epoch
+            rate = finished_requests_counter.value / elapsed if elapsed > 0 else 0.0
         self.stage_runtime_info[stage_id] = StageRuntimeInfo(
             stage_id=stage_id,
             rate=rate,
             start_time=start_time_epoch,
-            end_time=time.time(),
+            end_time=end_time_epoch,
             status=stage_status,
             concurrency_level=concurrency_level,
+            dispatch=None if self.worker_side_schedule or closed_loop_stage is not None else dispatch_stats,
+            parent_cpu_utilization=_cpu_utilization(cpu_start, start_time_epoch, end_time_epoch),
+            schedule_slip=self._schedule_slip_stats(slip_start),
         )
         logger.info("Stage %d - run completed" if stage_status == StageStatus.COMPLETED else "Stage %d - run failed", stage_id)
 
     async def preprocess(
         self,
         client: ModelServerClient,
-        request_queue: RequestQueue[RequestQueueData],
+        request_queue: RequestQueue[WorkItem],
         active_requests_counter: "Synchronized[int]",
         finished_requests_counter: "Synchronized[int]",
         request_phase: SyncEvent,
@@ -873,6 +1353,15 @@ class LoadGenerator:
 
         if self.sweep_config is None:
             raise Exception("sweep_config cannot be none")
+        if self.sweep_config.search == SweepSearch.ADAPTIVE:
+            return await self.adaptive_preprocess(
+                request_queue,
+                active_requests_counter,
+                finished_requests_counter,
+                request_phase,
+                cancel_signal,
+                stage_barrier=stage_barrier,
+            )
 
         # Aggregator collects timestamped value of active_requests throughout the preprocessing
         async def aggregator() -> None:
@@ -937,10 +1426,81 @@ class LoadGenerator:
         self.stages = [StandardLoadStage(rate=r, duration=self.sweep_config.stage_duration) for r in rates]
         logger.info(f"Generated load stages: {[s.rate for s in self.stages]}")
 
+    async def adaptive_preprocess(
+        self,
+        request_queue: RequestQueue[WorkItem],
+        active_requests_counter: "Synchronized[int]",
+        finished_requests_counter: "Synchronized[int]",
+        request_phase: SyncEvent,
+        cancel_signal: SyncEvent,
+        stage_barrier: Optional[SyncBarrier] = None,
+    ) -> None:
+        """
+        Finds the highest rate that meets the sweep SLOs with short probe stages, then generates the
+        benchmark stages around it.
+
+        Probes run as stages -1, -2, ... so they are left out of the lifecycle reports. Each probe's
+        metrics are judged as the metrics collector receives them.
+        """
+        if self.sweep_config is None:
+            raise Exception("sweep_config cannot be none")
+        if self.request_metrics_collector is None:
+            raise Exception("Adaptive sweep search requires the request metrics collector")
+        search = SaturationSearch(self.sweep_config)
+        duration = self.sweep_config.probe_duration
+
+        while (rate := search.next_rate()) is not None and not self.interrupt_sig:
+            stage_id = -1 - len(search.results)
+            probe = SaturationProbe(stage_id)
+            self.request_metrics_collector.add_listener(probe.feed)
+            try:
+                await self.run_stage(
+                    stage_id,
+                    rate,
+                    duration,
+                    request_queue,
+                    active_requests_counter,
+                    finished_requests_counter,
+                    request_phase,
+                    timeout=self.sweep_config.timeout,
+                    cancel_signal=cancel_signal,
+                    stage_barrier=stage_barrier,
+                )
+                # Workers record metrics before counting a request as finished, but the collector may still be catching up
+                deadline = time.perf_counter() + PROBE_METRICS_GRACE_PERIOD
+                while probe.num_received < finished_requests_counter.value and time.perf_counter() < deadline:
+                    await sleep(0.05)
+            finally:
+                self.request_metrics_collector.remove_listener(probe.feed)
+
+            completed = self.stage_runtime_info[stage_id].status == StageStatus.COMPLETED
+            result = probe.evaluate(rate, self.sweep_config, completed)
+            logger.info(
+                f"Sweep probe at {rate:0.2f} QPS {'passed' if result.passed else 'failed'}: "
+                f"{result.num_requests} requests, {result.num_failed} failed, goodput {result.goodput_percentage}, "
+                f"p99 TTFT {result.ttft_p99}"
+            )
+            search.record(result)
+            if self.stageInterval:
+                await sleep(self.stageInterval)
+
+        logger.info(f"Saturation point estimated at {search.highest_passing:0.2f} QPS after {len(search.results)} probes.")
+        rates = search.stage_rates()
+        self.stages = [StandardLoadStage(rate=r, duration=self.sweep_config.stage_duration) for r in rates]
+        logger.info(f"Generated load stages: {[s.rate for s in self.stages]}")
+
     async def mp_run(self, client: ModelServerClient) -> None:
-        request_queue: RequestQueue[RequestQueueData] = RequestQueue(
-            self.num_workers if self.datagen.is_preferred_worker_requested() else 1
+        # Per-worker schedules need a channel per worker so each one receives exactly its own share
+        num_channels = (
+            self.num_workers
+            if self.datagen.is_preferred_worker_requested() or self.worker_side_schedule or self.closed_loop
+            else 1
         )
+        request_queue: RequestQueue[WorkItem]
+        if self.request_queue_backend == RequestQueueBackend.RING_BUFFER:
+            request_queue = RingBufferRequestQueue(num_channels, codec=RequestQueueDataCodec(self.lora_adapters))
+        else:
+            request_queue = RequestQueue(num_channels)
         finished_requests_counter: "Synchronized[int]" = mp.Value("i", 0)
         active_requests_counter: "Synchronized[int]" = mp.Value("i", 0)
         request_phase: SyncEvent = mp.Event()
@@ -952,6 +1512,9 @@ class LoadGenerator:
         # start workers in the request phase
         request_phase.set()
 
+        if self.closed_loop:
+            self.user_pool = VirtualUserPool()
+
         # Create list of workers to process requests
         for id in range(self.num_workers):
             # Create shared value for each worker's max concurrency if concurrent load type
@@ -959,6 +1522,8 @@ class LoadGenerator:
                 shared_max_concurrency = mp.Value("i", self.worker_max_concurrency)
             else:
                 shared_max_concurrency = None
+            slip_histogram = SlipHistogram()
+            self.slip_histograms.append(slip_histogram)
 
             self.workers.append(
                 Worker(
@@ -975,6 +1540,8 @@ class LoadGenerator:
                     shared_max_concurrency,
                     self.base_seed,
                     stage_barrier,
+                    get_dispatch_scheduler(self.scheduler_config, slip_histogram),
+                    self.user_pool,
                 )
             )
             self.workers[-1].start()
@@ -1046,9 +1613,9 @@ class LoadGenerator:
                     logger.debug(f"Setting worker concurrency to {stage.concurrency_level} for stage {stage_id}")
                     self._set_worker_concurrency(stage.concurrency_level)
 
-                    # Use the dynamically set rate/duration from main.py
-                    rate = getattr(stage, "rate", stage.num_requests)
-                    duration = getattr(stage, "duration", 1)
+                    # Use the dynamically set rate/duration from main.py (unused in closed-loop mode)
+                    rate = stage.rate if stage.rate is not None else stage.num_requests
+                    duration = stage.duration if stage.duration is not None else 1
                     concurrency_level = stage.concurrency_level
                     await self.run_stage(
                         stage_id,
@@ -1062,6 +1629,7 @@ class LoadGenerator:
                         concurrency_level=concurrency_level,
                         progress_ctx=progress,
                         stage_barrier=stage_barrier,
+                        closed_loop_stage=stage if self.closed_loop else None,
                     )
                 elif self.load_type != LoadType.CONCURRENT and isinstance(stage, StandardLoadStage):
                     rate = stage.rate
@@ -1118,6 +1686,7 @@ class LoadGenerator:
 
                 timer = self.get_timer(stage.rate, stage.duration)
                 start_time_epoch = time.time()
+                cpu_start = _process_cpu_seconds()
                 start_time = time.perf_counter()
                 end_time = start_time + stage.duration
                 stage_status = StageStatus.RUNNING
@@ -1166,13 +1735,15 @@ class LoadGenerator:
                     logger.info("Stage %d - run completed", stage_id)
                 else:
                     logger.info("Stage %d - run failed", stage_id)
+                end_time_epoch = time.time()
                 self.stage_runtime_info[stage_id] = StageRuntimeInfo(
                     stage_id=stage_id,
                     rate=stage.rate,
                     start_time=start_time_epoch,
-                    end_time=time.time(),
+                    end_time=end_time_epoch,
                     status=stage_status,
                     concurrency_level=None,
+                    parent_cpu_utilization=_cpu_utilization(cpu_start, start_time_epoch, end_time_epoch),
                 )
                 progress.update(overall_task, advance=1)
                 LocalUserSession.clear_instances()
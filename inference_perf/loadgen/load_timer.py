@@ -39,11 +39,10 @@ class ConstantLoadTimer(LoadTimer):
     Introduces a small amount of random noise in timing.
     """
 
-    def __init__(self, rate: float, duration: float) -> None:
+    def __init__(self, rate: float, duration: float, rng: Optional[np.random.Generator] = None) -> None:
         self._rate = rate
         self._duration = duration
-        # TODO: Make random state a global seed
-        self._rand = np.random.default_rng()
+        self._rand = rng if rng is not None else np.random.default_rng()
 
     def start_timer(self, initial: Optional[float] = None) -> Generator[float, None, None]:
         num_requests = int(self._rate * self._duration)
@@ -70,10 +69,10 @@ class PoissonLoadTimer(LoadTimer):
     A load generator that generates requests based on a Poisson distribution.
     """
 
-    def __init__(self, rate: float, duration: float) -> None:
+    def __init__(self, rate: float, duration: float, rng: Optional[np.random.Generator] = None) -> None:
         self._rate = rate
         self._duration = duration
-        self._rand = np.random.default_rng()
+        self._rand = rng if rng is not None else np.random.default_rng()
 
     def start_timer(self, initial: Optional[float] = None) -> Generator[float, None, None]:
         # Set start time
@@ -90,7 +89,7 @@ class PoissonLoadTimer(LoadTimer):
                 continue
 
             # Schedule the requests over the next second
-            timer = ConstantLoadTimer(req_count, 1.0)
+            timer = ConstantLoadTimer(req_count, 1.0, self._rand)
             time_generator = timer.start_timer(next_time)
             for _ in range(req_count):
                 next_time = next(time_generator)
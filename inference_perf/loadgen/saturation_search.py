@@ -0,0 +1,154 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from inference_perf.apis import RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.config import GoodputConfig, StageGenType, SweepConfig
+from inference_perf.reportgen.base import calculate_goodput_metrics, effective_output_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeResult(NamedTuple):
+    rate: float
+    num_requests: int
+    num_failed: int
+    goodput_percentage: Optional[float]
+    ttft_p99: Optional[float]
+    passed: bool
+
+
+class SaturationProbe:
+    """
+    Judges one probe stage of the adaptive sweep against its SLOs.
+
+    Registered as a metrics collector listener, so the per-request latencies are computed as the metrics arrive
+    rather than in one pass at the end; evaluate() then runs the same goodput calculation as the reports.
+    """
+
+    def __init__(self, stage_id: int) -> None:
+        self.stage_id = stage_id
+        self.num_received = 0
+        self.successful: List[RequestLifecycleMetric] = []
+        self.ttft_values: List[Optional[float]] = []
+        self.tpot_values: List[Optional[float]] = []
+        self.ntpot_values: List[float] = []
+        self.request_latency_values: List[float] = []
+        self.itl_values: List[Optional[float]] = []
+
+    def feed(self, metric: RequestLifecycleMetric) -> None:
+        if metric.stage_id != self.stage_id:
+            return
+        self.num_received += 1
+        if metric.error is not None:
+            return
+        self.successful.append(metric)
+        latency = metric.end_time - metric.start_time
+        self.request_latency_values.append(latency)
+        output_tokens = effective_output_tokens(metric.info.response_metrics, False)
+        self.ntpot_values.append(latency / output_tokens if output_tokens > 0 else 0.0)
+
+        response_metrics = metric.info.response_metrics
+        if isinstance(response_metrics, StreamedResponseMetrics) and len(response_metrics.output_token_times) > 1:
+            token_times = response_metrics.output_token_times
+            self.ttft_values.append(token_times[0] - metric.start_time)
+            decode_time = token_times[-1] - token_times[0]
+            self.tpot_values.append(decode_time / (output_tokens - 1) if output_tokens > 1 else None)
+            self.itl_values.append(decode_time / (len(token_times) - 1))
+        else:
+            self.ttft_values.append(None)
+            self.tpot_values.append(None)
+            self.itl_values.append(None)
+
+    def evaluate(self, rate: float, config: SweepConfig, completed: bool = True) -> ProbeResult:
+        goodput_percentage: Optional[float] = None
+        if config.constraints:
+            goodput = calculate_goodput_metrics(
+                self.successful,
+                GoodputConfig(constraints=config.constraints),
+                self.ttft_values,
+                self.tpot_values,
+                self.ntpot_values,
+                self.request_latency_values,
+                self.itl_values,
+            )
+            good_requests = goodput["good_requests"] if goodput is not None else 0
+            # Failed requests never meet an SLO
+            goodput_percentage = good_requests / self.num_received * 100 if self.num_received > 0 else 0.0
+
+        valid_ttft = [v for v in self.ttft_values if v is not None]
+        ttft_p99 = float(np.percentile(valid_ttft, 99)) if valid_ttft else None
+
+        passed = completed and self.num_received > 0
+        if goodput_percentage is not None and goodput_percentage < config.min_goodput_percentage:
+            passed = False
+        if config.max_ttft_p99 is not None and (ttft_p99 is None or ttft_p99 > config.max_ttft_p99):
+            passed = False
+        return ProbeResult(
+            rate=rate,
+            num_requests=self.num_received,
+            num_failed=self.num_received - len(self.successful),
+            goodput_percentage=goodput_percentage,
+            ttft_p99=ttft_p99,
+            passed=passed,
+        )
+
+
+class SaturationSearch:
+    """
+    Finds the highest rate that passes its probe.
+
+    Doubles the rate from start_rate until a probe fails, then bisects between the highest passing and lowest
+    failing rate until they are within tolerance of each other or the probe budget runs out.
+    """
+
+    def __init__(self, config: SweepConfig) -> None:
+        self.config = config
+        self.highest_passing = 0.0
+        self.lowest_failing: Optional[float] = None
+        self.results: List[ProbeResult] = []
+
+    def next_rate(self) -> Optional[float]:
+        """The rate to probe next, or None once the search has converged."""
+        if len(self.results) >= self.config.max_probes:
+            return None
+        if self.lowest_failing is None:
+            return self.highest_passing * 2 if self.highest_passing > 0 else self.config.start_rate
+        if self.lowest_failing - self.highest_passing <= self.config.tolerance * self.lowest_failing:
+            return None
+        return (self.highest_passing + self.lowest_failing) / 2
+
+    def record(self, result: ProbeResult) -> None:
+        self.results.append(result)
+        if result.passed:
+            self.highest_passing = max(self.highest_passing, result.rate)
+        elif self.lowest_failing is None or result.rate < self.lowest_failing:
+            self.lowest_failing = result.rate
+
+    def stage_rates(self) -> List[float]:
+        """Rates of the benchmark stages, spread around the saturation rate."""
+        knee = self.highest_passing
+        if knee <= 0:
+            raise Exception("Adaptive sweep found no rate that meets the SLOs, try a lower start_rate or looser constraints")
+        if self.lowest_failing is None:
+            logger.warning(f"Adaptive sweep never found a failing rate, using the highest rate probed ({knee:0.2f} QPS)")
+        low, high = knee * (1 - self.config.knee_spread), knee * (1 + self.config.knee_spread)
+        if self.config.type == StageGenType.GEOM:
+            rates = np.geomspace(low, high, num=self.config.num_stages)
+        else:
+            rates = np.linspace(low, high, self.config.num_stages)
+        return [float(round(r, 2)) for r in rates]
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import multiprocessing as mp
+import os
 import sys
 from argparse import ArgumentParser
 from inference_perf.analysis.analyze import analyze_reports
@@ -46,6 +47,7 @@ from inference_perf.datagen import (
     ConversationReplayDataGenerator,
     VisionArenaDataGenerator,
 )
+from inference_perf.datagen.replay import SessionCompletionChannel
 from inference_perf.client.modelserver import (
     ModelServerClient,
     vLLMModelServerClient,
@@ -151,6 +153,10 @@ def main_cli() -> None:
         config.load.worker_max_concurrency = 0
     # Note: StandardLoadStage validation is automatically handled by Pydantic
 
+    # The per-request report includes the response body, so streamed bodies must be kept
+    if config.report.request_lifecycle.per_request:
+        config.api.capture_raw_response = True
+
     # Define Circuit Breakers
     if config.circuit_breakers:
         init_circuit_breakers(config.circuit_breakers)
@@ -177,7 +183,11 @@ def main_cli() -> None:
     # Define Report Generator
     collector: RequestMetricCollector
     if config.load.num_workers > 0:
-        collector = MultiprocessRequestMetricCollector()
+        store_directory: Optional[str] = None
+        if config.report.request_lifecycle.spill_to_disk:
+            run_directory = config.storage.local_storage.path if config.storage else "."
+            store_directory = os.path.join(run_directory, "request_metrics")
+        collector = MultiprocessRequestMetricCollector(store_directory)
     else:
         collector = LocalRequestMetricCollector()
     reportgen = ReportGenerator(metrics_client, collector, config=config)
@@ -263,15 +273,15 @@ def main_cli() -> None:
     if len(config.load.stages) == 0 and config.load.sweep is None:
         raise Exception("Load stages must be configured, or sweep must be configured")
 
-    # Create multiprocessing manager for session replay datagens if needed.
-    # Must be created before workers are forked.
-    mp_manager = None
+    # Create the worker → main session completion channel for session replay datagens if needed.
+    # Must be created before workers are started.
+    completion_channel = None
     if (
         config.data
         and config.data.type in (DataGenType.OTelTraceReplay, DataGenType.WekaTraceReplay)
         and config.load.num_workers > 0
     ):
-        mp_manager = mp.Manager()
+        completion_channel = SessionCompletionChannel()
 
     datagen: BaseGenerator
     if config.data:
@@ -357,11 +367,21 @@ def main_cli() -> None:
             datagen = VisionArenaDataGenerator(config.api, config.data, tokenizer)
         elif config.data.type == DataGenType.OTelTraceReplay:
             datagen = OTelTraceReplayDataGenerator(
-                config.api, config.data, tokenizer, mp_manager, config.load.base_seed, num_workers=config.load.num_workers
+                config.api,
+                config.data,
+                tokenizer,
+                completion_channel,
+                config.load.base_seed,
+                num_workers=config.load.num_workers,
             )
         elif config.data.type == DataGenType.WekaTraceReplay:
             datagen = WekaTraceReplayDataGenerator(
-                config.api, config.data, tokenizer, mp_manager, config.load.base_seed, num_workers=config.load.num_workers
+                config.api,
+                config.data,
+                tokenizer,
+                completion_channel,
+                config.load.base_seed,
+                num_workers=config.load.num_workers,
             )
         else:
             datagen = MockDataGenerator(config.api, config.data, tokenizer)
@@ -376,7 +396,7 @@ def main_cli() -> None:
     # Define LoadGenerator with session metrics collector
     if isinstance(metrics_client, PrometheusMetricsClient) and config.report.prometheus and config.report.prometheus.per_stage:
         config.load.interval = max(config.load.interval, metrics_client.scrape_interval)
-    loadgen = LoadGenerator(datagen, config.load, session_metrics_collector)
+    loadgen = LoadGenerator(datagen, config.load, session_metrics_collector, reportgen.get_metrics_collector())
 
     # Wire session metrics collector into reportgen if it exists
     if session_metrics_collector:
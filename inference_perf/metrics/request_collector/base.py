@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import ABC, abstractmethod
-from typing import List, AsyncIterator
+from typing import Callable, Iterator, List, AsyncIterator, Optional
 from contextlib import asynccontextmanager
 
 from inference_perf.apis import RequestLifecycleMetric
@@ -23,6 +23,20 @@ class RequestMetricCollector(ABC):
     Responsible for collecting request information
     """
 
+    def __init__(self) -> None:
+        self._listeners: List[Callable[[RequestLifecycleMetric], None]] = []
+
+    def add_listener(self, listener: Callable[[RequestLifecycleMetric], None]) -> None:
+        """Call listener with every metric as the main process receives it."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RequestLifecycleMetric], None]) -> None:
+        self._listeners.remove(listener)
+
+    def notify_listeners(self, metric: RequestLifecycleMetric) -> None:
+        for listener in self._listeners:
+            listener(metric)
+
     @abstractmethod
     def record_metric(self, metric: RequestLifecycleMetric) -> None:
         raise NotImplementedError
@@ -31,6 +45,12 @@ class RequestMetricCollector(ABC):
     def get_metrics(self) -> List[RequestLifecycleMetric]:
         raise NotImplementedError
 
+    def iter_metrics(self, stage_id: Optional[int] = None) -> Iterator[RequestLifecycleMetric]:
+        """Iterate over the metrics, optionally only those of one stage, without building a list of them all."""
+        for metric in self.get_metrics():
+            if stage_id is None or metric.stage_id == stage_id:
+                yield metric
+
     @asynccontextmanager
     async def start(self) -> AsyncIterator[None]:
         yield
@@ -0,0 +1,253 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+import os
+import pickle
+import time
+import weakref
+from multiprocessing.util import Finalize
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from inference_perf.apis import RequestLifecycleMetric, StreamedResponseMetrics
+
+# Fixed-width fields of a metric. None is stored as NaN for floats and flagged for the stage id.
+METRIC_DTYPE = np.dtype(
+    [
+        ("stage_id", np.int64),
+        ("has_stage_id", np.bool_),
+        ("scheduled_time", np.float64),
+        ("start_time", np.float64),
+        ("end_time", np.float64),
+        ("ttft_slo_sec", np.float64),
+        ("tpot_slo_sec", np.float64),
+        ("json_encode_time", np.float64),
+        ("json_decode_time", np.float64),
+        # output_token_times is the same list as chunk_times, so it isn't sent twice
+        ("token_times_are_chunk_times", np.bool_),
+        ("side_file", np.int64),
+        ("side_offset", np.int64),
+        ("side_length", np.int64),
+    ]
+)
+
+
+class CompactMetric(NamedTuple):
+    """A RequestLifecycleMetric as sent from a worker to the main process."""
+
+    # One METRIC_DTYPE record
+    fields: bytes
+    # float64 arrays
+    chunk_times: bytes
+    output_token_times: bytes
+    # int32 array
+    chunk_token_counts: bytes
+    # Pickled session id, error and InferenceInfo with the bulky fields stripped; small and needed by
+    # every consumer, so it travels with the record
+    meta: bytes
+
+
+class MetricSideStore:
+    """
+    Append-only files holding the bulky fields of metrics: request and response bodies, raw response
+    chunks and extra_info.
+
+    Each writing process appends to its own file, so writes need no locking. Metrics reference their
+    entry by file, offset and length, and the main process reads an entry back only when a report
+    needs the full metric. Entries are buffered and written every flush_bytes bytes or flush_interval
+    seconds rather than one write per request; workers also flush at the end of every stage (see
+    flush_side_stores) and at exit, so every entry is on disk before a report reads it.
+    """
+
+    def __init__(self, directory: str, flush_bytes: int = 1 << 20, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._pid: Optional[int] = None
+        self._fd = -1
+        self._offset = 0
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+        self._read_fds: Dict[int, int] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"directory": self.directory, "flush_bytes": self.flush_bytes, "flush_interval": self.flush_interval}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def _path(self, file_id: int) -> str:
+        return os.path.join(self.directory, f"metrics-{file_id}.bin")
+
+    def write(self, blob: bytes) -> Tuple[int, int, int]:
+        pid = os.getpid()
+        if self._pid != pid:
+            # First write of this process (or of a forked child that inherited the parent's state and buffer)
+            self._pid = pid
+            self._fd = os.open(self._path(pid), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            self._offset = os.fstat(self._fd).st_size
+            self._buffer = bytearray()
+            _register_writing_store(self)
+        offset = self._offset
+        self._buffer += blob
+        self._offset += len(blob)
+        if len(self._buffer) >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return pid, offset, len(blob)
+
+    def flush(self) -> None:
+        """Write out the entries this process has buffered."""
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._pid != os.getpid():
+            return
+        pending = memoryview(self._buffer)
+        while pending:
+            pending = pending[os.write(self._fd, pending) :]
+        pending.release()
+        self._buffer = bytearray()
+
+    def read(self, file_id: int, offset: int, length: int) -> bytes:
+        if file_id == self._pid:
+            self.flush()
+        fd = self._read_fds.get(file_id)
+        if fd is None:
+            fd = self._read_fds[file_id] = os.open(self._path(file_id), os.O_RDONLY)
+        return os.pread(fd, length, offset)
+
+
+# Side stores this process has written to, and the process that registered the exit flush
+_writing_stores: "weakref.WeakSet[MetricSideStore]" = weakref.WeakSet()
+_exit_flush_pid: Optional[int] = None
+
+
+def _register_writing_store(store: MetricSideStore) -> None:
+    global _exit_flush_pid
+    _writing_stores.add(store)
+    if _exit_flush_pid != os.getpid():
+        _exit_flush_pid = os.getpid()
+        # Run by multiprocessing when a worker process exits, and at interpreter exit in the main process
+        Finalize(None, flush_side_stores, exitpriority=0)
+
+
+def flush_side_stores() -> None:
+    """Write out the entries buffered by every side store this process has written to."""
+    for store in list(_writing_stores):
+        store.flush()
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def encode_metric(metric: RequestLifecycleMetric, side_store: MetricSideStore) -> CompactMetric:
+    info = metric.info
+    response_metrics = info.response_metrics
+    chunk_times: Any = []
+    output_token_times: Any = []
+    chunk_token_counts: Any = []
+    response_chunks: Any = []
+    stripped_response_metrics = response_metrics
+    if isinstance(response_metrics, StreamedResponseMetrics):
+        chunk_times = response_metrics.chunk_times
+        output_token_times = response_metrics.output_token_times
+        chunk_token_counts = response_metrics.chunk_token_counts
+        response_chunks = response_metrics.response_chunks
+        stripped_response_metrics = response_metrics.model_copy(
+            update={"chunk_times": [], "output_token_times": [], "chunk_token_counts": [], "response_chunks": []}
+        )
+    token_times_are_chunk_times = output_token_times == chunk_times
+
+    side = pickle.dumps(
+        (metric.request_data, metric.response_data, response_chunks, info.extra_info), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    side_file, side_offset, side_length = side_store.write(side)
+
+    record = np.zeros((), dtype=METRIC_DTYPE)
+    record["stage_id"] = metric.stage_id if metric.stage_id is not None else 0
+    record["has_stage_id"] = metric.stage_id is not None
+    record["scheduled_time"] = metric.scheduled_time
+    record["start_time"] = metric.start_time
+    record["end_time"] = metric.end_time
+    record["ttft_slo_sec"] = _float_or_nan(metric.ttft_slo_sec)
+    record["tpot_slo_sec"] = _float_or_nan(metric.tpot_slo_sec)
+    record["json_encode_time"] = _float_or_nan(metric.json_encode_time)
+    record["json_decode_time"] = _float_or_nan(metric.json_decode_time)
+    record["token_times_are_chunk_times"] = token_times_are_chunk_times
+    record["side_file"] = side_file
+    record["side_offset"] = side_offset
+    record["side_length"] = side_length
+
+    stripped_info = info.model_copy(update={"response_metrics": stripped_response_metrics, "extra_info": {}})
+    return CompactMetric(
+        fields=record.tobytes(),
+        chunk_times=np.asarray(chunk_times, dtype=np.float64).tobytes(),
+        output_token_times=b"" if token_times_are_chunk_times else np.asarray(output_token_times, dtype=np.float64).tobytes(),
+        chunk_token_counts=np.asarray(chunk_token_counts, dtype=np.int32).tobytes(),
+        meta=pickle.dumps((metric.session_id, metric.error, stripped_info), protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def decode_metric(compact: CompactMetric, side_store: Optional[MetricSideStore] = None) -> RequestLifecycleMetric:
+    """
+    Rebuild the metric. Without a side store the bulky fields are left empty, which is all listeners
+    and circuit breakers need while the run is in progress.
+    """
+    record = np.frombuffer(compact.fields, dtype=METRIC_DTYPE)[0]
+    session_id, error, info = pickle.loads(compact.meta)
+
+    request_data = ""
+    response_data: Optional[str] = None
+    response_chunks: Any = []
+    extra_info: Dict[str, Any] = {}
+    if side_store is not None:
+        request_data, response_data, response_chunks, extra_info = pickle.loads(
+            side_store.read(int(record["side_file"]), int(record["side_offset"]), int(record["side_length"]))
+        )
+
+    if isinstance(info.response_metrics, StreamedResponseMetrics):
+        chunk_times = np.frombuffer(compact.chunk_times, dtype=np.float64).tolist()
+        if record["token_times_are_chunk_times"]:
+            output_token_times = chunk_times
+        else:
+            output_token_times = np.frombuffer(compact.output_token_times, dtype=np.float64).tolist()
+        info.response_metrics = info.response_metrics.model_copy(
+            update={
+                "chunk_times": chunk_times,
+                "output_token_times": output_token_times,
+                "chunk_token_counts": np.frombuffer(compact.chunk_token_counts, dtype=np.int32).tolist(),
+                "response_chunks": response_chunks,
+            }
+        )
+    info.extra_info = extra_info
+
+    return RequestLifecycleMetric(
+        stage_id=int(record["stage_id"]) if record["has_stage_id"] else None,
+        session_id=session_id,
+        scheduled_time=float(record["scheduled_time"]),
+        start_time=float(record["start_time"]),
+        end_time=float(record["end_time"]),
+        request_data=request_data,
+        response_data=response_data,
+        info=info,
+        error=error,
+        ttft_slo_sec=_nan_to_none(record["ttft_slo_sec"]),
+        tpot_slo_sec=_nan_to_none(record["tpot_slo_sec"]),
+        json_encode_time=_nan_to_none(record["json_encode_time"]),
+        json_decode_time=_nan_to_none(record["json_decode_time"]),
+    )
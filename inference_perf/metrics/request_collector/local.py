@@ -22,11 +22,13 @@ class LocalRequestMetricCollector(RequestMetricCollector):
     """Responsible for accumulating client request metrics"""
 
     def __init__(self) -> None:
+        super().__init__()
         self.metrics: List[RequestLifecycleMetric] = []
 
     def record_metric(self, metric: RequestLifecycleMetric) -> None:
         self.metrics.append(metric)
         feed_breakers(metric)
+        self.notify_listeners(metric)
 
     def get_metrics(self) -> List[RequestLifecycleMetric]:
         return self.metrics
@@ -13,31 +13,62 @@
 # limitations under the License.
 
 import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+import weakref
 
 from asyncio import get_event_loop, create_task
 from contextlib import asynccontextmanager
 from queue import Empty
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Iterator, Optional
 from functools import partial
 import logging
 from inference_perf.metrics.request_collector import RequestMetricCollector
+from inference_perf.metrics.request_collector.compact import CompactMetric, MetricSideStore, decode_metric, encode_metric
+from inference_perf.metrics.request_collector.segments import SegmentedMetricStore
 from inference_perf.apis import RequestLifecycleMetric
-from inference_perf.circuit_breaker import feed_breakers
+from inference_perf.circuit_breaker import circuit_breakers_enabled, feed_breakers
 
 logger = logging.getLogger(__name__)
 
 
 class MultiprocessRequestMetricCollector(RequestMetricCollector):
-    """Responsible for accumulating client request metrics"""
-
-    def __init__(self) -> None:
-        self.queue: "mp.JoinableQueue[Optional[RequestLifecycleMetric]]" = mp.JoinableQueue()
+    """
+    Responsible for accumulating client request metrics
+
+    Workers send each metric as a CompactMetric: fixed-width fields and float64 timestamp arrays,
+    with request/response bodies and raw chunks written to a side store on disk. The main process
+    keeps the compact form and rebuilds full metrics only when get_metrics() is called for reports.
+
+    With a store_directory, the compact metrics are appended to Arrow IPC segments in a new
+    run-<timestamp>-* directory under it as they arrive instead of being kept in memory, and the side
+    store lives next to them; both are left on disk after the run so the metrics of a run that crashed
+    can still be read.
+    """
+
+    def __init__(self, store_directory: Optional[str] = None) -> None:
+        super().__init__()
+        self.queue: "mp.JoinableQueue[Optional[CompactMetric]]" = mp.JoinableQueue()
+        self.store: Optional[SegmentedMetricStore] = None
+        if store_directory is not None:
+            # Each run gets its own directory, so the reader never merges in segments left by an earlier run
+            os.makedirs(store_directory, exist_ok=True)
+            run_directory = tempfile.mkdtemp(prefix=time.strftime("run-%Y%m%d-%H%M%S-"), dir=store_directory)
+            self.store = SegmentedMetricStore(run_directory)
+            self.side_store = MetricSideStore(os.path.join(run_directory, "bodies"))
+            os.makedirs(self.side_store.directory, exist_ok=True)
+        else:
+            self.side_store = MetricSideStore(tempfile.mkdtemp(prefix="inference-perf-metrics-"))
+            weakref.finalize(self, shutil.rmtree, self.side_store.directory, ignore_errors=True)
+        self.compact_metrics: list[CompactMetric] = []
 
     def record_metric(self, metric: RequestLifecycleMetric) -> None:
-        self.queue.put(metric)
+        self.queue.put(encode_metric(metric, self.side_store))
 
-    async def collect_metrics(self) -> list[RequestLifecycleMetric]:
-        metrics: list[RequestLifecycleMetric] = []
+    async def collect_metrics(self) -> list[CompactMetric]:
+        metrics: list[CompactMetric] = []
         event_loop = get_event_loop()
         # prevent get from blocking the executor for too long:
         get_queue = partial(self.queue.get, timeout=0.5)
@@ -46,14 +77,24 @@ class MultiprocessRequestMetricCollector(RequestMetricCollector):
             try:
                 item = await event_loop.run_in_executor(None, get_queue)
             except Empty:
+                if self.store is not None:
+                    # Write out what arrived before the lull rather than holding it until the next batch fills
+                    self.store.flush()
                 continue
 
             if item is None:
                 self.queue.task_done()
                 break
 
-            metrics.append(item)
-            feed_breakers(item)
+            if self.store is not None:
+                self.store.append(item)
+            else:
+                metrics.append(item)
+            if self._listeners or circuit_breakers_enabled():
+                # Listeners and breakers judge latencies and errors, not bodies
+                metric = decode_metric(item)
+                feed_breakers(metric)
+                self.notify_listeners(metric)
             self.queue.task_done()
 
         return metrics
@@ -65,8 +106,21 @@ class MultiprocessRequestMetricCollector(RequestMetricCollector):
         yield
 
         self.queue.put(None)
-        self.metrics = await collector_task
-        logger.debug(f"Collector collected {len(self.metrics)} metrics")
+        self.compact_metrics = await collector_task
+        if self.store is not None:
+            self.store.close()
+            logger.debug(f"Collector wrote {len(self.store)} metrics to {self.store.directory}")
+        else:
+            logger.debug(f"Collector collected {len(self.compact_metrics)} metrics")
+
+    def iter_metrics(self, stage_id: Optional[int] = None) -> Iterator[RequestLifecycleMetric]:
+        if self.store is None:
+            yield from super().iter_metrics(stage_id)
+            return
+        for compact in self.store.iter_compact(stage_id):
+            yield decode_metric(compact, self.side_store)
 
     def get_metrics(self) -> list[RequestLifecycleMetric]:
-        return self.metrics
+        if self.store is not None:
+            return list(self.iter_metrics())
+        return [decode_metric(compact, self.side_store) for compact in self.compact_metrics]
@@ -0,0 +1,191 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import glob
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from inference_perf.metrics.request_collector.compact import METRIC_DTYPE, CompactMetric
+
+logger = logging.getLogger(__name__)
+
+FIELD_NAMES: List[str] = list(METRIC_DTYPE.names or ())
+
+SEGMENT_SCHEMA = pa.schema(
+    [pa.field(name, pa.from_numpy_dtype(METRIC_DTYPE[name])) for name in FIELD_NAMES]
+    + [
+        pa.field("chunk_times", pa.list_(pa.float64())),
+        pa.field("output_token_times", pa.list_(pa.float64())),
+        pa.field("chunk_token_counts", pa.list_(pa.int32())),
+        pa.field("meta", pa.binary()),
+    ]
+)
+
+
+def _list_array(blobs: List[bytes], dtype: np.dtype) -> pa.Array:
+    values = np.frombuffer(b"".join(blobs), dtype=dtype)
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int32)
+    np.cumsum([len(blob) // dtype.itemsize for blob in blobs], out=offsets[1:])
+    return pa.ListArray.from_arrays(pa.array(offsets), pa.array(values, type=pa.from_numpy_dtype(dtype)))
+
+
+class _ListColumn:
+    """Per-row bytes of a list<float64> or list<int32> column, sliced without converting to Python lists."""
+
+    def __init__(self, column: Any) -> None:
+        self.offsets: np.ndarray = column.offsets.to_numpy()
+        self.values: np.ndarray = column.values.to_numpy()
+
+    def __getitem__(self, row: int) -> bytes:
+        return self.values[self.offsets[row] : self.offsets[row + 1]].tobytes()
+
+
+def to_record_batch(metrics: List[CompactMetric]) -> pa.RecordBatch:
+    """One SEGMENT_SCHEMA record batch holding metrics."""
+    records = np.frombuffer(b"".join(metric.fields for metric in metrics), dtype=METRIC_DTYPE)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(records[name]) for name in FIELD_NAMES]
+        + [
+            _list_array([metric.chunk_times for metric in metrics], np.dtype(np.float64)),
+            _list_array([metric.output_token_times for metric in metrics], np.dtype(np.float64)),
+            _list_array([metric.chunk_token_counts for metric in metrics], np.dtype(np.int32)),
+            pa.array([metric.meta for metric in metrics], type=pa.binary()),
+        ],
+        schema=SEGMENT_SCHEMA,
+    )
+
+
+def record_batch_metrics(batch: pa.RecordBatch, stage_id: Optional[int] = None) -> Iterator[CompactMetric]:
+    """The CompactMetrics in a SEGMENT_SCHEMA record batch, optionally only those of one stage."""
+    records = np.empty(batch.num_rows, dtype=METRIC_DTYPE)
+    for name in FIELD_NAMES:
+        records[name] = batch.column(name).to_numpy(zero_copy_only=False)
+    if stage_id is None:
+        rows = np.arange(batch.num_rows)
+    else:
+        rows = np.flatnonzero(records["has_stage_id"] & (records["stage_id"] == stage_id))
+        if len(rows) == 0:
+            return
+    chunk_times = _ListColumn(batch.column("chunk_times"))
+    output_token_times = _ListColumn(batch.column("output_token_times"))
+    chunk_token_counts = _ListColumn(batch.column("chunk_token_counts"))
+    meta = batch.column("meta")
+    for i in rows:
+        yield CompactMetric(
+            fields=records[i].tobytes(),
+            chunk_times=chunk_times[i],
+            output_token_times=output_token_times[i],
+            chunk_token_counts=chunk_token_counts[i],
+            meta=meta[i].as_py(),
+        )
+
+
+class SegmentedMetricStore:
+    """
+    Appends CompactMetrics to Arrow IPC stream files in a directory instead of holding them in memory.
+
+    Metrics are buffered and written as one record batch every batch_rows metrics or flush_interval
+    seconds, and a new segment file is started every segment_rows metrics. The stream format needs
+    no footer, so the segments of a run that crashed are readable up to the last batch written.
+    """
+
+    def __init__(self, directory: str, batch_rows: int = 1024, segment_rows: int = 65536, flush_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.batch_rows = batch_rows
+        self.segment_rows = segment_rows
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self._pending: List[CompactMetric] = []
+        self._last_flush = time.monotonic()
+        self._writer: Optional[pa.ipc.RecordBatchStreamWriter] = None
+        self._sink: Optional[pa.OSFile] = None
+        self._segment_rows_written = 0
+        self._next_segment = len(self.segment_paths())
+        self.num_rows = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the main process writes; workers that receive the collector get an idle store
+        return {
+            "directory": self.directory,
+            "batch_rows": self.batch_rows,
+            "segment_rows": self.segment_rows,
+            "flush_interval": self.flush_interval,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def segment_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "segment-*.arrows")))
+
+    def append(self, metric: CompactMetric) -> None:
+        self._pending.append(metric)
+        self.num_rows += 1
+        if len(self._pending) >= self.batch_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        batch = to_record_batch(pending)
+
+        if self._writer is None:
+            path = os.path.join(self.directory, f"segment-{self._next_segment:05d}.arrows")
+            self._next_segment += 1
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_stream(self._sink, SEGMENT_SCHEMA)
+            self._segment_rows_written = 0
+        self._writer.write_batch(batch)
+        self._sink.flush()  # type: ignore[union-attr]
+        self._segment_rows_written += batch.num_rows
+        if self._segment_rows_written >= self.segment_rows:
+            self._close_segment()
+
+    def _close_segment(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def close(self) -> None:
+        self.flush()
+        self._close_segment()
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def iter_compact(self, stage_id: Optional[int] = None) -> Iterator[CompactMetric]:
+        """Stream the stored metrics one record batch at a time, optionally only those of one stage."""
+        self.flush()
+        for path in self.segment_paths():
+            try:
+                with pa.OSFile(path, "rb") as source:
+                    reader = pa.ipc.open_stream(source)
+                    while True:
+                        try:
+                            batch = reader.read_next_batch()
+                        except StopIteration:
+                            break
+                        yield from record_batch_metrics(batch, stage_id)
+            except (pa.ArrowInvalid, OSError) as e:
+                # A segment cut off mid-batch by a crash; the batches before the cut were returned
+                logger.warning(f"Stopped reading truncated metric segment {path}: {e}")
@@ -11,11 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import logging
 import json
 import re
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+from concurrent.futures import Future
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union, TYPE_CHECKING
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
 if TYPE_CHECKING:
@@ -26,18 +29,22 @@ import numpy as np
 from pydantic import BaseModel
 
 from inference_perf.apis import RequestLifecycleMetric, ResponseMetrics, SessionLifecycleMetric, StreamedResponseMetrics
+from inference_perf.apis.json_codec import get_json_codec
 from inference_perf.client.server_metrics import ServerMetricsClient, PerfRuntimeParameters
 from inference_perf.client.server_metrics.base import ModelServerMetrics, StageStatus
 from inference_perf.client.server_metrics.prometheus_client import PrometheusMetricsClient
 from inference_perf.metrics.request_collector import RequestMetricCollector
 from inference_perf.config import (
     Config,
+    DispatchPolicy,
     PrometheusMetricsReportConfig,
     ReportConfig,
     SessionLifecycleReportConfig,
     GoodputConfig,
+    PercentileMode,
 )
 from inference_perf.metrics import SessionMetricsCollector
+from inference_perf.reportgen.sketch import QuantileSketch
 from inference_perf.utils import ReportFile
 
 logger = logging.getLogger(__name__)
@@ -165,17 +172,30 @@ def safe_float(value: Any) -> float:
         return 0.0
 
 
-def summarize(items: List[float], percentiles: List[float]) -> Optional[dict[str, float]]:
+def summarize(
+    items: Union[Sequence[float], np.ndarray, QuantileSketch],
+    percentiles: List[float],
+    sketch_accuracy: Optional[float] = None,
+) -> Optional[dict[str, float]]:
+    """min, mean, max and percentiles of items; estimated with a QuantileSketch when sketch_accuracy is set."""
+    if isinstance(items, QuantileSketch):
+        return items.summarize(percentiles)
     if len(items) == 0:
         return None
+    # Converted once and partitioned once for all percentiles
+    values = np.asarray(items, dtype=np.float64)
+    if sketch_accuracy is not None:
+        sketch = QuantileSketch(sketch_accuracy)
+        sketch.add(values)
+        return sketch.summarize(percentiles)
     result = {
-        "mean": float(np.mean(items)),
-        "min": float(np.min(items)),
-        "max": float(np.max(items)),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
     }
-    for p in percentiles:
+    for p, value in zip(percentiles, np.percentile(values, percentiles), strict=True):
         key = "median" if p == 50 else f"p{p:g}"
-        result[key] = float(np.percentile(items, p))
+        result[key] = float(value)
     return result
 
 
@@ -213,7 +233,9 @@ def extract_cached_prompt_tokens(server_usage: Optional[dict[str, Any]]) -> Opti
     return min(max(cached, 0), prompt), prompt
 
 
-def summarize_prompt_token_usage(metrics: List[RequestLifecycleMetric], percentiles: List[float]) -> dict[str, float]:
+def summarize_prompt_token_usage(
+    metrics: List[RequestLifecycleMetric], percentiles: List[float], sketch_accuracy: Optional[float] = None
+) -> dict[str, float]:
     """Input tokens already resolved at request time (request_metrics.text.input_tokens).
 
     The per-request value is the server-reported usage.prompt_tokens when the server
@@ -240,12 +262,14 @@ def summarize_prompt_token_usage(metrics: List[RequestLifecycleMetric], percenti
         "cached": prompt_tokens_cached,
         "uncached": max(prompt_tokens_total - prompt_tokens_cached, 0.0),
     }
-    if distribution := summarize(per_request, percentiles):
+    if distribution := summarize(per_request, percentiles, sketch_accuracy):
         result.update(distribution)
     return result
 
 
-def summarize_output_token_usage(metrics: List[RequestLifecycleMetric], percentiles: List[float]) -> dict[str, float]:
+def summarize_output_token_usage(
+    metrics: List[RequestLifecycleMetric], percentiles: List[float], sketch_accuracy: Optional[float] = None
+) -> dict[str, float]:
     """Output tokens as reported by the server (usage.completion_tokens).
 
     The server-side count is exact (a count of decode steps), unlike a
@@ -270,7 +294,7 @@ def summarize_output_token_usage(metrics: List[RequestLifecycleMetric], percenti
         per_request.append(completion_tokens_value)
 
     result = {"total": output_tokens_total}
-    if distribution := summarize(per_request, percentiles):
+    if distribution := summarize(per_request, percentiles, sketch_accuracy):
         result.update(distribution)
     return result
 
@@ -301,13 +325,17 @@ class ResponsesSummary(BaseModel):
 def calculate_goodput_metrics(
     metrics: List[RequestLifecycleMetric],
     goodput_config: Optional[GoodputConfig],
-    ttft_values: List[Optional[float]],
-    tpot_values: List[Optional[float]],
-    ntpot_values: List[float],
-    request_latency_values: List[float],
-    itl_values: List[Optional[float]],
+    ttft_values: Union[Sequence[Optional[float]], np.ndarray],
+    tpot_values: Union[Sequence[Optional[float]], np.ndarray],
+    ntpot_values: Union[Sequence[float], np.ndarray],
+    request_latency_values: Union[Sequence[float], np.ndarray],
+    itl_values: Union[Sequence[Optional[float]], np.ndarray],
     use_server_output_tokens: bool = False,
 ) -> Optional[dict[str, Any]]:
+    """
+    Share of requests meeting every SLO that applies to them, and the request and token rates they
+    account for. Values are 1:1 with metrics; None or NaN marks a value that is undefined for a request.
+    """
     has_constraints = False
     if goodput_config and goodput_config.constraints:
         has_constraints = True
@@ -320,76 +348,51 @@ def calculate_goodput_metrics(
         return None
 
     total_benchmark_time = max(m.end_time for m in metrics) - min(m.start_time for m in metrics)
+    constraints = goodput_config.constraints if goodput_config else {}
 
-    good_requests_count = 0
-    good_total_tokens = 0
-
-    attainment_counts: defaultdict[str, int] = defaultdict(int)
-    total_applicable_counts: defaultdict[str, int] = defaultdict(int)
-
-    for i, m in enumerate(metrics):
-        is_good = True
-
-        effective_ttft_slo = (
-            m.ttft_slo_sec
-            if m.ttft_slo_sec is not None
-            else (goodput_config.constraints.get("ttft") if goodput_config else None)
-        )
-        effective_tpot_slo = (
-            m.tpot_slo_sec
-            if m.tpot_slo_sec is not None
-            else (goodput_config.constraints.get("tpot") if goodput_config else None)
+    def per_request_slo(slo_attr: str, constraint: str) -> np.ndarray:
+        # A request's own SLO overrides the configured constraint; NaN where neither applies
+        default = constraints.get(constraint)
+        return np.array(
+            [
+                slo if (slo := getattr(m, slo_attr)) is not None else (default if default is not None else np.nan)
+                for m in metrics
+            ],
+            dtype=np.float64,
         )
 
-        effective_itl_slo = goodput_config.constraints.get("itl") if goodput_config else None
-        effective_ntpot_slo = goodput_config.constraints.get("ntpot") if goodput_config else None
-        effective_latency_slo = goodput_config.constraints.get("request_latency") if goodput_config else None
-
-        if effective_ttft_slo is not None:
-            total_applicable_counts["ttft"] += 1
-            val = ttft_values[i]
-            if val is not None and val <= effective_ttft_slo:
-                attainment_counts["ttft"] += 1
-            else:
-                is_good = False
-
-        if effective_tpot_slo is not None:
-            total_applicable_counts["tpot"] += 1
-            val = tpot_values[i]
-            if val is not None and val <= effective_tpot_slo:
-                attainment_counts["tpot"] += 1
-            else:
-                is_good = False
-
-        if effective_itl_slo is not None:
-            total_applicable_counts["itl"] += 1
-            val = itl_values[i]
-            if val is not None and val <= effective_itl_slo:
-                attainment_counts["itl"] += 1
-            else:
-                is_good = False
-
-        if effective_ntpot_slo is not None:
-            total_applicable_counts["ntpot"] += 1
-            val = ntpot_values[i]
-            if val is not None and val <= effective_ntpot_slo:
-                attainment_counts["ntpot"] += 1
-            else:
-                is_good = False
-
-        if effective_latency_slo is not None:
-            total_applicable_counts["request_latency"] += 1
-            val = request_latency_values[i]
-            if val is not None and val <= effective_latency_slo:
-                attainment_counts["request_latency"] += 1
-            else:
-                is_good = False
+    slos: Dict[str, np.ndarray] = {
+        "ttft": per_request_slo("ttft_slo_sec", "ttft"),
+        "tpot": per_request_slo("tpot_slo_sec", "tpot"),
+    }
+    for name in ("itl", "ntpot", "request_latency"):
+        if constraints.get(name) is not None:
+            slos[name] = np.full(total, constraints[name], dtype=np.float64)
+    values: Dict[str, Any] = {
+        "ttft": ttft_values,
+        "tpot": tpot_values,
+        "itl": itl_values,
+        "ntpot": ntpot_values,
+        "request_latency": request_latency_values,
+    }
 
-        if is_good:
-            good_requests_count += 1
-            in_tokens = m.info.request_metrics.text.input_tokens
-            out_tokens = effective_output_tokens(m.info.response_metrics, use_server_output_tokens)
-            good_total_tokens += in_tokens + out_tokens
+    is_good = np.ones(total, dtype=bool)
+    attainment_counts: Dict[str, int] = {}
+    total_applicable_counts: Dict[str, int] = {}
+    for name, slo in slos.items():
+        applicable = ~np.isnan(slo)
+        # Undefined values (None or NaN) never meet an SLO
+        met = np.less_equal(np.array(values[name], dtype=np.float64), slo, where=applicable, out=np.zeros(total, dtype=bool))
+        total_applicable_counts[name] = int(applicable.sum())
+        attainment_counts[name] = int(met.sum())
+        is_good &= met | ~applicable
+
+    good_requests_count = int(is_good.sum())
+    good_total_tokens = sum(
+        metrics[i].info.request_metrics.text.input_tokens
+        + effective_output_tokens(metrics[i].info.response_metrics, use_server_output_tokens)
+        for i in np.flatnonzero(is_good)
+    )
 
     goodput_percentage = (good_requests_count / total * 100) if total > 0 else 0.0
     request_goodput = good_requests_count / total_benchmark_time if total_benchmark_time > 0 else 0.0
@@ -459,6 +462,128 @@ def summarize_prometheus_metrics(metrics: ModelServerMetrics) -> ResponsesSummar
     )
 
 
+def summarize_coordinated_omission(
+    metrics: List[RequestLifecycleMetric], percentiles: List[float], sketch_accuracy: Optional[float] = None
+) -> dict[str, Any]:
+    """Latencies measured from each request's scheduled time rather than its send time.
+
+    When a worker falls behind its schedule, the time a request spends waiting to be sent is part of the
+    latency an open-loop client would have seen; measuring from the send time hides it.
+    """
+    successful = [x for x in metrics if x.error is None]
+    ttft_values = [
+        m.info.response_metrics.output_token_times[0] - m.scheduled_time
+        for m in successful
+        if isinstance(m.info.response_metrics, StreamedResponseMetrics) and len(m.info.response_metrics.output_token_times) > 1
+    ]
+    return {
+        "request_latency": summarize([m.end_time - m.scheduled_time for m in successful], percentiles, sketch_accuracy),
+        "time_to_first_token": summarize(ttft_values, percentiles, sketch_accuracy),
+    }
+
+
+def summarize_json_codec(
+    metrics: List[RequestLifecycleMetric], percentiles: List[float], codec: str, sketch_accuracy: Optional[float] = None
+) -> Optional[dict[str, Any]]:
+    """The active JSON codec and the time each request spent encoding its body and decoding responses."""
+    encode_times = [m.json_encode_time for m in metrics if m.json_encode_time is not None]
+    decode_times = [m.json_decode_time for m in metrics if m.json_decode_time is not None]
+    if not encode_times and not decode_times:
+        return None
+    return {
+        "codec": codec,
+        "encode_time": summarize(encode_times, percentiles, sketch_accuracy),
+        "decode_time": summarize(decode_times, percentiles, sketch_accuracy),
+    }
+
+
+class _TokenGaps:
+    """Gaps between consecutive output token times of each request, computed a block of requests at a time."""
+
+    BLOCK_TOKENS = 1 << 20
+
+    def __init__(self, sketch: Optional[QuantileSketch]) -> None:
+        self.sketch = sketch
+        self._gaps: List[np.ndarray] = []
+        self._pending: List[List[float]] = []
+        self._pending_tokens = 0
+
+    def add(self, token_times: List[float]) -> None:
+        self._pending.append(token_times)
+        self._pending_tokens += len(token_times)
+        if self._pending_tokens >= self.BLOCK_TOKENS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        lengths = np.fromiter((len(times) for times in self._pending), dtype=np.int64, count=len(self._pending))
+        times = np.fromiter(chain.from_iterable(self._pending), dtype=np.float64, count=int(lengths.sum()))
+        self._pending = []
+        self._pending_tokens = 0
+        gaps = np.diff(times)
+        # Drop the gap from each request's last token to the next request's first
+        gaps = np.delete(gaps, np.cumsum(lengths)[:-1] - 1)
+        if self.sketch is not None:
+            self.sketch.add(gaps)
+        else:
+            self._gaps.append(gaps)
+
+    def result(self) -> Union[np.ndarray, QuantileSketch]:
+        self._flush()
+        if self.sketch is not None:
+            return self.sketch
+        return np.concatenate(self._gaps) if self._gaps else np.empty(0)
+
+
+def _expand_output_token_times(response_metrics: StreamedResponseMetrics, tokenizer: Optional[CustomTokenizer]) -> bool:
+    """
+    Give every output token of a streamed response the arrival time of its chunk, from the chunk token
+    counts recorded at completion or else by re-tokenizing the raw chunks. Returns whether the token
+    count disagrees with the server-reported completion_tokens.
+    """
+    expected_output_tokens = response_metrics.server_usage.get("completion_tokens") if response_metrics.server_usage else None
+    if response_metrics.chunk_token_counts and len(response_metrics.chunk_token_counts) == len(response_metrics.chunk_times):
+        chunk_token_counts = np.asarray(response_metrics.chunk_token_counts)
+        response_metrics.output_token_times = np.repeat(response_metrics.chunk_times, chunk_token_counts).tolist()
+        return expected_output_tokens is not None and int(chunk_token_counts.sum()) != expected_output_tokens
+
+    if not (response_metrics.response_chunks and tokenizer):
+        return False
+
+    output_token_times: List[float] = []
+    accumulated_tokens = 0
+    parsed_chunks = []
+    for chunk_str, chunk_time in zip(response_metrics.response_chunks, response_metrics.chunk_times, strict=True):
+        try:
+            data = json.loads(chunk_str)
+            if choices := data.get("choices"):
+                delta = choices[0]
+                text = delta.get("text") or delta.get("delta", {}).get("content")
+                if text:
+                    parsed_chunks.append((text, chunk_time))
+        except json.JSONDecodeError:
+            continue
+
+    for text, chunk_time in parsed_chunks:
+        # Count each chunk as a sequence fragment (add_special_tokens=False): re-tokenizing a
+        # chunk with special tokens prepends a BOS per chunk, which inflates the count (~2x at
+        # one token per chunk) and, since these timestamps are the basis for ITL, deflates ITL
+        # by the same factor. See #564.
+        tokens_in_chunk = tokenizer.count_tokens(text, add_special_tokens=False)
+        if tokens_in_chunk > 0:
+            # Assign every token in a chunk the chunk's arrival time to match user-perceived
+            # latency: intra-chunk ITL is 0, inter-chunk ITL absorbs the full gap. TPOT still
+            # reports the smoothed average.
+            output_token_times.extend([chunk_time] * tokens_in_chunk)
+            accumulated_tokens += tokens_in_chunk
+
+    response_metrics.output_token_times = output_token_times
+    # Do not overwrite output_tokens with the per-chunk sum. Keep the API layer's whole-message
+    # count_tokens value, and surface the exact server count as `output_tokens`. See #564.
+    return expected_output_tokens is not None and accumulated_tokens != expected_output_tokens
+
+
 def summarize_requests(
     metrics: List[RequestLifecycleMetric],
     percentiles: List[float],
@@ -468,6 +593,7 @@ def summarize_requests(
     tokenizer: Optional[CustomTokenizer] = None,
     use_server_output_tokens: bool = False,
     max_error_messages: int = 100,
+    sketch_accuracy: Optional[float] = None,
 ) -> ResponsesSummary:
     all_successful: List[RequestLifecycleMetric] = [x for x in metrics if x.error is None]
     all_failed: List[RequestLifecycleMetric] = [x for x in metrics if x.error is not None]
@@ -479,7 +605,7 @@ def summarize_requests(
 
     load_summary: dict[Any, Any] = {
         "count": len(metrics),
-        "schedule_delay": summarize(schedule_deltas, percentiles),
+        "schedule_delay": summarize(schedule_deltas, percentiles, sketch_accuracy),
     }
 
     if stage_rate is not None:
@@ -488,7 +614,7 @@ def summarize_requests(
         achieved_rate = len(metrics) / send_duration if send_duration > 0 else 0.0
         load_summary = {
             "count": len(metrics),
-            "schedule_delay": summarize(schedule_deltas, percentiles),
+            "schedule_delay": summarize(schedule_deltas, percentiles, sketch_accuracy),
             "send_duration": send_duration,
             "requested_rate": stage_rate,
             "achieved_rate": achieved_rate,
@@ -496,105 +622,54 @@ def summarize_requests(
         if stage_concurrency is not None:
             load_summary["concurrency"] = stage_concurrency
 
-    # --- Pre-calculate Metrics for all successful requests ---
-    # We maintain 1:1 mapping with 'all_successful' to pass to SLO calculator
+    load_summary["percentile_mode"] = PercentileMode.EXACT.value if sketch_accuracy is None else PercentileMode.SKETCH.value
+    if sketch_accuracy is not None:
+        load_summary["percentile_relative_accuracy"] = sketch_accuracy
 
-    ntpot_values: List[float] = []
-    tpot_values: List[Optional[float]] = []  # Optional: None if not streamable
-    ttft_values: List[Optional[float]] = []  # Optional: None if not streamable
-    request_latency_values: List[float] = []
-    itl_values: List[Optional[float]] = []
-    inter_token_latencies: List[float] = []
+    # --- Pre-calculate Metrics for all successful requests ---
+    # One Python pass collects the per-request columns; every latency is then derived with array
+    # operations. Arrays stay 1:1 with 'all_successful' for the SLO calculator, NaN where undefined.
+
+    num_successful = len(all_successful)
+    start_times = np.empty(num_successful)
+    end_times = np.empty(num_successful)
+    input_tokens = np.empty(num_successful)
+    output_tokens = np.empty(num_successful)
+    first_token_times = np.full(num_successful, np.nan)
+    last_token_times = np.full(num_successful, np.nan)
+    num_token_times = np.zeros(num_successful, dtype=np.int64)
+    # One value per output token, so in sketch mode they go straight into the sketch instead of an array
+    itl_sketch = QuantileSketch(sketch_accuracy) if sketch_accuracy is not None else None
+    token_gaps = _TokenGaps(itl_sketch)
 
     mismatched_requests = 0
-    for m in all_successful:
-        request_latency_values.append(m.end_time - m.start_time)
-
-        # Process raw chunks if present and tokenizer is available
-        if (
-            isinstance(m.info.response_metrics, StreamedResponseMetrics)
-            and m.info.response_metrics.response_chunks
-            and tokenizer
-        ):
-            output_token_times = []
-            accumulated_tokens = 0
-            parsed_chunks = []
-            expected_output_tokens = (
-                m.info.response_metrics.server_usage.get("completion_tokens") if m.info.response_metrics.server_usage else None
-            )
-
-            for chunk_str, chunk_time in zip(
-                m.info.response_metrics.response_chunks, m.info.response_metrics.chunk_times, strict=True
-            ):
-                try:
-                    data = json.loads(chunk_str)
-                    if choices := data.get("choices"):
-                        delta = choices[0]
-                        text = delta.get("text") or delta.get("delta", {}).get("content")
-                        if text:
-                            parsed_chunks.append((text, chunk_time))
-                except json.JSONDecodeError:
-                    continue
-
-            for text, chunk_time in parsed_chunks:
-                # Count each chunk as a sequence fragment (add_special_tokens=False): re-tokenizing a
-                # chunk with special tokens prepends a BOS per chunk, which inflates the count (~2x at
-                # one token per chunk) and, since these timestamps are the basis for ITL, deflates ITL
-                # by the same factor. See #564.
-                tokens_in_chunk = tokenizer.count_tokens(text, add_special_tokens=False)
-                if tokens_in_chunk > 0:
-                    # Assign every token in a chunk the chunk's arrival time to match user-perceived
-                    # latency: intra-chunk ITL is 0, inter-chunk ITL absorbs the full gap. TPOT still
-                    # reports the smoothed average.
-                    for _ in range(tokens_in_chunk):
-                        output_token_times.append(chunk_time)
-                    accumulated_tokens += tokens_in_chunk
-
-            m.info.response_metrics.output_token_times = output_token_times
-            # Do not overwrite output_tokens with the per-chunk sum. Keep the API layer's whole-message
-            # count_tokens value, and surface the exact server count as `output_tokens`. See #564.
-
-            if expected_output_tokens is not None and accumulated_tokens != expected_output_tokens:
-                mismatched_requests += 1
-
-        # NTPOT: (End - Start) / Output Tokens (Calculated for ALL successful requests)
-        ntpot_output_tokens = effective_output_tokens(m.info.response_metrics, use_server_output_tokens)
-        if ntpot_output_tokens > 0:
-            ntpot_values.append((m.end_time - m.start_time) / ntpot_output_tokens)
-        else:
-            ntpot_values.append(0.0)
-
-        # Check if streamable: Must have more than 1 output token timestamp
+    for i, m in enumerate(all_successful):
+        start_times[i] = m.start_time
+        end_times[i] = m.end_time
+        input_tokens[i] = safe_float(m.info.request_metrics.text.input_tokens)
         response_metrics = m.info.response_metrics
-        if isinstance(response_metrics, StreamedResponseMetrics) and len(response_metrics.output_token_times) > 1:
-            # TTFT: First Token Time - Start Time
-            ttft = response_metrics.output_token_times[0] - m.start_time
-            ttft_values.append(ttft)
-
-            # TPOT: (Last Token Time - First Token Time) / (Num Output Tokens - 1)
-            duration = response_metrics.output_token_times[-1] - response_metrics.output_token_times[0]
-            tpot_output_tokens = effective_output_tokens(response_metrics, use_server_output_tokens)
-            if tpot_output_tokens > 1:
-                tpot = duration / (tpot_output_tokens - 1)
-            else:
-                tpot = None
-            tpot_values.append(tpot)
-
-            # Add inter-token deltas
-            request_itl = []
-            for t1, t2 in zip(response_metrics.output_token_times, response_metrics.output_token_times[1:], strict=False):
-                inter_token_latencies.append(t2 - t1)
-                request_itl.append(t2 - t1)
-
-            if request_itl:
-                itl_values.append(sum(request_itl) / len(request_itl))
-            else:
-                itl_values.append(None)
-        else:
-            # Not streamable, so TTFT and TPOT are undefined
-            ttft_values.append(None)
-            tpot_values.append(None)
-            itl_values.append(None)
+        output_tokens[i] = effective_output_tokens(response_metrics, use_server_output_tokens)
+        if isinstance(response_metrics, StreamedResponseMetrics):
+            if _expand_output_token_times(response_metrics, tokenizer):
+                mismatched_requests += 1
+            # Streamable only with more than 1 output token timestamp
+            token_times = response_metrics.output_token_times
+            if len(token_times) > 1:
+                first_token_times[i] = token_times[0]
+                last_token_times[i] = token_times[-1]
+                num_token_times[i] = len(token_times)
+                token_gaps.add(token_times)
+
+    request_latency_values = end_times - start_times
+    # NTPOT: (End - Start) / Output Tokens (Calculated for ALL successful requests)
+    ntpot_values = np.divide(request_latency_values, output_tokens, out=np.zeros(num_successful), where=output_tokens > 0)
+    # TTFT: First Token Time - Start Time
+    ttft_values = first_token_times - start_times
+    # TPOT: (Last Token Time - First Token Time) / (Num Output Tokens - 1)
+    decode_times = last_token_times - first_token_times
+    tpot_values = np.where(output_tokens > 1, decode_times / np.maximum(output_tokens - 1, 1), np.nan)
+    # Mean inter-token gap of each request
+    itl_values = decode_times / np.maximum(num_token_times - 1, 1)
 
     # --- Calculate Goodput Metrics ---
     goodput_metrics = calculate_goodput_metrics(
@@ -608,9 +683,9 @@ def summarize_requests(
         use_server_output_tokens=use_server_output_tokens,
     )
 
-    # --- Filter lists for summarization (remove Nones) ---
-    valid_tpot = [v for v in tpot_values if v is not None]
-    valid_ttft = [v for v in ttft_values if v is not None]
+    # --- Filter arrays for summarization (remove undefined values) ---
+    valid_tpot = tpot_values[~np.isnan(tpot_values)]
+    valid_ttft = ttft_values[~np.isnan(ttft_values)]
 
     request_sizes = [len(x.request_data.encode("utf-8")) for x in all_successful]
     all_images = []
@@ -637,59 +712,41 @@ def summarize_requests(
     successes_dict: dict[str, Any] = {
         "count": len(all_successful),
         "latency": {
-            "request_latency": summarize(request_latency_values, percentiles),
-            "normalized_time_per_output_token": summarize(ntpot_values, percentiles),
-            "time_per_output_token": summarize(valid_tpot, percentiles),
-            "time_to_first_token": summarize(valid_ttft, percentiles),
-            "inter_token_latency": summarize(inter_token_latencies, percentiles),
+            "request_latency": summarize(request_latency_values, percentiles, sketch_accuracy),
+            "normalized_time_per_output_token": summarize(ntpot_values, percentiles, sketch_accuracy),
+            "time_per_output_token": summarize(valid_tpot, percentiles, sketch_accuracy),
+            "time_to_first_token": summarize(valid_ttft, percentiles, sketch_accuracy),
+            "inter_token_latency": summarize(token_gaps.result(), percentiles, sketch_accuracy),
         },
         "throughput": {
-            "input_tokens_per_sec": (
-                sum(safe_float(x.info.request_metrics.text.input_tokens) for x in all_successful) / total_time
-                if total_time > 0
-                else 0.0
-            ),
-            "output_tokens_per_sec": (
-                sum(effective_output_tokens(x.info.response_metrics, use_server_output_tokens) for x in all_successful)
-                / total_time
-                if total_time > 0
-                else 0.0
-            ),
-            "total_tokens_per_sec": (
-                sum(
-                    safe_float(x.info.request_metrics.text.input_tokens)
-                    + effective_output_tokens(x.info.response_metrics, use_server_output_tokens)
-                    for x in all_successful
-                )
-                / total_time
-                if total_time > 0
-                else 0.0
-            ),
+            "input_tokens_per_sec": (float(input_tokens.sum()) / total_time if total_time > 0 else 0.0),
+            "output_tokens_per_sec": (float(output_tokens.sum()) / total_time if total_time > 0 else 0.0),
+            "total_tokens_per_sec": (float(input_tokens.sum() + output_tokens.sum()) / total_time if total_time > 0 else 0.0),
             "requests_per_sec": (len(all_successful) / total_time if total_time > 0 else 0.0),
             "images_per_sec": (sum(image_counts) / total_time if total_time > 0 else 0.0),
             "videos_per_sec": (sum(video_counts) / total_time if total_time > 0 else 0.0),
             "audios_per_sec": (sum(audio_counts) / total_time if total_time > 0 else 0.0),
         },
-        "request_size_bytes": summarize([float(x) for x in request_sizes], percentiles),
+        "request_size_bytes": summarize([float(x) for x in request_sizes], percentiles, sketch_accuracy),
         "image": {
-            "count": summarize(image_counts, percentiles),
-            "pixels": summarize([safe_float(inst.pixels) for inst in all_images], percentiles),
-            "bytes": summarize([safe_float(inst.bytes) for inst in all_images], percentiles),
-            "aspect_ratio": summarize([safe_float(inst.aspect_ratio) for inst in all_images], percentiles),
+            "count": summarize(image_counts, percentiles, sketch_accuracy),
+            "pixels": summarize([safe_float(inst.pixels) for inst in all_images], percentiles, sketch_accuracy),
+            "bytes": summarize([safe_float(inst.bytes) for inst in all_images], percentiles, sketch_accuracy),
+            "aspect_ratio": summarize([safe_float(inst.aspect_ratio) for inst in all_images], percentiles, sketch_accuracy),
         },
         "video": {
-            "count": summarize(video_counts, percentiles),
-            "frames": summarize([safe_float(inst.frames) for inst in all_videos], percentiles),
-            "pixels": summarize([safe_float(inst.pixels) for inst in all_videos], percentiles),
-            "bytes": summarize([safe_float(inst.bytes) for inst in all_videos], percentiles),
-            "aspect_ratio": summarize([safe_float(inst.aspect_ratio) for inst in all_videos], percentiles),
+            "count": summarize(video_counts, percentiles, sketch_accuracy),
+            "frames": summarize([safe_float(inst.frames) for inst in all_videos], percentiles, sketch_accuracy),
+            "pixels": summarize([safe_float(inst.pixels) for inst in all_videos], percentiles, sketch_accuracy),
+            "bytes": summarize([safe_float(inst.bytes) for inst in all_videos], percentiles, sketch_accuracy),
+            "aspect_ratio": summarize([safe_float(inst.aspect_ratio) for inst in all_videos], percentiles, sketch_accuracy),
         },
         "audio": {
-            "count": summarize(audio_counts, percentiles),
-            "seconds": summarize([safe_float(inst.seconds) for inst in all_audios], percentiles),
-            "bytes": summarize([safe_float(inst.bytes) for inst in all_audios], percentiles),
+            "count": summarize(audio_counts, percentiles, sketch_accuracy),
+            "seconds": summarize([safe_float(inst.seconds) for inst in all_audios], percentiles, sketch_accuracy),
+            "bytes": summarize([safe_float(inst.bytes) for inst in all_audios], percentiles, sketch_accuracy),
         },
-        "prompt_tokens": summarize_prompt_token_usage(all_successful, percentiles),
+        "prompt_tokens": summarize_prompt_token_usage(all_successful, percentiles, sketch_accuracy),
         "output_len": summarize(
             [
                 float(v)
@@ -697,8 +754,9 @@ def summarize_requests(
                 if success.info.response_metrics and (v := success.info.response_metrics.output_tokens) is not None
             ],
             percentiles,
+            sketch_accuracy,
         ),
-        "output_tokens": summarize_output_token_usage(all_successful, percentiles),
+        "output_tokens": summarize_output_token_usage(all_successful, percentiles, sketch_accuracy),
         "token_count_mismatches": mismatched_requests,
     }
     if goodput_metrics:
@@ -710,8 +768,10 @@ def summarize_requests(
         successes=successes_dict,
         failures={
             "count": len(all_failed),
-            "request_latency": summarize([(failed.end_time - failed.start_time) for failed in all_failed], percentiles),
-            "prompt_tokens": summarize_prompt_token_usage(all_failed, percentiles),
+            "request_latency": summarize(
+                [(failed.end_time - failed.start_time) for failed in all_failed], percentiles, sketch_accuracy
+            ),
+            "prompt_tokens": summarize_prompt_token_usage(all_failed, percentiles, sketch_accuracy),
             "by_label": build_error_counts(
                 [(m.error.error_type, m.error.error_msg, m.session_id) for m in all_failed if m.error is not None],
                 max_error_messages,
@@ -754,10 +814,18 @@ class ReportGenerator:
         self, report_config: ReportConfig, runtime_parameters: PerfRuntimeParameters
     ) -> List[ReportFile]:
         logger.info("Generating Reports...")
-        lifecycle_reports = []
+        lifecycle_reports: List[ReportFile] = []
+        # Listed after the per-request report
+        adapter_reports: List[ReportFile] = []
         percentiles = report_config.request_lifecycle.percentiles
         use_server_output_tokens = report_config.request_lifecycle.use_server_output_tokens
         max_error_messages = report_config.request_lifecycle.max_error_messages
+        sketch_accuracy = (
+            report_config.request_lifecycle.sketch_relative_accuracy
+            if report_config.request_lifecycle.percentile_mode == PercentileMode.SKETCH
+            else None
+        )
+        json_codec = get_json_codec(self.config.api.json_codec).name
 
         tokenizer = None
         if self.config.tokenizer:
@@ -765,120 +833,165 @@ class ReportGenerator:
 
             tokenizer = CustomTokenizer(self.config.tokenizer)
 
+        # Only the whole-run reports need every metric at once; per-stage and per-request reports stream them
+        # from the collector, which keeps memory bounded when it spills metrics to disk.
+        lifecycle_config = report_config.request_lifecycle
+        needs_all_metrics = bool(
+            lifecycle_config.summary
+            or lifecycle_config.per_adapter
+            or lifecycle_config.per_adapter_stage
+            or (self.session_metrics_collector and report_config.session_lifecycle)
+        )
+        if needs_all_metrics and lifecycle_config.spill_to_disk:
+            whole_run_reports = [
+                name
+                for name, enabled in (
+                    ("summary", lifecycle_config.summary),
+                    ("per_adapter", lifecycle_config.per_adapter),
+                    ("per_adapter_stage", lifecycle_config.per_adapter_stage),
+                    ("session_lifecycle", self.session_metrics_collector and report_config.session_lifecycle),
+                )
+                if enabled
+            ]
+            logger.warning(
+                f"spill_to_disk is set, but the {', '.join(whole_run_reports)} report(s) load every request metric into "
+                "memory at once; disable them to keep report generation bounded as well"
+            )
         # Filter out the preprocessing stage -1
-        request_metrics = [
-            metric for metric in self.metrics_collector.get_metrics() if metric.stage_id is not None and metric.stage_id >= 0
-        ]
+        request_metrics = (
+            [metric for metric in self.metrics_collector.get_metrics() if metric.stage_id is not None and metric.stage_id >= 0]
+            if needs_all_metrics
+            else []
+        )
 
-        if report_config.request_lifecycle.summary:
-            if len(request_metrics) != 0:
-                report_file = ReportFile(
-                    name="summary_lifecycle_metrics",
-                    contents=summarize_requests(
-                        request_metrics,
-                        percentiles,
-                        goodput_config=report_config.goodput,
-                        tokenizer=tokenizer,
-                        use_server_output_tokens=use_server_output_tokens,
-                        max_error_messages=max_error_messages,
-                    ).model_dump(),
-                )
-                lifecycle_reports.append(report_file)
-
-        if report_config.request_lifecycle.per_stage:
-            stage_buckets: dict[int, List[RequestLifecycleMetric]] = defaultdict(list)
-            for metric in request_metrics:
-                if metric.stage_id is not None:
-                    stage_buckets[metric.stage_id].append(metric)
-            for stage_id, metrics in stage_buckets.items():
-                stage_rate = runtime_parameters.stages[stage_id].rate
-                concurrency_level = runtime_parameters.stages[stage_id].concurrency_level
-                if concurrency_level is not None:
-                    report_file = ReportFile(
-                        name=f"stage_{stage_id}_lifecycle_metrics",
-                        contents=summarize_requests(
-                            metrics,
-                            percentiles,
-                            stage_rate,
-                            concurrency_level,
-                            goodput_config=report_config.goodput,
-                            tokenizer=tokenizer,
-                            use_server_output_tokens=use_server_output_tokens,
-                            max_error_messages=max_error_messages,
-                        ).model_dump(),
-                    )
+        from inference_perf.reportgen.parallel import BucketSummarizer
+
+        # Summaries are filled in once their buckets are summarized, which may be on a process pool; the
+        # load_summary additions are computed here in the meantime.
+        pending_summaries: List[tuple[ReportFile, "Future[Dict[str, Any]]", Dict[str, Any]]] = []
+        with BucketSummarizer(
+            lifecycle_config.report_workers,
+            percentiles,
+            goodput_config=report_config.goodput,
+            tokenizer=tokenizer,
+            use_server_output_tokens=use_server_output_tokens,
+            max_error_messages=max_error_messages,
+            sketch_accuracy=sketch_accuracy,
+        ) as summarizer:
+            if report_config.request_lifecycle.summary:
+                if len(request_metrics) != 0:
+                    report_file = ReportFile(name="summary_lifecycle_metrics", contents=None)
+                    load_summary_extras: Dict[str, Any] = {}
+                    future = summarizer.submit(request_metrics)
+                    json_codec_summary = summarize_json_codec(request_metrics, percentiles, json_codec, sketch_accuracy)
+                    if json_codec_summary is not None:
+                        load_summary_extras["json_codec"] = json_codec_summary
+                    pending_summaries.append((report_file, future, load_summary_extras))
+                    lifecycle_reports.append(report_file)
+
+            if report_config.request_lifecycle.per_stage:
+                stage_buckets: Iterable[tuple[int, List[RequestLifecycleMetric]]]
+                if needs_all_metrics:
+                    buckets: dict[int, List[RequestLifecycleMetric]] = defaultdict(list)
+                    for metric in request_metrics:
+                        if metric.stage_id is not None:
+                            buckets[metric.stage_id].append(metric)
+                    stage_buckets = buckets.items()
                 else:
-                    report_file = ReportFile(
-                        name=f"stage_{stage_id}_lifecycle_metrics",
-                        contents=summarize_requests(
-                            metrics,
-                            percentiles,
-                            stage_rate,
-                            goodput_config=report_config.goodput,
-                            tokenizer=tokenizer,
-                            use_server_output_tokens=use_server_output_tokens,
-                            max_error_messages=max_error_messages,
-                        ).model_dump(),
+                    # Send each stage to the pool as it is loaded rather than holding them all
+                    summarizer.start()
+                    stage_buckets = self._stream_stage_metrics(runtime_parameters)
+                for stage_id, metrics in stage_buckets:
+                    stage = runtime_parameters.stages[stage_id]
+                    report_file = ReportFile(name=f"stage_{stage_id}_lifecycle_metrics", contents=None)
+                    future = summarizer.submit(metrics, stage.rate, stage.concurrency_level, shared=needs_all_metrics)
+                    load_summary_extras = {}
+                    if stage.dispatch is not None:
+                        load_summary_extras["dispatch"] = stage.dispatch.model_dump()
+                    if stage.parent_cpu_utilization is not None:
+                        load_summary_extras["parent_cpu_utilization"] = stage.parent_cpu_utilization
+                    if stage.schedule_slip is not None:
+                        load_summary_extras["schedule_slip"] = stage.schedule_slip.model_dump()
+                        if stage.schedule_slip.policy == DispatchPolicy.COORDINATED_OMISSION_CORRECTED.value:
+                            load_summary_extras["coordinated_omission_corrected"] = summarize_coordinated_omission(
+                                metrics, percentiles, sketch_accuracy
+                            )
+                    json_codec_summary = summarize_json_codec(metrics, percentiles, json_codec, sketch_accuracy)
+                    if json_codec_summary is not None:
+                        load_summary_extras["json_codec"] = json_codec_summary
+                    pending_summaries.append((report_file, future, load_summary_extras))
+                    lifecycle_reports.append(report_file)
+
+            if report_config.request_lifecycle.per_adapter:
+                adapter_buckets: dict[Optional[str], List[RequestLifecycleMetric]] = defaultdict(list)
+                for metric in request_metrics:
+                    if metric.info.lora_adapter is not None:
+                        adapter_buckets[metric.info.lora_adapter].append(metric)
+                for adapter, metrics in adapter_buckets.items():
+                    report_file = ReportFile(name=f"adapter_{adapter}_lifecycle_metrics", contents=None)
+                    pending_summaries.append((report_file, summarizer.submit(metrics), {}))
+                    adapter_reports.append(report_file)
+
+            if report_config.request_lifecycle.per_adapter_stage:
+                # Group by (adapter, stage_id) tuple
+                adapter_stage_buckets: dict[tuple[Optional[str], int], List[RequestLifecycleMetric]] = defaultdict(list)
+                for metric in request_metrics:
+                    if metric.stage_id is not None and metric.info.lora_adapter is not None:
+                        adapter_stage_buckets[(metric.info.lora_adapter, metric.stage_id)].append(metric)
+                for (adapter, stage_id), metrics in adapter_stage_buckets.items():
+                    report_file = ReportFile(name=f"adapter_{adapter}_stage_{stage_id}_lifecycle_metrics", contents=None)
+                    future = summarizer.submit(metrics, runtime_parameters.stages[stage_id].rate)
+                    pending_summaries.append((report_file, future, {}))
+                    adapter_reports.append(report_file)
+
+            summarizer.start()
+            if report_config.request_lifecycle.per_request:
+                # Records are produced as the report is written, so the report never holds every request
+                # body at once; without request_metrics they are read from the collector again each time.
+                def per_request_records() -> Iterator[dict[str, Any]]:
+                    for metric in request_metrics if needs_all_metrics else self.metrics_collector.iter_metrics():
+                        if metric.stage_id is not None and metric.stage_id >= 0:
+                            yield {
+                                "start_time": metric.start_time,
+                                "end_time": metric.end_time,
+                                "request": metric.request_data,
+                                "response": metric.response_data,
+                                "info": metric.info.model_dump() if metric.info else None,
+                                "error": metric.error.model_dump() if metric.error else None,
+                            }
+
+                lifecycle_reports.append(
+                    ReportFile.streamed(
+                        "per_request_lifecycle_metrics",
+                        per_request_records,
+                        file_type=lifecycle_config.per_request_format.value,
+                        compression=(
+                            lifecycle_config.per_request_compression.value
+                            if lifecycle_config.per_request_compression
+                            else None
+                        ),
                     )
-                lifecycle_reports.append(report_file)
-
-        if report_config.request_lifecycle.per_request:
-            report_file = ReportFile(
-                name="per_request_lifecycle_metrics",
-                contents=[
-                    {
-                        "start_time": metric.start_time,
-                        "end_time": metric.end_time,
-                        "request": metric.request_data,
-                        "response": metric.response_data,
-                        "info": metric.info.model_dump() if metric.info else None,
-                        "error": metric.error.model_dump() if metric.error else None,
-                    }
-                    for metric in request_metrics
-                ],
-            )
-            lifecycle_reports.append(report_file)
-
-        if report_config.request_lifecycle.per_adapter:
-            adapter_buckets: dict[Optional[str], List[RequestLifecycleMetric]] = defaultdict(list)
-            for metric in request_metrics:
-                if metric.info.lora_adapter is not None:
-                    adapter_buckets[metric.info.lora_adapter].append(metric)
-            for adapter, metrics in adapter_buckets.items():
-                report_file = ReportFile(
-                    name=f"adapter_{adapter}_lifecycle_metrics",
-                    contents=summarize_requests(
-                        metrics,
-                        percentiles,
-                        goodput_config=report_config.goodput,
-                        tokenizer=tokenizer,
-                        use_server_output_tokens=use_server_output_tokens,
-                        max_error_messages=max_error_messages,
-                    ).model_dump(),
                 )
-                lifecycle_reports.append(report_file)
-
-        if report_config.request_lifecycle.per_adapter_stage:
-            # Group by (adapter, stage_id) tuple
-            adapter_stage_buckets: dict[tuple[Optional[str], int], List[RequestLifecycleMetric]] = defaultdict(list)
-            for metric in request_metrics:
-                if metric.stage_id is not None and metric.info.lora_adapter is not None:
-                    adapter_stage_buckets[(metric.info.lora_adapter, metric.stage_id)].append(metric)
-            for (adapter, stage_id), metrics in adapter_stage_buckets.items():
-                stage_rate = runtime_parameters.stages[stage_id].rate
-                report_file = ReportFile(
-                    name=f"adapter_{adapter}_stage_{stage_id}_lifecycle_metrics",
-                    contents=summarize_requests(
-                        metrics,
-                        percentiles,
-                        stage_rate,
-                        goodput_config=report_config.goodput,
-                        tokenizer=tokenizer,
-                        use_server_output_tokens=use_server_output_tokens,
-                        max_error_messages=max_error_messages,
-                    ).model_dump(),
+            if report_config.request_lifecycle.per_request_parquet:
+                from inference_perf.reportgen.parquet_export import parquet_chunks, request_record_batches
+
+                def per_request_parquet_chunks() -> Iterator[bytes]:
+                    metrics = request_metrics if needs_all_metrics else self.metrics_collector.iter_metrics()
+                    return parquet_chunks(
+                        request_record_batches(
+                            (metric for metric in metrics if metric.stage_id is not None and metric.stage_id >= 0),
+                            use_server_output_tokens,
+                        )
+                    )
+
+                lifecycle_reports.append(
+                    ReportFile.encoded_chunks("per_request_lifecycle_metrics", per_request_parquet_chunks, "parquet")
                 )
-                lifecycle_reports.append(report_file)
+            lifecycle_reports.extend(adapter_reports)
+
+            for report_file, future, load_summary_extras in pending_summaries:
+                report_file.contents = await asyncio.wrap_future(future)
+                report_file.contents["load_summary"].update(load_summary_extras)
 
         if report_config.prometheus:
             # This runs after the load has already been sent; a failure here must cost the
@@ -904,6 +1017,17 @@ class ReportGenerator:
         lifecycle_reports.append(self.generate_config_report())
         return lifecycle_reports
 
+    def _stream_stage_metrics(
+        self, runtime_parameters: PerfRuntimeParameters
+    ) -> Iterator[tuple[int, List[RequestLifecycleMetric]]]:
+        """Load the metrics of one stage at a time, skipping stages that recorded none and the preprocessing stages."""
+        for stage_id in sorted(runtime_parameters.stages):
+            if stage_id < 0:
+                continue
+            metrics = list(self.metrics_collector.iter_metrics(stage_id))
+            if metrics:
+                yield stage_id, metrics
+
     def summarize_sessions(
         self, metrics: List[SessionLifecycleMetric], percentiles: List[float], max_error_messages: int = 100
     ) -> Dict[str, Any]:
@@ -0,0 +1,199 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+import multiprocessing as mp
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import pyarrow as pa
+
+from inference_perf.apis import RequestLifecycleMetric
+from inference_perf.config import GoodputConfig
+from inference_perf.metrics.request_collector.compact import CompactMetric, MetricSideStore, decode_metric, encode_metric
+from inference_perf.metrics.request_collector.segments import SEGMENT_SCHEMA, record_batch_metrics, to_record_batch
+from inference_perf.reportgen.base import summarize_requests
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+# Set once per pool process by _init_worker, so the tokenizer is not sent with every bucket
+_worker_tokenizer: Optional[CustomTokenizer] = None
+# Buckets of the current BucketSummarizer, inherited by pool processes when they are forked
+_inherited_buckets: List[Tuple[List[RequestLifecycleMetric], Dict[str, Any]]] = []
+
+
+def _init_worker(tokenizer: Optional[CustomTokenizer]) -> None:
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _summarize_inherited_bucket(index: int) -> Dict[str, Any]:
+    metrics, options = _inherited_buckets[index]
+    return summarize_requests(metrics, tokenizer=_worker_tokenizer, **options).model_dump()
+
+
+def _summarize_bucket(batch: bytes, side_directory: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    side_store = MetricSideStore(side_directory)
+    metrics = [
+        decode_metric(compact, side_store)
+        for compact in record_batch_metrics(pa.ipc.read_record_batch(pa.py_buffer(batch), SEGMENT_SCHEMA))
+    ]
+    return summarize_requests(metrics, tokenizer=_worker_tokenizer, **options).model_dump()
+
+
+def _copy_outcome(source: "Future[Dict[str, Any]]", target: "Future[Dict[str, Any]]") -> None:
+    if (exception := source.exception()) is not None:
+        target.set_exception(exception)
+    else:
+        target.set_result(source.result())
+
+
+class BucketSummarizer:
+    """
+    Runs summarize_requests over the buckets of a report: the whole run, each stage, each adapter.
+
+    With one worker each bucket is summarized inline when submitted. With more, buckets are collected
+    until start() and then summarized on a process pool. Forked pool processes inherit the buckets, so
+    only their summaries cross a pipe. Under other start methods buckets are sent as Arrow record
+    batches of CompactMetrics, the columns the spilled metric segments use, with the request and
+    response bodies in a temporary side store the workers read back; a metric in several buckets is
+    encoded once.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        percentiles: List[float],
+        goodput_config: Optional[GoodputConfig] = None,
+        tokenizer: Optional[CustomTokenizer] = None,
+        use_server_output_tokens: bool = False,
+        max_error_messages: int = 100,
+        sketch_accuracy: Optional[float] = None,
+    ) -> None:
+        self.workers = workers
+        self.tokenizer = tokenizer
+        self.options: Dict[str, Any] = {
+            "percentiles": percentiles,
+            "goodput_config": goodput_config,
+            "use_server_output_tokens": use_server_output_tokens,
+            "max_error_messages": max_error_messages,
+            "sketch_accuracy": sketch_accuracy,
+        }
+        self._pending: List[Tuple[List[RequestLifecycleMetric], Dict[str, Any], bool, Future[Dict[str, Any]]]] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._side_directory: Optional[str] = None
+        self._side_store: Optional[MetricSideStore] = None
+        self._compact: Dict[int, Tuple[RequestLifecycleMetric, CompactMetric]] = {}
+
+    def __enter__(self) -> "BucketSummarizer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _encode(self, metric: RequestLifecycleMetric, shared: bool) -> CompactMetric:
+        assert self._side_store is not None
+        if not shared:
+            return encode_metric(metric, self._side_store)
+        # The metric is kept with its encoding so its id is not reused while cached
+        cached = self._compact.get(id(metric))
+        if cached is None:
+            cached = self._compact[id(metric)] = (metric, encode_metric(metric, self._side_store))
+        return cached[1]
+
+    def submit(
+        self,
+        metrics: List[RequestLifecycleMetric],
+        stage_rate: Optional[float] = None,
+        stage_concurrency: Optional[int] = None,
+        shared: bool = True,
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Summarize one bucket; the future resolves to the summary as a dict. Pass shared=False for metrics
+        that are in no other bucket, so that when sent as record batches they are not kept referenced
+        until close.
+        """
+        options = {**self.options, "stage_rate": stage_rate, "stage_concurrency": stage_concurrency}
+        future: Future[Dict[str, Any]] = Future()
+        if self.workers <= 1:
+            future.set_result(summarize_requests(metrics, tokenizer=self.tokenizer, **options).model_dump())
+        elif self._pool is not None:
+            self._dispatch(metrics, options, shared, future)
+        else:
+            self._pending.append((metrics, options, shared, future))
+        return future
+
+    def start(self) -> None:
+        """Start the pool on the buckets submitted so far; later buckets are sent to it as they come."""
+        if self.workers <= 1 or self._pool is not None:
+            return
+        global _inherited_buckets
+        context = mp.get_context()
+        if context.get_start_method() == "fork":
+            # Forked processes are all started on the first submit and see the buckets as of then
+            _inherited_buckets = [(metrics, options) for metrics, options, _, _ in self._pending]
+        else:
+            self._open_side_store()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_init_worker, initargs=(self.tokenizer,)
+        )
+        pending, self._pending = self._pending, []
+        for index, (metrics, options, shared, future) in enumerate(pending):
+            if self._side_store is None:
+                self._pool.submit(_summarize_inherited_bucket, index).add_done_callback(
+                    functools.partial(_copy_outcome, target=future)
+                )
+            else:
+                self._dispatch(metrics, options, shared, future)
+
+    def _open_side_store(self) -> None:
+        self._side_directory = tempfile.mkdtemp(prefix="inference-perf-report-")
+        self._side_store = MetricSideStore(self._side_directory)
+
+    def _dispatch(
+        self, metrics: List[RequestLifecycleMetric], options: Dict[str, Any], shared: bool, future: "Future[Dict[str, Any]]"
+    ) -> None:
+        assert self._pool is not None
+        if self._side_store is None:
+            # Started by fork: buckets after start() are not in the workers' memory
+            self._open_side_store()
+        assert self._side_store is not None
+        batch = to_record_batch([self._encode(metric, shared) for metric in metrics]).serialize().to_pybytes()
+        # The pool reads the bucket's side entries from disk
+        self._side_store.flush()
+        self._pool.submit(_summarize_bucket, batch, self._side_store.directory, options).add_done_callback(
+            functools.partial(_copy_outcome, target=future)
+        )
+
+    def close(self) -> None:
+        global _inherited_buckets
+        # Buckets never started are dropped
+        for _, _, _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        _inherited_buckets = []
+        if self._side_directory is not None:
+            shutil.rmtree(self._side_directory, ignore_errors=True)
+            self._side_directory = None
+            self._side_store = None
+        self._compact.clear()
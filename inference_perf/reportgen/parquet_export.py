@@ -0,0 +1,141 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""One row per request as Parquet, for analysis that should not re-parse per_request_lifecycle_metrics.json."""
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from inference_perf.apis import RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.reportgen.base import effective_output_tokens, extract_cached_prompt_tokens
+
+# Rows per record batch, each written as one row group with min/max statistics, so readers filtering on
+# stage or time skip the row groups that cannot match
+ROW_GROUP_ROWS = 65536
+
+PER_REQUEST_SCHEMA = pa.schema(
+    [
+        pa.field("stage_id", pa.int32()),
+        pa.field("session_id", pa.string()),
+        pa.field("lora_adapter", pa.string()),
+        pa.field("scheduled_time", pa.float64()),
+        pa.field("start_time", pa.float64()),
+        pa.field("end_time", pa.float64()),
+        pa.field("ttft", pa.float64()),
+        pa.field("tpot", pa.float64()),
+        pa.field("input_tokens", pa.int64()),
+        pa.field("output_tokens", pa.int64()),
+        pa.field("cached_tokens", pa.int64()),
+        pa.field("error_type", pa.string()),
+        pa.field("chunk_times", pa.list_(pa.float64())),
+    ]
+)
+
+
+def _latencies(metric: RequestLifecycleMetric, output_tokens: int) -> Tuple[Optional[float], Optional[float]]:
+    """TTFT and TPOT as summarize_requests defines them; None when the response was not streamed."""
+    response_metrics = metric.info.response_metrics
+    if not isinstance(response_metrics, StreamedResponseMetrics):
+        return None, None
+    # Before report generation expands them, output token times may still be the chunk times; the first
+    # and last are the same either way
+    token_times = response_metrics.output_token_times or response_metrics.chunk_times
+    if len(token_times) <= 1:
+        return None, None
+    tpot = (token_times[-1] - token_times[0]) / (output_tokens - 1) if output_tokens > 1 else None
+    return token_times[0] - metric.start_time, tpot
+
+
+def request_record_batches(
+    metrics: Iterable[RequestLifecycleMetric], use_server_output_tokens: bool = False, batch_rows: int = ROW_GROUP_ROWS
+) -> Iterator[pa.RecordBatch]:
+    """PER_REQUEST_SCHEMA record batches of at most batch_rows requests each."""
+    iterator = iter(metrics)
+    while batch := list(islice(iterator, batch_rows)):
+        columns: dict[str, List[Any]] = {name: [] for name in PER_REQUEST_SCHEMA.names}
+        for metric in batch:
+            response_metrics = metric.info.response_metrics
+            output_tokens = effective_output_tokens(response_metrics, use_server_output_tokens)
+            ttft, tpot = _latencies(metric, output_tokens)
+            cached = extract_cached_prompt_tokens(response_metrics.server_usage if response_metrics else None)
+            columns["stage_id"].append(metric.stage_id)
+            columns["session_id"].append(metric.session_id)
+            columns["lora_adapter"].append(metric.info.lora_adapter)
+            columns["scheduled_time"].append(metric.scheduled_time)
+            columns["start_time"].append(metric.start_time)
+            columns["end_time"].append(metric.end_time)
+            columns["ttft"].append(ttft)
+            columns["tpot"].append(tpot)
+            columns["input_tokens"].append(metric.info.request_metrics.text.input_tokens)
+            columns["output_tokens"].append(output_tokens)
+            columns["cached_tokens"].append(cached[0] if cached else None)
+            columns["error_type"].append(metric.error.error_type if metric.error else None)
+            columns["chunk_times"].append(
+                response_metrics.chunk_times if isinstance(response_metrics, StreamedResponseMetrics) else None
+            )
+        yield pa.RecordBatch.from_pydict(columns, schema=PER_REQUEST_SCHEMA)
+
+
+class _ChunkSink:
+    """Write target for ParquetWriter that hands back what was written since the last drain."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_chunks(batches: Iterable[pa.RecordBatch], schema: pa.Schema = PER_REQUEST_SCHEMA) -> Iterator[bytes]:
+    """A zstd-compressed Parquet file of batches, one row group each, yielded as each row group is written."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    for batch in batches:
+        writer.write_batch(batch)
+        if data := sink.drain():
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def read_request_metrics(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Union[List[Tuple[Any, ...]], List[List[Tuple[Any, ...]]]]] = None,
+) -> pa.Table:
+    """
+    Read a per_request_lifecycle_metrics.parquet export, only the given columns and only rows matching
+    filters (e.g. [("stage_id", "=", 2)]); row groups whose statistics rule out a match are not read.
+    """
+    return pq.read_table(path, columns=list(columns) if columns is not None else None, filters=filters)
@@ -0,0 +1,100 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+from collections import Counter
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+# Magnitudes below this are counted as zero; well under the resolution of any latency we measure
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Quantile sketch with a relative error bound, in the style of DDSketch.
+
+    Values fall into logarithmically sized buckets, so any quantile is returned within
+    relative_accuracy of the true value while memory grows with the log of the value range
+    rather than the number of values. count, sum, min and max are tracked exactly. Values
+    can be added a block at a time, which gives the same result as adding them all at once.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Counter[int] = Counter()
+        self.negative: Counter[int] = Counter()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _add_to(self, store: Counter[int], magnitudes: np.ndarray) -> None:
+        if len(magnitudes) == 0:
+            return
+        indexes, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64), return_counts=True)
+        store.update(dict(zip(indexes.tolist(), counts.tolist(), strict=True)))
+
+    def add(self, values: Union[float, Iterable[float], np.ndarray]) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        magnitudes = np.abs(values)
+        indexable = magnitudes >= MIN_INDEXABLE_VALUE
+        self.zero_count += int(len(values) - np.count_nonzero(indexable))
+        self._add_to(self.positive, values[indexable & (values > 0)])
+        self._add_to(self.negative, -values[indexable & (values < 0)])
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint (in relative terms) of the bucket (gamma^(index-1), gamma^index]
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        """Values at quantiles qs (each in [0, 1]), ranked like numpy's default linear percentile."""
+        if self.count == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        negative_indexes = sorted(self.negative, reverse=True)
+        positive_indexes = sorted(self.positive)
+        values = np.array(
+            [-self._bucket_value(i) for i in negative_indexes] + [0.0] + [self._bucket_value(i) for i in positive_indexes]
+        )
+        counts = np.array(
+            [self.negative[i] for i in negative_indexes] + [self.zero_count] + [self.positive[i] for i in positive_indexes]
+        )
+        cumulative = np.cumsum(counts)
+        ranks = np.asarray(qs, dtype=np.float64) * (self.count - 1)
+        buckets = np.searchsorted(cumulative, ranks, side="right")
+        estimates = np.clip(values[np.minimum(buckets, len(values) - 1)], self.min, self.max)
+        # The extremes are tracked exactly
+        estimates[ranks <= 0] = self.min
+        estimates[ranks >= self.count - 1] = self.max
+        return [float(v) for v in estimates]
+
+    def summarize(self, percentiles: List[float]) -> Optional[dict[str, float]]:
+        """The same keys as reportgen's exact summarize."""
+        if self.count == 0:
+            return None
+        result = {"mean": self.sum / self.count, "min": self.min, "max": self.max}
+        for p, value in zip(percentiles, self.quantiles([p / 100 for p in percentiles]), strict=True):
+            result["median" if p == 50 else f"p{p:g}"] = value
+        return result
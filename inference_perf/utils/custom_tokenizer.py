@@ -11,16 +11,32 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
 from transformers import AutoTokenizer, PreTrainedTokenizerBase
 from transformers.tokenization_utils_base import VERY_LARGE_INTEGER
 from inference_perf.config import CustomTokenizerConfig
 
+# Upper bound on the texts encoded in one batch call, so a burst of completions doesn't
+# hold up the counts that arrive behind it for too long
+MAX_TOKEN_COUNT_BATCH = 64
+
 
 class CustomTokenizer:
     def __init__(self, config: CustomTokenizerConfig) -> None:
         self.tokenizer: PreTrainedTokenizerBase = AutoTokenizer.from_pretrained(
             config.pretrained_model_name_or_path, token=config.token, trust_remote_code=config.trust_remote_code
         )
+        self._batcher: Optional[TokenCountBatcher] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The batcher holds an executor and futures of the current event loop; each worker
+        # process builds its own on first use.
+        state = self.__dict__.copy()
+        state["_batcher"] = None
+        return state
 
     def count_tokens(self, text: str, add_special_tokens: bool = True) -> int:
         if text == "":
@@ -38,6 +54,40 @@ class CustomTokenizer:
             ).input_ids
         )
 
+    def count_tokens_batch(self, texts: List[str], add_special_tokens: bool = True) -> List[int]:
+        """Count the tokens of each text with a single batched encode call; matches count_tokens per text."""
+        counts = [0] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text != ""]
+        if not indices:
+            return counts
+        batch = [texts[i] for i in indices]
+        if self.tokenizer.model_max_length == VERY_LARGE_INTEGER:
+            encoded = self.tokenizer(batch, add_special_tokens=add_special_tokens)
+        else:
+            encoded = self.tokenizer(
+                batch, truncation=True, max_length=self.tokenizer.model_max_length, add_special_tokens=add_special_tokens
+            )
+        for i, input_ids in zip(indices, encoded.input_ids, strict=True):
+            counts[i] = len(input_ids)
+        return counts
+
+    async def count_tokens_async(self, text: str, add_special_tokens: bool = True) -> int:
+        """
+        Count tokens without blocking the event loop.
+
+        Counts requested while a batch is being encoded are queued and coalesced into the next
+        count_tokens_batch call, which runs on the tokenizer thread. HF fast tokenizers release the
+        GIL while encoding, so the loop keeps timestamping chunks of other in-flight requests.
+        """
+        if text == "":
+            return 0
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher.loop is not loop:
+            if self._batcher is not None:
+                self._batcher.close()
+            self._batcher = TokenCountBatcher(self, loop)
+        return await self._batcher.submit(text, add_special_tokens)
+
     def has_chat_template(self) -> bool:
         return getattr(self.tokenizer, "chat_template", None) is not None
 
@@ -56,3 +106,82 @@ class CustomTokenizer:
 
     def get_tokenizer(self) -> PreTrainedTokenizerBase:
         return self.tokenizer
+
+
+class TokenCountBatcher:
+    """Per-event-loop queue of pending token counts, drained in batches on a dedicated thread."""
+
+    def __init__(self, tokenizer: CustomTokenizer, loop: asyncio.AbstractEventLoop) -> None:
+        self.tokenizer = tokenizer
+        self.loop = loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tokenizer")
+        self._pending: List[Tuple[str, bool, asyncio.Future[int]]] = []
+        self._drain_task: Optional[asyncio.Task[None]] = None
+
+    def submit(self, text: str, add_special_tokens: bool) -> "asyncio.Future[int]":
+        future: asyncio.Future[int] = self.loop.create_future()
+        self._pending.append((text, add_special_tokens, future))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = self.loop.create_task(self._drain())
+        return future
+
+    async def _drain(self) -> None:
+        while self._pending:
+            # Texts encoded in one call must share add_special_tokens; the rest wait for the next round
+            add_special_tokens = self._pending[0][1]
+            batch: List[Tuple[str, bool, asyncio.Future[int]]] = []
+            remaining: List[Tuple[str, bool, asyncio.Future[int]]] = []
+            for item in self._pending:
+                if item[1] == add_special_tokens and len(batch) < MAX_TOKEN_COUNT_BATCH:
+                    batch.append(item)
+                else:
+                    remaining.append(item)
+            self._pending = remaining
+            texts = [text for text, _, _ in batch]
+            try:
+                counts = await self.loop.run_in_executor(
+                    self._executor, self.tokenizer.count_tokens_batch, texts, add_special_tokens
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, _, future), count in zip(batch, counts, strict=True):
+                if not future.done():
+                    future.set_result(count)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+async def count_tokens_async(tokenizer: CustomTokenizer, text: str, add_special_tokens: Optional[bool] = None) -> int:
+    """
+    Count tokens of a response off the event loop where the tokenizer supports it.
+
+    Tokenizers that replace count_tokens (test doubles, custom subclasses) are called directly since
+    count_tokens_batch would bypass their counting.
+    """
+    if isinstance(tokenizer, CustomTokenizer) and type(tokenizer).count_tokens is CustomTokenizer.count_tokens:
+        return await tokenizer.count_tokens_async(text, add_special_tokens=add_special_tokens is not False)
+    if add_special_tokens is None:
+        return tokenizer.count_tokens(text)
+    return tokenizer.count_tokens(text, add_special_tokens=add_special_tokens)
+
+
+async def count_chunk_tokens_async(tokenizer: Optional[CustomTokenizer], chunk_texts: List[str]) -> List[int]:
+    """
+    Count the tokens of each streamed chunk as a fragment of the response (no special tokens).
+
+    The counts are stored with the chunk times so reports can expand them into per-token times
+    without re-tokenizing every chunk. Returns [] without a tokenizer to count with, in which case
+    reports fall back to re-tokenizing response_chunks.
+    """
+    if not chunk_texts or not isinstance(tokenizer, CustomTokenizer):
+        return []
+    if type(tokenizer).count_tokens is CustomTokenizer.count_tokens:
+        # Queued together, so the batcher encodes the chunks of a response in as few calls as possible
+        return list(
+            await asyncio.gather(*(tokenizer.count_tokens_async(text, add_special_tokens=False) for text in chunk_texts))
+        )
+    return [tokenizer.count_tokens(text, add_special_tokens=False) for text in chunk_texts]
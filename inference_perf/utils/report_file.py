@@ -12,20 +12,122 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# Streamed reports are handed to storage in chunks of about this many bytes
+CHUNK_SIZE = 1 << 20
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "yaml": "application/yaml",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _zstd_compress(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd report compression requires the zstandard package: pip install inference-perf[zstd]") from e
+    compressor = zstandard.ZstdCompressor().compressobj()
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
 
 
 class ReportFile:
+    """
+    A report to store. contents is written as JSON or YAML, or, for a streamed report, is a function
+    returning a fresh iterable of records each time the report is written, so a report with a record per
+    request is never held in memory whole and can be saved to several storage clients.
+    """
+
     name: str
     contents: Any
 
-    def __init__(self, name: str, contents: Any, file_type: str = "json"):
+    def __init__(self, name: str, contents: Any, file_type: str = "json", compression: Optional[str] = None):
         self.name = name
         self.contents = contents
         self.file_type = file_type
+        self.compression = compression
+        self.encoded = False
+
+    @classmethod
+    def streamed(
+        cls, name: str, records: Callable[[], Iterable[Any]], file_type: str = "json", compression: Optional[str] = None
+    ) -> "ReportFile":
+        """A report of records, written as a JSON array ('json') or one JSON object per line ('ndjson')."""
+        return cls(name, records, file_type, compression)
+
+    @classmethod
+    def encoded_chunks(cls, name: str, chunks: Callable[[], Iterable[bytes]], file_type: str) -> "ReportFile":
+        """A streamed report already encoded as file_type, e.g. Parquet, stored as the given bytes."""
+        report = cls(name, chunks, file_type)
+        report.encoded = True
+        return report
+
+    def is_streamed(self) -> bool:
+        return callable(self.contents)
 
     def get_filename(self) -> str:
-        return f"{self.name}.{self.file_type}"
+        suffix = ".zst" if self.compression == "zstd" else ""
+        return f"{self.name}.{self.file_type}{suffix}"
+
+    def get_content_type(self) -> str:
+        if self.compression == "zstd":
+            return "application/zstd"
+        return CONTENT_TYPES.get(self.file_type, "application/octet-stream")
 
     def get_contents(self) -> Any:
+        if self.encoded:
+            return b"".join(self.contents())
+        if self.is_streamed():
+            return list(self.contents())
         return self.contents
+
+    def _iter_text(self, indent: Optional[int]) -> Iterator[str]:
+        records = self.contents() if self.is_streamed() else self.contents
+        if self.file_type == "ndjson":
+            for record in records:
+                yield json.dumps(record)
+                yield "\n"
+            return
+        # The same text json.dumps gives for the whole list, one element at a time
+        separator, open_bracket, close_bracket = ", ", "[", "]"
+        if indent is not None:
+            pad = " " * indent
+            separator, open_bracket, close_bracket = ",\n" + pad, "[\n" + pad, "\n]"
+        first = True
+        for record in records:
+            text = json.dumps(record, indent=indent)
+            if indent is not None:
+                text = text.replace("\n", "\n" + pad)
+            yield (open_bracket if first else separator) + text
+            first = False
+        yield "[]" if first else close_bracket
+
+    def iter_chunks(self, indent: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """The encoded (and compressed) report in chunks of about chunk_size bytes."""
+        if self.encoded:
+            return iter(self.contents())
+
+        def encoded() -> Iterator[bytes]:
+            buffer: list[str] = []
+            size = 0
+            for text in self._iter_text(indent):
+                buffer.append(text)
+                size += len(text)
+                if size >= chunk_size:
+                    yield "".join(buffer).encode("utf-8")
+                    buffer, size = [], 0
+            if buffer:
+                yield "".join(buffer).encode("utf-8")
+
+        if self.compression == "zstd":
+            return _zstd_compress(encoded())
+        if self.compression is not None:
+            raise ValueError(f"Unsupported report compression: {self.compression}")
+        return encoded()
@@ -11,15 +11,40 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import ctypes
 import logging
 import multiprocessing as mp
+import time
+from abc import ABC, abstractmethod
+from asyncio import sleep
 from queue import Empty
-from typing import Generic, List, TypeVar
+from typing import Any, Generic, List, NamedTuple, Optional, Protocol, Sequence, Tuple, TypeVar
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# How often an async put checks a full ring channel for room again
+FULL_CHANNEL_POLL_INTERVAL = 0.005
+
+
+class RequestChannel(Protocol[T]):
+    """One channel of a RequestQueue, as its consumers use it; mp.JoinableQueue and RingBufferChannel implement it."""
+
+    def put(self, obj: T, /) -> None: ...
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> T: ...
+
+    def get_nowait(self) -> T: ...
+
+    def task_done(self) -> None: ...
+
+    def join(self) -> None: ...
+
+    def empty(self) -> bool: ...
+
 
 class RequestQueue(Generic[T]):
     def __init__(self, num_channels: int = 1):
@@ -30,9 +55,9 @@ class RequestQueue(Generic[T]):
             num_channels (int, optional): number of channels. Defaults to 1.
         """
         self.num_channels: int = num_channels
-        self.queues: List[mp.JoinableQueue[T]] = [mp.JoinableQueue() for _ in range(num_channels)]
+        self.queues: List[RequestChannel[T]] = [mp.JoinableQueue() for _ in range(num_channels)]
 
-    def get_channel(self, channel_id: int) -> "mp.JoinableQueue[T]":
+    def get_channel(self, channel_id: int) -> RequestChannel[T]:
         return self.queues[channel_id % self.num_channels]
 
     def drain(self, channel_id: int = -1) -> None:
@@ -76,3 +101,258 @@ class RequestQueue(Generic[T]):
         queues_to_join = self.queues if channel_id == -1 else [self.get_channel(channel_id)]
         for queue in queues_to_join:
             queue.join()
+
+    def put_batch(self, items: Sequence[T], channel_id: int = -1) -> None:
+        """
+        put several items into the specific queue by giving channel id, when channel id is -1, put into all queues.
+
+        Args:
+            items (Sequence[object]): the items to put into the queue, in order.
+            channel_id (int, optional): the id of the queue to put into. Defaults to -1 (all queues).
+        """
+        for item in items:
+            self.put(item, channel_id)
+
+    async def put_batch_async(self, items: Sequence[T], channel_id: int = -1) -> None:
+        """
+        put several items like put_batch, from an event loop: waiting for room in a full queue yields to the loop
+        instead of blocking it.
+
+        Args:
+            items (Sequence[object]): the items to put into the queue, in order.
+            channel_id (int, optional): the id of the queue to put into. Defaults to -1 (all queues).
+        """
+        # mp.JoinableQueue is unbounded, so a put never waits for room
+        self.put_batch(items, channel_id)
+
+
+class RingSlot(NamedTuple):
+    """Fixed-width record stored in a shared-memory ring slot."""
+
+    stage_id: int
+    data_index: int
+    scheduled_time: float
+    lora_id: int
+    preferred_worker_id: int
+
+
+class SlotCodec(ABC, Generic[T]):
+    """Converts queue items to and from fixed-width ring slots.
+
+    Items the codec cannot represent (encode returns None) are pickled and sent alongside the ring.
+    """
+
+    @abstractmethod
+    def encode(self, item: T) -> Optional[RingSlot]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, slot: RingSlot) -> T:
+        raise NotImplementedError
+
+
+_SLOT_DTYPE = np.dtype(
+    [
+        ("stage_id", "<i4"),
+        ("lora_id", "<i4"),
+        ("data_index", "<i8"),
+        ("scheduled_time", "<f8"),
+        ("preferred_worker_id", "<i4"),
+        ("pickled", "<i4"),
+    ]
+)
+
+
+class RingBufferChannel(Generic[T]):
+    """
+    A single-channel, multi-producer/multi-consumer queue over a shared-memory ring of fixed-size slots.
+
+    Exposes the subset of mp.JoinableQueue used by the load generator (put, get, get_nowait, task_done,
+    join, empty) plus put_batch/get_batch, which move many items under a single lock acquisition.
+    Items the codec can encode never leave shared memory; anything else is pickled through a side
+    mp.Queue whose order is kept in step with the ring by a flag in the slot.
+    """
+
+    def __init__(self, codec: Optional[SlotCodec[T]], capacity: int = 16384) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.codec = codec
+        self.capacity = capacity
+        self._buffer = mp.RawArray(ctypes.c_char, capacity * _SLOT_DTYPE.itemsize)
+        self._head = mp.RawValue(ctypes.c_int64, 0)
+        self._tail = mp.RawValue(ctypes.c_int64, 0)
+        self._unfinished = mp.RawValue(ctypes.c_int64, 0)
+        self._lock = mp.Lock()
+        self._not_empty = mp.Condition(self._lock)
+        self._not_full = mp.Condition(self._lock)
+        self._all_done = mp.Condition(mp.Lock())
+        self._overflow: "mp.Queue[T]" = mp.Queue()
+        self._slots: Optional[np.ndarray[Any, Any]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        # numpy views can't cross a process boundary, rebuild it lazily on the other side
+        state["_slots"] = None
+        return state
+
+    @property
+    def slots(self) -> "np.ndarray[Any, Any]":
+        if self._slots is None:
+            self._slots = np.frombuffer(memoryview(self._buffer), dtype=_SLOT_DTYPE)
+        return self._slots
+
+    def _write(self, start: int, records: "np.ndarray[Any, Any]") -> None:
+        first = min(len(records), self.capacity - start)
+        self.slots[start : start + first] = records[:first]
+        self.slots[: len(records) - first] = records[first:]
+
+    def _read(self, start: int, count: int) -> "np.ndarray[Any, Any]":
+        first = min(count, self.capacity - start)
+        return np.concatenate((self.slots[start : start + first], self.slots[: count - first]))
+
+    def put(self, item: T) -> None:
+        self.put_batch([item])
+
+    def _encode(self, items: Sequence[T]) -> Tuple[List[Optional[RingSlot]], "np.ndarray[Any, Any]"]:
+        encoded = [self.codec.encode(item) if self.codec is not None else None for item in items]
+        records = np.array(
+            [
+                (slot.stage_id, slot.lora_id, slot.data_index, slot.scheduled_time, slot.preferred_worker_id, 0)
+                if slot is not None
+                else (0, 0, 0, 0.0, 0, 1)
+                for slot in encoded
+            ],
+            dtype=_SLOT_DTYPE,
+        )
+        return encoded, records
+
+    def _room(self) -> int:
+        return self.capacity - (self._tail.value - self._head.value)
+
+    def _publish(self, items: Sequence[T], encoded: List[Optional[RingSlot]], records: "np.ndarray[Any, Any]") -> None:
+        # Called holding the lock, with room for every item
+        for item, slot in zip(items, encoded, strict=True):
+            if slot is None:
+                # Published before the slot so a reader that sees the flag always finds the payload
+                self._overflow.put(item)
+        self._write(self._tail.value % self.capacity, records)
+        self._tail.value += len(items)
+        self._not_empty.notify(len(items))
+
+    def put_batch(self, items: Sequence[T]) -> None:
+        if not items:
+            return
+        if len(items) > self.capacity:
+            for start in range(0, len(items), self.capacity):
+                self.put_batch(items[start : start + self.capacity])
+            return
+        encoded, records = self._encode(items)
+        with self._all_done:
+            self._unfinished.value += len(items)
+        with self._not_full:
+            while self._room() < len(items):
+                self._not_full.wait()
+            self._publish(items, encoded, records)
+
+    def try_put_batch(self, items: Sequence[T]) -> bool:
+        """Put all of items if they fit in the ring right now, without waiting for room. Returns whether they were put."""
+        if len(items) > self.capacity:
+            raise ValueError(f"cannot put {len(items)} items into a ring of {self.capacity} slots at once")
+        # Checked without the lock first so a full ring costs no encoding; consumers only ever make more room
+        if not items or self._room() < len(items):
+            return not items
+        encoded, records = self._encode(items)
+        with self._not_full:
+            if self._room() < len(items):
+                return False
+            with self._all_done:
+                self._unfinished.value += len(items)
+            self._publish(items, encoded, records)
+        return True
+
+    async def put_batch_async(self, items: Sequence[T]) -> None:
+        """put_batch for an event loop: while the ring is full, sleep rather than block the loop waiting for room."""
+        for start in range(0, len(items), self.capacity):
+            chunk = items[start : start + self.capacity]
+            while not self.try_put_batch(chunk):
+                await sleep(FULL_CHANNEL_POLL_INTERVAL)
+
+    def get_batch(self, max_items: int = 64, block: bool = True, timeout: Optional[float] = None) -> List[T]:
+        """Take up to max_items items, blocking (up to timeout) only until the first one is available."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while self._tail.value == self._head.value:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    raise Empty
+                self._not_empty.wait(remaining)
+            head = self._head.value
+            count = min(max_items, self._tail.value - head)
+            records = self._read(head % self.capacity, count)
+            payloads = [self._overflow.get() for _ in range(int(records["pickled"].sum()))]
+            self._head.value = head + count
+            self._not_full.notify_all()
+        items: List[T] = []
+        overflow = iter(payloads)
+        for stage_id, lora_id, data_index, scheduled_time, preferred_worker_id, pickled in records.tolist():
+            if pickled or self.codec is None:
+                items.append(next(overflow))
+            else:
+                items.append(self.codec.decode(RingSlot(stage_id, data_index, scheduled_time, lora_id, preferred_worker_id)))
+        return items
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> T:
+        return self.get_batch(1, block, timeout)[0]
+
+    def get_nowait(self) -> T:
+        return self.get(False)
+
+    def empty(self) -> bool:
+        with self._lock:
+            return bool(self._head.value == self._tail.value)
+
+    def task_done(self, count: int = 1) -> None:
+        with self._all_done:
+            if self._unfinished.value < count:
+                raise ValueError("task_done() called too many times")
+            self._unfinished.value -= count
+            if self._unfinished.value == 0:
+                self._all_done.notify_all()
+
+    def join(self) -> None:
+        with self._all_done:
+            while self._unfinished.value > 0:
+                self._all_done.wait()
+
+
+class RingBufferRequestQueue(RequestQueue[T]):
+    """
+    RequestQueue backed by shared-memory rings instead of mp.JoinableQueue.
+
+    Same put/get_channel/drain/join semantics; put_batch writes a whole batch under one lock.
+    """
+
+    def __init__(self, num_channels: int = 1, codec: Optional[SlotCodec[T]] = None, capacity: int = 16384):
+        """
+        initialize ring buffer request queue based on number of channels.
+
+        Args:
+            num_channels (int, optional): number of channels. Defaults to 1.
+            codec (SlotCodec, optional): encodes items into fixed-width slots. Items it can't encode, or all items
+                when no codec is given, are pickled.
+            capacity (int, optional): number of slots per channel. put blocks while a channel is full.
+        """
+        self.num_channels = num_channels
+        self.rings: List[RingBufferChannel[T]] = [RingBufferChannel(codec, capacity) for _ in range(num_channels)]
+        self.queues = list(self.rings)
+
+    def get_channel(self, channel_id: int) -> RingBufferChannel[T]:
+        return self.rings[channel_id % self.num_channels]
+
+    def put_batch(self, items: Sequence[T], channel_id: int = -1) -> None:
+        for channel in self.rings if channel_id == -1 else [self.get_channel(channel_id)]:
+            channel.put_batch(items)
+
+    async def put_batch_async(self, items: Sequence[T], channel_id: int = -1) -> None:
+        for channel in self.rings if channel_id == -1 else [self.get_channel(channel_id)]:
+            await channel.put_batch_async(items)
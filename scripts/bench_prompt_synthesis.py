@@ -0,0 +1,97 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for exact-length random prompt synthesis.
+
+Times generate_random_exact_length_text at each --lengths prompt length,
+sampling from the full vocab (the decode/re-encode convergence loop) and from
+the round-trip-stable subset, and reports prompts/s for both. Prompt lengths
+are checked outside the timed loop. Uses
+--tokenizer when given, otherwise a byte-level BPE tokenizer trained on the
+repo's docs so the benchmark runs offline.
+
+Usage: PYTHONPATH=. python scripts/bench_prompt_synthesis.py [--tokenizer NAME] [--lengths 128 1024 8192 32768] [--seconds 3]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import AutoTokenizer, PreTrainedTokenizerFast
+
+from inference_perf.datagen.datagen_utils import (
+    generate_random_exact_length_text,
+    init_vocab_sampling,
+    round_trip_stable_token_ids,
+)
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+
+def load_tokenizer(name: Optional[str], vocab_size: int) -> CustomTokenizer:
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer._batcher = None
+    if name:
+        tokenizer.tokenizer = AutoTokenizer.from_pretrained(name)
+        return tokenizer
+    repo = Path(__file__).resolve().parents[1]
+    files = [str(path) for path in sorted((repo / "docs").rglob("*.md"))] + [str(repo / "README.md")]
+    bpe = Tokenizer(models.BPE())
+    bpe.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    bpe.decoder = decoders.ByteLevel()
+    bpe.train(files, trainers.BpeTrainer(vocab_size=vocab_size, initial_alphabet=pre_tokenizers.ByteLevel.alphabet()))
+    tokenizer.tokenizer = PreTrainedTokenizerFast(tokenizer_object=bpe)
+    return tokenizer
+
+
+def prompts_per_second(
+    tokenizer: CustomTokenizer, valid: np.ndarray, stable: Optional[np.ndarray], length: int, seconds: float
+) -> float:
+    rng = np.random.default_rng(0)
+    texts = []
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds or not texts:
+        text, _ = generate_random_exact_length_text(rng, valid, tokenizer, length, stable_token_ids=stable)
+        texts.append(text)
+    # Checked outside the timed loop, which the stable path exists to skip
+    assert all(tokenizer.count_tokens(text) == length for text in texts[:20])
+    return len(texts) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", type=str, default=None, help="HF tokenizer to benchmark instead of a trained one.")
+    parser.add_argument("--vocab-size", type=int, default=8000, help="Vocab size of the trained tokenizer.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[128, 1024, 8192, 32768], help="Prompt lengths.")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Time spent per length and path.")
+    args = parser.parse_args()
+
+    tokenizer = load_tokenizer(args.tokenizer, args.vocab_size)
+    _, _, valid = init_vocab_sampling(tokenizer)
+    start = time.perf_counter()
+    stable = round_trip_stable_token_ids(tokenizer, valid)
+    if stable is None:
+        raise SystemExit("The tokenizer has no round-trip-stable tokens")
+    print(f"{len(stable)} of {len(valid)} tokens round-trip stable, found in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'length':>8} {'loop prompts/s':>15} {'stable prompts/s':>17} {'speedup':>8}")
+    for length in args.lengths:
+        loop = prompts_per_second(tokenizer, valid, None, length, args.seconds)
+        fast = prompts_per_second(tokenizer, valid, stable, length, args.seconds)
+        print(f"{length:>8} {loop:>15.1f} {fast:>17.1f} {fast / loop:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
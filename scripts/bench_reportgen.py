@@ -0,0 +1,95 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for lifecycle report summarization.
+
+Synthesizes --requests streamed request metrics with --tokens output token
+timestamps each (a few percent failed, SLOs on some) and times
+summarize_requests over them with goodput constraints set. --dump writes the
+summary as JSON so two versions of the code can be compared.
+
+Usage: python scripts/bench_reportgen.py [--requests 100000] [--tokens 256] [--sketch 0.01] [--dump FILE]
+"""
+
+import argparse
+import json
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from inference_perf.apis import ErrorResponseInfo, InferenceInfo, RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.config import GoodputConfig
+from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.reportgen.base import summarize_requests
+
+PERCENTILES = [0.1, 1, 5, 10, 25, 50, 75, 90, 95, 99, 99.9]
+
+
+def synthesize_metrics(num_requests: int, num_tokens: int, seed: int = 0) -> List[RequestLifecycleMetric]:
+    rng = np.random.default_rng(seed)
+    metrics = []
+    for i in range(num_requests):
+        scheduled = i * 0.01
+        start = scheduled + rng.exponential(0.001)
+        ttft = rng.lognormal(-3, 0.5)
+        gaps = rng.lognormal(-4.5, 0.3, size=num_tokens - 1)
+        token_times = (start + ttft + np.concatenate([[0.0], np.cumsum(gaps)])).tolist()
+        failed = i % 50 == 0
+        metrics.append(
+            RequestLifecycleMetric(
+                stage_id=0,
+                scheduled_time=scheduled,
+                start_time=start,
+                end_time=token_times[-1] + 0.001,
+                request_data="x" * 512,
+                info=InferenceInfo(
+                    request_metrics=RequestMetrics(text=Text(input_tokens=512)),
+                    response_metrics=StreamedResponseMetrics(
+                        output_tokens=num_tokens,
+                        chunk_times=token_times,
+                        output_token_times=token_times,
+                        server_usage={"prompt_tokens": 512, "completion_tokens": num_tokens},
+                    ),
+                ),
+                error=ErrorResponseInfo(error_type="HTTP Error 500", error_msg="boom") if failed else None,
+                ttft_slo_sec=0.06 if i % 3 == 0 else None,
+            )
+        )
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000, help="Requests to summarize.")
+    parser.add_argument("--tokens", type=int, default=256, help="Output token timestamps per request.")
+    parser.add_argument("--sketch", type=float, default=None, help="Summarize with sketch percentiles of this accuracy.")
+    parser.add_argument("--dump", type=str, default=None, help="Write the summary to this JSON file.")
+    args = parser.parse_args()
+
+    metrics = synthesize_metrics(args.requests, args.tokens)
+    goodput = GoodputConfig(constraints={"ttft": 0.05, "tpot": 0.012, "request_latency": 3.5})
+    sketch_accuracy: Optional[float] = args.sketch
+
+    start = time.perf_counter()
+    summary = summarize_requests(metrics, PERCENTILES, 100.0, goodput_config=goodput, sketch_accuracy=sketch_accuracy)
+    elapsed = time.perf_counter() - start
+    print(f"{args.requests} requests x {args.tokens} tokens: {elapsed:.2f} s ({elapsed / args.requests * 1e6:.1f} us/request)")
+
+    if args.dump:
+        with open(args.dump, "w") as f:
+            json.dump(summary.model_dump(), f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
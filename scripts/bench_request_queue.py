@@ -0,0 +1,103 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Microbenchmark for the load generator's request queue backends.
+
+Pushes lazily loaded requests from the parent to N consumer processes through
+the mp.JoinableQueue backend and the shared-memory ring buffer backend, then
+reports throughput (items/s) and per-item enqueue latency percentiles.
+
+Usage: python scripts/bench_request_queue.py [--items 200000] [--workers 1 8 64] [--batch 64]
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+from multiprocessing.synchronize import Event
+from queue import Empty
+from typing import Any, List
+
+import numpy as np
+
+from inference_perf.apis import LazyLoadInferenceAPIData
+from inference_perf.loadgen.load_generator import RequestQueueData, RequestQueueDataCodec, WorkItem
+from inference_perf.utils.request_queue import RequestQueue, RingBufferRequestQueue
+
+
+def consume(channel: Any, stop: Event) -> None:
+    get_batch = getattr(channel, "get_batch", None)
+    while not stop.is_set():
+        try:
+            items = get_batch(64, timeout=0.1) if get_batch is not None else [channel.get(timeout=0.1)]
+        except Empty:
+            continue
+        for _ in items:
+            channel.task_done()
+
+
+def run(backend: str, num_items: int, num_workers: int, batch: int) -> dict[str, float]:
+    queue: RequestQueue[WorkItem]
+    if backend == "ring_buffer":
+        queue = RingBufferRequestQueue(codec=RequestQueueDataCodec(["adapter-a", "adapter-b"]))
+    else:
+        queue = RequestQueue()
+    stop = mp.Event()
+    consumers = [mp.Process(target=consume, args=(queue.get_channel(0), stop), daemon=True) for _ in range(num_workers)]
+    for consumer in consumers:
+        consumer.start()
+
+    items: List[WorkItem] = [
+        RequestQueueData(0, LazyLoadInferenceAPIData(data_index=i), float(i), "adapter-a" if i % 2 else None)
+        for i in range(num_items)
+    ]
+    latencies = np.empty(num_items, dtype=np.float64)
+    start = time.perf_counter()
+    for offset in range(0, num_items, batch):
+        chunk = items[offset : offset + batch]
+        put_start = time.perf_counter()
+        queue.put_batch(chunk, 0)
+        # Every item in a batch waits for the whole call
+        latencies[offset : offset + len(chunk)] = time.perf_counter() - put_start
+    queue.join()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for consumer in consumers:
+        consumer.join()
+
+    return {
+        "items_per_sec": num_items / elapsed,
+        "enqueue_p50_us": float(np.percentile(latencies, 50)) * 1e6,
+        "enqueue_p99_us": float(np.percentile(latencies, 99)) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200_000, help="Requests pushed per run.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 64], help="Consumer process counts.")
+    parser.add_argument("--batch", type=int, default=64, help="Items per put_batch call.")
+    args = parser.parse_args()
+
+    print(f"{'backend':<16}{'workers':>8}{'items/s':>14}{'p50 enqueue us':>16}{'p99 enqueue us':>16}")
+    for num_workers in args.workers:
+        for backend in ("joinable_queue", "ring_buffer"):
+            result = run(backend, args.items, num_workers, args.batch)
+            print(
+                f"{backend:<16}{num_workers:>8}{result['items_per_sec']:>14,.0f}"
+                f"{result['enqueue_p50_us']:>16.1f}{result['enqueue_p99_us']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
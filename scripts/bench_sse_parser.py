@@ -0,0 +1,103 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Microbenchmark for the streaming response parser.
+
+Feeds SSE streams through parse_sse_stream the way aiohttp hands them over
+(several events per read, events split across reads) and reports the parse
+time per SSE chunk. Without --stream it synthesizes an OpenAI chat stream of
+--tokens one-token deltas; --stream replays a recorded raw response body
+instead, e.g. the "response" of a per-request lifecycle report.
+
+Usage: python scripts/bench_sse_parser.py [--tokens 8192] [--read-size 512 4096 65536] [--stream FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+import numpy as np
+
+from inference_perf.apis.streaming_parser import parse_sse_stream
+
+
+def synthesize_stream(num_tokens: int) -> bytes:
+    events: List[dict[str, Any]] = [{"choices": [{"index": 0, "delta": {"role": "assistant"}}]}]
+    events += [{"id": "cmpl-0", "choices": [{"index": 0, "delta": {"content": f" tok{i}"}}]} for i in range(num_tokens)]
+    events.append({"choices": [], "usage": {"prompt_tokens": 128, "completion_tokens": num_tokens}})
+    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+    return body.encode()
+
+
+class ReplayedContent:
+    def __init__(self, reads: List[bytes]) -> None:
+        self.reads = reads
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        for read in self.reads:
+            yield read
+
+
+class ReplayedResponse:
+    def __init__(self, reads: List[bytes]) -> None:
+        self.content = ReplayedContent(reads)
+
+
+def extract_content(data: dict[str, Any]) -> Optional[str]:
+    choices = data.get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content")  # type: ignore[no-any-return]
+
+
+async def run(body: bytes, read_size: int, capture_raw: bool, repeats: int) -> dict[str, float]:
+    reads = [body[i : i + read_size] for i in range(0, len(body), read_size)]
+    num_events = body.count(b"\n\n")
+    per_chunk = np.empty(repeats, dtype=np.float64)
+    for i in range(repeats):
+        start = time.perf_counter()
+        await parse_sse_stream(ReplayedResponse(reads), extract_content, capture_raw=capture_raw)  # type: ignore[arg-type]
+        per_chunk[i] = (time.perf_counter() - start) / num_events
+    return {
+        "events": num_events,
+        "p50_us": float(np.percentile(per_chunk, 50)) * 1e6,
+        "min_us": float(per_chunk.min()) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=8192, help="Content deltas in the synthesized stream.")
+    parser.add_argument("--read-size", type=int, nargs="+", default=[512, 4096, 65536], help="Bytes per network read.")
+    parser.add_argument("--stream", type=str, default=None, help="Raw SSE body to replay instead of a synthesized one.")
+    parser.add_argument("--repeats", type=int, default=20, help="Parses per configuration.")
+    args = parser.parse_args()
+
+    if args.stream:
+        with open(args.stream, "rb") as f:
+            body = f.read()
+    else:
+        body = synthesize_stream(args.tokens)
+
+    print(f"{'read size':>10}{'capture raw':>13}{'events':>9}{'p50 us/chunk':>15}{'min us/chunk':>15}")
+    for read_size in args.read_size:
+        for capture_raw in (False, True):
+            result = asyncio.run(run(body, read_size, capture_raw, args.repeats))
+            print(
+                f"{read_size:>10}{str(capture_raw):>13}{result['events']:>9.0f}"
+                f"{result['p50_us']:>15.2f}{result['min_us']:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import json
+from typing import List
+
+import pytest
+
+from inference_perf.apis import InferenceInfo, RequestLifecycleMetric
+from inference_perf.apis.json_codec import (
+    MSGSPEC_AVAILABLE,
+    ORJSON_AVAILABLE,
+    JsonCodec,
+    get_json_codec,
+    start_codec_timing,
+)
+from inference_perf.config import JsonCodecType
+from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.reportgen.base import summarize_json_codec
+
+
+def available_codecs() -> List[JsonCodec]:
+    codecs = [get_json_codec(JsonCodecType.STDLIB)]
+    if ORJSON_AVAILABLE:
+        codecs.append(get_json_codec(JsonCodecType.ORJSON))
+    if MSGSPEC_AVAILABLE:
+        codecs.append(get_json_codec(JsonCodecType.MSGSPEC))
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_codecs_round_trip_like_stdlib(codec: JsonCodec) -> None:
+    payload = {"model": "m", "messages": [{"role": "user", "content": "héllo ☃"}], "max_tokens": 5, "stream": True}
+    assert json.loads(codec.dumps(payload)) == payload
+    assert codec.loads(json.dumps(payload).encode()) == payload
+    assert codec.loads(json.dumps(payload)) == payload
+    # Payloads only the stdlib can serialize still go out
+    assert json.loads(codec.dumps({"big": 2**70})) == {"big": 2**70}
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+def test_codecs_raise_json_decode_error(codec: JsonCodec) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"choices": [')
+
+
+def test_auto_prefers_installed_fast_codec() -> None:
+    codec = get_json_codec(JsonCodecType.AUTO)
+    if ORJSON_AVAILABLE:
+        assert codec.codec_type == JsonCodecType.ORJSON
+    elif MSGSPEC_AVAILABLE:
+        assert codec.codec_type == JsonCodecType.MSGSPEC
+    else:
+        assert codec.codec_type == JsonCodecType.STDLIB
+
+
+def test_codec_timing_is_per_task() -> None:
+    codec = get_json_codec(JsonCodecType.STDLIB)
+
+    async def request(num_decodes: int) -> int:
+        timing = start_codec_timing()
+        codec.dumps({"prompt": "x" * 1000})
+        for _ in range(num_decodes):
+            codec.loads(b'{"choices": [{"text": "a"}]}')
+            await asyncio.sleep(0)
+        assert timing.encode_time > 0
+        return num_decodes if timing.decode_time > 0 else 0
+
+    async def run() -> List[int]:
+        return list(await asyncio.gather(request(1), request(50)))
+
+    assert asyncio.run(run()) == [1, 50]
+
+
+def test_summarize_json_codec() -> None:
+    def metric(encode: float, decode: float) -> RequestLifecycleMetric:
+        return RequestLifecycleMetric(
+            scheduled_time=0.0,
+            start_time=0.0,
+            end_time=1.0,
+            request_data="{}",
+            info=InferenceInfo(request_metrics=RequestMetrics(text=Text(input_tokens=1))),
+            error=None,
+            json_encode_time=encode,
+            json_decode_time=decode,
+        )
+
+    summary = summarize_json_codec([metric(0.001, 0.01), metric(0.003, 0.03)], [50], "orjson")
+    assert summary is not None
+    assert summary["codec"] == "orjson"
+    assert summary["encode_time"]["mean"] == pytest.approx(0.002)
+    assert summary["decode_time"]["max"] == pytest.approx(0.03)
+
+    untimed = metric(0.0, 0.0).model_copy(update={"json_encode_time": None, "json_decode_time": None})
+    assert summarize_json_codec([untimed], [50], "stdlib") is None
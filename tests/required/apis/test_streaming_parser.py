@@ -39,11 +39,12 @@ async def test_parse_sse_stream() -> None:
     def extract_content(data: dict[str, Any]) -> Optional[str]:
         return data.get("choices", [{}])[0].get("delta", {}).get("content")  # type: ignore[no-any-return]
 
-    output_text, chunk_times, raw_content, response_chunks, server_usage = await parse_sse_stream(
+    output_text, chunk_times, raw_content, response_chunks, server_usage, chunk_texts = await parse_sse_stream(
         mock_response, extract_content
     )
 
     assert output_text == "Hello world"
+    assert chunk_texts == ["Hello", " world"]
     assert len(chunk_times) == 2
     assert "Hello" in raw_content
     assert "world" in raw_content
@@ -87,7 +88,7 @@ async def test_parse_sse_stream_timestamps_only_content_events() -> None:
     def extract_content(data: dict[str, Any]) -> Optional[str]:
         return data.get("choices", [{}])[0].get("delta", {}).get("content")  # type: ignore[no-any-return]
 
-    output_text, chunk_times, _, response_chunks, server_usage = await parse_sse_stream(mock_response, extract_content)
+    output_text, chunk_times, _, response_chunks, server_usage, _ = await parse_sse_stream(mock_response, extract_content)
 
     assert output_text == "Hello world"
     assert len(chunk_times) == 2, (
@@ -136,3 +137,69 @@ async def test_parse_sse_stream_interrupted_preserves_partial_body() -> None:
     # The bytes received before the break are retained, not discarded.
     assert "Hello" in err.raw_content
     assert "world" in err.raw_content
+
+
+async def test_parse_sse_stream_handles_events_split_across_reads() -> None:
+    """Network reads don't line up with SSE events: a read can hold several events,
+    end mid-event, or end between the two newlines of a delimiter."""
+    body = (
+        b'data: {"choices": [{"delta": {"content": "a"}}]}\n\n'
+        b'data: {"choices": [{"delta": {"content": "b"}}]}\n\n'
+        b'data: {"choices": [{"delta": {"content": "c"}}]}\n\n'
+        b"data: [DONE]\n\n"
+    )
+    first_delimiter = body.index(b"\n\n")
+    reads = [body[: first_delimiter + 1], body[first_delimiter + 1 : first_delimiter + 20], body[first_delimiter + 20 :]]
+
+    mock_response = Mock()
+    mock_content = Mock()
+    mock_response.content = mock_content
+
+    async def mock_iter_any() -> AsyncGenerator[bytes, None]:
+        for read in reads:
+            yield read
+
+    mock_content.iter_any = mock_iter_any
+
+    def extract_content(data: dict[str, Any]) -> Optional[str]:
+        return data.get("choices", [{}])[0].get("delta", {}).get("content")  # type: ignore[no-any-return]
+
+    output_text, chunk_times, raw_content, response_chunks, _, _ = await parse_sse_stream(mock_response, extract_content)
+    assert output_text == "abc"
+    assert len(chunk_times) == len(response_chunks) == 3
+    assert raw_content == body.decode()
+
+    _, _, raw_content, _, _, _ = await parse_sse_stream(mock_response, extract_content, capture_raw=False)
+    assert raw_content == ""
+
+
+@pytest.mark.asyncio
+async def test_parse_sse_stream_ignores_events_after_done() -> None:
+    """Nothing after [DONE] is parsed, whether it arrives in the same read or a later one."""
+    body = (
+        b'data: {"choices": [{"delta": {"content": "a"}}]}\n\n'
+        b"data: [DONE]\n\n"
+        b'data: {"choices": [{"delta": {"content": "b"}}], "usage": {"completion_tokens": 9}}\n\n'
+    )
+    late = b'data: {"choices": [{"delta": {"content": "c"}}]}\n\n'
+
+    mock_response = Mock()
+    mock_content = Mock()
+    mock_response.content = mock_content
+
+    async def mock_iter_any() -> AsyncGenerator[bytes, None]:
+        yield body
+        yield late
+
+    mock_content.iter_any = mock_iter_any
+
+    def extract_content(data: dict[str, Any]) -> Optional[str]:
+        return data.get("choices", [{}])[0].get("delta", {}).get("content")  # type: ignore[no-any-return]
+
+    output_text, chunk_times, raw_content, response_chunks, server_usage, _ = await parse_sse_stream(
+        mock_response, extract_content
+    )
+    assert output_text == "a"
+    assert len(chunk_times) == len(response_chunks) == 1
+    assert server_usage is None
+    assert raw_content == (body + late).decode()
@@ -0,0 +1,67 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from typing import Any, Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from inference_perf.client.filestorage import s3
+from inference_perf.client.filestorage.s3 import SimpleStorageServiceClient
+from inference_perf.config import SimpleStorageServiceConfig
+from inference_perf.utils.report_file import ReportFile
+
+
+def _records() -> Iterator[Any]:
+    for i in range(20000):
+        yield {"start_time": float(i), "request": "x" * 100}
+
+
+def _s3_client() -> tuple[SimpleStorageServiceClient, MagicMock]:
+    boto_client = MagicMock()
+    boto_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    boto_client.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+    with patch("boto3.client", return_value=boto_client):
+        client = SimpleStorageServiceClient(SimpleStorageServiceConfig(bucket_name="bucket", path="run"))
+    return client, boto_client
+
+
+def test_s3_uploads_streamed_report_in_parts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(s3, "MULTIPART_PART_SIZE", 1 << 20)
+    client, boto_client = _s3_client()
+
+    client._upload_multipart("run/per_request.ndjson", ReportFile.streamed("per_request", _records, file_type="ndjson"))
+
+    bodies = [call.kwargs["Body"] for call in boto_client.upload_part.call_args_list]
+    assert len(bodies) > 1
+    assert [json.loads(line) for line in b"".join(bodies).decode().splitlines()] == list(_records())
+    assert all(len(body) >= 1 << 20 for body in bodies[:-1])
+    boto_client.create_multipart_upload.assert_called_once_with(
+        Bucket="bucket", Key="run/per_request.ndjson", ContentType="application/x-ndjson"
+    )
+    parts = boto_client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert parts == [{"ETag": f"etag-{i}", "PartNumber": i} for i in range(1, len(bodies) + 1)]
+
+
+def test_s3_aborts_multipart_upload_on_failure() -> None:
+    client, boto_client = _s3_client()
+    boto_client.upload_part.side_effect = RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        client._upload_multipart("run/per_request.json", ReportFile.streamed("per_request", _records))
+
+    boto_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="bucket", Key="run/per_request.json", UploadId="upload-1"
+    )
+    boto_client.complete_multipart_upload.assert_not_called()
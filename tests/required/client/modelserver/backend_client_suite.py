@@ -206,7 +206,7 @@ class BackendClientSuite:
     async def test_streaming_completion_parsing(self) -> None:
         sse = sse_stream(self.backend.completion_stream)
         data = CompletionAPIData(prompt=COMPLETION_PROMPT)
-        config = APIConfig(type=APIType.Completion, streaming=True)
+        config = APIConfig(type=APIType.Completion, streaming=True, capture_raw_response=True)
         response = FakeStreamingResponse([sse.encode()])
 
         info = await data.process_response(cast(ClientResponse, response), config, stub_tokenizer())
@@ -229,7 +229,7 @@ class BackendClientSuite:
     async def test_streaming_chat_parsing(self) -> None:
         sse = sse_stream(self.backend.chat_stream)
         data = ChatCompletionAPIData(messages=[ChatMessage(role="user", content=CHAT_PROMPT)])
-        config = APIConfig(type=APIType.Chat, streaming=True)
+        config = APIConfig(type=APIType.Chat, streaming=True, capture_raw_response=True)
         response = FakeStreamingResponse([sse.encode()])
 
         info = await data.process_response(cast(ClientResponse, response), config, stub_tokenizer())
@@ -196,7 +196,7 @@ async def test_anthropic_messages_request_uses_messages_route_and_headers(mock_c
     assert headers_passed["x-api-key"] == "test-key"
     assert headers_passed["anthropic-version"] == ANTHROPIC_VERSION
     assert "Authorization" not in headers_passed
-    assert '"ignore_eos"' not in session.session.post.call_args.kwargs["data"]
+    assert b'"ignore_eos"' not in session.session.post.call_args.kwargs["data"]
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,147 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from datasets import Dataset
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import PreTrainedTokenizerFast
+
+from inference_perf.apis import CompletionAPIData, LazyLoadInferenceAPIData
+from inference_perf.config import APIConfig, APIType, DataConfig, DataGenType, Distribution
+from inference_perf.datagen.dataset import length_index
+from inference_perf.datagen.dataset.hf_sharegpt_datagen import HFShareGPTDataGenerator
+from inference_perf.datagen.dataset.length_index import build_length_index
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+# transformers leaves the constructor unannotated; wrapping a tokenizers.Tokenizer returns a fast tokenizer
+_fast_tokenizer: Callable[..., PreTrainedTokenizerFast] = PreTrainedTokenizerFast
+
+WORDS = "shall i compare thee to a summer's day thou art more lovely and temperate rough winds do shake".split()
+
+
+def _tokenizer() -> CustomTokenizer:
+    bpe = Tokenizer(models.BPE())
+    bpe.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    bpe.decoder = decoders.ByteLevel()
+    bpe.train_from_iterator(
+        [" ".join(WORDS)] * 10, trainers.BpeTrainer(vocab_size=300, initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    )
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer.tokenizer = _fast_tokenizer(tokenizer_object=bpe)
+    tokenizer._batcher = None
+    return tokenizer
+
+
+def _text(n: int) -> str:
+    return " ".join(itertools.islice(itertools.cycle(WORDS), n))
+
+
+def _write_sharegpt(path: Path) -> List[Tuple[str, str]]:
+    records: List[Any] = []
+    pairs = []
+    for i in range(40):
+        prompt, completion = _text(1 + i % 13), _text(1 + i % 5)
+        pairs.append((prompt, completion))
+        records.append({"conversations": [{"from": "human", "value": prompt}, {"from": "gpt", "value": completion}]})
+    records.insert(7, {"conversations": [{"from": "human", "value": "unanswered"}]})
+    path.write_text("\n".join(json.dumps(record) for record in records))
+    return pairs
+
+
+def _sharegpt(
+    path: Path, cache_dir: Optional[Path], tokenizer: CustomTokenizer, tokenize_workers: int = 1
+) -> HFShareGPTDataGenerator:
+    config = DataConfig(
+        type=DataGenType.ShareGPT,
+        path=str(path),
+        prompt_cache_dir=str(cache_dir) if cache_dir else None,
+        tokenize_workers=tokenize_workers,
+        input_distribution=Distribution(mean=8, min=5, max=10, std_dev=1),
+        output_distribution=Distribution(mean=3, min=2, max=4, std_dev=1),
+    )
+    return HFShareGPTDataGenerator(APIConfig(type=APIType.Completion), config, tokenizer)
+
+
+@pytest.mark.parametrize("tokenize_workers", [1, 2])
+def test_indexed_sharegpt_serves_records_within_lengths(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, tokenize_workers: int
+) -> None:
+    tokenizer = _tokenizer()
+    pairs = _write_sharegpt(tmp_path / "sharegpt.json")
+    expected = [
+        (prompt, tokenizer.count_tokens(completion))
+        for prompt, completion in pairs
+        if 5 <= len(tokenizer.get_tokenizer().encode(prompt)) <= 10 and 2 <= tokenizer.count_tokens(completion) <= 4
+    ]
+    assert 0 < len(expected) < len(pairs)
+
+    first = _sharegpt(tmp_path / "sharegpt.json", tmp_path / "cache", tokenizer, tokenize_workers)
+    monkeypatch.setattr(length_index, "build_length_index", lambda *args, **kwargs: pytest.fail("dataset re-indexed"))
+    generator = _sharegpt(tmp_path / "sharegpt.json", tmp_path / "cache", tokenizer)
+
+    assert first.is_lazy_load_supported() and generator.is_lazy_load_supported()
+    served = []
+    for request in itertools.islice(generator.get_data(), 2 * len(expected)):
+        assert isinstance(request, LazyLoadInferenceAPIData)
+        data = generator.load_lazy_data(request)
+        assert isinstance(data, CompletionAPIData)
+        served.append((data.prompt, data.max_tokens))
+    assert served == expected * 2
+
+
+def test_sharegpt_streams_without_a_cache_dir(tmp_path: Path) -> None:
+    tokenizer = _tokenizer()
+    _write_sharegpt(tmp_path / "sharegpt.json")
+    generator = _sharegpt(tmp_path / "sharegpt.json", None, tokenizer)
+
+    assert not generator.is_lazy_load_supported()
+    data = next(generator.get_data())
+    assert isinstance(data, CompletionAPIData)
+    assert 5 <= len(tokenizer.get_tokenizer().encode(data.prompt)) <= 10
+
+
+@pytest.mark.parametrize("num_proc", [1, 2])
+def test_index_skips_unusable_records_across_batches(num_proc: int) -> None:
+    def extract(record: Any) -> Optional[Tuple[str, str]]:
+        if record["prompt"] is None:
+            return None
+        return record["prompt"], record["completion"]
+
+    # The usable records by dataset offset
+    usable = {0: (_text(3), _text(1)), 3: (_text(4), _text(2)), 4: (_text(1), _text(3))}
+    records: List[Dict[str, Optional[str]]] = [
+        {"prompt": usable[0][0], "completion": usable[0][1]},
+        {"prompt": None, "completion": _text(1)},
+        {"prompt": _text(2), "completion": None},
+        {"prompt": usable[3][0], "completion": usable[3][1]},
+        {"prompt": usable[4][0], "completion": usable[4][1]},
+    ]
+    tokenizer = _tokenizer()
+
+    index = build_length_index(Dataset.from_list(records), extract, tokenizer, num_proc=num_proc, batch_size=2)
+
+    assert index.rows.tolist() == [
+        [offset, tokenizer.count_tokens(prompt), tokenizer.count_tokens(completion)]
+        for offset, (prompt, completion) in usable.items()
+    ]
+    assert index.table["prompt"] == [prompt for prompt, _ in usable.values()]
+    # Prompts of one to three words, which leaves out the four-word one
+    bounds = Distribution(mean=2, min=int(index.rows[2, 1]), max=int(index.rows[0, 1]), std_dev=1)
+    assert index.select(bounds, None).tolist() == [0, 2]
+    assert index.select(bounds, Distribution(mean=1, min=1, max=int(index.rows[0, 2]), std_dev=0)).tolist() == [0]
+    assert index.completion_data(2) == CompletionAPIData(prompt=_text(1), max_tokens=int(index.rows[2, 2]))
@@ -0,0 +1,71 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing as mp
+from queue import Empty
+from typing import Any, Dict
+
+import pytest
+
+from inference_perf.datagen.replay import SessionCompletionChannel
+
+
+def _report(channel: SessionCompletionChannel, completion: Dict[str, Any]) -> None:
+    channel.put_nowait(completion)
+
+
+def test_round_trip_preserves_optional_keys() -> None:
+    channel = SessionCompletionChannel()
+    channel.bind_sessions(["s0", "s1"])
+
+    completed = {
+        "session_id": "s1",
+        "completion_time": 12.5,
+        "failed": False,
+        "event_completion_times": {"event_0": 10.0, "event_1": 12.5},
+        "recorded_substitution_event_ids": ["event_1"],
+        "n_recorded_substitutions": 1,
+    }
+    skipped = {
+        "session_id": "s0",
+        "completion_time": 3.0,
+        "failed": True,
+        "failure_reason": "predecessor failed",
+        "cancelled_events": 4,
+        "event_completion_times": {},
+    }
+    assert channel.unpack(channel.pack(completed)) == completed
+    assert channel.unpack(channel.pack(skipped)) == skipped
+    # Sessions the channel was not bound to are sent by ID
+    unknown = {"session_id": "other", "completion_time": 1.0, "failed": False, "event_completion_times": {}}
+    assert channel.unpack(channel.pack(unknown)) == unknown
+
+
+def test_failure_flags_and_records_cross_processes() -> None:
+    channel = SessionCompletionChannel()
+    channel.bind_sessions(["s0", "s1", "s2"])
+    with pytest.raises(Empty):
+        channel.get(timeout=0.01)
+
+    worker = mp.Process(
+        target=_report,
+        args=(channel, {"session_id": "s2", "completion_time": 1.0, "failed": True, "event_completion_times": {}}),
+    )
+    worker.start()
+    completion = channel.get(timeout=5)
+    worker.join(timeout=5)
+
+    assert completion["session_id"] == "s2"
+    assert completion["failed"] is True
+    assert channel.is_failed("s2")
+    assert not channel.is_failed("s0")
@@ -1,8 +1,23 @@
 import pytest
-from typing import Any, List
-from inference_perf.datagen.datagen_utils import converge_to_exact_length_text
+from pathlib import Path
+from typing import Any, Callable, List
+
+import numpy as np
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, processors, trainers
+from transformers import AutoTokenizer, PreTrainedTokenizerFast
+
+from inference_perf.datagen.datagen_utils import (
+    build_word_start_token_ids,
+    converge_to_exact_length_text,
+    generate_random_exact_length_text,
+    init_vocab_sampling,
+    round_trip_stable_token_ids,
+)
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
+# transformers leaves the constructor unannotated; wrapping a tokenizers.Tokenizer returns a fast tokenizer
+_fast_tokenizer: Callable[..., PreTrainedTokenizerFast] = PreTrainedTokenizerFast
+
 
 class DummyTokenizer:
     vocab_size = 1000
@@ -106,3 +121,98 @@ def test_generate_exact_length_text_with_wrap_fn() -> None:
     assert tokenizer.count_tokens(result, add_special_tokens=False) == 5
     assert result == "<open> 10 20 30 <close>"
     assert ids == [10, 20, 30]
+
+
+CORPUS = [
+    "Shall I compare thee to a summer's day? Thou art more lovely and more temperate.",
+    "Rough winds do shake the darling buds of May, and summer's lease hath all too short a date.",
+    "Sometime too hot the eye of heaven shines, and often is his gold complexion dimm'd.",
+] * 20
+
+
+def _bpe_tokenizer(bos: bool) -> CustomTokenizer:
+    """A small byte-level BPE tokenizer, optionally prepending a BOS token like Llama's."""
+    bpe = Tokenizer(models.BPE())
+    bpe.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    bpe.decoder = decoders.ByteLevel()
+    bpe.train_from_iterator(
+        CORPUS,
+        trainers.BpeTrainer(vocab_size=400, special_tokens=["<s>"], initial_alphabet=pre_tokenizers.ByteLevel.alphabet()),
+    )
+    if bos:
+        bpe.post_processor = processors.TemplateProcessing(single="<s> $A", special_tokens=[("<s>", 0)])
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer.tokenizer = _fast_tokenizer(tokenizer_object=bpe, bos_token="<s>")
+    tokenizer._batcher = None
+    return tokenizer
+
+
+@pytest.mark.parametrize("bos", [False, True])
+def test_stable_tokens_give_exact_length_in_one_pass(bos: bool) -> None:
+    tokenizer = _bpe_tokenizer(bos)
+    _, _, valid = init_vocab_sampling(tokenizer)
+    stable = round_trip_stable_token_ids(tokenizer, valid)
+    assert stable is not None and 0 < len(stable) < len(valid)
+    rng = np.random.default_rng(0)
+
+    for target_len in [2, 3, 17, 500, 3000]:
+        text, ids = generate_random_exact_length_text(rng, valid, tokenizer, target_len, stable_token_ids=stable)
+        assert tokenizer.count_tokens(text) == target_len
+        assert set(ids) <= set(stable.tolist())
+
+
+def test_stable_tokens_with_wrap_fn_still_converge() -> None:
+    tokenizer = _bpe_tokenizer(bos=False)
+    _, _, valid = init_vocab_sampling(tokenizer)
+    stable = round_trip_stable_token_ids(tokenizer, valid)
+
+    text, _ = generate_random_exact_length_text(
+        np.random.default_rng(0), valid, tokenizer, 50, wrap_fn=lambda t: f"Question:{t}\nAnswer:", stable_token_ids=stable
+    )
+
+    assert text.startswith("Question:") and tokenizer.count_tokens(text, add_special_tokens=False) == 50
+
+
+def test_non_hf_tokenizers_have_no_stable_tokens() -> None:
+    assert round_trip_stable_token_ids(DummyCustomTokenizer(), np.arange(4, 1000)) is None
+
+
+def test_vocab_tables_match_per_token_decoding() -> None:
+    tokenizer = _bpe_tokenizer(bos=True)
+    hf = tokenizer.get_tokenizer()
+    vocab_size, special, valid = init_vocab_sampling(tokenizer)
+    word_starts = build_word_start_token_ids(tokenizer, valid)
+
+    assert valid.tolist() == [i for i in range(vocab_size) if i not in special]
+    expected_word_starts = []
+    for token_id in valid.tolist():
+        text = hf.decode([token_id], skip_special_tokens=True)
+        assert isinstance(text, str)
+        if text[:1].isspace():
+            expected_word_starts.append(token_id)
+    assert word_starts.tolist() == expected_word_starts
+    assert build_word_start_token_ids(DummyCustomTokenizer(), np.arange(4, 10)).tolist() == list(range(4, 10))
+
+
+def test_vocab_tables_are_cached_per_tokenizer_name(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _bpe_tokenizer(bos=False).get_tokenizer().save_pretrained(tmp_path / "tokenizer")
+
+    def load() -> CustomTokenizer:
+        tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+        tokenizer.tokenizer = AutoTokenizer.from_pretrained(str(tmp_path / "tokenizer"))
+        tokenizer._batcher = None
+        return tokenizer
+
+    def tables(tokenizer: CustomTokenizer) -> List[List[int]]:
+        _, _, valid = init_vocab_sampling(tokenizer, str(tmp_path / "cache"))
+        word_starts = build_word_start_token_ids(tokenizer, valid, str(tmp_path / "cache"))
+        stable = round_trip_stable_token_ids(tokenizer, valid, str(tmp_path / "cache"))
+        assert stable is not None
+        return [valid.tolist(), word_starts.tolist(), stable.tolist()]
+
+    first = load()
+    built = tables(first)
+    monkeypatch.setattr(PreTrainedTokenizerFast, "batch_decode", lambda *args, **kwargs: pytest.fail("vocab decoded"))
+
+    assert tables(first) == built
+    assert tables(load()) == built
@@ -0,0 +1,179 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
+from transformers.tokenization_utils_base import VERY_LARGE_INTEGER
+
+from inference_perf.apis import LazyLoadInferenceAPIData
+from inference_perf.config import (
+    APIConfig,
+    APIType,
+    ConversationReplayConfig,
+    DataConfig,
+    DataGenType,
+    Distribution,
+    SharedPrefix,
+)
+from inference_perf.datagen.prompt_cache import corpus_key, load_corpus, store_corpus
+from inference_perf.datagen.replay.conversation_replay_datagen import ConversationReplayDataGenerator
+from inference_perf.datagen.synthetic import random_datagen
+from inference_perf.datagen.synthetic.random_datagen import RandomDataGenerator
+from inference_perf.datagen.synthetic.shared_prefix_datagen import SharedPrefixDataGenerator
+from inference_perf.utils.custom_tokenizer import CustomTokenizer
+
+
+class WordTokenizer:
+    """Stands in for a HF tokenizer: token i is the word "w<i>" and text is words joined by spaces."""
+
+    model_max_length = VERY_LARGE_INTEGER
+    all_special_ids: List[int] = []
+
+    def __init__(self, vocab_size: int = 200) -> None:
+        self.vocab_size = vocab_size
+
+    def get_vocab(self) -> Dict[str, int]:
+        return {f"w{i}": i for i in range(self.vocab_size)}
+
+    def decode(self, ids: List[int], **kwargs: Any) -> str:
+        return " ".join(f"w{i}" for i in ids)
+
+    def __call__(self, text: Union[str, List[str]], add_special_tokens: bool = True, **kwargs: Any) -> SimpleNamespace:
+        return SimpleNamespace(input_ids=[int(word[1:]) for word in str(text).split()])
+
+
+def make_tokenizer(vocab_size: int = 200) -> CustomTokenizer:
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer.tokenizer = WordTokenizer(vocab_size)  # type: ignore[assignment]
+    tokenizer._batcher = None
+    return tokenizer
+
+
+def _shared_prefix(cache_dir: Optional[Path], multi_turn: bool = False) -> SharedPrefixDataGenerator:
+    config = DataConfig(
+        type=DataGenType.SharedPrefix,
+        prompt_cache_dir=str(cache_dir) if cache_dir else None,
+        shared_prefix=SharedPrefix(
+            num_groups=3,
+            num_prompts_per_group=4,
+            system_prompt_len=20,
+            question_len=Distribution(mean=10, min=5, max=15, std_dev=3),
+            output_len=8,
+            seed=7,
+            enable_multi_turn_chat=multi_turn,
+        ),
+    )
+    return SharedPrefixDataGenerator(APIConfig(type=APIType.Completion), config, make_tokenizer())
+
+
+@pytest.mark.parametrize("multi_turn", [False, True])
+def test_shared_prefix_cache_hit_matches_generated_prompts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, multi_turn: bool
+) -> None:
+    uncached = _shared_prefix(None, multi_turn)
+    first = _shared_prefix(tmp_path, multi_turn)
+    monkeypatch.setattr(SharedPrefixDataGenerator, "_build_prompts", lambda self: pytest.fail("prompts regenerated"))
+    cached = _shared_prefix(tmp_path, multi_turn)
+
+    for generator in (first, cached):
+        assert list(generator.prompts) == uncached.prompts
+        assert generator.prefix_texts == uncached.prefix_texts
+        assert generator.prompt_groups == uncached.prompt_groups
+        assert generator.flat_output_lens == uncached.flat_output_lens
+        assert [(s.user_session_id, s.context) for s in generator.user_sessions] == [
+            (s.user_session_id, s.context) for s in uncached.user_sessions
+        ]
+        assert generator.rng.bit_generator.state == uncached.rng.bit_generator.state
+    assert pickle.loads(pickle.dumps(cached.prompts))[5] == uncached.prompts[5]
+
+
+def _random(cache_dir: Path, seed: int) -> RandomDataGenerator:
+    config = DataConfig(
+        type=DataGenType.Random,
+        prompt_cache_dir=str(cache_dir),
+        input_distribution=Distribution(mean=30, min=10, max=50, std_dev=10, total_count=12),
+        output_distribution=Distribution(mean=10, min=10, max=10, std_dev=0, total_count=12),
+    )
+    return RandomDataGenerator(APIConfig(type=APIType.Completion), config, make_tokenizer(), seed=seed)
+
+
+def _prompts(generator: RandomDataGenerator) -> List[str]:
+    return [generator.load_lazy_data(LazyLoadInferenceAPIData(data_index=i)).prompt for i in range(12)]  # type: ignore[attr-defined]
+
+
+def test_random_prompts_are_generated_once_per_seed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    first = _random(tmp_path, seed=1)
+    assert [len(prompt.split()) for prompt in _prompts(first)] == first.input_lengths.tolist()
+
+    monkeypatch.setattr(
+        random_datagen, "generate_random_exact_length_text", lambda *args, **kwargs: pytest.fail("prompt regenerated")
+    )
+    assert _prompts(_random(tmp_path, seed=1)) == _prompts(first)
+    with pytest.raises(pytest.fail.Exception):
+        _random(tmp_path, seed=2)
+
+
+def _conversation_replay(cache_dir: Optional[Path]) -> ConversationReplayDataGenerator:
+    config = DataConfig(
+        type=DataGenType.ConversationReplay,
+        prompt_cache_dir=str(cache_dir) if cache_dir else None,
+        conversation_replay=ConversationReplayConfig(
+            num_conversations=3,
+            shared_system_prompt_len=16,
+            dynamic_system_prompt_len=Distribution(mean=6, min=2, max=10, std_dev=2),
+            turns_per_conversation=Distribution(mean=3, min=1, max=5, std_dev=1),
+            input_tokens_per_turn=Distribution(mean=12, min=4, max=20, std_dev=4),
+            output_tokens_per_turn=Distribution(mean=8, min=8, max=8, std_dev=0),
+        ),
+    )
+    return ConversationReplayDataGenerator(APIConfig(type=APIType.Completion), config, make_tokenizer())
+
+
+def test_conversation_replay_cache_hit_matches_generated_blueprints(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    uncached = _conversation_replay(None)
+    _conversation_replay(tmp_path)
+    monkeypatch.setattr(
+        ConversationReplayDataGenerator, "_generate_conversations", lambda self: pytest.fail("conversations regenerated")
+    )
+    cached = _conversation_replay(tmp_path)
+
+    assert cached.blueprints == uncached.blueprints
+    assert [s.context for s in cached.user_sessions] == [s.context for s in uncached.user_sessions]
+    assert cached.rng.bit_generator.state == uncached.rng.bit_generator.state
+
+
+def test_corpus_round_trips_texts_and_token_ids(tmp_path: Path) -> None:
+    texts = ["", "héllo wörld", "w1 w2"]
+    corpus = store_corpus(str(tmp_path), "key", texts, [[], [5, 6], [1, 2]], meta={"order": [2, 0, 1]})
+
+    assert list(corpus) == texts
+    assert corpus[-1] == "w1 w2" and corpus[1:] == texts[1:]
+    assert corpus.token_ids(1) == [5, 6]
+    assert corpus.meta == {"order": [2, 0, 1]}
+
+
+def test_unreadable_entry_is_regenerated(tmp_path: Path) -> None:
+    store_corpus(str(tmp_path), "key", ["w1 w2", "w3"])
+    (tmp_path / "key" / "texts.bin").write_bytes(b"w1")
+
+    assert load_corpus(str(tmp_path), "key") is None
+    assert list(store_corpus(str(tmp_path), "key", ["w4"])) == ["w4"]
+
+
+def test_key_depends_on_tokenizer_vocab() -> None:
+    assert corpus_key(make_tokenizer(), "generator", {"seed": 1}) == corpus_key(make_tokenizer(), "generator", {"seed": 1})
+    assert corpus_key(make_tokenizer(), "generator", {"seed": 1}) != corpus_key(make_tokenizer(201), "generator", {"seed": 1})
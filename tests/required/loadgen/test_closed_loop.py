@@ -0,0 +1,36 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from inference_perf.loadgen.closed_loop import VirtualUserPool
+
+
+def test_users_and_indices_are_bounded_per_stage() -> None:
+    pool = VirtualUserPool()
+    pool.start_stage(num_users=2, num_requests=3)
+
+    assert pool.acquire_user(timeout=0.01)
+    assert pool.acquire_user(timeout=0.01)
+    assert not pool.acquire_user(timeout=0.01)
+    assert [pool.claim_index() for _ in range(4)] == [0, 1, 2, None]
+
+    pool.release_user()
+    pool.release_user()
+    pool.reset()
+    assert not pool.acquire_user(timeout=0.01)
+
+    # The next stage starts over from index 0 with its own number of users
+    pool.start_stage(num_users=1, num_requests=1)
+    assert pool.acquire_user(timeout=0.01)
+    assert not pool.acquire_user(timeout=0.01)
+    assert pool.claim_index() == 0
+    assert pool.claim_index() is None
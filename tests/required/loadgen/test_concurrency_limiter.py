@@ -0,0 +1,64 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import unittest
+
+from inference_perf.loadgen.concurrency_limiter import ConcurrencyLimiter
+
+
+class TestConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_grow_wakes_waiters_immediately(self) -> None:
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        limiter.resize(2)
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(limiter.in_use, 2)
+
+    async def test_shrink_keeps_held_permits(self) -> None:
+        limiter = ConcurrencyLimiter(3)
+        for _ in range(3):
+            await limiter.acquire()
+        limiter.resize(1)
+        self.assertEqual(limiter.in_use, 3)
+        self.assertTrue(limiter.locked())
+
+        waiter = asyncio.create_task(limiter.acquire())
+        limiter.release()
+        limiter.release()
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())  # still at the new limit
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(limiter.in_use, 1)
+
+    async def test_cancelled_waiter_does_not_leak_permit(self) -> None:
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        limiter.release()
+        await asyncio.wait_for(queued, timeout=1)
+        self.assertEqual(limiter.in_use, 1)
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+
+    async def test_release_without_acquire_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            ConcurrencyLimiter(1).release()
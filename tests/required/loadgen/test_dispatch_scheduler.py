@@ -0,0 +1,79 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+import unittest
+
+from inference_perf.config import DispatchPolicy, DispatchSchedulerConfig
+from inference_perf.loadgen.dispatch_scheduler import (
+    SLIP_BUCKETS,
+    CoordinatedOmissionCorrectedScheduler,
+    DropIfLateScheduler,
+    SlipHistogram,
+    StrictScheduler,
+    get_dispatch_scheduler,
+)
+
+
+class TestSlipHistogram(unittest.TestCase):
+    def test_buckets_and_dropped_slot(self) -> None:
+        histogram = SlipHistogram()
+        histogram.record(0.0)
+        histogram.record(0.001)
+        histogram.record(0.003)
+        histogram.record(60.0)
+        histogram.record_dropped()
+
+        counts = histogram.snapshot()
+        self.assertEqual(len(counts), len(SLIP_BUCKETS) + 2)
+        self.assertEqual(counts[0], 2)  # bucket upper bounds are inclusive
+        self.assertEqual(counts[2], 1)
+        self.assertEqual(counts[len(SLIP_BUCKETS)], 1)  # overflow
+        self.assertEqual(counts[-1], 1)
+
+
+class TestDispatchScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_strict_sends_late_requests(self) -> None:
+        histogram = SlipHistogram()
+        scheduler = StrictScheduler(histogram)
+        self.assertTrue(await scheduler.wait_for_dispatch(time.perf_counter() - 10.0))
+        self.assertEqual(histogram.snapshot()[len(SLIP_BUCKETS)], 1)
+        self.assertEqual(histogram.snapshot()[-1], 0)
+
+    async def test_strict_waits_for_scheduled_time(self) -> None:
+        scheduler = StrictScheduler(SlipHistogram())
+        request_time = time.perf_counter() + 0.05
+        self.assertTrue(await scheduler.wait_for_dispatch(request_time))
+        self.assertGreaterEqual(time.perf_counter(), request_time)
+
+    async def test_drop_if_late_skips_beyond_threshold(self) -> None:
+        histogram = SlipHistogram()
+        scheduler = DropIfLateScheduler(histogram, late_threshold=0.5)
+        self.assertTrue(await scheduler.wait_for_dispatch(time.perf_counter()))
+        self.assertFalse(await scheduler.wait_for_dispatch(time.perf_counter() - 1.0))
+        counts = histogram.snapshot()
+        self.assertEqual(sum(counts[:-1]), 2)  # slip is recorded for dropped requests too
+        self.assertEqual(counts[-1], 1)
+
+    def test_factory(self) -> None:
+        histogram = SlipHistogram()
+        self.assertIsInstance(get_dispatch_scheduler(DispatchSchedulerConfig(), histogram), StrictScheduler)
+        drop = get_dispatch_scheduler(
+            DispatchSchedulerConfig(policy=DispatchPolicy.DROP_IF_LATE, late_threshold=0.25), histogram
+        )
+        assert isinstance(drop, DropIfLateScheduler)
+        self.assertEqual(drop.late_threshold, 0.25)
+        self.assertIsInstance(
+            get_dispatch_scheduler(DispatchSchedulerConfig(policy=DispatchPolicy.COORDINATED_OMISSION_CORRECTED), histogram),
+            CoordinatedOmissionCorrectedScheduler,
+        )
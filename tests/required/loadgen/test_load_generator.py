@@ -18,14 +18,29 @@ import multiprocessing as mp
 import asyncio
 import typing
 import sys
+import time
 import numpy as np
+from queue import Empty
 from typing import Any
 
-from inference_perf.loadgen.load_generator import LoadGenerator, RequestQueueData
-from inference_perf.config import LoadConfig, LoadType, TraceConfig, TraceFormat, StandardLoadStage
+from inference_perf.loadgen.load_generator import LoadGenerator, RequestQueueData, RequestQueueDataCodec, WorkItem
+from inference_perf.config import (
+    LoadConfig,
+    LoadType,
+    StageGenType,
+    SweepConfig,
+    SweepSearch,
+    TraceConfig,
+    TraceFormat,
+    StandardLoadStage,
+    TraceSessionReplayLoadStage,
+)
 from inference_perf.client.modelserver import ModelServerClient
-from inference_perf.apis import InferenceAPIData
-from inference_perf.utils.request_queue import RequestQueue
+from inference_perf.client.server_metrics.base import StageRuntimeInfo, StageStatus
+from inference_perf.metrics import LocalRequestMetricCollector
+from inference_perf.apis import InferenceAPIData, InferenceInfo, LazyLoadInferenceAPIData, RequestLifecycleMetric
+from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.utils.request_queue import RequestQueue, RingBufferRequestQueue
 
 # Patch asyncio.TaskGroup for Python < 3.11
 if sys.version_info < (3, 11):
@@ -46,7 +61,7 @@ if sys.version_info < (3, 11):
 if sys.version_info < (3, 10):
     typing.TypeAlias = typing.Any
 
-from inference_perf.datagen import DataGenerator
+from inference_perf.datagen import DataGenerator, SessionGenerator
 
 
 class MockWorker:
@@ -204,6 +219,44 @@ class TestLoadGenerator(unittest.IsolatedAsyncioTestCase):
         cancel_signal.set.assert_called_once()
         self.assertEqual(self.load_generator.stage_runtime_info[0].status.name, "FAILED")
 
+    async def test_run_stage_bounded_lookahead(self) -> None:
+        self.load_generator.dispatch_lookahead = 0.1
+        finished_counter = mp.Value("i", 0)
+        put_times: list[float] = []
+
+        def put_batch_async(items: list[RequestQueueData], channel_id: int = -1) -> None:
+            # Simulate a worker that finishes each request immediately
+            for _ in items:
+                put_times.append(time.perf_counter())
+                finished_counter.value += 1
+
+        request_queue = MagicMock(spec=RequestQueue)
+        request_queue.put_batch_async.side_effect = put_batch_async
+
+        base = time.perf_counter()
+        mock_timer = MagicMock()
+        # One request already a second late, one 0.3s in the future
+        mock_timer.start_timer.return_value = iter([base - 1.0, base + 0.3])
+        with patch.object(self.load_generator, "get_timer", return_value=mock_timer):
+            await self.load_generator.run_stage(
+                stage_id=0,
+                rate=2,
+                duration=1,
+                request_queue=request_queue,
+                active_requests_counter=mp.Value("i", 0),
+                finished_requests_counter=finished_counter,
+                request_phase=MagicMock(),
+            )
+
+        self.assertEqual(len(put_times), 2)
+        # The future request is held back until it enters the lookahead window
+        self.assertGreaterEqual(put_times[1], base + 0.3 - 0.1)
+        dispatch = self.load_generator.stage_runtime_info[0].dispatch
+        assert dispatch is not None
+        self.assertEqual(dispatch.enqueued, 2)
+        self.assertEqual(dispatch.late_enqueues, 1)
+        self.assertGreaterEqual(dispatch.max_producer_lag, 1.0)
+
     @patch("inference_perf.loadgen.load_generator.sleep", new_callable=AsyncMock)
     async def test_run_single_worker_mode(self, mock_sleep: AsyncMock) -> None:
         # Setup for num_workers = 0 (single worker loop)
@@ -240,7 +293,7 @@ class TestLoadGenerator(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(self.load_generator.stage_runtime_info[0].status.name, "COMPLETED")
 
     async def test_drain(self) -> None:
-        q: RequestQueue[RequestQueueData] = RequestQueue(1)
+        q: RequestQueue[WorkItem] = RequestQueue(1)
         dummy_data = MagicMock(spec=InferenceAPIData)
         q.put(RequestQueueData(0, dummy_data, 0.0, None), 0)
         q.put(RequestQueueData(0, dummy_data, 0.0, None), 0)
@@ -260,5 +313,167 @@ class TestLoadGenerator(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(self.load_generator.interrupt_sig)
 
 
+class TestSessionStage(unittest.IsolatedAsyncioTestCase):
+    async def test_run_session_stage_dispatches_on_reported_completions(self) -> None:
+        datagen = MagicMock(spec=SessionGenerator)
+        datagen.get_session_count.return_value = 4
+        datagen.get_session_info.side_effect = lambda idx: {"session_id": f"s{idx}"}
+        datagen.get_session_events.side_effect = lambda idx: [LazyLoadInferenceAPIData(data_index=idx)]
+        # Each wakeup reports only the sessions that finished since the previous one
+        datagen.wait_for_session_completions.side_effect = [["s0", "s1"], [], ["s2", "s3"]]
+        load_config = LoadConfig(
+            type=LoadType.TRACE_SESSION_REPLAY,
+            num_workers=1,
+            stages=[TraceSessionReplayLoadStage(concurrent_sessions=2)],
+        )
+        with patch("inference_perf.loadgen.load_generator.get_circuit_breaker"):
+            load_generator = LoadGenerator(datagen, load_config)
+
+        request_queue = MagicMock(spec=RequestQueue)
+        await load_generator.run_session_stage(
+            stage_id=0,
+            stage=TraceSessionReplayLoadStage(concurrent_sessions=2),
+            request_queue=request_queue,
+            active_requests_counter=mp.Value("i", 0),
+            finished_requests_counter=mp.Value("i", 0),
+            request_phase=MagicMock(),
+        )
+
+        self.assertEqual(request_queue.put_batch_async.await_count, 4)
+        self.assertEqual(datagen.wait_for_session_completions.call_count, 3)
+        datagen.check_session_completed.assert_not_called()
+        self.assertEqual(datagen.cleanup_session.call_count, 4)
+        stage_info = load_generator.stage_runtime_info[0]
+        self.assertEqual(stage_info.status.name, "COMPLETED")
+        self.assertIsNotNone(stage_info.parent_cpu_utilization)
+
+    async def test_session_events_wait_for_room_in_a_full_ring_without_blocking_the_loop(self) -> None:
+        events_per_session = 5
+        datagen = MagicMock(spec=SessionGenerator)
+        datagen.get_session_count.return_value = 2
+        datagen.get_session_info.side_effect = lambda idx: {"session_id": f"s{idx}"}
+        datagen.get_session_events.side_effect = lambda idx: [
+            LazyLoadInferenceAPIData(data_index=idx * events_per_session + i) for i in range(events_per_session)
+        ]
+        completed: list[str] = []
+
+        def wait_for_session_completions(timeout: float) -> list[str]:
+            time.sleep(min(timeout, 0.01))
+            reported = list(completed)
+            completed.clear()
+            return reported
+
+        datagen.wait_for_session_completions.side_effect = wait_for_session_completions
+        load_config = LoadConfig(
+            type=LoadType.TRACE_SESSION_REPLAY,
+            num_workers=1,
+            stages=[TraceSessionReplayLoadStage(concurrent_sessions=2)],
+        )
+        with patch("inference_perf.loadgen.load_generator.get_circuit_breaker"):
+            load_generator = LoadGenerator(datagen, load_config)
+
+        # Smaller than one session's events, so dispatching has to wait for the worker to take some
+        request_queue: RingBufferRequestQueue[WorkItem] = RingBufferRequestQueue(codec=RequestQueueDataCodec(), capacity=2)
+        channel = request_queue.get_channel(0)
+
+        async def worker() -> list[int]:
+            # Runs on the same loop as the stage, so a put blocked on the full ring would never let it in
+            received: list[int] = []
+            while len(received) < 2 * events_per_session:
+                await asyncio.sleep(0.01)
+                try:
+                    items = channel.get_batch(2, block=False)
+                except Empty:
+                    continue
+                for item in items:
+                    assert isinstance(item, RequestQueueData) and isinstance(item.request_data, LazyLoadInferenceAPIData)
+                    received.append(item.request_data.data_index)
+                    if len(received) % events_per_session == 0:
+                        completed.append(f"s{len(received) // events_per_session - 1}")
+                channel.task_done(len(items))
+            return received
+
+        consumer = asyncio.create_task(worker())
+        await asyncio.wait_for(
+            load_generator.run_session_stage(
+                stage_id=0,
+                stage=TraceSessionReplayLoadStage(concurrent_sessions=2),
+                request_queue=request_queue,
+                active_requests_counter=mp.Value("i", 0),
+                finished_requests_counter=mp.Value("i", 0),
+                request_phase=MagicMock(),
+            ),
+            timeout=10,
+        )
+
+        self.assertEqual(sorted(await consumer), list(range(2 * events_per_session)))
+        self.assertEqual(load_generator.stage_runtime_info[0].status.name, "COMPLETED")
+
+
+class TestAdaptiveSweep(unittest.IsolatedAsyncioTestCase):
+    async def test_adaptive_preprocess_generates_stages_around_knee(self) -> None:
+        collector = LocalRequestMetricCollector()
+        load_config = LoadConfig(
+            type=LoadType.CONSTANT,
+            num_workers=1,
+            interval=0,
+            sweep=SweepConfig(
+                type=StageGenType.LINEAR,
+                search=SweepSearch.ADAPTIVE,
+                constraints={"request_latency": 1.0},
+                start_rate=2.0,
+                num_stages=3,
+                stage_duration=60,
+                knee_spread=0.2,
+            ),
+        )
+        with patch("inference_perf.loadgen.load_generator.get_circuit_breaker"):
+            load_generator = LoadGenerator(MagicMock(spec=DataGenerator), load_config, request_metrics_collector=collector)
+
+        finished = mp.Value("i", 0)
+
+        async def fake_run_stage(stage_id: int, rate: float, duration: int, *args: Any, **kwargs: Any) -> None:
+            # The server keeps latency under the 1s SLO up to 20 QPS
+            num_requests = int(rate * duration)
+            for _ in range(num_requests):
+                collector.record_metric(
+                    RequestLifecycleMetric(
+                        stage_id=stage_id,
+                        scheduled_time=0.0,
+                        start_time=0.0,
+                        end_time=rate / 20,
+                        request_data="",
+                        info=InferenceInfo(request_metrics=RequestMetrics(text=Text(input_tokens=1))),
+                        error=None,
+                    )
+                )
+            finished.value = num_requests
+            load_generator.stage_runtime_info[stage_id] = StageRuntimeInfo(
+                stage_id=stage_id, rate=rate, start_time=0.0, end_time=1.0, status=StageStatus.COMPLETED
+            )
+
+        with patch.object(load_generator, "run_stage", side_effect=fake_run_stage) as run_stage:
+            await load_generator.preprocess(
+                MagicMock(),
+                MagicMock(spec=RequestQueue),
+                mp.Value("i", 0),
+                finished,
+                MagicMock(),
+                MagicMock(),
+            )
+
+        probe_stage_ids = [call.args[0] for call in run_stage.call_args_list]
+        self.assertEqual(probe_stage_ids, list(range(-1, -len(probe_stage_ids) - 1, -1)))
+        self.assertEqual([call.args[1] for call in run_stage.call_args_list][:4], [2.0, 4.0, 8.0, 16.0])
+        rates = []
+        for stage in load_generator.stages:
+            assert isinstance(stage, StandardLoadStage) and stage.rate is not None
+            rates.append(stage.rate)
+        self.assertEqual(len(rates), 3)
+        self.assertGreaterEqual(rates[1], 19.0)
+        self.assertLessEqual(rates[1], 20.0)
+        self.assertAlmostEqual(rates[0], rates[1] * 0.8, delta=0.02)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,100 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Dict, Optional
+
+import pytest
+
+from inference_perf.apis import ErrorResponseInfo, InferenceInfo, RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.config import StageGenType, SweepConfig, SweepSearch
+from inference_perf.loadgen.saturation_search import ProbeResult, SaturationProbe, SaturationSearch
+from inference_perf.payloads import RequestMetrics, Text
+
+
+def _metric(stage_id: int, ttft: float, latency: float, error: Optional[str] = None) -> RequestLifecycleMetric:
+    return RequestLifecycleMetric(
+        stage_id=stage_id,
+        scheduled_time=0.0,
+        start_time=0.0,
+        end_time=latency,
+        request_data="",
+        info=InferenceInfo(
+            request_metrics=RequestMetrics(text=Text(input_tokens=5)),
+            response_metrics=StreamedResponseMetrics(output_tokens=3, output_token_times=[ttft, ttft + 0.1, ttft + 0.2]),
+        ),
+        error=ErrorResponseInfo(error_type="Timeout", error_msg=error) if error else None,
+    )
+
+
+def _adaptive(constraints: Optional[Dict[str, float]] = None, **kwargs: float) -> SweepConfig:
+    return SweepConfig(type=StageGenType.LINEAR, search=SweepSearch.ADAPTIVE, constraints=constraints or {}, **kwargs)
+
+
+def test_adaptive_requires_an_slo() -> None:
+    with pytest.raises(ValueError):
+        SweepConfig(type=StageGenType.LINEAR, search=SweepSearch.ADAPTIVE)
+
+
+def test_probe_counts_failures_against_goodput() -> None:
+    config = _adaptive(constraints={"request_latency": 1.0}, min_goodput_percentage=75)
+    probe = SaturationProbe(stage_id=-1)
+    for latency in (0.5, 0.5, 0.5):
+        probe.feed(_metric(-1, 0.1, latency))
+    probe.feed(_metric(-2, 0.1, 5.0))  # another probe's metric is ignored
+    assert probe.evaluate(1.0, config).passed
+
+    probe.feed(_metric(-1, 0.1, 0.5, error="timed out"))
+    probe.feed(_metric(-1, 0.1, 2.0))
+    result = probe.evaluate(1.0, config)
+    assert result.num_requests == 5
+    assert result.num_failed == 1
+    assert result.goodput_percentage == pytest.approx(60.0)
+    assert not result.passed
+
+
+def test_probe_ttft_p99() -> None:
+    config = _adaptive(max_ttft_p99=0.5)
+    probe = SaturationProbe(stage_id=-1)
+    for _ in range(99):
+        probe.feed(_metric(-1, 0.1, 1.0))
+    assert probe.evaluate(1.0, config).passed
+    for _ in range(5):
+        probe.feed(_metric(-1, 2.0, 3.0))
+    assert not probe.evaluate(1.0, config).passed
+    assert not SaturationProbe(stage_id=-1).evaluate(1.0, config).passed  # nothing measured
+
+
+def test_search_brackets_then_bisects_to_tolerance() -> None:
+    config = _adaptive(max_ttft_p99=1.0, start_rate=1.0, tolerance=0.05, num_stages=3, knee_spread=0.1)
+    search = SaturationSearch(config)
+    capacity = 11.0
+    probed = []
+    while (rate := search.next_rate()) is not None:
+        probed.append(rate)
+        search.record(ProbeResult(rate, 10, 0, None, None, rate <= capacity))
+
+    assert probed[:5] == [1.0, 2.0, 4.0, 8.0, 16.0]
+    assert search.lowest_failing is not None
+    assert search.lowest_failing - search.highest_passing <= 0.05 * search.lowest_failing
+    assert capacity * 0.95 <= search.highest_passing <= capacity
+    knee = search.highest_passing
+    assert search.stage_rates() == [round(knee * 0.9, 2), round(knee, 2), round(knee * 1.1, 2)]
+
+
+def test_search_respects_probe_budget_and_failure() -> None:
+    search = SaturationSearch(_adaptive(max_ttft_p99=1.0, max_probes=3))
+    while (rate := search.next_rate()) is not None:
+        search.record(ProbeResult(rate, 10, 10, None, None, False))
+    assert len(search.results) == 3
+    with pytest.raises(Exception, match="no rate"):
+        search.stage_rates()
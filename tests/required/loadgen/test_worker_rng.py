@@ -13,25 +13,36 @@
 # limitations under the License.
 import ast
 import multiprocessing as mp
+import os
 import sys
 import unittest
-from typing import Any
+from asyncio import wait_for
+from collections import Counter
+from typing import Any, Optional
 
+from inference_perf.apis import InferenceAPIData
 from inference_perf.client.modelserver.mock_client import MockModelServerClient
 from inference_perf.config import (
     APIConfig,
     APIType,
+    ConcurrentLoadStage,
     DataConfig,
+    DistributionType,
     DataGenType,
     Distribution,
     LoadConfig,
     LoadType,
+    MultiLoRAConfig,
+    RequestQueueBackend,
+    StageGenType,
     StandardLoadStage,
+    SweepConfig,
+    SweepSearch,
 )
 from inference_perf.datagen.synthetic.random_datagen import RandomDataGenerator
 from inference_perf.datagen.synthetic.synthetic_datagen import SyntheticDataGenerator
 from inference_perf.loadgen.load_generator import LoadGenerator
-from inference_perf.metrics.request_collector import MultiprocessRequestMetricCollector
+from inference_perf.metrics.request_collector import MultiprocessRequestMetricCollector, RequestMetricCollector
 from inference_perf.utils.custom_tokenizer import CustomTokenizer
 
 # Match the start method used in production (main.py) so the tokenizer and
@@ -71,6 +82,22 @@ class _DummyCustomTokenizer(CustomTokenizer):
         return len(text.split()) if text else 0
 
 
+class _PidRecordingClient(MockModelServerClient):
+    """Mock client noting which worker process sent each request."""
+
+    def __init__(
+        self, metrics_collector: RequestMetricCollector, api_config: APIConfig, pids: Any, mock_latency: float
+    ) -> None:
+        super().__init__(metrics_collector, api_config, mock_latency=mock_latency)
+        self.pids = pids
+
+    async def process_request(
+        self, data: InferenceAPIData, stage_id: int, scheduled_time: float, lora_adapter: Optional[str] = None
+    ) -> None:
+        self.pids.append(os.getpid())
+        await super().process_request(data, stage_id, scheduled_time, lora_adapter)
+
+
 class TestWorkerRNGUniqueness(unittest.IsolatedAsyncioTestCase):
     """Integration test: multi-worker LoadGenerator must produce unique prompts per request.
 
@@ -157,6 +184,283 @@ class TestWorkerRNGUniqueness(unittest.IsolatedAsyncioTestCase):
             + "\n".join(f"  [{i}] {p!r}" for i, p in enumerate(prompts)),
         )
 
+    async def test_worker_side_schedule_prompts_unique(self) -> None:
+        """Workers expanding their own share of a stage must cover every data index exactly once."""
+        num_requests = 7
+        num_workers = 2
+
+        api_config = APIConfig(type=APIType.Completion, streaming=False)
+        data_config = DataConfig(
+            type=DataGenType.Random,
+            input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=num_requests),
+            output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=num_requests),
+        )
+        datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+
+        collector = MultiprocessRequestMetricCollector()
+        client = MockModelServerClient(collector, api_config, mock_latency=0)
+
+        load_config = LoadConfig(
+            type=LoadType.POISSON,
+            num_workers=num_workers,
+            worker_max_concurrency=10,
+            stages=[StandardLoadStage(rate=num_requests, duration=1)],
+            base_seed=42,
+            worker_side_schedule=True,
+        )
+        load_gen = LoadGenerator(datagen, load_config)
+        self.assertTrue(load_gen.worker_side_schedule)
+
+        async with collector.start():
+            await load_gen.mp_run(client)
+
+        metrics = collector.get_metrics()
+        self.assertEqual(len(metrics), num_requests, f"Expected {num_requests} completed requests")
+        self.assertEqual(load_gen.stage_runtime_info[0].status.name, "COMPLETED")
+        prompts = [ast.literal_eval(m.request_data)["prompt"] for m in metrics]
+        self.assertEqual(len(set(prompts)), num_requests)
+
+    async def test_ring_buffer_backend_prompts_unique(self) -> None:
+        """Requests sent through the shared-memory ring must reach workers exactly once."""
+        num_requests = 12
+        num_workers = 3
+
+        api_config = APIConfig(type=APIType.Completion, streaming=False)
+        data_config = DataConfig(
+            type=DataGenType.Random,
+            input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=num_requests),
+            output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=num_requests),
+        )
+        datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+
+        collector = MultiprocessRequestMetricCollector()
+        client = MockModelServerClient(collector, api_config, mock_latency=0)
+
+        load_config = LoadConfig(
+            type=LoadType.CONSTANT,
+            num_workers=num_workers,
+            worker_max_concurrency=10,
+            stages=[StandardLoadStage(rate=num_requests, duration=1)],
+            base_seed=42,
+            request_queue_backend=RequestQueueBackend.RING_BUFFER,
+        )
+        load_gen = LoadGenerator(datagen, load_config)
+
+        async with collector.start():
+            await load_gen.mp_run(client)
+
+        metrics = collector.get_metrics()
+        self.assertEqual(len(metrics), num_requests, f"Expected {num_requests} completed requests")
+        self.assertEqual(load_gen.stage_runtime_info[0].status.name, "COMPLETED")
+        prompts = [ast.literal_eval(m.request_data)["prompt"] for m in metrics]
+        self.assertEqual(len(set(prompts)), num_requests)
+
+    async def test_closed_loop_prompts_unique_and_concurrency_bounded(self) -> None:
+        """Virtual users shared by all workers must send every request once and never exceed the stage concurrency."""
+        num_requests = 12
+        concurrency_level = 3
+
+        api_config = APIConfig(type=APIType.Completion, streaming=False)
+        data_config = DataConfig(
+            type=DataGenType.Random,
+            input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=num_requests),
+            output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=num_requests),
+        )
+        datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+
+        collector = MultiprocessRequestMetricCollector()
+        client = MockModelServerClient(collector, api_config, mock_latency=0.05)
+
+        load_config = LoadConfig(
+            type=LoadType.CONCURRENT,
+            num_workers=2,
+            worker_max_concurrency=10,
+            # rate and duration are left unset: the closed loop does not build an arrival schedule
+            stages=[
+                ConcurrentLoadStage(
+                    num_requests=num_requests,
+                    concurrency_level=concurrency_level,
+                    think_time=Distribution(type=DistributionType.FIXED, min=0, max=10, mean=10.0, std_dev=0.0),
+                )
+            ],
+            base_seed=42,
+            closed_loop=True,
+        )
+        load_gen = LoadGenerator(datagen, load_config)
+        self.assertTrue(load_gen.closed_loop)
+
+        async with collector.start():
+            await load_gen.mp_run(client)
+
+        metrics = collector.get_metrics()
+        self.assertEqual(len(metrics), num_requests, f"Expected {num_requests} completed requests")
+        self.assertEqual(load_gen.stage_runtime_info[0].status.name, "COMPLETED")
+        prompts = [ast.literal_eval(m.request_data)["prompt"] for m in metrics]
+        self.assertEqual(len(set(prompts)), num_requests)
+
+        events = sorted([(m.start_time, 1) for m in metrics] + [(m.end_time, -1) for m in metrics])
+        in_flight = max_in_flight = 0
+        for _, delta in events:
+            in_flight += delta
+            max_in_flight = max(max_in_flight, in_flight)
+        self.assertLessEqual(max_in_flight, concurrency_level)
+
+    async def test_ring_buffer_closed_loop_runs_users_on_every_worker(self) -> None:
+        """Each worker's closed-loop schedule must reach that worker, not whichever one drains a shared ring first."""
+        num_requests = 24
+        num_workers = 3
+
+        api_config = APIConfig(type=APIType.Completion, streaming=False)
+        data_config = DataConfig(
+            type=DataGenType.Random,
+            input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=num_requests),
+            output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=num_requests),
+        )
+        datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+
+        collector = MultiprocessRequestMetricCollector()
+        with mp.Manager() as manager:
+            client = _PidRecordingClient(collector, api_config, manager.list(), mock_latency=0.05)
+            load_config = LoadConfig(
+                type=LoadType.CONCURRENT,
+                num_workers=num_workers,
+                worker_max_concurrency=10,
+                stages=[ConcurrentLoadStage(num_requests=num_requests, concurrency_level=num_workers)],
+                base_seed=42,
+                closed_loop=True,
+                request_queue_backend=RequestQueueBackend.RING_BUFFER,
+            )
+            load_gen = LoadGenerator(datagen, load_config)
+            self.assertTrue(load_gen.closed_loop)
+
+            async with collector.start():
+                await load_gen.mp_run(client)
+            worker_pids = set(client.pids)
+
+        self.assertEqual(len(collector.get_metrics()), num_requests)
+        self.assertEqual(load_gen.stage_runtime_info[0].status.name, "COMPLETED")
+        self.assertEqual(len(worker_pids), num_workers)
+
+    async def test_worker_side_schedule_lora_adapters_follow_stage_seed(self) -> None:
+        """Adapters a worker picks for a stage must not depend on how many requests earlier stages sent."""
+        second_stage_requests = 16
+
+        async def second_stage_adapters(first_stage_rate: int) -> Counter[Optional[str]]:
+            total = first_stage_rate + second_stage_requests
+            api_config = APIConfig(type=APIType.Completion, streaming=False)
+            data_config = DataConfig(
+                type=DataGenType.Random,
+                input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=total),
+                output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=total),
+            )
+            datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+            collector = MultiprocessRequestMetricCollector()
+            client = MockModelServerClient(collector, api_config, mock_latency=0)
+            load_config = LoadConfig(
+                type=LoadType.CONSTANT,
+                num_workers=2,
+                worker_max_concurrency=10,
+                stages=[
+                    StandardLoadStage(rate=first_stage_rate, duration=1),
+                    StandardLoadStage(rate=second_stage_requests, duration=1),
+                ],
+                interval=0,
+                base_seed=42,
+                worker_side_schedule=True,
+                lora_traffic_split=[MultiLoRAConfig(name="a", split=0.5), MultiLoRAConfig(name="b", split=0.5)],
+            )
+            load_gen = LoadGenerator(datagen, load_config)
+            self.assertTrue(load_gen.worker_side_schedule)
+            async with collector.start():
+                await load_gen.mp_run(client)
+            metrics = [m for m in collector.get_metrics() if m.stage_id == 1]
+            self.assertEqual(len(metrics), second_stage_requests)
+            return Counter(m.info.lora_adapter for m in metrics)
+
+        adapters = await second_stage_adapters(first_stage_rate=6)
+        self.assertEqual(await second_stage_adapters(first_stage_rate=4), adapters)
+        self.assertEqual(set(adapters), {"a", "b"})
+
+    async def test_closed_loop_lora_adapters_follow_stage_seed(self) -> None:
+        """Adapters a virtual user loop picks for a stage must not depend on how many requests earlier stages sent."""
+        second_stage_requests = 16
+
+        async def second_stage_adapters(first_stage_requests: int) -> Counter[Optional[str]]:
+            total = first_stage_requests + second_stage_requests
+            api_config = APIConfig(type=APIType.Completion, streaming=False)
+            data_config = DataConfig(
+                type=DataGenType.Random,
+                input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=total),
+                output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=total),
+            )
+            datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+            collector = MultiprocessRequestMetricCollector()
+            client = MockModelServerClient(collector, api_config, mock_latency=0)
+            load_config = LoadConfig(
+                type=LoadType.CONCURRENT,
+                # One worker, so the requests of a stage do not race between worker streams
+                num_workers=1,
+                worker_max_concurrency=4,
+                stages=[
+                    ConcurrentLoadStage(num_requests=first_stage_requests, concurrency_level=2),
+                    ConcurrentLoadStage(num_requests=second_stage_requests, concurrency_level=2),
+                ],
+                interval=0,
+                base_seed=42,
+                closed_loop=True,
+                lora_traffic_split=[MultiLoRAConfig(name="a", split=0.5), MultiLoRAConfig(name="b", split=0.5)],
+            )
+            load_gen = LoadGenerator(datagen, load_config)
+            self.assertTrue(load_gen.closed_loop)
+            async with collector.start():
+                await load_gen.mp_run(client)
+            metrics = [m for m in collector.get_metrics() if m.stage_id == 1]
+            self.assertEqual(len(metrics), second_stage_requests)
+            return Counter(m.info.lora_adapter for m in metrics)
+
+        adapters = await second_stage_adapters(first_stage_requests=6)
+        self.assertEqual(await second_stage_adapters(first_stage_requests=4), adapters)
+        self.assertEqual(set(adapters), {"a", "b"})
+
+    async def test_worker_side_schedule_runs_adaptive_sweep_probes(self) -> None:
+        """Probe stages have negative ids, which workers expanding their own schedule must still be able to seed."""
+        api_config = APIConfig(type=APIType.Completion, streaming=False)
+        data_config = DataConfig(
+            type=DataGenType.Random,
+            input_distribution=Distribution(min=10, max=10, mean=10.0, std_dev=0.0, total_count=64),
+            output_distribution=Distribution(min=5, max=5, mean=5.0, std_dev=0.0, total_count=64),
+        )
+        datagen = RandomDataGenerator(api_config, data_config, _DummyCustomTokenizer())
+        collector = MultiprocessRequestMetricCollector()
+        client = MockModelServerClient(collector, api_config, mock_latency=0)
+        load_config = LoadConfig(
+            type=LoadType.CONSTANT,
+            num_workers=2,
+            worker_max_concurrency=10,
+            interval=0,
+            base_seed=42,
+            worker_side_schedule=True,
+            sweep=SweepConfig(
+                type=StageGenType.LINEAR,
+                search=SweepSearch.ADAPTIVE,
+                constraints={"request_latency": 1.0},
+                start_rate=2.0,
+                probe_duration=1,
+                max_probes=3,
+                timeout=10,
+                num_stages=1,
+                stage_duration=1,
+            ),
+        )
+        load_gen = LoadGenerator(datagen, load_config, request_metrics_collector=collector)
+        self.assertTrue(load_gen.worker_side_schedule)
+        async with collector.start():
+            await wait_for(load_gen.mp_run(client), timeout=60)
+
+        self.assertEqual([load_gen.stage_runtime_info[stage_id].status.name for stage_id in (-1, -2, -3)], ["COMPLETED"] * 3)
+        probe_requests = Counter(m.stage_id for m in collector.get_metrics() if m.stage_id is not None and m.stage_id < 0)
+        self.assertEqual(probe_requests, {-1: 2, -2: 4, -3: 8})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""RequestLifecycleMetrics for tests across the required tier."""
+
+from typing import Any, Dict, Optional, Sequence
+
+from inference_perf.apis import InferenceInfo, RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.payloads import RequestMetrics, Text
+
+
+def streamed_request_metric(
+    start_time: float = 1.0,
+    chunk_times: Sequence[float] = (1.5, 1.75, 2.0),
+    end_time: Optional[float] = None,
+    input_tokens: int = 7,
+    output_tokens: Optional[int] = None,
+    response_fields: Optional[Dict[str, Any]] = None,
+    info_fields: Optional[Dict[str, Any]] = None,
+    **metric_fields: Any,
+) -> RequestLifecycleMetric:
+    """
+    A streamed request that starts (and is scheduled) at start_time, receives a token at each of
+    chunk_times and ends at end_time, half a second after the last token by default.
+
+    response_fields and info_fields add to the StreamedResponseMetrics and InferenceInfo, and
+    metric_fields (stage_id, session_id, error, ...) to the RequestLifecycleMetric itself.
+    """
+    fields: Dict[str, Any] = {
+        "stage_id": 0,
+        "scheduled_time": start_time,
+        "request_data": '{"prompt": "hello"}',
+        "response_data": "data: ...",
+        "error": None,
+        **metric_fields,
+    }
+    return RequestLifecycleMetric(
+        start_time=start_time,
+        end_time=chunk_times[-1] + 0.5 if end_time is None else end_time,
+        info=InferenceInfo(
+            request_metrics=RequestMetrics(text=Text(input_tokens=input_tokens)),
+            response_metrics=StreamedResponseMetrics(
+                output_tokens=len(chunk_times) if output_tokens is None else output_tokens,
+                chunk_times=list(chunk_times),
+                output_token_times=list(chunk_times),
+                **(response_fields or {}),
+            ),
+            **(info_fields or {}),
+        ),
+        **fields,
+    )
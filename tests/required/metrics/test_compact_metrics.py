@@ -0,0 +1,122 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing as mp
+import os
+from pathlib import Path
+
+from metric_factories import streamed_request_metric
+
+from inference_perf.apis import (
+    ErrorResponseInfo,
+    RequestLifecycleMetric,
+    StreamedResponseMetrics,
+    UnaryResponseMetrics,
+)
+from inference_perf.datagen.replay.replay_graph_session_datagen import SessionInferenceInfo
+from inference_perf.metrics.request_collector import MultiprocessRequestMetricCollector
+from inference_perf.metrics.request_collector.compact import (
+    MetricSideStore,
+    decode_metric,
+    encode_metric,
+    flush_side_stores,
+)
+from inference_perf.payloads import RequestMetrics, Text
+
+
+def streamed_metric() -> RequestLifecycleMetric:
+    return streamed_request_metric(
+        stage_id=-2,
+        session_id="s1",
+        scheduled_time=1.0,
+        start_time=1.25,
+        end_time=2.5,
+        response_fields={
+            "response_chunks": ['{"a": 1}', '{"b": 2}', '{"c": 3}'],
+            "chunk_token_counts": [1, 1, 1],
+            "server_usage": {"completion_tokens": 3},
+        },
+        info_fields={"extra_info": {"raw_response": "x" * 100}, "lora_adapter": "adapter", "labels": {"tenant": "a"}},
+        ttft_slo_sec=0.5,
+        json_encode_time=0.001,
+    )
+
+
+def test_round_trip_streamed_metric(tmp_path: Path) -> None:
+    store = MetricSideStore(str(tmp_path))
+    metric = streamed_metric()
+    compact = encode_metric(metric, store)
+
+    assert decode_metric(compact, store) == metric
+    # The bulky fields stay on disk until asked for
+    assert b"hello" not in compact.meta and b"hello" not in compact.fields
+    light = decode_metric(compact)
+    assert light.request_data == "" and light.response_data is None
+    assert isinstance(light.info.response_metrics, StreamedResponseMetrics)
+    assert light.info.response_metrics.response_chunks == []
+    assert light.info.response_metrics.output_token_times == [1.5, 1.75, 2.0]
+    assert light.info.lora_adapter == "adapter"
+
+
+def test_round_trip_keeps_distinct_token_times_errors_and_subclasses(tmp_path: Path) -> None:
+    store = MetricSideStore(str(tmp_path))
+    streamed = streamed_metric()
+    assert isinstance(streamed.info.response_metrics, StreamedResponseMetrics)
+    streamed.info.response_metrics.output_token_times = [1.5, 1.6, 1.7, 2.0]
+    failed = RequestLifecycleMetric(
+        scheduled_time=0.0,
+        start_time=0.0,
+        end_time=1.0,
+        request_data="{}",
+        info=SessionInferenceInfo(
+            request_metrics=RequestMetrics(text=Text(input_tokens=1)),
+            response_metrics=UnaryResponseMetrics(output_tokens=0),
+        ),
+        error=ErrorResponseInfo(error_type="HTTP Error 500", error_msg="boom"),
+    )
+    for metric in (streamed, failed):
+        assert decode_metric(encode_metric(metric, store), store) == metric
+    assert isinstance(decode_metric(encode_metric(failed, store)).info, SessionInferenceInfo)
+
+
+def test_side_store_buffers_writes_until_flushed(tmp_path: Path) -> None:
+    store = MetricSideStore(str(tmp_path), flush_bytes=4096, flush_interval=3600)
+    entries = [store.write(bytes([i]) * 1000) for i in range(3)]
+    path = tmp_path / f"metrics-{os.getpid()}.bin"
+    assert path.stat().st_size == 0
+
+    flush_side_stores()
+    assert path.stat().st_size == 3000
+    # Crossing flush_bytes writes the buffer out, and reading back an entry still buffered flushes it first
+    entries += [store.write(b"x" * 1000) for _ in range(2)]
+    assert path.stat().st_size == 3000
+    assert [store.read(*entry) for entry in entries] == [bytes([i]) * 1000 for i in range(3)] + [b"x" * 1000] * 2
+    assert path.stat().st_size == 5000
+    store.write(b"y" * 4096)
+    assert path.stat().st_size == 5000 + 4096
+
+
+async def test_collector_rehydrates_metrics_written_by_workers() -> None:
+    streamed = streamed_metric()
+    collector = MultiprocessRequestMetricCollector()
+    seen: list[RequestLifecycleMetric] = []
+    collector.add_listener(seen.append)
+    async with collector.start():
+        processes = [mp.Process(target=collector.record_metric, args=(streamed,)) for _ in range(2)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    assert len(seen) == 2 and all(metric.request_data == "" for metric in seen)
+    assert collector.get_metrics() == [streamed, streamed]
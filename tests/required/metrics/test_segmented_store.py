@@ -0,0 +1,87 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing as mp
+import os
+from pathlib import Path
+
+from metric_factories import streamed_request_metric
+
+from inference_perf.metrics.request_collector import MultiprocessRequestMetricCollector
+from inference_perf.metrics.request_collector.compact import MetricSideStore, decode_metric, encode_metric
+from inference_perf.metrics.request_collector.segments import SegmentedMetricStore
+
+
+def test_store_streams_metrics_back_across_segments(tmp_path: Path) -> None:
+    side_store = MetricSideStore(str(tmp_path))
+    store = SegmentedMetricStore(str(tmp_path / "segments"), batch_rows=3, segment_rows=5)
+    metrics = [streamed_request_metric(stage_id=i % 2, end_time=10.0 + i) for i in range(11)]
+    for metric in metrics:
+        store.append(encode_metric(metric, side_store))
+
+    # Unflushed metrics are written out before reading
+    assert [decode_metric(c, side_store) for c in store.iter_compact()] == metrics
+    store.close()
+    assert len(store.segment_paths()) == 2
+    assert [decode_metric(c, side_store) for c in store.iter_compact(stage_id=1)] == metrics[1::2]
+    assert list(store.iter_compact(stage_id=7)) == []
+
+
+def test_store_reads_segments_cut_off_by_a_crash(tmp_path: Path) -> None:
+    side_store = MetricSideStore(str(tmp_path))
+    store = SegmentedMetricStore(str(tmp_path / "segments"), batch_rows=2)
+    for i in range(4):
+        store.append(encode_metric(streamed_request_metric(end_time=10.0 + i), side_store))
+    store.flush()
+
+    # The writer was never closed and the last batch was only partly written
+    path = store.segment_paths()[0]
+    os.truncate(path, os.path.getsize(path) - 16)
+    reopened = SegmentedMetricStore(str(tmp_path / "segments"))
+    assert [decode_metric(c, side_store).end_time for c in reopened.iter_compact()] == [10.0, 11.0]
+
+
+async def test_collector_spills_metrics_to_store_directory(tmp_path: Path) -> None:
+    metric = streamed_request_metric(stage_id=1, end_time=3.0)
+    collector = MultiprocessRequestMetricCollector(str(tmp_path))
+    async with collector.start():
+        processes = [mp.Process(target=collector.record_metric, args=(metric,)) for _ in range(2)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    assert collector.compact_metrics == []
+    assert collector.store is not None and len(collector.store) == 2
+    assert list(collector.iter_metrics(stage_id=1)) == [metric] * 2
+    assert list(collector.iter_metrics(stage_id=0)) == []
+    # Left in place so a crashed run's metrics survive
+    assert os.listdir(collector.side_store.directory)
+    assert os.path.dirname(collector.store.directory) == str(tmp_path)
+
+
+async def test_collector_leaves_out_an_earlier_runs_segments(tmp_path: Path) -> None:
+    earlier_metric, metric = (
+        streamed_request_metric(stage_id=1, end_time=2.0),
+        streamed_request_metric(stage_id=1, end_time=3.0),
+    )
+    earlier = MultiprocessRequestMetricCollector(str(tmp_path))
+    async with earlier.start():
+        earlier.record_metric(earlier_metric)
+
+    collector = MultiprocessRequestMetricCollector(str(tmp_path))
+    async with collector.start():
+        collector.record_metric(metric)
+
+    assert collector.get_metrics() == [metric]
+    assert earlier.get_metrics() == [earlier_metric]
@@ -0,0 +1,149 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import multiprocessing as mp
+from typing import Any, List
+from unittest.mock import Mock
+
+import pytest
+
+from metric_factories import streamed_request_metric
+
+from inference_perf.apis.base import ErrorResponseInfo, RequestLifecycleMetric
+from inference_perf.client.modelserver.metrics import BaseMetrics
+from inference_perf.client.server_metrics.base import PerfRuntimeParameters, StageRuntimeInfo, StageStatus
+from inference_perf.config.reportgen.config import ReportConfig, RequestLifecycleMetricsReportConfig
+from inference_perf.reportgen.base import ReportGenerator
+
+
+def _requests(count: int) -> List[RequestLifecycleMetric]:
+    """Requests spread over three stages and two adapters, with varied lengths and every seventh one failed."""
+    metrics = []
+    for i in range(count):
+        start = i * 0.5
+        token_times = [start + 0.1, start + 0.15, start + 0.3 + 0.01 * i]
+        metrics.append(
+            streamed_request_metric(
+                start_time=start,
+                chunk_times=token_times,
+                end_time=token_times[-1] + 0.05,
+                input_tokens=10 + i,
+                info_fields={"lora_adapter": f"adapter-{i % 2}"},
+                stage_id=i % 3,
+                request_data=f"prompt {i}",
+                error=ErrorResponseInfo(error_type="HTTP Error 500", error_msg="boom") if i % 7 == 0 else None,
+            )
+        )
+    return metrics
+
+
+async def _generate(metrics: List[RequestLifecycleMetric], report_workers: int) -> dict[str, Any]:
+    config = Mock()
+    config.tokenizer = None
+    config.model_dump = Mock(return_value={})
+    generator = ReportGenerator(
+        metrics_client=None, metrics_collector=Mock(get_metrics=Mock(return_value=metrics)), config=config
+    )
+    runtime_parameters = PerfRuntimeParameters(
+        start_time=0.0,
+        duration=1.0,
+        model_server_metrics=BaseMetrics(),
+        stages={
+            stage_id: StageRuntimeInfo(stage_id=stage_id, rate=1.0, start_time=0.0, end_time=1.0, status=StageStatus.COMPLETED)
+            for stage_id in range(3)
+        },
+    )
+    report_config = ReportConfig(
+        request_lifecycle=RequestLifecycleMetricsReportConfig(
+            per_request=True, per_request_parquet=True, per_adapter_stage=True, report_workers=report_workers
+        )
+    )
+    reports = await generator.generate_reports(report_config, runtime_parameters)
+    return {report.get_filename(): report.get_contents() for report in reports}
+
+
+@pytest.mark.parametrize("start_method", ["fork", "forkserver"])
+async def test_parallel_reports_match_serial_reports(monkeypatch: pytest.MonkeyPatch, start_method: str) -> None:
+    # Forked workers inherit the buckets; forkserver workers are sent them as record batches
+    get_context = mp.get_context
+    monkeypatch.setattr(mp, "get_context", lambda method=None: get_context(method or start_method))
+    metrics = _requests(40)
+
+    serial = await _generate(metrics, report_workers=1)
+    parallel = await _generate(metrics, report_workers=3)
+
+    assert list(parallel) == list(serial)
+    assert parallel == serial
+    assert "adapter_adapter-1_stage_2_lifecycle_metrics.json" in parallel
+    assert "per_request_lifecycle_metrics.parquet" in parallel
+
+
+async def test_streamed_stage_reports_leave_out_preprocessing_stages() -> None:
+    metrics = _requests(6) + [metric.model_copy(update={"stage_id": -1}) for metric in _requests(3)]
+    config = Mock()
+    config.tokenizer = None
+    config.model_dump = Mock(return_value={})
+    collector = Mock(
+        iter_metrics=Mock(side_effect=lambda stage_id=None: iter([m for m in metrics if stage_id in (None, m.stage_id)]))
+    )
+    generator = ReportGenerator(metrics_client=None, metrics_collector=collector, config=config)
+    runtime_parameters = PerfRuntimeParameters(
+        start_time=0.0,
+        duration=1.0,
+        model_server_metrics=BaseMetrics(),
+        stages={
+            stage_id: StageRuntimeInfo(stage_id=stage_id, rate=1.0, start_time=0.0, end_time=1.0, status=StageStatus.COMPLETED)
+            for stage_id in (-1, 0, 1, 2)
+        },
+    )
+    report_config = ReportConfig(request_lifecycle=RequestLifecycleMetricsReportConfig(summary=False, per_adapter=False))
+
+    reports = {report.name: report for report in await generator.generate_reports(report_config, runtime_parameters)}
+
+    collector.get_metrics.assert_not_called()
+    assert [name for name in reports if name.startswith("stage_")] == [f"stage_{i}_lifecycle_metrics" for i in range(3)]
+
+
+async def test_spilled_metrics_warn_when_whole_run_reports_load_them_all(caplog: pytest.LogCaptureFixture) -> None:
+    config = Mock()
+    config.tokenizer = None
+    config.model_dump = Mock(return_value={})
+    generator = ReportGenerator(
+        metrics_client=None,
+        metrics_collector=Mock(get_metrics=Mock(return_value=[streamed_request_metric(stage_id=1)])),
+        config=config,
+    )
+    runtime_parameters = PerfRuntimeParameters(
+        start_time=0.0,
+        duration=1.0,
+        model_server_metrics=BaseMetrics(),
+        stages={1: StageRuntimeInfo(stage_id=1, rate=1.0, start_time=0.0, end_time=1.0, status=StageStatus.COMPLETED)},
+    )
+
+    with caplog.at_level(logging.WARNING, logger="inference_perf.reportgen.base"):
+        await generator.generate_reports(
+            ReportConfig(request_lifecycle=RequestLifecycleMetricsReportConfig(spill_to_disk=True, per_adapter=False)),
+            runtime_parameters,
+        )
+    assert "the summary report(s) load every request metric" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="inference_perf.reportgen.base"):
+        await generator.generate_reports(
+            ReportConfig(
+                request_lifecycle=RequestLifecycleMetricsReportConfig(spill_to_disk=True, summary=False, per_adapter=False)
+            ),
+            Mock(stages={}),
+        )
+    assert "spill_to_disk" not in caplog.text
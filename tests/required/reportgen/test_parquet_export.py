@@ -0,0 +1,115 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from pathlib import Path
+from typing import List
+
+import pyarrow.parquet as pq
+import pytest
+
+from metric_factories import streamed_request_metric
+
+from inference_perf.apis.base import (
+    ErrorResponseInfo,
+    InferenceInfo,
+    RequestLifecycleMetric,
+    UnaryResponseMetrics,
+)
+from inference_perf.client.filestorage import LocalStorageClient
+from inference_perf.config import StorageConfigBase
+from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.reportgen.parquet_export import parquet_chunks, read_request_metrics, request_record_batches
+from inference_perf.utils.report_file import ReportFile
+
+
+def _requests(count: int) -> List[RequestLifecycleMetric]:
+    """One-second requests over two stages, each with a session, and the fourth one failed."""
+    return [
+        streamed_request_metric(
+            start_time=float(i),
+            chunk_times=[i + 0.2, i + 0.3, i + 0.6],
+            end_time=i + 1.0,
+            input_tokens=10,
+            output_tokens=5,
+            response_fields={"server_usage": {"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 4}}},
+            info_fields={"lora_adapter": "adapter-a" if i % 3 == 0 else None},
+            stage_id=i % 2,
+            session_id=f"session-{i}",
+            request_data="prompt",
+            error=ErrorResponseInfo(error_type="HTTP Error 500", error_msg="boom") if i == 3 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def test_parquet_export_has_a_row_per_request(tmp_path: Path) -> None:
+    metrics = _requests(10)
+    report = ReportFile.encoded_chunks(
+        "per_request_lifecycle_metrics",
+        lambda: parquet_chunks(request_record_batches(metrics, batch_rows=4)),
+        "parquet",
+    )
+
+    LocalStorageClient(StorageConfigBase(path=str(tmp_path))).save_report([report])
+
+    path = tmp_path / "per_request_lifecycle_metrics.parquet"
+    assert pq.ParquetFile(path).num_row_groups == 3
+    table = read_request_metrics(str(path))
+    rows = table.to_pylist()
+    assert len(rows) == 10
+    assert rows[3]["error_type"] == "HTTP Error 500"
+    assert rows[0] == {
+        "stage_id": 0,
+        "session_id": "session-0",
+        "lora_adapter": "adapter-a",
+        "scheduled_time": 0.0,
+        "start_time": 0.0,
+        "end_time": 1.0,
+        "ttft": pytest.approx(0.2),
+        "tpot": pytest.approx(0.4 / 4),
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "cached_tokens": 4,
+        "error_type": None,
+        "chunk_times": [0.2, 0.3, 0.6],
+    }
+
+
+def test_read_request_metrics_filters_and_projects(tmp_path: Path) -> None:
+    path = tmp_path / "requests.parquet"
+    path.write_bytes(b"".join(parquet_chunks(request_record_batches(_requests(10), batch_rows=4))))
+
+    table = read_request_metrics(str(path), columns=["stage_id", "start_time"], filters=[("stage_id", "=", 1)])
+
+    assert table.column_names == ["stage_id", "start_time"]
+    assert table.column("start_time").to_pylist() == [1.0, 3.0, 5.0, 7.0, 9.0]
+
+
+def test_unstreamed_requests_have_no_latencies() -> None:
+    metric = RequestLifecycleMetric(
+        stage_id=0,
+        scheduled_time=0.0,
+        start_time=0.0,
+        end_time=1.0,
+        request_data="prompt",
+        info=InferenceInfo(
+            request_metrics=RequestMetrics(text=Text(input_tokens=10)),
+            response_metrics=UnaryResponseMetrics(output_tokens=3),
+        ),
+        error=None,
+    )
+
+    (row,) = next(request_record_batches([metric])).to_pylist()
+
+    assert row["ttft"] is None and row["tpot"] is None and row["chunk_times"] is None
+    assert row["output_tokens"] == 3 and row["cached_tokens"] is None
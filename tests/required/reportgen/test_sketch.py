@@ -0,0 +1,79 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from inference_perf.apis import InferenceInfo, RequestLifecycleMetric, StreamedResponseMetrics
+from inference_perf.payloads import RequestMetrics, Text
+from inference_perf.reportgen.base import summarize, summarize_requests
+from inference_perf.reportgen.sketch import QuantileSketch
+
+PERCENTILES = [0.1, 1, 5, 10, 25, 50, 75, 90, 95, 99, 99.9]
+
+
+def test_sketch_percentiles_are_within_relative_accuracy() -> None:
+    values = np.random.default_rng(0).lognormal(mean=-4, sigma=1, size=100_000)
+    sketch = QuantileSketch(0.01)
+    sketch.add(values)
+
+    estimated = sketch.summarize(PERCENTILES)
+    exact = summarize(values.tolist(), PERCENTILES)
+    assert estimated is not None and exact is not None
+    assert estimated["min"] == exact["min"] and estimated["max"] == exact["max"]
+    assert estimated["mean"] == pytest.approx(exact["mean"])
+    for key in exact:
+        assert estimated[key] == pytest.approx(exact[key], rel=0.01)
+
+
+def test_sketch_handles_zero_and_negative_values() -> None:
+    sketch = QuantileSketch(0.01)
+    sketch.add([-2.0, -1.0, 0.0, 0.0, 1.0, 2.0])
+    low, median, high = sketch.quantiles([0.0, 0.5, 1.0])
+    assert low == -2.0 and median == 0.0 and high == 2.0
+    assert QuantileSketch().summarize([50]) is None
+
+
+def test_sketch_fed_in_blocks_matches_a_single_add() -> None:
+    values = np.random.default_rng(1).exponential(0.05, size=10_000)
+    whole, blocks = QuantileSketch(), QuantileSketch()
+    whole.add(values)
+    for start in range(0, len(values), 3000):
+        blocks.add(values[start : start + 3000])
+    assert blocks.summarize(PERCENTILES) == pytest.approx(whole.summarize(PERCENTILES))
+
+
+def test_summarize_requests_reports_percentile_mode() -> None:
+    token_times = [1.0 + 0.01 * i for i in range(50)]
+    metric = RequestLifecycleMetric(
+        scheduled_time=0.0,
+        start_time=0.0,
+        end_time=2.0,
+        request_data="test_request",
+        info=InferenceInfo(
+            request_metrics=RequestMetrics(text=Text(input_tokens=5)),
+            response_metrics=StreamedResponseMetrics(output_tokens=50, output_token_times=token_times),
+        ),
+        error=None,
+    )
+
+    exact = summarize_requests([metric], [50, 99])
+    sketched = summarize_requests([metric], [50, 99], sketch_accuracy=0.02)
+
+    assert exact.load_summary["percentile_mode"] == "exact"
+    assert sketched.load_summary["percentile_mode"] == "sketch"
+    assert sketched.load_summary["percentile_relative_accuracy"] == 0.02
+    exact_itl = exact.successes["latency"]["inter_token_latency"]
+    sketched_itl = sketched.successes["latency"]["inter_token_latency"]
+    assert sketched_itl["median"] == pytest.approx(exact_itl["median"], rel=0.02)
+    assert sketched_itl["p99"] == pytest.approx(exact_itl["p99"], rel=0.02)
@@ -2,7 +2,13 @@ from typing import Any
 from typing import cast
 
 import pytest
-from inference_perf.reportgen.base import summarize_requests, summarize_prompt_token_usage, ReportGenerator
+from inference_perf.reportgen import base
+from inference_perf.reportgen.base import (
+    summarize_coordinated_omission,
+    summarize_requests,
+    summarize_prompt_token_usage,
+    ReportGenerator,
+)
 from inference_perf.apis.base import (
     RequestLifecycleMetric,
     InferenceInfo,
@@ -117,6 +123,63 @@ def test_summarize_requests_multiple_tokens_same_timestamp() -> None:
     assert metric.info.response_metrics.output_token_times == [1.0, 1.0, 1.0]
 
 
+def test_summarize_requests_uses_recorded_chunk_token_counts() -> None:
+    from unittest.mock import Mock
+
+    mock_tokenizer = Mock()
+    info = InferenceInfo(
+        request_metrics=RequestMetrics(text=Text(input_tokens=5)),
+        response_metrics=StreamedResponseMetrics(
+            response_chunks=['{"choices": [{"text": "hello"}]}', '{"choices": [{"text": " world"}]}'],
+            chunk_times=[1.0, 2.0],
+            chunk_token_counts=[2, 3],
+            output_tokens=5,
+            server_usage={"completion_tokens": 6},
+        ),
+    )
+    metric = RequestLifecycleMetric(
+        scheduled_time=0.0, start_time=0.0, end_time=10.0, request_data="test_request", info=info, error=None
+    )
+
+    result = summarize_requests([metric], [50], tokenizer=mock_tokenizer)
+
+    # Expanded from the recorded counts; the chunks are not re-tokenized
+    mock_tokenizer.count_tokens.assert_not_called()
+    assert isinstance(metric.info.response_metrics, StreamedResponseMetrics)
+    assert metric.info.response_metrics.output_token_times == [1.0, 1.0, 2.0, 2.0, 2.0]
+    assert result.successes["token_count_mismatches"] == 1
+
+
+def test_inter_token_latency_excludes_gaps_between_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Small blocks so the token gaps are computed across several flushes
+    monkeypatch.setattr(base._TokenGaps, "BLOCK_TOKENS", 4)
+    metrics = []
+    for i in range(5):
+        start = i * 100.0
+        token_times = [start + 1.0, start + 1.5, start + 2.5]
+        metrics.append(
+            RequestLifecycleMetric(
+                scheduled_time=start,
+                start_time=start,
+                end_time=start + 3.0,
+                request_data="test_request",
+                info=InferenceInfo(
+                    request_metrics=RequestMetrics(text=Text(input_tokens=5)),
+                    response_metrics=StreamedResponseMetrics(output_tokens=3, output_token_times=token_times),
+                ),
+                error=None,
+            )
+        )
+
+    result = summarize_requests(metrics, [50])
+
+    itl = result.successes["latency"]["inter_token_latency"]
+    assert itl["min"] == pytest.approx(0.5)
+    assert itl["max"] == pytest.approx(1.0)
+    assert itl["mean"] == pytest.approx(0.75)
+    assert result.successes["latency"]["time_to_first_token"]["mean"] == pytest.approx(1.0)
+
+
 def test_itl_not_inflated_by_per_chunk_bos() -> None:
     """Regression for the ITL half of #564, using the real
     neuralmagic/Meta-Llama-3.1-8B-Instruct-FP8 tokenizer, which prepends a BOS
@@ -703,3 +766,19 @@ def test_summarize_requests_handles_null_prompt_tokens_details() -> None:
     assert prompt_tokens["total"] == pytest.approx(10.0)
     assert prompt_tokens["cached"] == pytest.approx(0.0)
     assert prompt_tokens["uncached"] == pytest.approx(10.0)
+
+
+def test_summarize_coordinated_omission_measures_from_scheduled_time() -> None:
+    info = InferenceInfo(
+        request_metrics=RequestMetrics(text=Text(input_tokens=5)),
+        response_metrics=StreamedResponseMetrics(output_tokens=3, output_token_times=[3.0, 3.5, 4.0]),
+    )
+    # Sent 2s after its scheduled time
+    metric = RequestLifecycleMetric(
+        scheduled_time=0.0, start_time=2.0, end_time=4.0, request_data="test_request", info=info, error=None
+    )
+
+    result = summarize_coordinated_omission([metric], [50])
+
+    assert result["request_latency"]["mean"] == pytest.approx(4.0)
+    assert result["time_to_first_token"]["mean"] == pytest.approx(3.0)
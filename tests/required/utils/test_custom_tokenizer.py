@@ -0,0 +1,123 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import pickle
+import threading
+from types import SimpleNamespace
+from typing import Any, List, Union
+from unittest.mock import MagicMock
+
+import pytest
+from transformers.tokenization_utils_base import VERY_LARGE_INTEGER
+
+from inference_perf.utils.custom_tokenizer import CustomTokenizer, count_chunk_tokens_async, count_tokens_async
+
+
+class WordTokenizer:
+    """Stands in for a HF tokenizer: one token per word, plus a BOS when add_special_tokens is set."""
+
+    model_max_length = VERY_LARGE_INTEGER
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+        self.threads: List[str] = []
+
+    def __call__(self, text: Union[str, List[str]], add_special_tokens: bool = True, **kwargs: Any) -> SimpleNamespace:
+        self.threads.append(threading.current_thread().name)
+        texts = [text] if isinstance(text, str) else text
+        self.calls.append(texts)
+        ids = [[0] * (len(t.split()) + (1 if add_special_tokens else 0)) for t in texts]
+        return SimpleNamespace(input_ids=ids[0] if isinstance(text, str) else ids)
+
+
+def make_tokenizer() -> CustomTokenizer:
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer.tokenizer = WordTokenizer()  # type: ignore[assignment]
+    tokenizer._batcher = None
+    return tokenizer
+
+
+def test_count_tokens_batch_matches_count_tokens() -> None:
+    tokenizer = make_tokenizer()
+    texts = ["one two three", "", "four"]
+    for add_special_tokens in (True, False):
+        expected = [tokenizer.count_tokens(t, add_special_tokens=add_special_tokens) for t in texts]
+        assert tokenizer.count_tokens_batch(texts, add_special_tokens=add_special_tokens) == expected
+
+
+async def test_count_tokens_async_coalesces_concurrent_counts() -> None:
+    tokenizer = make_tokenizer()
+    hf = tokenizer.tokenizer
+    assert isinstance(hf, WordTokenizer)
+
+    texts = [" ".join(["w"] * n) for n in range(1, 21)]
+    counts = await asyncio.gather(*(tokenizer.count_tokens_async(t, add_special_tokens=False) for t in texts))
+
+    assert counts == list(range(1, 21))
+    # The first count starts a batch on its own; everything queued behind it goes in the next one
+    assert len(hf.calls) <= 2
+    assert all(name.startswith("tokenizer") for name in hf.threads)
+
+
+async def test_count_tokens_async_keeps_special_token_modes_apart() -> None:
+    tokenizer = make_tokenizer()
+    with_bos, without_bos = await asyncio.gather(
+        tokenizer.count_tokens_async("a b", add_special_tokens=True),
+        tokenizer.count_tokens_async("a b", add_special_tokens=False),
+    )
+    assert (with_bos, without_bos) == (3, 2)
+
+
+async def test_count_tokens_async_propagates_errors() -> None:
+    tokenizer = make_tokenizer()
+    tokenizer.tokenizer = MagicMock(side_effect=RuntimeError("boom"), model_max_length=VERY_LARGE_INTEGER)
+    with pytest.raises(RuntimeError, match="boom"):
+        await tokenizer.count_tokens_async("a b")
+
+
+async def test_count_tokens_async_helper_falls_back_to_count_tokens() -> None:
+    mock = MagicMock()
+    mock.count_tokens.side_effect = lambda text: len(text.split())
+    assert await count_tokens_async(mock, "a b c") == 3
+    mock.count_tokens.assert_called_once_with("a b c")
+
+    class Subclass(CustomTokenizer):
+        def __init__(self) -> None:
+            pass
+
+        def count_tokens(self, text: str, add_special_tokens: bool = True) -> int:
+            return 42
+
+    assert await count_tokens_async(Subclass(), "a", add_special_tokens=False) == 42
+
+
+async def test_tokenizer_pickles_without_batcher() -> None:
+    tokenizer = make_tokenizer()
+    await tokenizer.count_tokens_async("a b")
+    assert tokenizer._batcher is not None
+
+    restored = pickle.loads(pickle.dumps(tokenizer))
+    assert restored._batcher is None
+    assert await restored.count_tokens_async("a b c") == 4
+
+
+async def test_count_chunk_tokens_counts_chunks_as_fragments_in_one_batch() -> None:
+    tokenizer = make_tokenizer()
+    hf = tokenizer.tokenizer
+    assert isinstance(hf, WordTokenizer)
+
+    assert await count_chunk_tokens_async(tokenizer, ["a", "b c", "d e f"]) == [1, 2, 3]
+    assert len(hf.calls) <= 2
+    assert await count_chunk_tokens_async(tokenizer, []) == []
+    assert await count_chunk_tokens_async(MagicMock(), ["a"]) == []
@@ -0,0 +1,71 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from inference_perf.client.filestorage import LocalStorageClient
+from inference_perf.config import StorageConfigBase
+from inference_perf.utils.report_file import ReportFile
+
+RECORDS: List[Any] = [{"start_time": 1.0, "request": "a\nb", "info": {"tokens": [1, 2]}}, {"start_time": 2.0, "error": None}]
+
+
+def _records() -> Iterator[Any]:
+    yield from RECORDS
+
+
+@pytest.mark.parametrize("records", [RECORDS, [RECORDS[0]], []])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streamed_json_matches_json_dumps(records: List[Any], indent: Any) -> None:
+    report = ReportFile.streamed("per_request", lambda: iter(records))
+
+    assert b"".join(report.iter_chunks(indent=indent, chunk_size=16)).decode() == json.dumps(records, indent=indent)
+
+
+def test_streamed_ndjson_writes_a_record_per_line() -> None:
+    report = ReportFile.streamed("per_request", _records, file_type="ndjson")
+
+    assert report.get_filename() == "per_request.ndjson"
+    lines = b"".join(report.iter_chunks()).decode().splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_streamed_report_can_be_written_more_than_once() -> None:
+    report = ReportFile.streamed("per_request", _records)
+
+    assert b"".join(report.iter_chunks()) == b"".join(report.iter_chunks())
+    assert report.get_contents() == RECORDS
+
+
+def test_zstd_compressed_report_round_trips() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    report = ReportFile.streamed("per_request", _records, file_type="ndjson", compression="zstd")
+
+    assert report.get_filename() == "per_request.ndjson.zst"
+    assert report.get_content_type() == "application/zstd"
+    compressed = b"".join(report.iter_chunks(chunk_size=8))
+    lines = zstandard.ZstdDecompressor().decompressobj().decompress(compressed).decode().splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_local_storage_writes_streamed_report(tmp_path: Path) -> None:
+    client = LocalStorageClient(StorageConfigBase(path=str(tmp_path)))
+
+    client.save_report([ReportFile.streamed("per_request", _records), ReportFile("summary", {"count": 2})])
+
+    assert (tmp_path / "per_request.json").read_text() == json.dumps(RECORDS, indent=2)
+    assert json.loads((tmp_path / "summary.json").read_text()) == {"count": 2}
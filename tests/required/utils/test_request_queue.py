@@ -0,0 +1,116 @@
+# Copyright 2026 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import multiprocessing as mp
+import threading
+from queue import Empty
+
+import pytest
+
+from inference_perf.apis import CompletionAPIData, LazyLoadInferenceAPIData
+from inference_perf.loadgen.load_generator import RequestQueueData, RequestQueueDataCodec, WorkItem
+from inference_perf.utils.request_queue import RequestChannel, RingBufferRequestQueue
+
+
+def _consume(channel: RequestChannel[WorkItem], out: "mp.Queue[int]") -> None:
+    while True:
+        item = channel.get()
+        if item is None:
+            channel.task_done()
+            return
+        assert isinstance(item, RequestQueueData)
+        assert isinstance(item.request_data, LazyLoadInferenceAPIData)
+        out.put(item.request_data.data_index)
+        channel.task_done()
+
+
+def test_ring_buffer_round_trip() -> None:
+    queue: RingBufferRequestQueue[WorkItem] = RingBufferRequestQueue(codec=RequestQueueDataCodec(["a", "b"]))
+    lazy = RequestQueueData(3, LazyLoadInferenceAPIData(data_index=7, stage_id=3), 12.5, "b")
+    full = RequestQueueData(3, CompletionAPIData(prompt="hi", max_tokens=4), 13.0, None)
+    labelled = RequestQueueData(3, LazyLoadInferenceAPIData(data_index=8, labels={"k": "v"}), 14.0, None)
+    queue.put_batch([lazy, full, labelled])
+
+    channel = queue.get_channel(0)
+    items = channel.get_batch(10, timeout=1)
+    assert len(items) == 3
+    assert items[0] == lazy
+    assert isinstance(items[1], RequestQueueData) and items[1].request_data == full.request_data
+    assert isinstance(items[2], RequestQueueData) and items[2].request_data.labels == {"k": "v"}
+    for _ in items:
+        channel.task_done()
+    queue.join()
+    with pytest.raises(Empty):
+        channel.get_nowait()
+
+
+def test_ring_buffer_wraps_and_blocks_when_full() -> None:
+    queue: RingBufferRequestQueue[WorkItem] = RingBufferRequestQueue(codec=RequestQueueDataCodec(), capacity=4)
+    channel = queue.get_channel(0)
+    items = [RequestQueueData(0, LazyLoadInferenceAPIData(data_index=i), float(i), None) for i in range(10)]
+    producer = threading.Thread(target=queue.put_batch, args=(items,))
+    producer.start()
+
+    received: list[WorkItem] = []
+    while len(received) < len(items):
+        received.extend(channel.get_batch(3, timeout=1))
+    producer.join(timeout=1)
+    assert not producer.is_alive()
+    assert [item.request_data.data_index for item in received] == list(range(10))  # type: ignore[union-attr]
+
+
+async def test_ring_buffer_async_put_waits_for_room_without_blocking_the_loop() -> None:
+    queue: RingBufferRequestQueue[WorkItem] = RingBufferRequestQueue(codec=RequestQueueDataCodec(), capacity=4)
+    channel = queue.get_channel(0)
+    items = [RequestQueueData(0, LazyLoadInferenceAPIData(data_index=i), float(i), None) for i in range(10)]
+    with pytest.raises(ValueError):
+        channel.try_put_batch(items[:5])
+    assert channel.try_put_batch(items[:3])
+    assert not channel.try_put_batch(items[3:5])
+
+    producer = asyncio.create_task(queue.put_batch_async(items[3:]))
+    received: list[WorkItem] = []
+    while len(received) < len(items):
+        # The consumer runs on the same loop, so a put blocked on the full ring would never let it in
+        await asyncio.sleep(0.01)
+        try:
+            received.extend(channel.get_batch(3, block=False))
+        except Empty:
+            pass
+    await asyncio.wait_for(producer, timeout=1)
+    assert [item.request_data.data_index for item in received] == list(range(10))  # type: ignore[union-attr]
+    channel.task_done(len(received))
+    queue.join()
+
+
+def test_ring_buffer_drain_and_join_across_processes() -> None:
+    queue: RingBufferRequestQueue[WorkItem] = RingBufferRequestQueue(2, codec=RequestQueueDataCodec())
+    out: "mp.Queue[int]" = mp.Queue()
+    consumers = [mp.Process(target=_consume, args=(queue.get_channel(i), out)) for i in range(2)]
+    for consumer in consumers:
+        consumer.start()
+
+    for i in range(20):
+        queue.put(RequestQueueData(0, LazyLoadInferenceAPIData(data_index=i), 0.0, None), i % 2)
+    queue.join()
+    assert sorted(out.get(timeout=5) for _ in range(20)) == list(range(20))
+
+    queue.put(None)  # type: ignore[arg-type]
+    for consumer in consumers:
+        consumer.join(timeout=5)
+        assert consumer.exitcode == 0
+
+    queue.put_batch([RequestQueueData(0, LazyLoadInferenceAPIData(data_index=0), 0.0, None)] * 3)
+    queue.drain()
+    queue.join()
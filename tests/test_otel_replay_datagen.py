@@ -35,6 +35,7 @@ from __future__ import annotations
 import asyncio
 import json
 import multiprocessing as mp
+import queue
 import sys
 from pathlib import Path
 from typing import Any, List, Optional
@@ -724,6 +725,38 @@ class TestOTelTraceReplayDataGenerator:
         # Should return False
         assert result is False
 
+    def test_wait_for_session_completions_returns_reported_sessions(self) -> None:
+        """wait_for_session_completions blocks for the first notification and drains the rest."""
+        gen = object.__new__(OTelTraceReplayDataGenerator)
+
+        mock_graph = MagicMock()
+        mock_graph.events = {"event_0": MagicMock()}
+        gen.session_graph_state = {
+            sid: ReplaySessionState(
+                session_id=sid,
+                graph=mock_graph,
+                ready_events=set(),
+                dispatched_events=set(),
+                completed_events=set(),
+                event_completion_times={},
+                is_active=True,
+                is_complete=False,
+            )
+            for sid in ("session_1", "session_2")
+        }
+
+        completions: queue.Queue[Any] = queue.Queue()
+        gen.session_completion_queue = completions
+        assert gen.wait_for_session_completions(0.01) == []
+
+        completions.put({"session_id": "session_2", "failed": True, "event_completion_times": {}})
+        completions.put({"session_id": "unknown", "event_completion_times": {}})
+        completions.put({"session_id": "session_1", "event_completion_times": {"event_0": 5.0}})
+        assert gen.wait_for_session_completions(1.0) == ["session_2", "session_1"]
+        assert gen.session_graph_state["session_2"].failed is True
+        assert gen.session_graph_state["session_1"].completed_events == {"event_0"}
+        assert gen.check_session_completed("session_1") is True
+
     def test_activate_session_marks_root_events_ready(self) -> None:
         """activate_session marks root events (no predecessors) as ready."""
         gen = object.__new__(OTelTraceReplayDataGenerator)